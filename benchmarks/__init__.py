@@ -0,0 +1,6 @@
+"""
+关键工具流程的性能基准。
+
+在进程内的 Polygon 替身上运行 readiness 检查、打包等待、发布流程、批量读取测试和题目包下载，
+可注入延迟和带宽限制，记录耗时、请求数、峰值内存和 CPU 时间。运行方式: python -m benchmarks --help
+"""
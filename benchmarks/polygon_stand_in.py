@@ -0,0 +1,355 @@
+import json
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+POLYGON_API_PREFIX = "https://polygon.codeforces.com/api/"
+
+DEFAULT_PROBLEM_ID = 1
+DEFAULT_TEST_COUNT = 50
+DEFAULT_TEST_INPUT_BYTES = 4096
+DEFAULT_PACKAGE_BYTES = 1024 * 1024
+DEFAULT_BUILD_SECONDS = 0.2
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d+)-$")
+# 生成包内容时重复使用的数据块，避免为几百 MB 的包在“服务端”一次性分配内存
+_PACKAGE_FILL = bytes(range(256)) * 256
+_ZIP_HEADER = b"PK\x03\x04"
+
+
+class _ThrottledBody:
+    """按给定带宽逐块产出合成内容的响应体，实现 requests 读取响应所需的 read/close 接口。"""
+
+    def __init__(self, size: int, produce: Callable[[int, int], bytes], sleep_for: Callable[[int], None]):
+        self._size = size
+        self._produce = produce
+        self._sleep_for = sleep_for
+        self._position = 0
+        self.closed = False
+
+    def read(self, amt: Optional[int] = None, **_: Any) -> bytes:
+        if self.closed or self._position >= self._size:
+            return b""
+        end = self._size if amt is None else min(self._size, self._position + amt)
+        chunk = self._produce(self._position, end)
+        self._sleep_for(len(chunk))
+        self._position = end
+        return chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _package_bytes(start: int, end: int) -> bytes:
+    chunks = []
+    position = start
+    while position < end:
+        if position < len(_ZIP_HEADER):
+            piece = _ZIP_HEADER[position:min(end, len(_ZIP_HEADER))]
+        else:
+            offset = position % len(_PACKAGE_FILL)
+            piece = _PACKAGE_FILL[offset:offset + min(end - position, len(_PACKAGE_FILL) - offset)]
+        chunks.append(piece)
+        position += len(piece)
+    return b"".join(chunks)
+
+
+class PolygonStandIn:
+    """
+    进程内的 Polygon API 替身，模拟一道题目的读写接口、打包过程和题目包下载。
+
+    latency_ms 是每个请求到达响应头前的固定延迟；bandwidth_mbps 限制响应体的传输速率（兆比特每秒），
+    为 None 时不限速。题目包内容按需逐块生成，下载几百 MB 的包也不会让替身本身占用同样多的内存，
+    因此测得的峰值内存反映的是客户端代码的行为。request_counts 按 Polygon 方法名统计收到的请求数。
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0.0,
+        bandwidth_mbps: Optional[float] = None,
+        problem_id: int = DEFAULT_PROBLEM_ID,
+        test_count: int = DEFAULT_TEST_COUNT,
+        test_input_bytes: int = DEFAULT_TEST_INPUT_BYTES,
+        package_bytes: int = DEFAULT_PACKAGE_BYTES,
+        build_seconds: float = DEFAULT_BUILD_SECONDS,
+    ):
+        if latency_ms < 0:
+            raise ValueError("latency_ms 不能小于 0")
+        if bandwidth_mbps is not None and bandwidth_mbps <= 0:
+            raise ValueError("bandwidth_mbps 必须大于 0")
+        if test_count <= 0:
+            raise ValueError("test_count 必须大于 0")
+        if test_input_bytes <= 0 or package_bytes <= 0:
+            raise ValueError("test_input_bytes 和 package_bytes 必须大于 0")
+        if build_seconds < 0:
+            raise ValueError("build_seconds 不能小于 0")
+
+        self.latency_ms = latency_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.problem_id = problem_id
+        self.test_count = test_count
+        self.test_input_bytes = test_input_bytes
+        self.package_bytes = package_bytes
+        self.build_seconds = build_seconds
+
+        self.request_counts: Counter[str] = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._revision = 10
+        self._modified = True
+        self._created_at = int(time.time())
+        self._packages: list[dict[str, Any]] = [
+            self._package_payload(1, self._revision - 1, self._created_at - 3600, "READY"),
+        ]
+        self._build_started: dict[int, float] = {}
+
+        self._json_handlers: dict[str, Callable[[dict[str, str]], Any]] = {
+            "problems.list": self._problems_list,
+            "problem.info": lambda params: {
+                "inputFile": "stdin",
+                "outputFile": "stdout",
+                "interactive": False,
+                "timeLimit": 1000,
+                "memoryLimit": 256,
+            },
+            "problem.statements": lambda params: {
+                "english": {
+                    "encoding": "UTF-8",
+                    "name": "Benchmark",
+                    "legend": "Sum the numbers.",
+                    "input": "The first line contains $n$.",
+                    "output": "Print the answer.",
+                },
+            },
+            "problem.validator": lambda params: "validator.cpp",
+            "problem.checker": lambda params: "checker.cpp",
+            "problem.interactor": lambda params: "",
+            "problem.extraValidators": lambda params: [],
+            "problem.files": self._files,
+            "problem.statementResources": lambda params: [],
+            "problem.tests": self._tests,
+            "problem.solutions": self._solutions,
+            "problem.packages": self._list_packages,
+            "problem.viewGeneralTutorial": lambda params: "Read the numbers and add them up.",
+            "problem.viewTestGroup": lambda params: [],
+            "problem.validatorTests": lambda params: [
+                {"index": 1, "input": "1\n", "expectedVerdict": "VALID"},
+            ],
+            "problem.checkerTests": lambda params: [
+                {"index": 1, "input": "1\n", "output": "1\n", "answer": "1\n", "expectedVerdict": "OK"},
+            ],
+            "problem.updateWorkingCopy": lambda params: None,
+            "problem.buildPackage": self._build_package,
+            "problem.commitChanges": self._commit_changes,
+        }
+        self._raw_handlers: dict[str, Callable[[dict[str, str]], bytes]] = {
+            "problem.script": lambda params: "".join(
+                f"gen {index} > {index}\n" for index in range(2, self.test_count + 1)
+            ).encode(),
+            "problem.testInput": self._test_file,
+            "problem.testAnswer": self._test_file,
+        }
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def install(self, session: requests.Session) -> requests.Session:
+        """把替身挂载到 requests.Session 上，之后发往 Polygon API 的请求都由替身应答。"""
+        session.mount(POLYGON_API_PREFIX, StandInAdapter(self))
+        return session
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.request_counts.values())
+
+    def wait_for_latency(self) -> None:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def wait_for_bandwidth(self, size: int) -> None:
+        with self._lock:
+            self.bytes_sent += size
+        if self.bandwidth_mbps is not None and size:
+            time.sleep(size * 8 / (self.bandwidth_mbps * 1_000_000))
+
+    def handle(self, method: str, params: dict[str, str], headers: CaseInsensitiveDict) -> tuple[int, dict, Any]:
+        """返回 (状态码, 响应头, 响应体)；响应体是 bytes 或按需生成内容的 _ThrottledBody。"""
+        with self._lock:
+            self.request_counts[method] += 1
+
+        if method == "problem.package":
+            return self._package_download(params, headers)
+        if method in self._raw_handlers:
+            return 200, {}, self._raw_handlers[method](params)
+        handler = self._json_handlers.get(method)
+        if handler is None:
+            payload: dict[str, Any] = {"status": "FAILED", "comment": f"Unknown method {method}"}
+            return 400, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+        result = handler(params)
+        payload = {"status": "OK"} if result is None else {"status": "OK", "result": result}
+        return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+    def _problem_payload(self) -> dict[str, Any]:
+        with self._lock:
+            ready_revisions = [package["revision"] for package in self._packages if package["state"] == "READY"]
+            return {
+                "id": self.problem_id,
+                "owner": "bench",
+                "name": "benchmark-problem",
+                "accessType": "OWNER",
+                "revision": self._revision,
+                "latestPackage": max(ready_revisions, default=None),
+                "modified": self._modified,
+            }
+
+    def _problems_list(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        if "id" in params and int(params["id"]) != self.problem_id:
+            return []
+        return [self._problem_payload()]
+
+    def _files(self, params: dict[str, str]) -> dict[str, Any]:
+        return {
+            "resourceFiles": [
+                {"name": "testlib.h", "modificationTimeSeconds": self._created_at, "length": 180000},
+            ],
+            "sourceFiles": [
+                {"name": name, "modificationTimeSeconds": self._created_at, "length": 2048}
+                for name in ("gen.cpp", "validator.cpp", "checker.cpp")
+            ],
+            "auxFiles": [],
+        }
+
+    def _solutions(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        return [
+            {"name": name, "modificationTimeSeconds": self._created_at, "length": 1024, "tag": tag}
+            for name, tag in (("main.cpp", "MA"), ("slow.py", "TL"), ("wrong.cpp", "WA"))
+        ]
+
+    def _tests(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        include_inputs = params.get("noInputs") != "true"
+        tests = []
+        for index in range(1, self.test_count + 1):
+            manual = index == 1
+            test: dict[str, Any] = {
+                "index": index,
+                "manual": manual,
+                "useInStatements": manual,
+                "description": f"test {index}",
+            }
+            if manual:
+                test.update(
+                    inputForStatement="1 2\n",
+                    outputForStatement="3\n",
+                    verifyInputOutputForStatements=True,
+                )
+                if include_inputs:
+                    test["input"] = self._test_file(params).decode()
+            if not manual:
+                test["scriptLine"] = f"gen {index} > {index}"
+            tests.append(test)
+        return tests
+
+    def _test_file(self, params: dict[str, str]) -> bytes:
+        line = b"1 2 3 4 5 6 7 8 9\n"
+        return (line * (self.test_input_bytes // len(line) + 1))[: self.test_input_bytes]
+
+    @staticmethod
+    def _package_payload(package_id: int, revision: int, created_at: int, state: str) -> dict[str, Any]:
+        return {
+            "id": package_id,
+            "revision": revision,
+            "creationTimeSeconds": created_at,
+            "state": state,
+            "comment": "",
+            "type": "linux",
+        }
+
+    def _list_packages(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            for package in self._packages:
+                started = self._build_started.get(package["id"])
+                if started is not None and now - started >= self.build_seconds:
+                    package["state"] = "READY"
+                    del self._build_started[package["id"]]
+            return [dict(package) for package in self._packages]
+
+    def _build_package(self, params: dict[str, str]) -> None:
+        with self._lock:
+            package_id = max(package["id"] for package in self._packages) + 1
+            self._packages.append(self._package_payload(package_id, self._revision, int(time.time()), "PENDING"))
+            self._build_started[package_id] = time.monotonic()
+        return None
+
+    def _commit_changes(self, params: dict[str, str]) -> None:
+        with self._lock:
+            self._revision += 1
+            self._modified = False
+        return None
+
+    def _package_download(self, params: dict[str, str], headers: CaseInsensitiveDict) -> tuple[int, dict, Any]:
+        start = 0
+        status = 200
+        response_headers = {"Content-Type": "application/zip"}
+        range_match = _RANGE_PATTERN.match(headers.get("Range", ""))
+        if range_match is not None:
+            start = min(int(range_match.group(1)), self.package_bytes)
+            status = 206
+            response_headers["Content-Range"] = f"bytes {start}-{self.package_bytes - 1}/{self.package_bytes}"
+        response_headers["Content-Length"] = str(self.package_bytes - start)
+        body = _ThrottledBody(
+            self.package_bytes - start,
+            lambda begin, end: _package_bytes(start + begin, start + end),
+            self.wait_for_bandwidth,
+        )
+        return status, response_headers, body
+
+
+class StandInAdapter(BaseAdapter):
+    """requests 传输适配器：在进程内把请求交给 PolygonStandIn，并按配置注入延迟和带宽限制。"""
+
+    def __init__(self, stand_in: PolygonStandIn):
+        super().__init__()
+        self.stand_in = stand_in
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any) -> requests.Response:
+        url = urlsplit(request.url)
+        method = url.path.rsplit("/", 1)[-1]
+        params = dict(parse_qsl(url.query))
+        if request.body:
+            body = request.body.decode() if isinstance(request.body, bytes) else request.body
+            params.update(parse_qsl(body))
+
+        self.stand_in.wait_for_latency()
+        status, headers, body = self.stand_in.handle(method, params, request.headers)
+        if isinstance(body, bytes):
+            content = body
+            headers.setdefault("Content-Length", str(len(content)))
+            body = _ThrottledBody(
+                len(content),
+                lambda begin, end: content[begin:end],
+                self.stand_in.wait_for_bandwidth,
+            )
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = body
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.reason = "OK" if status < 400 else "Error"
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        pass
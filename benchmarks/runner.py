@@ -0,0 +1,322 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional, Sequence
+from unittest.mock import patch
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，此时不记录峰值内存
+    resource = None
+
+from benchmarks.polygon_stand_in import (
+    DEFAULT_BUILD_SECONDS,
+    DEFAULT_PACKAGE_BYTES,
+    DEFAULT_TEST_COUNT,
+    DEFAULT_TEST_INPUT_BYTES,
+    PolygonStandIn,
+)
+from benchmarks.scenarios import DEFAULT_PACKAGE_SIZES_MB, BenchmarkScenario, build_scenarios
+from src.mcp.utils import common
+
+RESULTS_SCHEMA_VERSION = 1
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+# 与基线比较的指标；请求数是确定的，任何增加都算回归，其余指标按相对阈值判断
+COMPARED_METRICS = ("wall_time_seconds", "cpu_seconds", "peak_rss_bytes", "request_count")
+
+
+class BenchmarkConfig(NamedTuple):
+    """一次基准运行的替身配置，会原样写入结果文件，比较两份结果前应确认配置一致。"""
+
+    latency_ms: float = DEFAULT_LATENCY_MS
+    bandwidth_mbps: Optional[float] = None
+    test_count: int = DEFAULT_TEST_COUNT
+    test_input_bytes: int = DEFAULT_TEST_INPUT_BYTES
+    build_seconds: float = DEFAULT_BUILD_SECONDS
+    package_sizes_mb: tuple[float, ...] = DEFAULT_PACKAGE_SIZES_MB
+    repeat: int = 1
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上 ru_maxrss 的单位是 KiB，macOS 上是字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_scenario(scenario: BenchmarkScenario, config: BenchmarkConfig) -> dict[str, Any]:
+    """
+    在当前进程中对替身执行一次场景并测量。
+
+    工具通过正常的客户端注册表创建 PolygonClient，只把替身挂到 build_transport 创建的连接上，
+    所以连接池、响应缓存、限速等环境变量配置照常生效。峰值内存是进程级的历史最大值，
+    需要按场景比较时应在独立进程中运行（见 run_benchmarks）。
+    """
+    stand_in = PolygonStandIn(
+        latency_ms=config.latency_ms,
+        bandwidth_mbps=config.bandwidth_mbps,
+        test_count=config.test_count,
+        test_input_bytes=config.test_input_bytes,
+        package_bytes=scenario.package_bytes or DEFAULT_PACKAGE_BYTES,
+        build_seconds=config.build_seconds,
+    )
+    build_transport = common.build_transport
+
+    def build_stand_in_transport():
+        transport = build_transport()
+        stand_in.install(transport.session)
+        return transport
+
+    with tempfile.TemporaryDirectory(prefix="polygon-benchmark-") as temp_dir, patch.dict(
+        os.environ,
+        {"POLYGON_API_KEY": "benchmark", "POLYGON_API_SECRET": "benchmark"},
+    ), patch.object(common, "build_transport", build_stand_in_transport):
+        common.reset_client_cache()
+        rss_before = _peak_rss_bytes()
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        try:
+            outcome = scenario.run(stand_in, Path(temp_dir))
+        except Exception as exc:
+            outcome = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+        finally:
+            wall_time = time.perf_counter() - started
+            cpu_time = time.process_time() - cpu_started
+            common.reset_client_cache()
+        peak_rss = _peak_rss_bytes()
+
+    return {
+        "wall_time_seconds": round(wall_time, 4),
+        "cpu_seconds": round(cpu_time, 4),
+        "peak_rss_bytes": peak_rss,
+        "rss_growth_bytes": peak_rss - rss_before if peak_rss is not None else None,
+        "request_count": stand_in.total_requests(),
+        "requests_by_method": dict(sorted(stand_in.request_counts.items())),
+        "bytes_received": stand_in.bytes_sent,
+        "outcome": outcome,
+    }
+
+
+def _summarize_runs(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    peaks = [run["peak_rss_bytes"] for run in runs if run["peak_rss_bytes"] is not None]
+    last = runs[-1]
+    return {
+        "wall_time_seconds": round(statistics.median(run["wall_time_seconds"] for run in runs), 4),
+        "cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in runs), 4),
+        "peak_rss_bytes": max(peaks) if peaks else None,
+        "request_count": max(run["request_count"] for run in runs),
+        "requests_by_method": last["requests_by_method"],
+        "bytes_received": last["bytes_received"],
+        "succeeded": all(run["outcome"].get("status") == "success" for run in runs),
+        "runs": runs,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def select_scenarios(
+    scenarios: list[BenchmarkScenario],
+    names: Optional[Iterable[str]],
+) -> list[BenchmarkScenario]:
+    """按名称或名称前缀筛选场景，未给出 names 时返回全部场景。"""
+    if not names:
+        return scenarios
+    selected = []
+    for name in names:
+        matches = [scenario for scenario in scenarios if scenario.name.startswith(name)]
+        if not matches:
+            available = ", ".join(scenario.name for scenario in scenarios)
+            raise ValueError(f"未知的基准场景: {name}，可选值: {available}")
+        selected.extend(match for match in matches if match not in selected)
+    return selected
+
+
+def run_benchmarks(
+    config: BenchmarkConfig,
+    names: Optional[Iterable[str]] = None,
+    *,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """
+    运行选中的场景，每个场景重复 config.repeat 次，返回可直接写成 JSON 的结果文档。
+
+    isolate=True 时每次运行都在新的 spawn 子进程中进行，峰值内存只反映该场景，各场景之间也不会共享
+    客户端、会话缓存等进程级状态。
+    """
+    if config.repeat <= 0:
+        raise ValueError("repeat 必须大于 0")
+    scenarios = select_scenarios(build_scenarios(config.package_sizes_mb), names)
+
+    spawn_context = multiprocessing.get_context("spawn")
+    results: dict[str, Any] = {}
+    for scenario in scenarios:
+        runs = []
+        for _ in range(config.repeat):
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn_context) as executor:
+                    runs.append(executor.submit(run_scenario, scenario, config).result())
+            else:
+                runs.append(run_scenario(scenario, config))
+        results[scenario.name] = _summarize_runs(runs)
+
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "isolated": isolate,
+        "config": {**config._asdict(), "package_sizes_mb": list(config.package_sizes_mb)},
+        "scenarios": results,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """
+    找出 current 相对 baseline 变差的指标。
+
+    耗时、CPU 和峰值内存超过基线的 (1 + threshold) 倍才算回归，请求数只要增加就算回归；
+    只比较两份结果中都存在的场景。
+    """
+    if threshold < 0:
+        raise ValueError("threshold 不能小于 0")
+    regressions = []
+    for name, current_result in current["scenarios"].items():
+        baseline_result = baseline.get("scenarios", {}).get(name)
+        if baseline_result is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before = baseline_result.get(metric)
+            after = current_result.get(metric)
+            if before is None or after is None:
+                continue
+            limit = before if metric == "request_count" else before * (1 + threshold)
+            if after > limit:
+                regressions.append(
+                    {
+                        "scenario": name,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "ratio": round(after / before, 3) if before else None,
+                    }
+                )
+    return regressions
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    return f"{value / (1024 * 1024):.1f}MiB"
+
+
+def format_report(document: dict[str, Any]) -> str:
+    lines = [f"{'scenario':<44} {'wall s':>8} {'cpu s':>8} {'requests':>8} {'peak rss':>10}  status"]
+    for name, result in document["scenarios"].items():
+        lines.append(
+            f"{name:<44} {result['wall_time_seconds']:>8.3f} {result['cpu_seconds']:>8.3f} "
+            f"{result['request_count']:>8} {_format_bytes(result['peak_rss_bytes']):>10}  "
+            f"{'ok' if result['succeeded'] else 'FAILED'}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_sizes(value: str) -> tuple[float, ...]:
+    try:
+        return tuple(float(item) for item in value.split(",") if item.strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"题目包大小必须是逗号分隔的数字: {value}") from exc
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="在进程内的 Polygon 替身上运行关键工具流程的性能基准",
+    )
+    parser.add_argument("scenarios", nargs="*", help="只运行这些场景（按名称前缀匹配），默认运行全部")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS, help="每个请求注入的延迟")
+    parser.add_argument("--bandwidth-mbps", type=float, default=None, help="响应体带宽上限，默认不限速")
+    parser.add_argument("--tests", type=int, default=DEFAULT_TEST_COUNT, help="测试集中的测试数")
+    parser.add_argument("--test-input-bytes", type=int, default=DEFAULT_TEST_INPUT_BYTES, help="每个测试输入的大小")
+    parser.add_argument("--build-seconds", type=float, default=DEFAULT_BUILD_SECONDS, help="模拟的打包耗时")
+    parser.add_argument(
+        "--package-sizes-mb",
+        type=_parse_sizes,
+        default=DEFAULT_PACKAGE_SIZES_MB,
+        help="逗号分隔的题目包大小（MB），每个大小一个下载场景",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="每个场景的运行次数，汇总取中位数")
+    parser.add_argument("--output", help="把结果写入该 JSON 文件")
+    parser.add_argument("--compare", help="与该 JSON 结果比较，出现回归时以非零状态退出")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD, help="回归的相对阈值")
+    parser.add_argument("--in-process", action="store_true", help="在当前进程中运行，峰值内存不再按场景区分")
+    parser.add_argument("--list", action="store_true", help="只列出场景名称")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    config = BenchmarkConfig(
+        latency_ms=args.latency_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        test_count=args.tests,
+        test_input_bytes=args.test_input_bytes,
+        build_seconds=args.build_seconds,
+        package_sizes_mb=args.package_sizes_mb,
+        repeat=args.repeat,
+    )
+    if args.list:
+        for scenario in build_scenarios(config.package_sizes_mb):
+            print(scenario.name)
+        return 0
+
+    document = run_benchmarks(config, args.scenarios, isolate=not args.in_process)
+    print(format_report(document))
+    if args.output:
+        output = Path(args.output).expanduser()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"结果已写入 {output}")
+
+    exit_code = 0 if all(result["succeeded"] for result in document["scenarios"].values()) else 1
+    if args.compare:
+        baseline = json.loads(Path(args.compare).expanduser().read_text(encoding="utf-8"))
+        if baseline.get("config") != document["config"]:
+            print("警告: 基线的替身配置与本次不同，比较结果仅供参考", file=sys.stderr)
+        regressions = compare_results(baseline, document, args.threshold)
+        for item in regressions:
+            print(
+                f"回归: {item['scenario']} {item['metric']} {item['baseline']} -> {item['current']}",
+                file=sys.stderr,
+            )
+        if regressions:
+            exit_code = 1
+    return exit_code
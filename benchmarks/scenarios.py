@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+from benchmarks.polygon_stand_in import PolygonStandIn
+from src.mcp.utils.problem_package_workflow import build_problem_package_and_wait
+from src.mcp.utils.problem_packages import download_problem_package_info
+from src.mcp.utils.problem_readiness import check_problem_readiness
+from src.mcp.utils.problem_release import prepare_problem_release
+from src.mcp.utils.problem_tests_export import export_problem_tests
+from src.mcp.utils.problem_tests_extended import get_problem_tests
+
+MEGABYTE = 1024 * 1024
+DEFAULT_PACKAGE_SIZES_MB = (1.0, 50.0, 500.0)
+DEFAULT_POLL_INTERVAL_SECONDS = 0.05
+DOWNLOAD_SCENARIO_PREFIX = "download_problem_package_info_"
+
+
+class BenchmarkScenario(NamedTuple):
+    """一个基准场景：在替身上执行一次完整的工具调用，返回工具结果中值得记录的字段。"""
+
+    name: str
+    run: Callable[[PolygonStandIn, Path], dict[str, Any]]
+    package_bytes: Optional[int] = None
+
+
+def _tool_outcome(result: dict[str, Any]) -> dict[str, Any]:
+    outcome = {"status": result.get("status")}
+    if result.get("status") != "success":
+        outcome["message"] = result.get("message")
+        outcome["error"] = result.get("error")
+    return outcome
+
+
+def _run_readiness(stand_in: PolygonStandIn, work_dir: Path) -> dict[str, Any]:
+    result = check_problem_readiness(stand_in.problem_id)
+    return {
+        "status": "success",
+        "blocking_issues": len(result["blocking_issues"]),
+        "warnings": len(result["warnings"]),
+        "fetch_waves": result["fetch_timings"]["wave_count"],
+    }
+
+
+def _run_build(stand_in: PolygonStandIn, work_dir: Path) -> dict[str, Any]:
+    result = build_problem_package_and_wait(
+        stand_in.problem_id,
+        full=True,
+        verify=True,
+        poll_interval_seconds=DEFAULT_POLL_INTERVAL_SECONDS,
+    )
+    return {**_tool_outcome(result), "polls": result.get("polls")}
+
+
+def _run_release(stand_in: PolygonStandIn, work_dir: Path) -> dict[str, Any]:
+    result = prepare_problem_release(
+        stand_in.problem_id,
+        poll_interval_seconds=DEFAULT_POLL_INTERVAL_SECONDS,
+        allow_warnings=True,
+    )
+    return {**_tool_outcome(result), "revision": stand_in.revision}
+
+
+def _run_test_pages(stand_in: PolygonStandIn, work_dir: Path) -> dict[str, Any]:
+    """逐页读取整个测试集，并加载每一页上所有测试的输入。"""
+    indices = list(range(1, stand_in.test_count + 1))
+    cursor: Optional[str] = None
+    pages = 0
+    loaded = 0
+    while True:
+        page = get_problem_tests(stand_in.problem_id, "tests", cursor=cursor, input_indices=indices)
+        pages += 1
+        loaded += sum(1 for item in page.items if item.get("input") is not None)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    return {"status": "success", "pages": pages, "inputs_loaded": loaded}
+
+
+def _run_test_export(stand_in: PolygonStandIn, work_dir: Path) -> dict[str, Any]:
+    result = export_problem_tests(stand_in.problem_id, "tests", str(work_dir / "tests"))
+    summary = (result.get("result") or {}).get("summary", {})
+    return {**_tool_outcome(result), "downloaded": summary.get("downloaded"), "skipped": summary.get("skipped")}
+
+
+def _run_package_download(stand_in: PolygonStandIn, work_dir: Path) -> dict[str, Any]:
+    result = download_problem_package_info(stand_in.problem_id, 1, target_path=str(work_dir / "package.zip"))
+    return {**_tool_outcome(result), "size_bytes": result.get("size_bytes")}
+
+
+def format_size_mb(size_mb: float) -> str:
+    return f"{size_mb:g}".replace(".", "_") + "mb"
+
+
+def build_scenarios(package_sizes_mb: tuple[float, ...] = DEFAULT_PACKAGE_SIZES_MB) -> list[BenchmarkScenario]:
+    """返回全部基准场景；题目包下载按 package_sizes_mb 中的每个大小各生成一个场景。"""
+    scenarios = [
+        BenchmarkScenario("check_problem_readiness", _run_readiness),
+        BenchmarkScenario("build_problem_package_and_wait", _run_build),
+        BenchmarkScenario("prepare_problem_release", _run_release),
+        BenchmarkScenario("get_problem_tests", _run_test_pages),
+        BenchmarkScenario("export_problem_tests", _run_test_export),
+    ]
+    for size_mb in package_sizes_mb:
+        if size_mb <= 0:
+            raise ValueError("题目包大小必须大于 0")
+        scenarios.append(
+            BenchmarkScenario(
+                f"{DOWNLOAD_SCENARIO_PREFIX}{format_size_mb(size_mb)}",
+                _run_package_download,
+                package_bytes=int(size_mb * MEGABYTE),
+            )
+        )
+    return scenarios
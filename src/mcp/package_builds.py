@@ -0,0 +1,141 @@
+"""
+题目包构建流程共用的轮询策略、构建耗时记录和 package 解析工具。
+
+build_problem_package_and_wait 与 build_contest_packages_and_wait 共用这里的实现，
+构建耗时历史也在两者之间共享。
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any, Callable, Optional
+
+from src.polygon.models import Package
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_POLL_INTERVAL_SECONDS = 30.0
+POLL_BACKOFF_FACTOR = 2.0
+POLL_JITTER_RATIO = 0.2
+# 已知预计构建耗时时，先等到预计耗时的这个比例再开始密集轮询。
+EXPECTED_DURATION_WARMUP_RATIO = 0.8
+# 预计构建耗时的指数滑动平均权重（新观测值所占比例）。
+BUILD_DURATION_SMOOTHING = 0.5
+
+
+class BuildDurationHistory:
+    """进程内记录每个题目按 (full, verify) 区分的构建耗时，用指数滑动平均估计下一次构建需要多久。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: dict[tuple[int, bool, bool], float] = {}
+
+    def expected(self, problem_id: int, full: bool, verify: bool) -> Optional[float]:
+        with self._lock:
+            return self._durations.get((problem_id, full, verify))
+
+    def record(self, problem_id: int, full: bool, verify: bool, duration_seconds: float) -> None:
+        key = (problem_id, full, verify)
+        with self._lock:
+            previous = self._durations.get(key)
+            self._durations[key] = (
+                duration_seconds
+                if previous is None
+                else previous + BUILD_DURATION_SMOOTHING * (duration_seconds - previous)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._durations.clear()
+
+
+build_durations = BuildDurationHistory()
+
+
+class AdaptivePollSchedule:
+    """
+    构建轮询的等待策略。
+
+    没有历史耗时时从 initial_interval 开始按指数退避，并加上随机抖动避免多个任务同步轮询；
+    知道预计耗时时先以不超过 max_interval 的步长等到预计耗时的 80%，再从 initial_interval 重新开始退避。
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_interval: float,
+        max_interval: float,
+        expected_duration: Optional[float] = None,
+        jitter_ratio: float = POLL_JITTER_RATIO,
+        uniform: Callable[[float, float], float] = random.uniform,
+    ):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.expected_duration = expected_duration
+        self.jitter_ratio = jitter_ratio
+        self._uniform = uniform
+        self._backoff_steps = 0
+
+    def next_delay(self, elapsed_seconds: float, remaining_seconds: float) -> float:
+        warmup_until = (
+            self.expected_duration * EXPECTED_DURATION_WARMUP_RATIO
+            if self.expected_duration is not None
+            else 0.0
+        )
+        if elapsed_seconds < warmup_until:
+            delay = min(self.max_interval, warmup_until - elapsed_seconds)
+        else:
+            delay = min(
+                self.max_interval,
+                self.initial_interval * (POLL_BACKOFF_FACTOR ** self._backoff_steps),
+            )
+            self._backoff_steps += 1
+        delay *= self._uniform(1 - self.jitter_ratio, 1 + self.jitter_ratio)
+        return max(0.0, min(delay, self.max_interval, remaining_seconds))
+
+
+def extract_package_id(build_result: Any) -> Optional[int]:
+    if isinstance(build_result, Package):
+        return build_result.id
+    if isinstance(build_result, int):
+        return build_result
+    if isinstance(build_result, dict):
+        for key in ("packageId", "id"):
+            value = build_result.get(key)
+            if value is not None:
+                return int(value)
+        nested_package = build_result.get("package")
+        if nested_package is not None:
+            return extract_package_id(nested_package)
+    return None
+
+
+def serialize_package(package: Package) -> dict[str, Any]:
+    return {
+        "id": package.id,
+        "revision": package.revision,
+        "creation_time": package.creationTimeSeconds.isoformat(),
+        "state": package.state.value,
+        "comment": package.comment,
+        "type": package.type.value,
+    }
+
+
+def pick_latest_package(packages: list[Package]) -> Optional[Package]:
+    if not packages:
+        return None
+    return max(packages, key=lambda package: (package.creationTimeSeconds, package.id))
+
+
+def validate_build_request(
+    timeout_seconds: int,
+    poll_interval_seconds: float,
+    max_poll_interval_seconds: float,
+) -> Optional[ValueError]:
+    if timeout_seconds <= 0:
+        return ValueError("timeout_seconds 必须大于 0")
+    if poll_interval_seconds <= 0:
+        return ValueError("poll_interval_seconds 必须大于 0")
+    if max_poll_interval_seconds < poll_interval_seconds:
+        return ValueError("max_poll_interval_seconds 不能小于 poll_interval_seconds")
+    return None
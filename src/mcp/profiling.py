@@ -0,0 +1,280 @@
+import cProfile
+import functools
+import json
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+PROFILE_MODE_CPU = "cpu"
+PROFILE_MODE_MEMORY = "memory"
+PROFILE_MODES = (PROFILE_MODE_CPU, PROFILE_MODE_MEMORY)
+PROFILE_SORT_KEYS = ("tottime", "cumtime", "calls")
+
+DEFAULT_PROFILE_HISTORY = 50
+DEFAULT_PROFILE_TOP = 20
+TOP_ALLOCATIONS_PER_CALL = 25
+# tracemalloc 记录的调用栈深度；1 层足以按行号定位分配热点，开销也最小
+TRACEMALLOC_FRAMES = 1
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _format_function(key: tuple[str, int, str]) -> str:
+    filename, lineno, name = key
+    if filename == "~":
+        return name
+    return f"{filename}:{lineno}({name})"
+
+
+class ProfileRecord:
+    """一次被剖析的工具调用：按函数汇总的 CPU 统计、按代码行汇总的内存分配，以及写出的文件。"""
+
+    def __init__(self, tool: str, started_at: float):
+        self.tool = tool
+        self.started_at = started_at
+        self.duration_ms = 0.0
+        # 函数 -> (调用次数, 自身耗时秒, 累计耗时秒)
+        self.functions: dict[str, tuple[int, float, float]] = {}
+        # 代码行 -> (新增字节数, 新增分配块数)
+        self.allocations: dict[str, tuple[int, int]] = {}
+        self.peak_bytes: Optional[int] = None
+        self.paths: list[Path] = []
+        self.error: Optional[str] = None
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "started_at": round(self.started_at, 3),
+            "duration_ms": self.duration_ms,
+            "peak_bytes": self.peak_bytes,
+            "error": self.error,
+            "paths": [str(path) for path in self.paths],
+        }
+
+
+class ToolProfiler:
+    """
+    按需包在 MCP 工具外层的 cProfile / tracemalloc 剖析器。
+
+    cpu 模式为每次调用单独运行一个 cProfile.Profile，只统计执行工具体的线程；memory 模式在首次使用时启动
+    tracemalloc，并对比调用前后的快照得到按代码行汇总的新增分配（tracemalloc 是进程级的，并发调用时
+    结果会混入同时运行的其他调用）。最近 history 次调用的结果保存在内存中供 hotspots 汇总；
+    配置了 profile_dir 时每次调用写出 .prof（可用 pstats 或 snakeviz 打开）和 .memory.json 文件，
+    结果被挤出内存时对应文件一并删除，目录大小保持有界。
+    """
+
+    def __init__(
+        self,
+        modes: Iterable[str],
+        *,
+        tools: Optional[Iterable[str]] = None,
+        profile_dir: Optional[Union[str, Path]] = None,
+        history: int = DEFAULT_PROFILE_HISTORY,
+    ):
+        self.modes = frozenset(modes)
+        unknown_modes = sorted(self.modes - set(PROFILE_MODES))
+        if unknown_modes:
+            raise ValueError(f"无效的剖析模式: {', '.join(unknown_modes)}，可选值: {', '.join(PROFILE_MODES)}")
+        if not self.modes:
+            raise ValueError("至少需要启用一种剖析模式")
+        if history <= 0:
+            raise ValueError("history 必须大于 0")
+        self.tools = frozenset(tools) if tools is not None else None
+        self.profile_dir = Path(profile_dir).expanduser() if profile_dir else None
+        self.history = history
+        self._records: deque[ProfileRecord] = deque()
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def should_profile(self, tool_name: str) -> bool:
+        return self.tools is None or tool_name in self.tools
+
+    def wrap(self, func: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+        """
+        返回剖析 func 每次调用的包装函数，名称、文档和签名保持不变。
+
+        name 是记录中的工具名，应与注册名一致（hotspots 的 tool 过滤和 POLYGON_PROFILE_TOOLS 都按注册名匹配）；
+        不传时使用 func.__name__。
+        """
+        tool_name = name if name is not None else func.__name__
+
+        @functools.wraps(func)
+        def tool(*args: Any, **kwargs: Any) -> Any:
+            return self.profile_call(tool_name, func, *args, **kwargs)
+
+        return tool
+
+    def profile_call(self, tool_name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        record = ProfileRecord(tool_name, time.time())
+        profile: Optional[cProfile.Profile] = None
+        snapshot_before: Optional[tracemalloc.Snapshot] = None
+
+        if PROFILE_MODE_MEMORY in self.modes:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            snapshot_before = tracemalloc.take_snapshot()
+        if PROFILE_MODE_CPU in self.modes:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # 同一时刻只允许一个剖析器的解释器上，并发调用中后到的那次不做 CPU 剖析
+                profile = None
+
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException as exc:
+            record.error = type(exc).__name__
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            if snapshot_before is not None:
+                self._collect_allocations(record, snapshot_before)
+            if profile is not None:
+                self._collect_functions(record, profile)
+            self._store(record, profile)
+
+    @staticmethod
+    def _collect_functions(record: ProfileRecord, profile: cProfile.Profile) -> None:
+        for key, (_, calls, tottime, cumtime, _) in pstats.Stats(profile).stats.items():
+            if "_lsprof.Profiler" in key[2]:
+                continue
+            record.functions[_format_function(key)] = (calls, tottime, cumtime)
+
+    @staticmethod
+    def _collect_allocations(record: ProfileRecord, snapshot_before: tracemalloc.Snapshot) -> None:
+        snapshot_after = tracemalloc.take_snapshot()
+        record.peak_bytes = tracemalloc.get_traced_memory()[1]
+        ignored = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        differences = snapshot_after.filter_traces(ignored).compare_to(
+            snapshot_before.filter_traces(ignored),
+            "lineno",
+        )
+        for difference in differences[:TOP_ALLOCATIONS_PER_CALL]:
+            if difference.size_diff <= 0:
+                continue
+            frame = difference.traceback[0]
+            record.allocations[f"{frame.filename}:{frame.lineno}"] = (difference.size_diff, difference.count_diff)
+
+    def _store(self, record: ProfileRecord, profile: Optional[cProfile.Profile]) -> None:
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        if self.profile_dir is not None:
+            self._write_files(record, profile, sequence)
+
+        evicted: list[ProfileRecord] = []
+        with self._lock:
+            self._records.append(record)
+            while len(self._records) > self.history:
+                evicted.append(self._records.popleft())
+        for old_record in evicted:
+            for path in old_record.paths:
+                path.unlink(missing_ok=True)
+
+    def _write_files(self, record: ProfileRecord, profile: Optional[cProfile.Profile], sequence: int) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(record.started_at))
+        stem = f"{stamp}-{sequence:06d}-{_UNSAFE_FILENAME_CHARS.sub('_', record.tool)}"
+        if profile is not None:
+            path = self.profile_dir / f"{stem}.prof"
+            profile.dump_stats(str(path))
+            record.paths.append(path)
+        if record.peak_bytes is not None:
+            path = self.profile_dir / f"{stem}.memory.json"
+            payload = {
+                **record.summary(),
+                "allocations": [
+                    {"location": location, "size_bytes": size, "count": count}
+                    for location, (size, count) in sorted(
+                        record.allocations.items(),
+                        key=lambda item: item[1][0],
+                        reverse=True,
+                    )
+                ],
+            }
+            path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            record.paths.append(path)
+
+    def records(self, tool: Optional[str] = None) -> list[ProfileRecord]:
+        with self._lock:
+            return [record for record in self._records if tool is None or record.tool == tool]
+
+    def hotspots(
+        self,
+        tool: Optional[str] = None,
+        top: int = DEFAULT_PROFILE_TOP,
+        sort: str = "tottime",
+    ) -> dict[str, Any]:
+        """汇总最近调用中最耗时的函数和新增分配最多的代码行。"""
+        if sort not in PROFILE_SORT_KEYS:
+            raise ValueError(f"无效的 sort: {sort}，可选值: {', '.join(PROFILE_SORT_KEYS)}")
+        if top <= 0:
+            raise ValueError("top 必须大于 0")
+
+        records = self.records(tool)
+        functions: dict[str, list[float]] = {}
+        allocations: dict[str, list[int]] = {}
+        tools: dict[str, int] = {}
+        for record in records:
+            tools[record.tool] = tools.get(record.tool, 0) + 1
+            for name, (calls, tottime, cumtime) in record.functions.items():
+                totals = functions.setdefault(name, [0, 0.0, 0.0])
+                totals[0] += calls
+                totals[1] += tottime
+                totals[2] += cumtime
+            for location, (size, count) in record.allocations.items():
+                totals = allocations.setdefault(location, [0, 0])
+                totals[0] += size
+                totals[1] += count
+
+        sort_index = {"calls": 0, "tottime": 1, "cumtime": 2}[sort]
+        ranked_functions = sorted(functions.items(), key=lambda item: item[1][sort_index], reverse=True)[:top]
+        ranked_allocations = sorted(allocations.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "modes": sorted(self.modes),
+            "calls_profiled": len(records),
+            "tools": dict(sorted(tools.items())),
+            "total_duration_ms": round(sum(record.duration_ms for record in records), 3),
+            "functions": [
+                {
+                    "function": name,
+                    "calls": calls,
+                    "tottime_ms": round(tottime * 1000, 3),
+                    "cumtime_ms": round(cumtime * 1000, 3),
+                }
+                for name, (calls, tottime, cumtime) in ranked_functions
+            ],
+            "allocations": [
+                {"location": location, "size_bytes": size, "count": count}
+                for location, (size, count) in ranked_allocations
+            ],
+            "recent_calls": [record.summary() for record in records[-5:]],
+        }
+
+    def clear(self) -> None:
+        """清空内存中的剖析结果；已写出的文件保留。"""
+        with self._lock:
+            self._records.clear()
+
+
+_active_profiler: Optional[ToolProfiler] = None
+
+
+def get_tool_profiler() -> Optional[ToolProfiler]:
+    """返回 register_tools 启用的剖析器；未启用剖析时为 None。"""
+    return _active_profiler
+
+
+def set_tool_profiler(profiler: Optional[ToolProfiler]) -> None:
+    global _active_profiler
+    _active_profiler = profiler
@@ -1,13 +1,24 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from importlib.metadata import PackageNotFoundError, version
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from src.mcp.tool_registry import iter_tool_registrations, validate_tool_registry
+from src.mcp.profiling import set_tool_profiler
+from src.mcp.tool_registry import get_registered_tool_names, iter_tool_registrations, validate_tool_registry
+from src.mcp.utils.common import build_tool_profiler, configure_tracing, export_metrics_if_configured, get_env_int
+from src.polygon.metrics import TOOL_METRICS, get_metrics_registry, payload_size
+from src.polygon.tracing import TOOL_SPAN, get_tracer
 
 if TYPE_CHECKING:
     from mcp.server.fastmcp import FastMCP
 
 
 _mcp_instance = None
+_tool_executor: Optional[ThreadPoolExecutor] = None
+
+DEFAULT_TOOL_CONCURRENCY = 16
 
 
 def _get_server_version() -> str:
@@ -25,12 +36,108 @@ def _get_fastmcp_class():
     return FastMCP
 
 
+def _get_tool_executor() -> ThreadPoolExecutor:
+    global _tool_executor
+    if _tool_executor is None:
+        max_workers = get_env_int("POLYGON_MCP_MAX_CONCURRENCY", DEFAULT_TOOL_CONCURRENCY)
+        if max_workers <= 0:
+            raise ValueError("POLYGON_MCP_MAX_CONCURRENCY 必须大于 0")
+        _tool_executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="polygon-tool",
+        )
+    return _tool_executor
+
+
+def _with_metrics(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    为工具记录调用指标：延迟、参数和返回值中 bytes/str 的字节数（不序列化其他对象），以及异常或 status=error 结果的错误类别。
+
+    每次调用结束后按 POLYGON_METRICS_PROMETHEUS_FILE 配置节流导出 Prometheus 文本。
+    """
+
+    @functools.wraps(func)
+    def tool(*args: Any, **kwargs: Any) -> Any:
+        try:
+            with get_metrics_registry().observe_call(TOOL_METRICS, func.__name__) as observation:
+                observation.bytes_in = payload_size(kwargs)
+                result = func(*args, **kwargs)
+                observation.bytes_out = payload_size(result)
+                if isinstance(result, dict) and result.get("status") == "error":
+                    observation.error = result.get("error_type") or "ToolError"
+                return result
+        finally:
+            try:
+                export_metrics_if_configured()
+            except (OSError, ValueError):
+                pass
+
+    return tool
+
+
+def _with_tracing(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    为每次工具调用创建一条 trace 的根 span。
+
+    工具参数逐个记录为 tool.arg.* 属性（凭证字段脱敏、长文本截断）；返回 status=error 的结果也标记为失败。
+    """
+
+    @functools.wraps(func)
+    def tool(*args: Any, **kwargs: Any) -> Any:
+        attributes = {f"tool.arg.{key}": value for key, value in kwargs.items()}
+        with get_tracer().span(func.__name__, span_type=TOOL_SPAN, **attributes) as span:
+            result = func(*args, **kwargs)
+            if isinstance(result, dict):
+                span.set_attribute("tool.status", result.get("status"))
+                if result.get("status") == "error":
+                    span.set_error(str(result.get("error") or result.get("message") or "error"))
+            return result
+
+    return tool
+
+
+def _as_coroutine_tool(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    把同步工具包装成协程工具。
+
+    FastMCP 会在事件循环上直接调用同步工具，一个慢请求就会卡住所有并发调用；
+    包装后工具体在有界线程池中执行，事件循环只负责等待，多个 agent 请求可以共享同一个循环。
+    名称、文档和签名通过 functools.wraps 保留，工具 schema 不变。
+    """
+
+    @functools.wraps(func)
+    async def tool(*args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            _get_tool_executor(),
+            functools.partial(context.run, func, *args, **kwargs),
+        )
+
+    return tool
+
+
 def register_tools(mcp_server: Any) -> list[str]:
-    """按注册表顺序向 MCP 服务注册全部工具。"""
+    """
+    按注册表顺序向 MCP 服务注册全部工具，统一以协程形式注册。
+
+    设置了 POLYGON_PROFILE 或 POLYGON_PROFILE_TOOLS 时，命中的工具最内层再包一层 cProfile / tracemalloc 剖析，
+    剖析结果不含指标和追踪包装自身的开销。
+    """
     validate_tool_registry()
+    profiler = build_tool_profiler()
+    if profiler is not None and profiler.tools is not None:
+        unknown_tools = sorted(profiler.tools - set(get_registered_tool_names()))
+        if unknown_tools:
+            raise ValueError(f"POLYGON_PROFILE_TOOLS 包含未注册的工具: {', '.join(unknown_tools)}")
+    set_tool_profiler(profiler)
+
     registered_names: list[str] = []
     for registration in iter_tool_registrations():
-        mcp_server.tool()(registration.func)
+        func = registration.func
+        if profiler is not None and profiler.should_profile(registration.name):
+            func = profiler.wrap(func, registration.name)
+        mcp_server.tool()(_as_coroutine_tool(_with_tracing(_with_metrics(func))))
         registered_names.append(registration.name)
     return registered_names
 
@@ -39,6 +146,7 @@ def create_mcp():
     fast_mcp_class = _get_fastmcp_class()
     mcp_server = fast_mcp_class("CF-Polygon-MCP")
     mcp_server._mcp_server.version = _get_server_version()
+    configure_tracing()
     register_tools(mcp_server)
     return mcp_server
 
@@ -0,0 +1,146 @@
+"""
+批量上传测试的共用实现：读取本地测试目录、带共享限流冷却的单个测试上传，以及并发数和重试次数。
+
+save_problem_tests_batch 与 sync_problem_tests 共用这里的实现。
+"""
+
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.mcp.utils.common import get_env_int, is_ok_result
+from src.polygon.models import PolygonHTTPError, PolygonNetworkError
+from src.polygon.rate_limit import PRIORITY_BULK, request_priority
+from src.polygon.utils.client_utils import (
+    DEFAULT_MAX_BACKOFF_SECONDS,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    DEFAULT_RETRY_STATUS_CODES,
+    request_max_retries,
+)
+
+DEFAULT_BATCH_MAX_WORKERS = 4
+DEFAULT_BATCH_MAX_RETRIES = 3
+
+_TEST_INPUT_FILE_PATTERN = re.compile(r"^(\d+)(?:\.(?:in|txt))?$", re.IGNORECASE)
+
+
+class RateLimitCooldown:
+    """批量上传共享的限流冷却窗口：任一请求被限流后，所有 worker 都等到窗口结束再发下一个请求。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def resolve_upload_limits(max_workers: Optional[int], max_retries: Optional[int]) -> tuple[int, int]:
+    """解析并校验并发数和重试次数；max_workers 未提供时读取 POLYGON_BATCH_MAX_WORKERS。"""
+    resolved_max_workers = (
+        get_env_int("POLYGON_BATCH_MAX_WORKERS", DEFAULT_BATCH_MAX_WORKERS)
+        if max_workers is None
+        else max_workers
+    )
+    if resolved_max_workers <= 0:
+        raise ValueError("max_workers 必须大于 0")
+    resolved_max_retries = DEFAULT_BATCH_MAX_RETRIES if max_retries is None else max_retries
+    if resolved_max_retries < 0:
+        raise ValueError("max_retries 不能小于 0")
+    return resolved_max_workers, resolved_max_retries
+
+
+def load_tests_from_dir(tests_dir: str, test_group: Optional[str]) -> list[dict[str, Any]]:
+    """读取目录中文件名形如 01、1.in、1.txt 的测试输入，答案文件（如 01.a）会被跳过。"""
+    directory = Path(tests_dir).expanduser()
+    if not directory.is_dir():
+        raise ValueError(f"tests_dir 不是有效目录: {tests_dir}")
+
+    specs: list[dict[str, Any]] = []
+    for path in sorted(directory.iterdir()):
+        match = _TEST_INPUT_FILE_PATTERN.match(path.name)
+        if match is None or not path.is_file():
+            continue
+        try:
+            test_input = path.read_text(encoding="utf-8")
+        except UnicodeDecodeError as exc:
+            raise ValueError(f"测试输入必须是 UTF-8 文本文件: {path}") from exc
+        spec: dict[str, Any] = {"test_index": int(match.group(1)), "test_input": test_input}
+        if test_group is not None:
+            spec["test_group"] = test_group
+        specs.append(spec)
+
+    if not specs:
+        raise ValueError(f"tests_dir 中没有找到测试输入文件（文件名形如 01、1.in、1.txt）: {tests_dir}")
+    return specs
+
+
+def _is_retryable_error(exc: Exception) -> bool:
+    if isinstance(exc, PolygonHTTPError):
+        return exc.status_code in DEFAULT_RETRY_STATUS_CODES
+    return isinstance(exc, PolygonNetworkError)
+
+
+def upload_test(
+    session: Any,
+    testset: str,
+    spec: dict[str, Any],
+    *,
+    check_existing: Optional[bool],
+    max_retries: int,
+    cooldown: RateLimitCooldown,
+) -> dict[str, Any]:
+    """
+    上传单个测试并返回逐项结果（状态、耗时、重试次数）。
+
+    可重试的错误在这里按指数退避重试，最多 max_retries 次；429 会暂停共享 cooldown 上的所有 worker。
+    """
+    started = time.perf_counter()
+    retries = 0
+    while True:
+        cooldown.wait()
+        try:
+            # 重试由本循环负责（限流时所有 worker 共享冷却窗口），关闭请求层重试，retries 即实际重发次数。
+            with request_priority(PRIORITY_BULK), request_max_retries(0):
+                result = session.save_test(testset=testset, check_existing=check_existing, **spec)
+        except Exception as exc:
+            if _is_retryable_error(exc) and retries < max_retries:
+                delay = min(
+                    DEFAULT_MAX_BACKOFF_SECONDS,
+                    DEFAULT_RETRY_BACKOFF_SECONDS * (2 ** retries),
+                )
+                if getattr(exc, "status_code", None) == 429:
+                    cooldown.pause(delay)
+                else:
+                    time.sleep(delay)
+                retries += 1
+                continue
+            return {
+                "test_index": spec["test_index"],
+                "status": "error",
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                "retries": retries,
+                "error": str(exc),
+                "error_type": type(exc).__name__,
+            }
+
+        success = is_ok_result(result)
+        item: dict[str, Any] = {
+            "test_index": spec["test_index"],
+            "status": "success" if success else "error",
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "retries": retries,
+        }
+        if not success:
+            item["error"] = str(result)
+            item["error_type"] = "PolygonResultError"
+        return item
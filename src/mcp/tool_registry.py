@@ -4,7 +4,10 @@ import inspect
 from dataclasses import dataclass
 from typing import Any, Callable, Iterable, get_args, get_origin
 
+from src.mcp.utils.contest_package_mirror import mirror_contest_packages
+from src.mcp.utils.contest_package_workflow import build_contest_packages_and_wait
 from src.mcp.utils.contest_problems import get_contest_problems
+from src.mcp.utils.contest_readiness import check_contest_readiness
 from src.mcp.utils.downloads import (
     download_contest_descriptor,
     download_contest_descriptor_info,
@@ -15,6 +18,8 @@ from src.mcp.utils.downloads import (
     download_problem_package_by_url,
     download_problem_package_info_by_url,
 )
+from src.mcp.utils.package_cache import get_package_cache_stats
+from src.mcp.utils.problem_changes import check_problem_changes
 from src.mcp.utils.problem_checker import get_problem_checker
 from src.mcp.utils.problem_content import (
     get_problem_files,
@@ -71,6 +76,9 @@ from src.mcp.utils.problem_tests_extended import (
     view_problem_test_groups,
     view_problem_test_input,
 )
+from src.mcp.utils.problem_tests_batch import save_problem_tests_batch
+from src.mcp.utils.problem_tests_export import export_problem_tests, get_problem_tests_export_progress
+from src.mcp.utils.problem_tests_sync import sync_problem_tests
 from src.mcp.utils.problem_update_info import update_problem_info
 from src.mcp.utils.problem_validator import get_problem_validator
 from src.mcp.utils.problem_working_copy import (
@@ -78,6 +86,11 @@ from src.mcp.utils.problem_working_copy import (
     update_problem_working_copy,
 )
 from src.mcp.utils.problems import get_problems
+from src.mcp.utils.rate_limit import get_rate_limit_stats
+from src.mcp.utils.response_cache import get_response_cache_stats
+from src.mcp.utils.server_metrics import get_server_metrics
+from src.mcp.utils.server_profiles import get_profile_hotspots
+from src.mcp.utils.server_traces import get_traces
 
 ToolCallable = Callable[..., object]
 
@@ -88,18 +101,22 @@ _COMMON_PARAM_NOTES: dict[str, str] = {
     "checker": "要设置为当前 checker 的源文件名。",
     "contest_id": "Polygon 比赛 ID。",
     "contest_url": "Polygon 比赛页面 URL。",
+    "cursor": "分页游标，传入上一页结果中的 next_cursor；不传时从第一页开始。游标与 filters 绑定，修改过滤条件后需重新从第一页开始。",
     "dependencies": "测试组依赖列表。",
     "description": "通用描述文本。",
     "enable": "是否启用对应功能。",
     "encoding": "题面编码，默认 UTF-8。",
     "feedback_policy": "测试组反馈策略。",
+    "fields": "只返回条目中的这些顶层字段；不传时返回完整条目，未知字段（包括结果为空时）会报错并列出可选字段。",
     "file_content": "直接上传的 UTF-8 文本内容。",
     "file_name": "文件名。",
     "file_type": "题目文件类型。",
     "for_types": "resource 文件高级属性中的 forTypes 原始字符串。",
+    "filters": "按顶层字段值在服务端过滤，例如 {\"tag\": [\"MA\", \"OK\"]}；值为列表时匹配其中任一值，比较使用 JSON 形式的值（枚举为字符串，时间为 ISO 8601）。",
     "force": "是否忽略 readiness 阻塞项继续执行发布流程。",
     "full": "是否构建完整题目包。",
     "group": "测试组名称。",
+    "include_details": "是否在结果中附带每一项的完整明细。",
     "input": "题面的输入说明。",
     "input_file": "输入文件名。",
     "interaction": "交互协议说明，仅交互题应填写。",
@@ -108,8 +125,13 @@ _COMMON_PARAM_NOTES: dict[str, str] = {
     "lang": "题面语言，默认 english。",
     "language": "下载比赛 PDF 时使用的语言，默认 english。",
     "legend": "题面正文。",
+    "limit": "本页最多返回的条目数，必须大于 0；不传时读取环境变量 POLYGON_LIST_PAGE_SIZE，默认 100，0 表示不分页。",
     "local_path": "本地文件路径；需要指向存在的 UTF-8 文本文件。",
     "login": "Polygon 登录名；未提供时读取环境变量 POLYGON_LOGIN。",
+    "max_in_flight": "同时处于构建中的题目数上限；未提供时读取环境变量 POLYGON_CONTEST_BUILD_MAX_IN_FLIGHT，默认 4。",
+    "max_poll_interval_seconds": "workflow 轮询退避的最大间隔（秒），不能小于 poll_interval_seconds。",
+    "max_retries": "单项遇到限流、5xx 或网络错误时的最大重试次数。",
+    "max_workers": "并发 worker 数上限；未提供时读取环境变量 POLYGON_BATCH_MAX_WORKERS，默认 4。",
     "memory_limit": "内存限制，单位 MB。",
     "message": "提交或发布时附带的说明消息。",
     "minor_changes": "是否将提交标记为 minor changes。",
@@ -126,6 +148,7 @@ _COMMON_PARAM_NOTES: dict[str, str] = {
     "points_policy": "测试组计分策略。",
     "poll_interval_seconds": "workflow 轮询间隔（秒），必须大于 0。",
     "problem_id": "Polygon 题目 ID。",
+    "problem_ids": "需要检查的 Polygon 题目 ID 列表；不传时表示当前凭证可访问的全部题目。",
     "problem_url": "Polygon 题目页面 URL，例如 https://polygon.codeforces.com/p/owner/problem 。",
     "remove": "是否删除附加标签；false 表示添加。",
     "revision": "指定 revision；未提供时使用最新版本。",
@@ -137,6 +160,10 @@ _COMMON_PARAM_NOTES: dict[str, str] = {
     "stages": "resource 文件的生效阶段列表。",
     "tag": "解法标签。",
     "tags": "题目标签列表。",
+    "target_path": (
+        "可选的本地保存路径；提供时内容分块流式写入该路径（先写同目录 .part 临时文件再原子重命名，"
+        "中断后再次调用会按已下载字节断点续传），结果附带 path；不提供时写入临时文件，生成元数据后删除。"
+    ),
     "test_answer": "checker 测试使用的标准答案内容。",
     "test_description": "测试点描述。",
     "test_group": "测试组名称。",
@@ -149,6 +176,13 @@ _COMMON_PARAM_NOTES: dict[str, str] = {
     "test_points": "测试点分值。",
     "test_use_in_statements": "是否把该测试展示为题面样例。",
     "test_verdict": "测试的期望判定。",
+    "tests": (
+        "内联测试列表；每项是一个对象，字段与 save_problem_test 的参数同名，"
+        "test_index 必填，可选 test_input、test_group、test_points、test_description、"
+        "test_use_in_statements、test_input_for_statements、test_output_for_statements、"
+        "verify_input_output_for_statements。"
+    ),
+    "tests_dir": "本地测试目录；文件名形如 01、1.in、1.txt 的 UTF-8 文件按编号作为测试输入，答案文件会被忽略。",
     "testset": "测试集名称，通常使用 tests。",
     "time_limit": "时间限制，单位毫秒。",
     "timeout_seconds": "workflow 等待超时时间（秒），必须大于 0。",
@@ -170,9 +204,69 @@ _PARAM_ALLOWED_VALUES: dict[str, tuple[str, ...]] = {
 }
 
 _TOOL_PARAM_NOTE_OVERRIDES: dict[str, dict[str, str]] = {
+    "build_problem_package_and_wait": {
+        "poll_interval_seconds": "首次轮询间隔（秒），之后按指数退避并加随机抖动，必须大于 0。",
+    },
+    "build_contest_packages_and_wait": {
+        "pin": "比赛的 PIN，只用于获取比赛题目列表；返回结果不会回显该字段。",
+        "poll_interval_seconds": "首次轮询间隔（秒），之后按指数退避并加随机抖动；新一批题目开始构建时重新起步，必须大于 0。",
+        "timeout_seconds": "整场构建的等待上限（秒），必须大于 0；超时时仍在构建的题目记为 timeout，尚未触发的记为 not_started。",
+    },
+    "mirror_contest_packages": {
+        "max_workers": "同时下载的题目数上限；未提供时读取环境变量 POLYGON_MIRROR_MAX_WORKERS，默认 4。",
+        "package_type": "镜像的题目包类型；linux/windows 只会选择完整包。可选值: standard, linux, windows。",
+        "pin": "比赛的 PIN，只用于获取比赛题目列表；返回结果不会回显该字段。",
+        "target_dir": "本地镜像目录，不存在时自动创建；目录中的 manifest.json 记录已镜像的 package。",
+        "verify_existing": "跳过 package 未变化的题目前是否重新计算本地文件 sha256；false 时只比较文件大小。",
+    },
+    "check_contest_readiness": {
+        "max_workers": (
+            "同时检查的题目数上限；未提供时读取环境变量 POLYGON_CONTEST_READINESS_WORKERS，默认 4；"
+            "不会超过 POLYGON_HTTP_POOL_MAXSIZE。"
+        ),
+        "pin": "比赛的 PIN，只用于获取比赛题目列表；返回结果不会回显该字段。",
+    },
     "download_problem_package_by_url": {
         "package_type": "题目包下载类型。可选值: linux, windows。",
     },
+    "export_problem_tests": {
+        "include_answers": "是否同时导出答案文件（NN.a）。",
+        "max_workers": "同时下载的文件数上限；未提供时读取环境变量 POLYGON_TEST_EXPORT_WORKERS，默认 8。",
+        "skip_unchanged": "题目 revision 与上次导出时相同且工作副本没有未提交修改时，跳过 sha256 与清单一致的本地文件。",
+        "target_dir": "导出目录，不存在时自动创建；输入写入 NN，答案写入 NN.a。",
+    },
+    "get_problem_tests": {
+        "input_indices": "需要附带输入内容的测试编号；只对当前页中的测试生效，每个测试单独调用 problem.testInput 下载。",
+        "no_inputs": "为 false 时一次性获取所有手动测试的输入；默认只返回元数据，输入通过 input_indices 按需获取。",
+    },
+    "get_problem_tests_export_progress": {
+        "problem_id": "只查看该题目的导出记录；不传时返回全部。",
+    },
+    "get_server_metrics": {
+        "kind": "只返回一类指标：polygon_method（Polygon API 方法）或 tool（MCP 工具）；不传时两类都返回。",
+        "prometheus_path": "提供时把全部指标按 Prometheus 文本格式写入该文件。",
+        "reset": "为 true 时在返回本次统计后清空全部指标。",
+        "top": "每类只返回累计耗时最高的前 N 项。",
+    },
+    "get_profile_hotspots": {
+        "reset": "为 true 时在返回本次汇总后清空内存中的剖析结果；已写出的剖析文件保留。",
+        "sort": "函数排序依据：tottime（函数自身耗时，默认）、cumtime（含子调用的累计耗时）或 calls（调用次数）。",
+        "tool": "只汇总该工具的调用；不传时汇总全部被剖析的工具。",
+        "top": "函数和内存分配位置各返回前 N 项，默认 20。",
+    },
+    "get_traces": {
+        "clear": "为 true 时在返回本次结果后清空追踪缓冲区。",
+        "errors_only": "为 true 时只返回包含失败 span 的 trace。",
+        "limit": "最多返回的 trace 条数，必须大于 0，默认 20；提供 trace_id 时忽略。",
+        "min_duration_ms": "只返回总耗时不少于该毫秒数的 trace。",
+        "name": "只返回根 span 名称（通常是工具名，例如 prepare_problem_release）等于该值的 trace。",
+        "trace_id": "提供时返回这条 trace 的完整 span 树，忽略其他过滤条件。",
+    },
+    "sync_problem_tests": {
+        "dry_run": "为 true 时只计算并返回同步计划，不上传任何测试。",
+        "full_compare": "为 true 时忽略同步状态，下载全部手动测试的远端输入逐一比较；用于远端输入可能在网页端被修改的场景。",
+        "test_group": "本地测试所属的测试组；提供时远端组不一致的测试也会重新上传。",
+    },
     "download_problem_package_info": {
         "package_type": "题目包下载类型。可选值: standard, linux, windows。",
     },
@@ -217,13 +311,160 @@ _TOOL_PRECONDITION_OVERRIDES: dict[str, tuple[str, ...]] = {
     "set_problem_validator": ("validator 对应的源文件必须已经存在于题目的 source 文件列表中。",),
     "set_problem_interactor": ("interactor 对应的源文件必须已经存在于题目的 source 文件列表中。",),
     "download_problem_package": ("package_id 必须对应题目已有的历史包。",),
+    "save_problem_tests_batch": (
+        "tests 与 tests_dir 必须且只能提供一个；test_index 不能重复。",
+        "开始上传前会先确认写权限；单个测试失败不会中断其余测试。",
+    ),
+    "export_problem_tests": (
+        "只读取数据，不修改 Polygon；每个文件先写 .part 临时文件再原子重命名，中断后重新导出会断点续传。",
+        "导出目录中的 .polygon-tests-export.json 记录每个文件的 sha256 和导出时的题目 revision。",
+        "导出进行中可以用 get_problem_tests_export_progress 查看进度。",
+    ),
+    "get_problem_tests_export_progress": ("只读取本进程内的导出进度，不访问 Polygon。",),
+    "sync_problem_tests": (
+        "tests_dir 的文件命名规则与 save_problem_tests_batch 相同；同步状态按 problem_id/testset 保存在 "
+        "POLYGON_TESTS_SYNC_STATE_DIR（默认 ~/.cache/cf-polygon-mcp/tests-sync），不会写入 tests_dir。",
+        "远端测试编号集合或某个测试的元数据（组、分值、描述等）与上次同步后不一致时，对应测试会重新下载远端输入比较；"
+        "只在网页端改了输入时请传 full_compare=true。状态保存失败时 result.warnings 给出原因。",
+        "generated（脚本生成）的测试不会被覆盖；只存在于远端的测试列在 remote_only 中，不会被删除。",
+    ),
+    "get_package_cache_stats": (
+        "只读取本地题目包缓存，不访问 Polygon；未设置 POLYGON_PACKAGE_CACHE_DIR 时缓存未启用。",
+    ),
+    "get_rate_limit_stats": (
+        "只读取本进程内的限速统计，不访问 Polygon；速率由 POLYGON_READ_RATE_LIMIT、POLYGON_WRITE_RATE_LIMIT 配置。",
+    ),
+    "check_problem_changes": (
+        "首次调用只建立快照，所有题目归入 new；之后的调用才能判断 changed / unchanged。",
+        "modified 持续为 true 的题目在工作副本继续被修改时快照不会变化，这类修改只能靠响应缓存的 TTL 兜底。",
+    ),
+    "get_response_cache_stats": (
+        "只读取本进程内的缓存统计，不访问 Polygon；未设置 POLYGON_RESPONSE_CACHE 时缓存未启用。",
+    ),
+    "get_server_metrics": (
+        "只读取本进程内的调用指标，不访问 Polygon；统计从进程启动或上次 reset 开始累计。",
+        "延迟分位数由固定桶直方图插值估算；设置 POLYGON_METRICS_PROMETHEUS_FILE 后每次工具调用结束都会按间隔自动导出。",
+    ),
+    "get_profile_hotspots": (
+        "只读取本进程内存中的剖析结果，不访问 Polygon；需要在启动服务前设置 POLYGON_PROFILE（cpu、memory 或 all）"
+        "或 POLYGON_PROFILE_TOOLS（工具名白名单）。",
+        "每次被剖析的调用会在 POLYGON_PROFILE_DIR 写出 .prof 与 .memory.json 文件，只保留最近 "
+        "POLYGON_PROFILE_HISTORY 次调用。",
+    ),
+    "get_traces": (
+        "只读取本进程内存中的追踪缓冲区，不访问 Polygon；缓冲区容量由 POLYGON_TRACE_BUFFER_SIZE 控制，旧 span 会被淘汰。",
+        "span 属性中的 pin、password 等凭证字段已按工具结果相同的规则脱敏。",
+    ),
     "build_problem_package_and_wait": ("适合 agent/workflow 编排场景；失败时优先阅读 recovery_actions。",),
+    "build_contest_packages_and_wait": (
+        "会为比赛内每道题触发 problem.buildPackage，属于写操作编排；需要对每道题都有写权限。",
+        "所有构建中题目共用一个轮询循环，每轮并发查询各题的 package 状态。",
+    ),
+    "check_contest_readiness": (
+        "只读取数据，不修改 Polygon；每道题的检查项与 check_problem_readiness 相同。",
+        "单道题检查失败记为该题 status=error 并计入阻塞，不会中断其余题目。",
+        "题目并发数乘以每道题的拉取线程数不超过连接池大小（POLYGON_HTTP_POOL_MAXSIZE），题目越多每道题的拉取线程越少。",
+    ),
+    "mirror_contest_packages": (
+        "只读取数据，不修改 Polygon；没有 READY 题目包的题目会被跳过并记为 no_ready_package。",
+        "中断后重新运行会跳过已完成的题目，并从 .part 临时文件续传未完成的下载。",
+    ),
     "prepare_problem_release": (
         "会依次执行工作副本更新、readiness、构建和提交，属于真正的发布编排操作。",
     ),
 }
 
 _TOOL_RETURN_OVERRIDES: dict[str, tuple[str, ...]] = {
+    "save_problem_tests_batch": (
+        "结构化 dict。",
+        "固定字段：status、action、message、result、error、error_type。",
+        "status=success 表示全部成功；status=partial 表示部分失败；status=error 表示全部失败或未能开始上传。",
+        "result.summary 汇总 total、succeeded、failed、total_retries、elapsed_ms、failed_indices；"
+        "result.items 逐项给出 test_index、status、latency_ms、retries 和失败原因。",
+    ),
+    "export_problem_tests": (
+        "结构化 dict。",
+        "固定字段：status、action、message、result、error、error_type。",
+        "result.items 逐个文件给出 test_index、kind（input/answer）、file、status（downloaded/skipped/error）、"
+        "size_bytes、sha256、latency_ms；result.summary 汇总下载、跳过、失败的文件数、bytes_written、"
+        "failed_files、stale_files（清单中存在但测试集里已没有的文件）和 revision。",
+    ),
+    "get_problem_tests_export_progress": (
+        "结构化 dict。",
+        "result.exports 为每个 (problem_id, testset) 最近一次导出的进度：state（running/finished）、total_files、"
+        "completed_files、downloaded、skipped、failed、bytes_written、percent、elapsed_seconds。",
+    ),
+    "sync_problem_tests": (
+        "结构化 dict。",
+        "固定字段：status、action、message、result、error、error_type。",
+        "result.plan 按 add、update、unchanged、generated、remote_only 列出测试编号；update_reasons 给出更新原因"
+        "（input、group、remote_unreadable）；fetched_inputs 为实际下载远端输入的测试数。",
+        "非 dry_run 时 result.items 与 save_problem_tests_batch 的逐项结果相同，result.summary 汇总 uploaded、failed、unchanged、elapsed_ms。",
+    ),
+    "get_package_cache_stats": (
+        "结构化 dict。",
+        "result.enabled 表示缓存是否启用；启用时还包含 root、entries、blobs、total_bytes、max_bytes、"
+        "hits、misses、evictions、corrupted。",
+    ),
+    "get_rate_limit_stats": (
+        "结构化 dict。",
+        "result.read 与 result.write 分别给出读/写预算的 rate_per_second、burst、available_tokens、"
+        "queue_depth、max_queue_depth、acquired、throttled（在本地排队等待过的请求数）、"
+        "server_throttled（收到 429 的次数）、total_wait_seconds、max_wait_seconds。",
+    ),
+    "check_problem_changes": (
+        "结构化 dict。",
+        "result.changed / unchanged / new / missing 为按变化情况分类的题目 ID；result.stale 为 changed 与 missing 的并集，"
+        "即需要重新读取的题目；result.checked_at 为探测时间，result.tracker 给出已跟踪题目数、探测次数和累计变化次数。",
+    ),
+    "build_contest_packages_and_wait": (
+        "结构化 dict。",
+        "固定字段：status、action、message、result、error、error_type；另含 stage、decision、can_retry、recovery_actions。",
+        "status=success 表示全部题目包 READY；status=partial 表示部分 READY；status=error 表示没有题目构建成功或未能开始。",
+        "problems 为逐题结果：problem_id、letter、status（ready/failed/timeout/error/not_started）、package_id、package_state、"
+        "package、package_history、triggered_after_seconds、finished_after_seconds、duration_seconds、polls、error。",
+        "completion_order 按完成先后列出每道题的 status、package_id 和耗时；summary 按状态汇总题号；"
+        "polling 给出 max_in_flight、request_count、poll_rounds、total_sleep_seconds、elapsed_seconds。",
+    ),
+    "check_contest_readiness": (
+        "结构化 dict。",
+        "固定字段：status、action、message、result、error、error_type；另含 stage、decision、can_retry、recovery_actions。",
+        "problems 为逐题摘要：problem_id、letter、name、status（ready/warnings/blocked/error）、ready、"
+        "blocking_issue_count、warning_count、blocking_issues、warnings、elapsed_ms；include_details=True 时附带 details 和 fetch_timings。",
+        "summary 为整场汇总：status、recommendation、各状态题目数、blocking_issue_count、warning_count，"
+        "以及 blocked_problems、warning_problems、error_problems 题号列表；timings 给出题目并发数 max_workers、"
+        "每道题的拉取线程数 fetch_workers、总耗时和逐题耗时之和。",
+    ),
+    "mirror_contest_packages": (
+        "结构化 dict。",
+        "固定字段：status、action、message、result、error、error_type；另含 stage、decision、can_retry、recovery_actions。",
+        "status=success 表示全部题目已镜像；status=partial 表示部分题目失败或没有 READY 包。",
+        "problems 为逐题结果：problem_id、letter、status（downloaded/unchanged/no_ready_package/error）、package_id、"
+        "previous_package_id、revision、path、size_bytes、sha256、elapsed_ms；下载时另含 resumed_from。",
+        "summary 按状态汇总题号并给出 downloaded_bytes 与 elapsed_ms；manifest_path 为 manifest.json 的路径。",
+    ),
+    "get_response_cache_stats": (
+        "结构化 dict。",
+        "result.enabled 表示缓存是否启用；启用时还包含 backend、entries、ttl_seconds、tracked_revisions、"
+        "hits、misses、stores、invalidations、revision_changes。",
+    ),
+    "get_server_metrics": (
+        "结构化 dict。",
+        "result.polygon_method 与 result.tool 按名称给出 calls、errors、error_classes、retries、bytes_in、bytes_out "
+        "和 latency_ms（p50、p95、p99、mean、max、total），按累计耗时从高到低排列；result.uptime_seconds 为统计时长。",
+    ),
+    "get_profile_hotspots": (
+        "结构化 dict。",
+        "result.functions 按 sort 排序列出函数的 calls、tottime_ms、cumtime_ms；result.allocations 列出新增分配最多的"
+        "代码行（size_bytes、count）；result.recent_calls 给出最近几次调用的耗时、峰值内存和剖析文件路径。"
+        "未启用剖析时 result.enabled 为 false。",
+    ),
+    "get_traces": (
+        "结构化 dict。",
+        "未提供 trace_id 时 result.traces 按开始时间从新到旧列出 trace 摘要（trace_id、name、duration_ms、span_count、"
+        "error_count、http_attempts）；提供时 result.spans 是按开始时间排序的 span 树，每个 span 带 span_type、"
+        "duration_ms、attributes、events 和 children。",
+    ),
     "download_problem_package_by_url": ("原始 bytes。失败时直接抛异常。",),
     "download_problem_package": ("原始 bytes。失败时直接抛异常。",),
     "download_problem_descriptor": ("原始 bytes。失败时直接抛异常。",),
@@ -254,6 +495,7 @@ TOOL_REGISTRY: tuple[ToolRegistration, ...] = (
     ToolRegistration("downloads", download_contest_statements_pdf),
     ToolRegistration("downloads", download_contest_statements_pdf_info),
     ToolRegistration("read", get_problems),
+    ToolRegistration("read", check_problem_changes),
     ToolRegistration("read", get_problem_info),
     ToolRegistration("read", get_problem_statements),
     ToolRegistration("read", get_problem_statement_resources),
@@ -267,6 +509,8 @@ TOOL_REGISTRY: tuple[ToolRegistration, ...] = (
     ToolRegistration("read", get_problem_tests),
     ToolRegistration("read", view_problem_test_input),
     ToolRegistration("read", view_problem_test_answer),
+    ToolRegistration("read", export_problem_tests),
+    ToolRegistration("read", get_problem_tests_export_progress),
     ToolRegistration("read", get_problem_validator_tests),
     ToolRegistration("read", get_problem_checker_tests),
     ToolRegistration("read", view_problem_test_groups),
@@ -277,6 +521,12 @@ TOOL_REGISTRY: tuple[ToolRegistration, ...] = (
     ToolRegistration("read", view_problem_general_tutorial),
     ToolRegistration("read", get_problem_packages),
     ToolRegistration("read", get_contest_problems),
+    ToolRegistration("read", get_package_cache_stats),
+    ToolRegistration("read", get_rate_limit_stats),
+    ToolRegistration("read", get_response_cache_stats),
+    ToolRegistration("read", get_server_metrics),
+    ToolRegistration("read", get_traces),
+    ToolRegistration("read", get_profile_hotspots),
     ToolRegistration("write", create_problem),
     ToolRegistration("write", save_problem_statement_resource),
     ToolRegistration("write", set_problem_checker),
@@ -285,6 +535,8 @@ TOOL_REGISTRY: tuple[ToolRegistration, ...] = (
     ToolRegistration("write", save_problem_file),
     ToolRegistration("write", save_problem_script),
     ToolRegistration("write", save_problem_test),
+    ToolRegistration("write", save_problem_tests_batch),
+    ToolRegistration("write", sync_problem_tests),
     ToolRegistration("write", save_problem_validator_test),
     ToolRegistration("write", save_problem_checker_test),
     ToolRegistration("write", save_problem_test_group),
@@ -304,6 +556,9 @@ TOOL_REGISTRY: tuple[ToolRegistration, ...] = (
     ToolRegistration("write", save_problem_statement),
     ToolRegistration("workflow", build_problem_package_and_wait),
     ToolRegistration("workflow", check_problem_readiness),
+    ToolRegistration("workflow", check_contest_readiness),
+    ToolRegistration("workflow", build_contest_packages_and_wait),
+    ToolRegistration("workflow", mirror_contest_packages),
     ToolRegistration("workflow", prepare_problem_release),
 )
 
@@ -374,7 +629,7 @@ def _build_preconditions(registration: ToolRegistration) -> list[str]:
         preconditions.append("这是 workflow 工具，可能串联多个底层步骤，适合自动化编排使用。")
     if registration.category == "downloads":
         preconditions.append(
-            "这是下载工具；原始下载接口直接返回 bytes，_info 接口返回带固定字段的结构化元数据。"
+            "这是下载工具；原始下载接口直接返回 bytes，_info 接口流式下载到磁盘并返回带固定字段的结构化元数据。"
         )
 
     if "problem_id" in param_names:
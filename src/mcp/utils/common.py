@@ -1,13 +1,64 @@
-import os
+import base64
+import binascii
 import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Optional, Type
+from typing import Any, Callable, Iterable, Optional, Type, Union
 
-from src.polygon.client import PolygonClient
+from pydantic import BaseModel
 
-SENSITIVE_FIELD_NAMES = frozenset({"pin", "password", "api_secret", "apisig"})
-REDACTED_VALUE = "***"
+from src.mcp.profiling import (
+    DEFAULT_PROFILE_HISTORY,
+    PROFILE_MODE_CPU,
+    PROFILE_MODES,
+    ToolProfiler,
+)
+from src.polygon.access_cache import DEFAULT_ACCESS_TYPE_TTL_SECONDS, AccessTypeCache
+from src.polygon.client import PolygonClient
+from src.polygon.metrics import get_metrics_registry
+from src.polygon.models import AccessDeniedException, DownloadedFile, Page
+from src.polygon.package_cache import DEFAULT_PACKAGE_CACHE_MAX_BYTES, PackageCache
+from src.polygon.rate_limit import RateLimiter
+from src.polygon.redaction import (
+    REDACTED_VALUE,
+    SENSITIVE_FIELD_NAMES,
+    is_sensitive_field_name,
+    sanitize_sensitive_data,
+)
+from src.polygon.response_cache import (
+    DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+    DEFAULT_RESPONSE_CACHE_TTL_SECONDS,
+    DiskResponseBackend,
+    MemoryResponseBackend,
+    ResponseCache,
+)
+from src.polygon.registry import (
+    DEFAULT_SESSION_CACHE_SIZE,
+    DEFAULT_SESSION_TTL_SECONDS,
+    PolygonClientRegistry,
+    ProblemSessionCache,
+)
+from src.polygon.streaming import DownloadDigest
+from src.polygon.tracing import DEFAULT_TRACE_BUFFER_SIZE, Tracer, set_tracer
+from src.polygon.transport import (
+    DEFAULT_CONNECT_RETRIES,
+    DEFAULT_POOL_MAXSIZE,
+    PolygonTransport,
+)
+from src.polygon.web_session import PolygonWebSession, WebSessionRegistry
+
+DEFAULT_LIST_PAGE_SIZE = 100
+DEFAULT_METRICS_EXPORT_INTERVAL_SECONDS = 15.0
+
+_session_cache: Optional[ProblemSessionCache] = None
+_package_cache: Optional[PackageCache] = None
+_metrics_export_lock = threading.Lock()
+_last_metrics_export = 0.0
 
 def get_api_credentials() -> tuple[str, str]:
     """获取API凭证"""
@@ -41,15 +92,270 @@ def get_account_credentials(
     return resolved_login, resolved_password
 
 
+def get_env_int(name: str, default: int) -> int:
+    """读取整数环境变量，未设置时返回默认值。"""
+    raw_value = os.getenv(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return int(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"环境变量 {name} 必须是整数: {raw_value}") from exc
+
+
+def get_env_bool(name: str, default: bool = False) -> bool:
+    """读取布尔环境变量，支持 1/0、true/false、yes/no、on/off。"""
+    raw_value = os.getenv(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    normalized = raw_value.strip().lower()
+    if normalized in ("1", "true", "yes", "on"):
+        return True
+    if normalized in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"环境变量 {name} 必须是布尔值: {raw_value}")
+
+
+def get_env_float(name: str, default: float) -> float:
+    """读取浮点数环境变量，未设置时返回默认值。"""
+    raw_value = os.getenv(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"环境变量 {name} 必须是数字: {raw_value}") from exc
+
+
+def build_rate_limiter() -> RateLimiter:
+    """按环境变量配置创建客户端级限速器；速率默认为 0，即不限速只统计。"""
+    read_burst = get_env_float("POLYGON_READ_BURST", 0.0)
+    write_burst = get_env_float("POLYGON_WRITE_BURST", 0.0)
+    return RateLimiter(
+        read_rate=get_env_float("POLYGON_READ_RATE_LIMIT", 0.0),
+        write_rate=get_env_float("POLYGON_WRITE_RATE_LIMIT", 0.0),
+        read_burst=read_burst or None,
+        write_burst=write_burst or None,
+    )
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """
+    按环境变量配置创建读接口响应缓存。
+
+    POLYGON_RESPONSE_CACHE 取 memory 或 disk 时启用，默认不启用；disk 后端需要同时设置
+    POLYGON_RESPONSE_CACHE_DIR。
+    """
+    backend_name = (os.getenv("POLYGON_RESPONSE_CACHE") or "").strip().lower()
+    if backend_name in ("", "0", "off", "false", "none"):
+        return None
+
+    if backend_name == "memory":
+        backend = MemoryResponseBackend(
+            max_entries=get_env_int(
+                "POLYGON_RESPONSE_CACHE_MAX_ENTRIES",
+                DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+            ),
+        )
+    elif backend_name == "disk":
+        cache_dir = (os.getenv("POLYGON_RESPONSE_CACHE_DIR") or "").strip()
+        if not cache_dir:
+            raise ValueError("POLYGON_RESPONSE_CACHE=disk 时必须设置 POLYGON_RESPONSE_CACHE_DIR")
+        backend = DiskResponseBackend(cache_dir)
+    else:
+        raise ValueError("POLYGON_RESPONSE_CACHE 只支持 memory 或 disk")
+
+    return ResponseCache(
+        backend,
+        ttl_seconds=get_env_float(
+            "POLYGON_RESPONSE_CACHE_TTL_SECONDS",
+            DEFAULT_RESPONSE_CACHE_TTL_SECONDS,
+        ),
+    )
+
+
+def get_http_pool_maxsize() -> int:
+    """共享客户端连接池的大小；同一进程内并发请求超过该值时，多出的请求要等待空闲连接。"""
+    return get_env_int("POLYGON_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+
+
+def build_transport() -> PolygonTransport:
+    """按环境变量配置创建带连接池的请求通道。"""
+    return PolygonTransport(
+        pool_maxsize=get_http_pool_maxsize(),
+        connect_retries=get_env_int("POLYGON_HTTP_CONNECT_RETRIES", DEFAULT_CONNECT_RETRIES),
+    )
+
+
+def _create_client(api_key: str, api_secret: str) -> PolygonClient:
+    return PolygonClient(
+        api_key,
+        api_secret,
+        transport=build_transport(),
+        access_types=AccessTypeCache(
+            ttl_seconds=get_env_int(
+                "POLYGON_ACCESS_TYPE_TTL_SECONDS",
+                int(DEFAULT_ACCESS_TYPE_TTL_SECONDS),
+            ),
+        ),
+        optimistic_writes=get_env_bool("POLYGON_OPTIMISTIC_WRITES"),
+        package_cache=get_package_cache(),
+        rate_limiter=build_rate_limiter(),
+        response_cache=build_response_cache(),
+    )
+
+
+_client_registry = PolygonClientRegistry(_create_client)
+_web_session_registry = WebSessionRegistry(
+    lambda login, password: PolygonWebSession(login, password, transport=build_transport())
+)
+
+
 def get_client() -> PolygonClient:
-    """创建一个带环境变量凭证的 PolygonClient。"""
+    """返回环境变量凭证对应的 PolygonClient，同一组凭证在进程内复用同一个客户端。"""
     api_key, api_secret = get_api_credentials()
-    return PolygonClient(api_key, api_secret)
+    return _client_registry.get(api_key, api_secret)
+
+
+def get_web_session(login: str, password: str) -> PolygonWebSession:
+    """返回账号对应的下载会话，同一账号的账号密码下载在进程内共享登录状态和连接池。"""
+    return _web_session_registry.get(login, password)
+
+
+def get_session_cache() -> ProblemSessionCache:
+    """返回进程级题目会话缓存，容量和过期时间按环境变量配置。"""
+    global _session_cache
+    if _session_cache is None:
+        _session_cache = ProblemSessionCache(
+            max_size=get_env_int("POLYGON_SESSION_CACHE_SIZE", DEFAULT_SESSION_CACHE_SIZE),
+            ttl_seconds=get_env_int(
+                "POLYGON_SESSION_TTL_SECONDS",
+                int(DEFAULT_SESSION_TTL_SECONDS),
+            ),
+        )
+    return _session_cache
+
+
+def get_package_cache() -> Optional[PackageCache]:
+    """
+    返回进程级题目包缓存。
+
+    只有设置了 POLYGON_PACKAGE_CACHE_DIR 才启用；容量上限读取 POLYGON_PACKAGE_CACHE_MAX_BYTES，默认 2 GiB。
+    """
+    global _package_cache
+    if _package_cache is None:
+        cache_dir = os.getenv("POLYGON_PACKAGE_CACHE_DIR")
+        if not cache_dir or not cache_dir.strip():
+            return None
+        _package_cache = PackageCache(
+            cache_dir.strip(),
+            max_bytes=get_env_int("POLYGON_PACKAGE_CACHE_MAX_BYTES", DEFAULT_PACKAGE_CACHE_MAX_BYTES),
+        )
+    return _package_cache
+
+
+
+def export_metrics_if_configured(force: bool = False) -> Optional[str]:
+    """
+    设置了 POLYGON_METRICS_PROMETHEUS_FILE 时，把调用指标按 Prometheus 文本格式写入该文件。
+
+    两次写入至少间隔 POLYGON_METRICS_EXPORT_INTERVAL_SECONDS 秒（默认 15），force=True 时立即写入；
+    返回写入的路径，未配置或未到间隔时返回 None。
+    """
+    global _last_metrics_export
+    path = os.getenv("POLYGON_METRICS_PROMETHEUS_FILE")
+    if not path or not path.strip():
+        return None
+    interval = get_env_float("POLYGON_METRICS_EXPORT_INTERVAL_SECONDS", DEFAULT_METRICS_EXPORT_INTERVAL_SECONDS)
+    with _metrics_export_lock:
+        now = time.monotonic()
+        if not force and _last_metrics_export and now - _last_metrics_export < interval:
+            return None
+        _last_metrics_export = now
+        return str(get_metrics_registry().write_prometheus(path.strip()))
+
+
+def configure_tracing() -> Tracer:
+    """
+    按环境变量重新创建进程级追踪器。
+
+    POLYGON_TRACE_BUFFER_SIZE 为内存环形缓冲区保留的 span 数，默认 4096；
+    POLYGON_TRACE_FILE 设置后每条 trace 结束时以 OTLP JSON 格式追加一行到该文件。两者都关闭时不记录追踪。
+    """
+    buffer_size = get_env_int("POLYGON_TRACE_BUFFER_SIZE", DEFAULT_TRACE_BUFFER_SIZE)
+    if buffer_size < 0:
+        raise ValueError("POLYGON_TRACE_BUFFER_SIZE 不能小于 0")
+    export_path = (os.getenv("POLYGON_TRACE_FILE") or "").strip() or None
+    tracer = Tracer(buffer_size=buffer_size, export_path=export_path)
+    set_tracer(tracer)
+    return tracer
+
+
+def _split_env_list(name: str) -> list[str]:
+    return [item.strip() for item in (os.getenv(name) or "").split(",") if item.strip()]
+
+
+def build_tool_profiler() -> Optional[ToolProfiler]:
+    """
+    按环境变量配置创建工具剖析器；未启用剖析时返回 None。
+
+    POLYGON_PROFILE 取 cpu、memory 或 all（逗号分隔，1/true 视为 cpu）时对全部工具启用；
+    POLYGON_PROFILE_TOOLS 为逗号分隔的工具名白名单，单独设置时只对这些工具启用 cpu 剖析。
+    每次调用的剖析文件写入 POLYGON_PROFILE_DIR（默认系统临时目录下的 cf-polygon-mcp-profiles），
+    最多保留最近 POLYGON_PROFILE_HISTORY 次调用（默认 50）。
+    """
+    modes: set[str] = set()
+    for mode in _split_env_list("POLYGON_PROFILE"):
+        normalized = mode.lower()
+        if normalized == "all":
+            modes.update(PROFILE_MODES)
+        elif normalized in ("1", "true", "yes", "on"):
+            modes.add(PROFILE_MODE_CPU)
+        elif normalized in ("0", "false", "no", "off"):
+            continue
+        elif normalized in PROFILE_MODES:
+            modes.add(normalized)
+        else:
+            raise ValueError(f"环境变量 POLYGON_PROFILE 包含无效的剖析模式: {mode}，可选值: cpu, memory, all")
+
+    tools = _split_env_list("POLYGON_PROFILE_TOOLS")
+    if tools and not modes:
+        modes.add(PROFILE_MODE_CPU)
+    if not modes:
+        return None
+
+    history = get_env_int("POLYGON_PROFILE_HISTORY", DEFAULT_PROFILE_HISTORY)
+    if history <= 0:
+        raise ValueError("POLYGON_PROFILE_HISTORY 必须大于 0")
+    profile_dir = (os.getenv("POLYGON_PROFILE_DIR") or "").strip()
+    return ToolProfiler(
+        modes,
+        tools=tools or None,
+        profile_dir=profile_dir or Path(tempfile.gettempdir()) / "cf-polygon-mcp-profiles",
+        history=history,
+    )
+
+
+def _invalidate_problem_caches(problem_id: int) -> None:
+    get_session_cache().invalidate(problem_id)
+    client = get_client()
+    client.access_types.invalidate(problem_id)
+    if client.response_cache is not None:
+        client.response_cache.invalidate(problem_id)
+
+
+def reset_client_cache() -> None:
+    """清空进程级客户端注册表、下载会话、题目会话缓存和题目包缓存对象（不删除磁盘上的缓存内容）。"""
+    global _session_cache, _package_cache
+    _session_cache = None
+    _package_cache = None
+    _client_registry.clear()
+    _web_session_registry.clear()
 
 
 def get_problem_session(problem_id: int, pin: Optional[str] = None):
-    """创建题目会话。"""
-    return get_client().create_problem_session(problem_id, pin)
+    """获取题目会话，优先复用缓存中未过期的会话。"""
+    return get_session_cache().get_or_create(get_client(), problem_id, pin)
 
 
 def call_client_method(method_name: str, /, *args: Any, **kwargs: Any) -> Any:
@@ -64,9 +370,13 @@ def call_problem_session(
     pin: Optional[str],
     operation: Callable[[Any], Any],
 ) -> Any:
-    """创建题目会话后执行给定操作。"""
+    """获取题目会话后执行给定操作；权限被拒绝时丢弃该题目的缓存会话和访问权限。"""
     session = get_problem_session(problem_id, pin)
-    return operation(session)
+    try:
+        return operation(session)
+    except AccessDeniedException:
+        _invalidate_problem_caches(problem_id)
+        raise
 
 
 def call_problem_session_method(
@@ -77,7 +387,7 @@ def call_problem_session_method(
     *args: Any,
     **kwargs: Any,
 ) -> Any:
-    """创建题目会话并调用指定方法。"""
+    """获取题目会话并调用指定方法。"""
     return call_problem_session(
         problem_id,
         pin,
@@ -85,6 +395,112 @@ def call_problem_session_method(
     )
 
 
+def _list_query_fingerprint(scope: str, filters: Optional[dict[str, Any]]) -> str:
+    payload = json.dumps([scope, filters or {}], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_list_cursor(offset: int, fingerprint: str) -> str:
+    raw = json.dumps({"o": offset, "q": fingerprint}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_list_cursor(cursor: str, fingerprint: str) -> int:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset = data["o"]
+        matched = data["q"] == fingerprint
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise ValueError("cursor 无效，请使用上一页结果中的 next_cursor") from exc
+    if not matched or not isinstance(offset, int) or offset < 0:
+        raise ValueError("cursor 与当前查询不匹配，改变查询条件或 filters 后需要从第一页重新开始")
+    return offset
+
+
+def _dump_list_item(item: Any) -> dict[str, Any]:
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json")
+    return dict(item)
+
+
+def _check_field_names(names: Iterable[str], allowed: set[str], parameter: str) -> None:
+    unknown = sorted(set(names) - allowed)
+    if unknown:
+        raise ValueError(
+            f"{parameter} 中包含未知字段: {', '.join(unknown)}，可选字段: {', '.join(sorted(allowed))}"
+        )
+
+
+def _matches_filters(item: dict[str, Any], filters: dict[str, Any]) -> bool:
+    for field, expected in filters.items():
+        value = item.get(field)
+        if isinstance(expected, (list, tuple, set)):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def paginate_items(
+    items: list[Any],
+    *,
+    scope: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    filters: Optional[dict[str, Any]] = None,
+    prepare: Optional[Callable[[list[Any]], None]] = None,
+    model: Optional[Type[BaseModel]] = None,
+    extra_fields: Iterable[str] = (),
+) -> Page[dict[str, Any]]:
+    """
+    对列表类读工具的结果做过滤、游标分页和字段投影。
+
+    filters 按字段精确匹配 JSON 形式的值，值为列表时匹配其中任一值；只有当前页的条目会被序列化和投影。
+    cursor 绑定 scope 和 filters，换了查询条件的旧 cursor 会被拒绝。prepare 在投影前接收当前页的原始条目。
+    提供 model 时 fields 和 filters 按 model 的字段加上 extra_fields 校验，结果为空或当前页为空时也会拒绝未知字段；
+    未提供时只能按实际条目的字段校验。
+    """
+    page_size = get_env_int("POLYGON_LIST_PAGE_SIZE", DEFAULT_LIST_PAGE_SIZE) if limit is None else limit
+    if limit is not None and limit <= 0:
+        raise ValueError("limit 必须大于 0")
+    if page_size < 0:
+        raise ValueError("环境变量 POLYGON_LIST_PAGE_SIZE 不能小于 0")
+    fingerprint = _list_query_fingerprint(scope, filters)
+    offset = 0 if cursor is None else _decode_list_cursor(cursor, fingerprint)
+
+    allowed = None if model is None else {*model.model_fields, *extra_fields}
+    if allowed is not None:
+        _check_field_names(filters or (), allowed, "filters")
+        _check_field_names(fields or (), allowed, "fields")
+
+    if filters:
+        dumped = [_dump_list_item(item) for item in items]
+        if dumped and allowed is None:
+            allowed = {key for entry in dumped for key in entry}
+            _check_field_names(filters, allowed, "filters")
+            _check_field_names(fields or (), allowed, "fields")
+        items = [item for item, entry in zip(items, dumped) if _matches_filters(entry, filters)]
+
+    end = len(items) if page_size == 0 else min(offset + page_size, len(items))
+    page_items = items[offset:end]
+    if prepare is not None:
+        prepare(page_items)
+    # prepare 可能修改条目（例如加载测试输入），所以当前页在 prepare 之后再序列化。
+    entries = [_dump_list_item(item) for item in page_items]
+    if fields and entries:
+        if allowed is None:
+            _check_field_names(fields, {key for entry in entries for key in entry}, "fields")
+        entries = [{field: entry.get(field) for field in fields} for entry in entries]
+    return Page[dict[str, Any]](
+        total=len(items),
+        limit=page_size or None,
+        next_cursor=_encode_list_cursor(end, fingerprint) if end < len(items) else None,
+        items=entries,
+    )
+
+
 def serialize_problem(problem: Any) -> dict[str, Any]:
     """把题目对象压平成适合工具返回的结构。"""
     return {
@@ -132,24 +548,6 @@ def is_ok_result(result: Any) -> bool:
     return result.get("status", "OK") in ("OK", "success")
 
 
-def _is_sensitive_field_name(field_name: str) -> bool:
-    return field_name.lower() in SENSITIVE_FIELD_NAMES
-
-
-def sanitize_sensitive_data(value: Any) -> Any:
-    """递归脱敏常见敏感字段，避免工具结果回显凭证。"""
-    if isinstance(value, dict):
-        return {
-            key: REDACTED_VALUE if _is_sensitive_field_name(str(key)) else sanitize_sensitive_data(item)
-            for key, item in value.items()
-        }
-    if isinstance(value, list):
-        return [sanitize_sensitive_data(item) for item in value]
-    if isinstance(value, tuple):
-        return tuple(sanitize_sensitive_data(item) for item in value)
-    return value
-
-
 def build_operation_result(
     *,
     action: str,
@@ -170,31 +568,73 @@ def build_operation_result(
         "error_type": type(error).__name__ if error is not None else None,
     }
     for key, value in context.items():
-        if value is None or _is_sensitive_field_name(str(key)):
+        if value is None or is_sensitive_field_name(str(key)):
             continue
         payload[key] = sanitize_sensitive_data(value)
     return payload
 
 
+def stream_download(
+    download: Callable[[Path], DownloadedFile],
+    *,
+    filename: str,
+    target_path: Optional[str] = None,
+) -> DownloadedFile:
+    """
+    执行一次流式下载。
+
+    提供 target_path 时文件保留在该路径；否则写入临时目录，返回元数据后即删除，
+    两种情况下内容都只以分块形式经过内存。
+    """
+    if target_path is not None:
+        return download(Path(target_path).expanduser())
+    with tempfile.TemporaryDirectory(prefix="polygon-download-") as temp_dir:
+        return download(Path(temp_dir) / filename)
+
+
 def build_download_result(
     *,
     action: str,
     filename: str,
     content_kind: str,
-    content: bytes,
+    content: Union[bytes, DownloadedFile, str, Path, Iterable[bytes]],
     source_kind: str,
     source_ref: str,
     source_url: Optional[str] = None,
     **context: Any,
 ) -> dict[str, Any]:
-    """构建统一的下载元数据结果。"""
+    """
+    构建统一的下载元数据结果。
+
+    content 可以是完整 bytes、流式下载得到的 DownloadedFile、本地文件路径或按块产出 bytes 的迭代器；
+    后两种情况逐块计算大小、sha256 并按文件头识别实际内容类型，不会把完整内容读入内存。
+    """
+    if isinstance(content, DownloadedFile):
+        size_bytes = content.size_bytes
+        sha256 = content.sha256
+        detected_content_kind = content.detected_content_kind
+    else:
+        if isinstance(content, (bytes, bytearray)):
+            digest = DownloadDigest.from_chunks([bytes(content)])
+        elif isinstance(content, (str, Path)):
+            digest = DownloadDigest.from_file(content)
+        else:
+            digest = DownloadDigest.from_chunks(content)
+        size_bytes = digest.size_bytes
+        sha256 = digest.sha256
+        detected_content_kind = digest.detected_content_kind
     metadata = {
         "source_kind": source_kind,
         "source_ref": source_ref,
         "filename": filename,
         "content_kind": content_kind,
-        "size_bytes": len(content),
-        "sha256": hashlib.sha256(content).hexdigest(),
+        "size_bytes": size_bytes,
+        "sha256": sha256,
+        **(
+            {"detected_content_kind": detected_content_kind}
+            if detected_content_kind is not None
+            else {}
+        ),
         **({"source_url": source_url} if source_url is not None else {}),
         **{key: value for key, value in context.items() if value is not None},
     }
@@ -219,6 +659,8 @@ def run_write_operation(
     try:
         result = operation()
     except Exception as exc:
+        if isinstance(exc, AccessDeniedException) and context.get("problem_id") is not None:
+            _invalidate_problem_caches(context["problem_id"])
         return build_operation_result(
             action=action,
             success=False,
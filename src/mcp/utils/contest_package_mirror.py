@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from src.mcp.utils.common import (
+    build_operation_result,
+    build_recovery_action,
+    get_client,
+    get_env_int,
+    get_problem_session,
+    parse_enum,
+)
+from src.polygon.models import Package, PackageState, PackageType
+from src.polygon.streaming import PARTIAL_SUFFIX, DownloadDigest, partial_path_for
+from src.polygon.tracing import propagate_trace_context
+
+DEFAULT_MIRROR_WORKERS = 4
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class _MirrorManifest:
+    """
+    镜像目录中的 manifest.json：记录每道题已下载的 package ID、文件名、大小和 sha256。
+
+    每下载完一道题就原子重写一次，中途中断后重新运行只会补下尚未完成的题目。
+    """
+
+    def __init__(self, path: Path, contest_id: int, package_type: Optional[str]):
+        self.path = path
+        self.contest_id = contest_id
+        self.package_type = package_type
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict[str, Any]] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return
+        if (
+            data.get("version") == MANIFEST_VERSION
+            and data.get("contest_id") == contest_id
+            and data.get("package_type") == package_type
+            and isinstance(data.get("problems"), dict)
+        ):
+            self.entries = data["problems"]
+
+    def get(self, problem_id: int) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(str(problem_id))
+
+    def update(self, problem_id: int, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.entries[str(problem_id)] = entry
+            self._save()
+
+    def _save(self) -> None:
+        payload = json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "contest_id": self.contest_id,
+                "package_type": self.package_type,
+                "problems": self.entries,
+            },
+            ensure_ascii=False,
+            indent=2,
+            sort_keys=True,
+        )
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".manifest-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(temp_name, self.path)
+
+
+def _resolve_max_workers(max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = get_env_int("POLYGON_MIRROR_MAX_WORKERS", DEFAULT_MIRROR_WORKERS)
+    if max_workers <= 0:
+        raise ValueError("max_workers 必须大于 0")
+    return max_workers
+
+
+def _package_file_stem(problem: Any) -> str:
+    prefix = f"{problem.contestLetter}-" if problem.contestLetter else ""
+    name = _UNSAFE_FILENAME_CHARS.sub("_", problem.name).strip("._") or "problem"
+    return f"{prefix}{problem.id}-{name}"
+
+
+def _package_filename(problem: Any, package_id: int) -> str:
+    """文件名带上 package ID：换包后不会续传到上一个包留下的 .part 上。"""
+    return f"{_package_file_stem(problem)}-package{package_id}.zip"
+
+
+def _discard_stale_partials(target_dir: Path, problem: Any, filename: str) -> None:
+    """删除这道题其他 package 中断下载留下的 .part 及其资源标识文件。"""
+    keep = partial_path_for(target_dir / filename)
+    for partial in target_dir.glob(f"{_package_file_stem(problem)}-package*.zip{PARTIAL_SUFFIX}*"):
+        if not partial.name.startswith(keep.name):
+            partial.unlink(missing_ok=True)
+
+
+def _pick_latest_ready_package(
+    packages: list[Package],
+    package_type: Optional[PackageType],
+) -> Optional[Package]:
+    candidates = [package for package in packages if package.state == PackageState.READY]
+    if package_type in (PackageType.LINUX, PackageType.WINDOWS):
+        candidates = [package for package in candidates if package.type != PackageType.STANDARD]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda package: (package.creationTimeSeconds, package.id))
+
+
+def _is_mirrored(target_dir: Path, entry: Optional[dict[str, Any]], package_id: int, verify: bool) -> bool:
+    if entry is None or entry.get("package_id") != package_id:
+        return False
+    path = target_dir / entry["file"]
+    if not path.is_file():
+        return False
+    if not verify:
+        return path.stat().st_size == entry.get("size_bytes")
+    digest = DownloadDigest.from_file(path)
+    return digest.sha256 == entry.get("sha256") and digest.size_bytes == entry.get("size_bytes")
+
+
+def _mirror_problem(
+    problem: Any,
+    *,
+    target_dir: Path,
+    manifest: _MirrorManifest,
+    package_type: Optional[PackageType],
+    verify_existing: bool,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    entry = manifest.get(problem.id)
+    item: dict[str, Any] = {
+        "problem_id": problem.id,
+        "letter": problem.contestLetter,
+        "name": problem.name,
+        "previous_package_id": entry.get("package_id") if entry is not None else None,
+    }
+    try:
+        session = get_problem_session(problem.id)
+        package = _pick_latest_ready_package(session.get_packages(), package_type)
+        if package is None:
+            item["status"] = "no_ready_package"
+            return item
+
+        item["package_id"] = package.id
+        item["revision"] = package.revision
+        if _is_mirrored(target_dir, entry, package.id, verify_existing):
+            item.update(
+                {
+                    "status": "unchanged",
+                    "path": str(target_dir / entry["file"]),
+                    "size_bytes": entry["size_bytes"],
+                    "sha256": entry["sha256"],
+                }
+            )
+            return item
+
+        filename = _package_filename(problem, package.id)
+        target_path = target_dir / filename
+        _discard_stale_partials(target_dir, problem, filename)
+        downloaded = session.download_package_to_file(package.id, target_path, package_type)
+        if downloaded.detected_content_kind != "zip":
+            Path(downloaded.path).unlink(missing_ok=True)
+            raise ValueError(
+                f"题目 {problem.id} 的 package {package.id} 下载内容不是 zip"
+                f"（识别为 {downloaded.detected_content_kind or 'unknown'}）"
+            )
+        if entry is not None and entry.get("file") not in (None, filename):
+            (target_dir / entry["file"]).unlink(missing_ok=True)
+
+        manifest.update(
+            problem.id,
+            {
+                "letter": problem.contestLetter,
+                "name": problem.name,
+                "package_id": package.id,
+                "revision": package.revision,
+                "file": filename,
+                "size_bytes": downloaded.size_bytes,
+                "sha256": downloaded.sha256,
+                "downloaded_at": time.time(),
+            },
+        )
+        item.update(
+            {
+                "status": "downloaded",
+                "path": str(target_path),
+                "size_bytes": downloaded.size_bytes,
+                "sha256": downloaded.sha256,
+                "resumed_from": downloaded.resumed_from,
+            }
+        )
+        return item
+    except Exception as exc:
+        item["status"] = "error"
+        item["error"] = str(exc)
+        item["error_type"] = type(exc).__name__
+        return item
+    finally:
+        item["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def mirror_contest_packages(
+    contest_id: int,
+    target_dir: str,
+    pin: Optional[str] = None,
+    package_type: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    verify_existing: bool = True,
+) -> dict[str, Any]:
+    """
+    把比赛内每道题最新的 READY 题目包镜像到本地目录
+
+    每道题通过 get_packages 找到最新的 READY 包，在有界线程池中并发流式下载到 target_dir
+    （文件名带 package ID；先写 .part 临时文件，中断后可断点续传，完成后原子重命名）。目录中的 manifest.json 记录每道题的
+    package ID 和 sha256；再次运行时 package ID 未变且本地文件校验通过的题目直接跳过。
+
+    Args:
+        contest_id: 比赛ID
+        target_dir: 本地镜像目录，不存在时自动创建
+        pin: 比赛的PIN码（如果有），只用于获取题目列表
+        package_type: 下载的包类型（standard、linux、windows）
+        max_workers: 同时下载的题目数；未提供时读取 POLYGON_MIRROR_MAX_WORKERS，默认 4
+        verify_existing: 跳过已镜像的题目前是否重新计算本地文件的 sha256
+
+    Returns:
+        dict: problems 为逐题结果，summary 汇总下载、跳过和失败的题目，manifest_path 为 manifest 文件路径
+    """
+    try:
+        package_type_enum = (
+            parse_enum(PackageType, package_type, "package_type") if package_type is not None else None
+        )
+        workers = _resolve_max_workers(max_workers)
+        problems = get_client().create_contest_session(contest_id, pin).get_problems()
+    except Exception as exc:
+        return build_operation_result(
+            action="mirror_contest_packages",
+            success=False,
+            message="获取比赛题目失败，无法镜像题目包",
+            error=exc,
+            contest_id=contest_id,
+            target_dir=target_dir,
+            stage="list_problems",
+            decision="contest_unavailable",
+            can_retry=True,
+            recovery_actions=[],
+        )
+    if not problems:
+        return build_operation_result(
+            action="mirror_contest_packages",
+            success=False,
+            message=f"比赛 {contest_id} 中没有找到题目",
+            contest_id=contest_id,
+            target_dir=target_dir,
+            stage="list_problems",
+            decision="contest_unavailable",
+            can_retry=True,
+            recovery_actions=[],
+        )
+
+    started = time.perf_counter()
+    directory = Path(target_dir).expanduser()
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = _MirrorManifest(directory / MANIFEST_FILENAME, contest_id, package_type)
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(problems)),
+        thread_name_prefix="polygon-mirror",
+    ) as executor:
+        items = list(
+            executor.map(
+                propagate_trace_context(
+                    lambda problem: _mirror_problem(
+                        problem,
+                        target_dir=directory,
+                        manifest=manifest,
+                        package_type=package_type_enum,
+                        verify_existing=verify_existing,
+                    )
+                ),
+                problems,
+            )
+        )
+
+    def labels(status: str) -> list[str]:
+        return [str(item["letter"] or item["problem_id"]) for item in items if item["status"] == status]
+
+    summary = {
+        "problem_count": len(items),
+        "downloaded_problems": labels("downloaded"),
+        "unchanged_problems": labels("unchanged"),
+        "no_ready_package_problems": labels("no_ready_package"),
+        "error_problems": labels("error"),
+        "downloaded_bytes": sum(item.get("size_bytes", 0) for item in items if item["status"] == "downloaded"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    failed = summary["error_problems"] + summary["no_ready_package_problems"]
+    succeeded = len(items) - len(failed)
+    recovery_actions = []
+    if summary["error_problems"]:
+        recovery_actions.append(
+            build_recovery_action(
+                action="rerun_mirror",
+                description="重新运行会跳过已完成的题目，并从 .part 文件续传中断的下载。",
+                tool="mirror_contest_packages",
+                params={"contest_id": contest_id, "target_dir": target_dir, "package_type": package_type},
+            )
+        )
+    if summary["no_ready_package_problems"]:
+        recovery_actions.append(
+            build_recovery_action(
+                action="build_missing_packages",
+                description="部分题目还没有 READY 的题目包，先构建后再镜像。",
+                tool="build_contest_packages_and_wait",
+                params={"contest_id": contest_id, "full": package_type in ("linux", "windows"), "verify": True},
+            )
+        )
+    return build_operation_result(
+        action="mirror_contest_packages",
+        success=not failed,
+        message=(
+            f"已镜像 {succeeded}/{len(items)} 道题目：新下载 {len(summary['downloaded_problems'])} 道，"
+            f"未变化 {len(summary['unchanged_problems'])} 道"
+        ),
+        status_override="partial" if failed and succeeded else None,
+        contest_id=contest_id,
+        target_dir=str(directory),
+        manifest_path=str(manifest.path),
+        stage="completed" if not failed else "download_packages",
+        decision="mirror_complete" if not failed else "mirror_incomplete",
+        can_retry=bool(failed),
+        recovery_actions=recovery_actions,
+        summary=summary,
+        problems=items,
+    )
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.mcp.package_builds import (
+    DEFAULT_MAX_POLL_INTERVAL_SECONDS,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    AdaptivePollSchedule,
+    build_durations,
+    extract_package_id,
+    pick_latest_package,
+    serialize_package,
+    validate_build_request,
+)
+from src.mcp.utils.common import (
+    build_operation_result,
+    build_recovery_action,
+    get_client,
+    get_env_int,
+    get_problem_session,
+)
+from src.polygon.models import PackageState
+from src.polygon.tracing import propagate_trace_context
+
+DEFAULT_CONTEST_BUILD_MAX_IN_FLIGHT = 4
+
+
+class _ProblemBuild:
+    """比赛构建流程中单道题的状态：queued → building → ready / failed / timeout / error，未来得及触发的为 not_started。"""
+
+    def __init__(self, problem: Any):
+        self.problem_id: int = problem.id
+        self.letter: Optional[str] = problem.contestLetter
+        self.name: str = problem.name
+        self.status = "queued"
+        self.session: Any = None
+        self.existing_package_ids: set[int] = set()
+        self.target_package_id: Optional[int] = None
+        self.package: Optional[dict[str, Any]] = None
+        self.package_history: list[dict[str, Any]] = []
+        self.triggered_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.polls = 0
+        self.error: Optional[Exception] = None
+
+    @property
+    def label(self) -> str:
+        return str(self.letter or self.problem_id)
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.triggered_at is None or self.finished_at is None:
+            return None
+        return round(self.finished_at - self.triggered_at, 2)
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            "problem_id": self.problem_id,
+            "letter": self.letter,
+            "name": self.name,
+            "status": self.status,
+            "package_id": self.package["id"] if self.package is not None else self.target_package_id,
+            "package_state": self.package["state"] if self.package is not None else None,
+            "package": self.package,
+            "package_history": self.package_history,
+            "triggered_after_seconds": self.triggered_at,
+            "finished_after_seconds": self.finished_at,
+            "duration_seconds": self.duration_seconds,
+            "polls": self.polls,
+            "error": str(self.error) if self.error is not None else None,
+            "error_type": type(self.error).__name__ if self.error is not None else None,
+        }
+
+
+def _resolve_max_in_flight(max_in_flight: Optional[int]) -> int:
+    if max_in_flight is None:
+        max_in_flight = get_env_int("POLYGON_CONTEST_BUILD_MAX_IN_FLIGHT", DEFAULT_CONTEST_BUILD_MAX_IN_FLIGHT)
+    if max_in_flight <= 0:
+        raise ValueError("max_in_flight 必须大于 0")
+    return max_in_flight
+
+
+def _trigger_build(build: _ProblemBuild, full: bool, verify: bool) -> None:
+    try:
+        build.session = get_problem_session(build.problem_id)
+        build.existing_package_ids = {package.id for package in build.session.get_packages()}
+        build.target_package_id = extract_package_id(
+            build.session.build_package(full=full, verify=verify)
+        )
+        build.status = "building"
+    except Exception as exc:
+        build.status = "error"
+        build.error = exc
+
+
+def _poll_build(build: _ProblemBuild) -> None:
+    build.polls += 1
+    try:
+        packages = build.session.get_packages()
+    except Exception as exc:
+        build.status = "error"
+        build.error = exc
+        return
+
+    if build.target_package_id is not None:
+        matched = next((package for package in packages if package.id == build.target_package_id), None)
+    else:
+        matched = pick_latest_package(
+            [package for package in packages if package.id not in build.existing_package_ids]
+        )
+    if matched is None:
+        return
+
+    build.package = serialize_package(matched)
+    if not build.package_history or build.package_history[-1]["state"] != build.package["state"]:
+        build.package_history.append(build.package)
+    if matched.state == PackageState.READY:
+        build.status = "ready"
+    elif matched.state == PackageState.FAILED:
+        build.status = "failed"
+
+
+def _build_summary(builds: list[_ProblemBuild]) -> dict[str, Any]:
+    def labels(status: str) -> list[str]:
+        return [build.label for build in builds if build.status == status]
+
+    return {
+        "problem_count": len(builds),
+        "ready_count": len(labels("ready")),
+        "ready_problems": labels("ready"),
+        "failed_problems": labels("failed"),
+        "timeout_problems": labels("timeout"),
+        "error_problems": labels("error"),
+        "not_started_problems": labels("not_started"),
+    }
+
+
+def _build_recovery_actions(
+    builds: list[_ProblemBuild],
+    *,
+    contest_id: int,
+    full: bool,
+    verify: bool,
+    timeout_seconds: int,
+) -> list[dict[str, Any]]:
+    actions: list[dict[str, Any]] = []
+    for build in builds:
+        if build.status in ("failed", "error"):
+            actions.append(
+                build_recovery_action(
+                    action="retry_problem_build",
+                    description=f"题目 {build.label} 构建未成功，修复原因后单独重新构建。",
+                    tool="build_problem_package_and_wait",
+                    params={"problem_id": build.problem_id, "full": full, "verify": verify},
+                )
+            )
+    if any(build.status in ("timeout", "not_started") for build in builds):
+        actions.append(
+            build_recovery_action(
+                action="retry_with_longer_timeout",
+                description="部分题目在超时前未完成或未开始构建，增大 timeout_seconds 后重新执行。",
+                tool="build_contest_packages_and_wait",
+                params={
+                    "contest_id": contest_id,
+                    "full": full,
+                    "verify": verify,
+                    "timeout_seconds": max(timeout_seconds * 2, timeout_seconds + 60),
+                },
+            )
+        )
+    return actions
+
+
+def build_contest_packages_and_wait(
+    contest_id: int,
+    full: bool,
+    verify: bool,
+    pin: Optional[str] = None,
+    max_in_flight: Optional[int] = None,
+    timeout_seconds: int = 1800,
+    poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    max_poll_interval_seconds: float = DEFAULT_MAX_POLL_INTERVAL_SECONDS,
+) -> dict[str, Any]:
+    """
+    为比赛内的全部题目触发打包，并在同一个轮询循环中等待它们完成。
+
+    同时处于构建中的题目不超过 max_in_flight，有题目完成后立即触发下一道；
+    每一轮在共享线程池中并发查询所有构建中题目的 package 状态，轮询间隔按指数退避（带抖动），
+    新一批题目开始构建时间隔重新从 poll_interval_seconds 起步。
+
+    Args:
+        contest_id: 比赛ID
+        full: 是否构建完整题目包
+        verify: 构建时是否执行校验
+        pin: 比赛的PIN码（如果有），只用于获取题目列表
+        max_in_flight: 同时构建的题目数；未提供时读取 POLYGON_CONTEST_BUILD_MAX_IN_FLIGHT，默认 4
+        timeout_seconds: 整场构建的等待上限（秒）
+        poll_interval_seconds: 首次轮询间隔（秒）
+        max_poll_interval_seconds: 轮询退避的最大间隔（秒）
+
+    Returns:
+        dict: problems 为逐题的 package、状态与耗时，completion_order 按完成先后记录每道题的结果
+    """
+    request = {
+        "contest_id": contest_id,
+        "full": full,
+        "verify": verify,
+        "max_in_flight": max_in_flight,
+        "timeout_seconds": timeout_seconds,
+        "poll_interval_seconds": poll_interval_seconds,
+        "max_poll_interval_seconds": max_poll_interval_seconds,
+    }
+    try:
+        validation_error = validate_build_request(
+            timeout_seconds,
+            poll_interval_seconds,
+            max_poll_interval_seconds,
+        )
+        if validation_error is not None:
+            raise validation_error
+        in_flight_limit = _resolve_max_in_flight(max_in_flight)
+    except ValueError as exc:
+        return build_operation_result(
+            action="build_contest_packages_and_wait",
+            success=False,
+            message="比赛构建流程参数无效",
+            error=exc,
+            contest_id=contest_id,
+            stage="validate_request",
+            decision="invalid_request",
+            can_retry=True,
+            recovery_actions=[],
+            request=request,
+        )
+
+    try:
+        problems = get_client().create_contest_session(contest_id, pin).get_problems()
+    except Exception as exc:
+        problems = None
+        list_error: Optional[Exception] = exc
+    else:
+        list_error = None
+    if not problems:
+        return build_operation_result(
+            action="build_contest_packages_and_wait",
+            success=False,
+            message="获取比赛题目失败，无法触发构建" if list_error else f"比赛 {contest_id} 中没有找到题目",
+            error=list_error,
+            contest_id=contest_id,
+            stage="list_problems",
+            decision="contest_unavailable",
+            can_retry=True,
+            recovery_actions=[],
+            request=request,
+        )
+
+    builds = [_ProblemBuild(problem) for problem in problems]
+    queue = deque(builds)
+    completion_order: list[dict[str, Any]] = []
+    request_count = 0
+    poll_rounds = 0
+    sleep_seconds = 0.0
+    schedule: Optional[AdaptivePollSchedule] = None
+    wave_started = 0.0
+    started = time.monotonic()
+
+    def elapsed() -> float:
+        return round(time.monotonic() - started, 2)
+
+    def record_finished(build: _ProblemBuild) -> None:
+        build.finished_at = elapsed()
+        if build.status == "ready" and build.duration_seconds is not None:
+            build_durations.record(build.problem_id, full, verify, build.duration_seconds)
+        completion_order.append(
+            {
+                "problem_id": build.problem_id,
+                "letter": build.letter,
+                "status": build.status,
+                "package_id": build.package["id"] if build.package is not None else build.target_package_id,
+                "finished_after_seconds": build.finished_at,
+                "duration_seconds": build.duration_seconds,
+            }
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=min(in_flight_limit, len(builds)),
+        thread_name_prefix="polygon-contest-build",
+    ) as executor:
+        while True:
+            building = [build for build in builds if build.status == "building"]
+            wave = [queue.popleft() for _ in range(min(in_flight_limit - len(building), len(queue)))]
+            if wave:
+                wave_started = elapsed()
+                for build in wave:
+                    build.triggered_at = wave_started
+                trigger_build = propagate_trace_context(lambda build: _trigger_build(build, full, verify))
+                list(executor.map(trigger_build, wave))
+                request_count += 2 * len(wave)
+                for build in wave:
+                    if build.status == "error":
+                        record_finished(build)
+                expected = [
+                    build_durations.expected(build.problem_id, full, verify)
+                    for build in wave
+                    if build.status == "building"
+                ]
+                schedule = AdaptivePollSchedule(
+                    initial_interval=poll_interval_seconds,
+                    max_interval=max_poll_interval_seconds,
+                    expected_duration=min(expected) if expected and None not in expected else None,
+                )
+                continue
+
+            if not building:
+                break
+            if elapsed() >= timeout_seconds:
+                for build in building:
+                    build.status = "timeout"
+                for build in queue:
+                    build.status = "not_started"
+                break
+
+            delay = schedule.next_delay(elapsed() - wave_started, timeout_seconds - elapsed())
+            sleep_seconds += delay
+            time.sleep(delay)
+            poll_rounds += 1
+            list(executor.map(propagate_trace_context(_poll_build), building))
+            request_count += len(building)
+            for build in building:
+                if build.status != "building":
+                    record_finished(build)
+
+    summary = _build_summary(builds)
+    all_ready = summary["ready_count"] == len(builds)
+    any_ready = summary["ready_count"] > 0
+    if all_ready:
+        decision = "packages_ready"
+    elif summary["timeout_problems"] or summary["not_started_problems"]:
+        decision = "build_timeout"
+    else:
+        decision = "packages_failed"
+    return build_operation_result(
+        action="build_contest_packages_and_wait",
+        success=all_ready,
+        message=f"{summary['ready_count']}/{len(builds)} 道题目的题目包已构建完成",
+        status_override=None if all_ready or not any_ready else "partial",
+        contest_id=contest_id,
+        stage="completed" if all_ready else "wait_packages",
+        decision=decision,
+        can_retry=not all_ready,
+        recovery_actions=_build_recovery_actions(
+            builds,
+            contest_id=contest_id,
+            full=full,
+            verify=verify,
+            timeout_seconds=timeout_seconds,
+        ),
+        summary=summary,
+        problems=[build.serialize() for build in builds],
+        completion_order=completion_order,
+        polling={
+            "max_in_flight": in_flight_limit,
+            "request_count": request_count,
+            "poll_rounds": poll_rounds,
+            "total_sleep_seconds": round(sleep_seconds, 3),
+            "elapsed_seconds": elapsed(),
+        },
+        request=request,
+    )
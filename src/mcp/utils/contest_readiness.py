@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.mcp.utils.common import (
+    build_operation_result,
+    build_recovery_action,
+    get_client,
+    get_env_int,
+    get_http_pool_maxsize,
+)
+from src.mcp.utils.problem_readiness import _check_problem_readiness, _get_fetch_workers
+from src.polygon.tracing import propagate_trace_context
+
+DEFAULT_CONTEST_READINESS_WORKERS = 4
+
+
+def _resolve_max_workers(max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = get_env_int("POLYGON_CONTEST_READINESS_WORKERS", DEFAULT_CONTEST_READINESS_WORKERS)
+    if max_workers <= 0:
+        raise ValueError("max_workers 必须大于 0")
+    return max_workers
+
+
+def _plan_concurrency(workers: int, fetch_workers: int, problem_count: int) -> tuple[int, int]:
+    """
+    返回 (同时检查的题目数, 每道题的拉取线程数)。
+
+    所有题目共用一个连接池，两层线程数相乘超过 POLYGON_HTTP_POOL_MAXSIZE 时，多出的请求只会排队等连接，
+    还会让连接池反复丢弃和新建连接；因此按连接池大小把每道题的拉取线程数压到 pool_maxsize // 题目并发数。
+    """
+    pool_maxsize = get_http_pool_maxsize()
+    problem_workers = max(1, min(workers, problem_count, pool_maxsize))
+    return problem_workers, max(1, min(fetch_workers, pool_maxsize // problem_workers))
+
+
+def _check_problem(problem: Any, testset: str, include_details: bool, fetch_workers: int) -> dict[str, Any]:
+    started = time.perf_counter()
+    item: dict[str, Any] = {
+        "problem_id": problem.id,
+        "letter": problem.contestLetter,
+        "name": problem.name,
+    }
+    try:
+        readiness = _check_problem_readiness(problem.id, None, testset, max_workers=fetch_workers)
+    except Exception as exc:
+        item.update(
+            {
+                "status": "error",
+                "ready": False,
+                "blocking_issue_count": 0,
+                "warning_count": 0,
+                "blocking_issues": [],
+                "warnings": [],
+                "error": str(exc),
+                "error_type": type(exc).__name__,
+            }
+        )
+    else:
+        summary = readiness["summary"]
+        item.update(
+            {
+                "status": summary["status"],
+                "ready": readiness["ready"],
+                "blocking_issue_count": summary["blocking_issue_count"],
+                "warning_count": summary["warning_count"],
+                "blocking_issues": readiness["blocking_issues"],
+                "warnings": readiness["warnings"],
+            }
+        )
+        if include_details:
+            item["details"] = readiness["details"]
+            item["fetch_timings"] = readiness["fetch_timings"]
+    item["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return item
+
+
+def _build_rollup(items: list[dict[str, Any]]) -> dict[str, Any]:
+    def labels(status: str) -> list[str]:
+        return [str(item["letter"] or item["problem_id"]) for item in items if item["status"] == status]
+
+    blocked = labels("blocked")
+    errored = labels("error")
+    with_warnings = labels("warnings")
+    if blocked or errored:
+        status = "blocked"
+        recommendation = "fix_blocking_issues"
+    elif with_warnings:
+        status = "warnings"
+        recommendation = "review_warnings"
+    else:
+        status = "ready"
+        recommendation = "ready_for_release"
+    return {
+        "status": status,
+        "recommendation": recommendation,
+        "problem_count": len(items),
+        "ready_count": len(labels("ready")),
+        "warning_problem_count": len(with_warnings),
+        "blocked_problem_count": len(blocked),
+        "error_problem_count": len(errored),
+        "blocking_issue_count": sum(item["blocking_issue_count"] for item in items),
+        "warning_count": sum(item["warning_count"] for item in items),
+        "blocked_problems": blocked,
+        "warning_problems": with_warnings,
+        "error_problems": errored,
+    }
+
+
+def _build_recovery_actions(items: list[dict[str, Any]], testset: str) -> list[dict[str, Any]]:
+    actions: list[dict[str, Any]] = []
+    for item in items:
+        if item["status"] in ("blocked", "error"):
+            actions.append(
+                build_recovery_action(
+                    action="fix_problem_blocking_issues",
+                    description=f"题目 {item['letter'] or item['problem_id']} 未通过检查，修复后单独重新检查。",
+                    tool="check_problem_readiness",
+                    params={"problem_id": item["problem_id"], "testset": testset},
+                )
+            )
+    return actions
+
+
+def check_contest_readiness(
+    contest_id: int,
+    pin: Optional[str] = None,
+    testset: str = "tests",
+    max_workers: Optional[int] = None,
+    include_details: bool = False,
+) -> dict[str, Any]:
+    """
+    检查比赛内全部题目的 readiness，并汇总阻塞项和警告。
+
+    先通过 contest.problems 获取题目列表，再在有界线程池中对每道题并发执行 check_problem_readiness；
+    所有题目共用同一个带连接池的客户端和题目会话缓存。题目并发数与每道题的拉取线程数之积不超过连接池大小，
+    timings 中的 max_workers 和 fetch_workers 是实际使用的值。单道题检查失败只记为该题 error，不影响其余题目。
+
+    Args:
+        contest_id: 比赛ID
+        pin: 比赛的PIN码（如果有），只用于获取题目列表
+        testset: 检查使用的测试集
+        max_workers: 同时检查的题目数；未提供时读取 POLYGON_CONTEST_READINESS_WORKERS，默认 4
+        include_details: 是否在每道题的结果中附带 details 和 fetch_timings
+
+    Returns:
+        dict: problems 为按题目编号排序的逐题摘要，summary 为整场比赛的汇总
+    """
+    started = time.perf_counter()
+    try:
+        workers = _resolve_max_workers(max_workers)
+        fetch_workers = _get_fetch_workers()
+        problems = get_client().create_contest_session(contest_id, pin).get_problems()
+    except Exception as exc:
+        return build_operation_result(
+            action="check_contest_readiness",
+            success=False,
+            message="获取比赛题目失败，无法检查 readiness",
+            error=exc,
+            contest_id=contest_id,
+            stage="list_problems",
+            decision="contest_unavailable",
+            can_retry=True,
+            recovery_actions=[],
+        )
+
+    if not problems:
+        return build_operation_result(
+            action="check_contest_readiness",
+            success=False,
+            message=f"比赛 {contest_id} 中没有找到题目，请确认比赛ID、访问权限和PIN码",
+            contest_id=contest_id,
+            stage="list_problems",
+            decision="contest_unavailable",
+            can_retry=True,
+            recovery_actions=[],
+        )
+
+    problem_workers, fetch_workers = _plan_concurrency(workers, fetch_workers, len(problems))
+    with ThreadPoolExecutor(
+        max_workers=problem_workers,
+        thread_name_prefix="polygon-contest-readiness",
+    ) as executor:
+        items = list(
+            executor.map(
+                propagate_trace_context(
+                    lambda problem: _check_problem(problem, testset, include_details, fetch_workers)
+                ),
+                problems,
+            )
+        )
+
+    summary = _build_rollup(items)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    return build_operation_result(
+        action="check_contest_readiness",
+        success=True,
+        message=(
+            f"已检查 {len(items)} 道题目：{summary['ready_count']} 道就绪，"
+            f"{summary['warning_problem_count']} 道有警告，"
+            f"{summary['blocked_problem_count'] + summary['error_problem_count']} 道被阻塞"
+        ),
+        contest_id=contest_id,
+        stage="completed",
+        decision=summary["recommendation"],
+        can_retry=summary["status"] != "ready",
+        recovery_actions=_build_recovery_actions(items, testset),
+        ready=summary["status"] != "blocked",
+        summary=summary,
+        problems=items,
+        timings={
+            "max_workers": problem_workers,
+            "fetch_workers": fetch_workers,
+            "elapsed_ms": elapsed_ms,
+            "sequential_elapsed_ms": round(sum(item["elapsed_ms"] for item in items), 2),
+        },
+    )
@@ -1,12 +1,23 @@
 from typing import Optional
 
-from src.mcp.utils.common import build_download_result, get_account_credentials
+from src.mcp.utils.common import (
+    build_download_result,
+    get_account_credentials,
+    get_package_cache,
+    get_web_session,
+    stream_download,
+)
 from src.polygon.download import (
     download_contest_descriptor as _download_contest_descriptor,
+    download_contest_descriptor_to_file as _download_contest_descriptor_to_file,
     download_contest_statements_pdf as _download_contest_statements_pdf,
+    download_contest_statements_pdf_to_file as _download_contest_statements_pdf_to_file,
     download_problem_descriptor as _download_problem_descriptor,
+    download_problem_descriptor_to_file as _download_problem_descriptor_to_file,
     download_problem_package as _download_problem_package,
+    download_problem_package_to_file as _download_problem_package_to_file,
 )
+from src.polygon.package_cache import build_url_package_cache_key
 
 
 DOWNLOAD_INFO_FIXED_FIELDS = (
@@ -19,6 +30,11 @@ DOWNLOAD_INFO_FIXED_FIELDS = (
 )
 
 
+def _validate_url_package_type(package_type: Optional[str]) -> None:
+    if package_type is not None and package_type not in {"linux", "windows"}:
+        raise ValueError("package_type 仅支持 linux 或 windows")
+
+
 def download_problem_package_by_url(
     problem_url: str,
     pin: Optional[str] = None,
@@ -38,17 +54,18 @@ def download_problem_package_by_url(
         login: Polygon 登录名；不传则读取 POLYGON_LOGIN
         password: Polygon 密码；不传则读取 POLYGON_PASSWORD
     """
-    if package_type is not None and package_type not in {"linux", "windows"}:
-        raise ValueError("package_type 仅支持 linux 或 windows")
+    _validate_url_package_type(package_type)
 
     resolved_login, resolved_password = get_account_credentials(login, password)
     return _download_problem_package(
         problem_url=problem_url,
         login=resolved_login,
         password=resolved_password,
+        web_session=get_web_session(resolved_login, resolved_password),
         pin=pin,
         revision=revision,
         package_type=package_type,
+        cache=get_package_cache(),
     )
 
 
@@ -59,26 +76,44 @@ def download_problem_package_info_by_url(
     package_type: Optional[str] = None,
     login: Optional[str] = None,
     password: Optional[str] = None,
+    target_path: Optional[str] = None,
 ) -> dict:
-    """下载题目包并返回元数据。"""
-    content = download_problem_package_by_url(
-        problem_url=problem_url,
-        pin=pin,
-        revision=revision,
-        package_type=package_type,
-        login=login,
-        password=password,
-    )
+    """流式下载题目包并返回元数据；提供 target_path 时文件保存到该路径。"""
+    _validate_url_package_type(package_type)
+    resolved_login, resolved_password = get_account_credentials(login, password)
+    cache = get_package_cache()
+    downloaded = None
+    if target_path is None and cache is not None and revision is not None:
+        downloaded = cache.lookup(
+            build_url_package_cache_key(problem_url, revision, package_type, account=resolved_login)
+        )
+    if downloaded is None:
+        downloaded = stream_download(
+            lambda path: _download_problem_package_to_file(
+                problem_url=problem_url,
+                target_path=path,
+                login=resolved_login,
+                password=resolved_password,
+                web_session=get_web_session(resolved_login, resolved_password),
+                pin=pin,
+                revision=revision,
+                package_type=package_type,
+                cache=cache,
+            ),
+            filename="package.zip",
+            target_path=target_path,
+        )
     return build_download_result(
         action="download_problem_package_info_by_url",
         filename="package.zip",
         content_kind="zip",
-        content=content,
+        content=downloaded,
         source_kind="url",
         source_ref=problem_url,
         source_url=problem_url,
         revision=revision,
         package_type=package_type,
+        path=downloaded.path if target_path is not None else None,
     )
 
 
@@ -95,6 +130,7 @@ def download_problem_descriptor(
         problem_url=problem_url,
         login=resolved_login,
         password=resolved_password,
+        web_session=get_web_session(resolved_login, resolved_password),
         pin=pin,
         revision=revision,
     )
@@ -106,24 +142,33 @@ def download_problem_descriptor_info(
     revision: Optional[int] = None,
     login: Optional[str] = None,
     password: Optional[str] = None,
+    target_path: Optional[str] = None,
 ) -> dict:
-    """下载 problem.xml 并返回元数据。"""
-    content = download_problem_descriptor(
-        problem_url=problem_url,
-        pin=pin,
-        revision=revision,
-        login=login,
-        password=password,
+    """流式下载 problem.xml 并返回元数据；提供 target_path 时文件保存到该路径。"""
+    resolved_login, resolved_password = get_account_credentials(login, password)
+    downloaded = stream_download(
+        lambda path: _download_problem_descriptor_to_file(
+            problem_url=problem_url,
+            target_path=path,
+            login=resolved_login,
+            password=resolved_password,
+            web_session=get_web_session(resolved_login, resolved_password),
+            pin=pin,
+            revision=revision,
+        ),
+        filename="problem.xml",
+        target_path=target_path,
     )
     return build_download_result(
         action="download_problem_descriptor_info",
         filename="problem.xml",
         content_kind="xml",
-        content=content,
+        content=downloaded,
         source_kind="url",
         source_ref=problem_url,
         source_url=problem_url,
         revision=revision,
+        path=downloaded.path if target_path is not None else None,
     )
 
 
@@ -139,6 +184,7 @@ def download_contest_descriptor(
         contest_url=contest_url,
         login=resolved_login,
         password=resolved_password,
+        web_session=get_web_session(resolved_login, resolved_password),
         pin=pin,
     )
 
@@ -148,22 +194,31 @@ def download_contest_descriptor_info(
     pin: Optional[str] = None,
     login: Optional[str] = None,
     password: Optional[str] = None,
+    target_path: Optional[str] = None,
 ) -> dict:
-    """下载 contest.xml 并返回元数据。"""
-    content = download_contest_descriptor(
-        contest_url=contest_url,
-        pin=pin,
-        login=login,
-        password=password,
+    """流式下载 contest.xml 并返回元数据；提供 target_path 时文件保存到该路径。"""
+    resolved_login, resolved_password = get_account_credentials(login, password)
+    downloaded = stream_download(
+        lambda path: _download_contest_descriptor_to_file(
+            contest_url=contest_url,
+            target_path=path,
+            login=resolved_login,
+            password=resolved_password,
+            web_session=get_web_session(resolved_login, resolved_password),
+            pin=pin,
+        ),
+        filename="contest.xml",
+        target_path=target_path,
     )
     return build_download_result(
         action="download_contest_descriptor_info",
         filename="contest.xml",
         content_kind="xml",
-        content=content,
+        content=downloaded,
         source_kind="url",
         source_ref=contest_url,
         source_url=contest_url,
+        path=downloaded.path if target_path is not None else None,
     )
 
 
@@ -180,6 +235,7 @@ def download_contest_statements_pdf(
         contest_url=contest_url,
         login=resolved_login,
         password=resolved_password,
+        web_session=get_web_session(resolved_login, resolved_password),
         language=language,
         pin=pin,
     )
@@ -191,22 +247,31 @@ def download_contest_statements_pdf_info(
     pin: Optional[str] = None,
     login: Optional[str] = None,
     password: Optional[str] = None,
+    target_path: Optional[str] = None,
 ) -> dict:
-    """下载比赛陈述 PDF 并返回元数据。"""
-    content = download_contest_statements_pdf(
-        contest_url=contest_url,
-        language=language,
-        pin=pin,
-        login=login,
-        password=password,
+    """流式下载比赛陈述 PDF 并返回元数据；提供 target_path 时文件保存到该路径。"""
+    resolved_login, resolved_password = get_account_credentials(login, password)
+    downloaded = stream_download(
+        lambda path: _download_contest_statements_pdf_to_file(
+            contest_url=contest_url,
+            target_path=path,
+            login=resolved_login,
+            password=resolved_password,
+            web_session=get_web_session(resolved_login, resolved_password),
+            language=language,
+            pin=pin,
+        ),
+        filename="statements.pdf",
+        target_path=target_path,
     )
     return build_download_result(
         action="download_contest_statements_pdf_info",
         filename="statements.pdf",
         content_kind="pdf",
-        content=content,
+        content=downloaded,
         source_kind="url",
         source_ref=contest_url,
         source_url=contest_url,
         language=language,
+        path=downloaded.path if target_path is not None else None,
     )
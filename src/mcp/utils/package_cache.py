@@ -0,0 +1,25 @@
+from typing import Any
+
+from src.mcp.utils.common import build_operation_result, get_package_cache
+
+
+def get_package_cache_stats() -> dict[str, Any]:
+    """查看本地题目包缓存的占用和命中统计。"""
+    cache = get_package_cache()
+    if cache is None:
+        return build_operation_result(
+            action="get_package_cache_stats",
+            success=True,
+            message="题目包缓存未启用，设置 POLYGON_PACKAGE_CACHE_DIR 后生效",
+            result={"enabled": False},
+            enabled=False,
+        )
+
+    stats = cache.stats()
+    return build_operation_result(
+        action="get_package_cache_stats",
+        success=True,
+        message=f"题目包缓存共 {stats['entries']} 个条目，占用 {stats['total_bytes']} 字节",
+        result={"enabled": True, **stats},
+        enabled=True,
+    )
@@ -0,0 +1,37 @@
+from typing import Any, Optional
+
+from src.mcp.utils.common import build_operation_result, get_client
+
+
+def check_problem_changes(problem_ids: Optional[list[int]] = None) -> dict[str, Any]:
+    """
+    用一次 problems.list 调用检查题目自上次观察以来是否有变化
+
+    比较每道题的 revision、modified 和 latestPackage 与本进程记录的快照；发生变化或无法访问的题目，
+    其已缓存的读接口结果会被批量失效，只需对它们做定向刷新。
+
+    Args:
+        problem_ids: 需要检查的题目 ID 列表；不传时检查当前凭证可访问的全部题目
+
+    Returns:
+        dict: 结构化结果，result 中按 changed、unchanged、new、missing 分类给出题目 ID
+    """
+    if problem_ids is not None and not problem_ids:
+        raise ValueError("problem_ids 不能为空列表")
+
+    client = get_client()
+    report = client.probe_problem_changes(problem_ids)
+    stale = report.stale
+    return build_operation_result(
+        action="check_problem_changes",
+        success=True,
+        message=(
+            f"检查了 {len(report.changed) + len(report.unchanged) + len(report.new) + len(report.missing)} 道题目，"
+            f"{len(stale)} 道需要刷新"
+        ),
+        result={
+            **report.model_dump(),
+            "stale": stale,
+            "tracker": client.problem_snapshots.stats(),
+        },
+    )
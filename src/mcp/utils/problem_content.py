@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import Any, Optional
 
 from src.mcp.utils.common import (
     call_problem_session_method,
     get_problem_session,
+    paginate_items,
     parse_enum,
     resolve_text_input,
     resolve_upload_name,
@@ -11,7 +12,7 @@ from src.mcp.utils.common import (
 from src.polygon.models import (
     File,
     FileType,
-    ProblemFiles,
+    Page,
     ResourceAsset,
     ResourceStage,
     SourceType,
@@ -51,9 +52,35 @@ def save_problem_statement_resource(
     )
 
 
-def get_problem_files(problem_id: int, pin: Optional[str] = None) -> ProblemFiles:
-    """获取题目的资源文件、源文件和辅助文件列表。"""
-    return call_problem_session_method(problem_id, pin, "get_files")
+def get_problem_files(
+    problem_id: int,
+    pin: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    filters: Optional[dict[str, Any]] = None,
+) -> Page[dict[str, Any]]:
+    """获取题目的资源文件、源文件和辅助文件列表，三类文件合并成一个列表并用 fileType 区分。"""
+    files = call_problem_session_method(problem_id, pin, "get_files")
+    items = [
+        {"fileType": file_type.value, **file.model_dump(mode="json")}
+        for file_type, group in (
+            (FileType.RESOURCE, files.resourceFiles),
+            (FileType.SOURCE, files.sourceFiles),
+            (FileType.AUX, files.auxFiles),
+        )
+        for file in group
+    ]
+    return paginate_items(
+        items,
+        scope=f"problem.files:{problem_id}",
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        model=File,
+        extra_fields=("fileType",),
+    )
 
 
 def save_problem_file(
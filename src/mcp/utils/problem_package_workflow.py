@@ -3,53 +3,51 @@ from __future__ import annotations
 import time
 from typing import Any, Optional
 
+from src.mcp.package_builds import (
+    DEFAULT_MAX_POLL_INTERVAL_SECONDS,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    AdaptivePollSchedule,
+    build_durations,
+    extract_package_id,
+    pick_latest_package,
+    serialize_package,
+    validate_build_request,
+)
 from src.mcp.utils.common import (
     build_operation_result,
     build_recovery_action,
     get_problem_session,
 )
 from src.polygon.models import Package, PackageState
+from src.polygon.tracing import trace_span
 
 
-def _extract_package_id(build_result: Any) -> Optional[int]:
-    if isinstance(build_result, Package):
-        return build_result.id
-    if isinstance(build_result, int):
-        return build_result
-    if isinstance(build_result, dict):
-        for key in ("packageId", "id"):
-            value = build_result.get(key)
-            if value is not None:
-                return int(value)
-        nested_package = build_result.get("package")
-        if nested_package is not None:
-            return _extract_package_id(nested_package)
-    return None
-
-
-def _serialize_package(package: Package) -> dict[str, Any]:
+def _summarize_polling(
+    *,
+    request_count: int,
+    poll_latencies_ms: list[float],
+    sleep_seconds: float,
+    expected_duration: Optional[float],
+) -> dict[str, Any]:
     return {
-        "id": package.id,
-        "revision": package.revision,
-        "creation_time": package.creationTimeSeconds.isoformat(),
-        "state": package.state.value,
-        "comment": package.comment,
-        "type": package.type.value,
+        "request_count": request_count,
+        "poll_requests": len(poll_latencies_ms),
+        "poll_latencies_ms": poll_latencies_ms,
+        "max_poll_latency_ms": max(poll_latencies_ms, default=0.0),
+        "total_sleep_seconds": round(sleep_seconds, 3),
+        "expected_duration_seconds": (
+            round(expected_duration, 2) if expected_duration is not None else None
+        ),
     }
 
 
-def _pick_latest_package(packages: list[Package]) -> Optional[Package]:
-    if not packages:
-        return None
-    return max(packages, key=lambda package: (package.creationTimeSeconds, package.id))
-
-
 def _serialize_request(
     problem_id: int,
     full: bool,
     verify: bool,
     timeout_seconds: int,
     poll_interval_seconds: float,
+    max_poll_interval_seconds: float,
 ) -> dict[str, Any]:
     return {
         "problem_id": problem_id,
@@ -57,6 +55,7 @@ def _serialize_request(
         "verify": verify,
         "timeout_seconds": timeout_seconds,
         "poll_interval_seconds": poll_interval_seconds,
+        "max_poll_interval_seconds": max_poll_interval_seconds,
     }
 
 
@@ -70,7 +69,7 @@ def _build_recovery_actions(
         return [
             build_recovery_action(
                 action="fix_request_parameters",
-                description="修正 timeout_seconds 或 poll_interval_seconds 后重新触发构建等待流程。",
+                description="修正 timeout_seconds、poll_interval_seconds 或 max_poll_interval_seconds 后重新触发构建等待流程。",
                 tool="build_problem_package_and_wait",
                 params=request,
             )
@@ -130,13 +129,17 @@ def build_problem_package_and_wait(
     verify: bool,
     pin: Optional[str] = None,
     timeout_seconds: int = 600,
-    poll_interval_seconds: float = 5.0,
+    poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    max_poll_interval_seconds: float = DEFAULT_MAX_POLL_INTERVAL_SECONDS,
 ) -> dict[str, Any]:
     """
     触发题目打包并等待构建完成。
 
+    轮询从 poll_interval_seconds 开始按指数退避（带抖动），间隔不超过 max_poll_interval_seconds；
+    同一进程内构建过同一题目时，会参考此前观测到的构建耗时推迟密集轮询。
+
     Returns:
-        dict: 包含构建请求结果、匹配到的 package 信息和最终状态。
+        dict: 包含构建请求结果、匹配到的 package 信息、最终状态和轮询统计。
     """
     request = _serialize_request(
         problem_id=problem_id,
@@ -144,29 +147,19 @@ def build_problem_package_and_wait(
         verify=verify,
         timeout_seconds=timeout_seconds,
         poll_interval_seconds=poll_interval_seconds,
+        max_poll_interval_seconds=max_poll_interval_seconds,
     )
-    if timeout_seconds <= 0:
-        return build_operation_result(
-            action="build_problem_package_and_wait",
-            success=False,
-            message="题目包构建流程参数无效",
-            error=ValueError("timeout_seconds 必须大于 0"),
-            problem_id=problem_id,
-            stage="validate_request",
-            decision="invalid_request",
-            can_retry=True,
-            recovery_actions=_build_recovery_actions(
-                "invalid_request",
-                request=request,
-            ),
-            request=request,
-        )
-    if poll_interval_seconds <= 0:
+    validation_error = validate_build_request(
+        timeout_seconds,
+        poll_interval_seconds,
+        max_poll_interval_seconds,
+    )
+    if validation_error is not None:
         return build_operation_result(
             action="build_problem_package_and_wait",
             success=False,
             message="题目包构建流程参数无效",
-            error=ValueError("poll_interval_seconds 必须大于 0"),
+            error=validation_error,
             problem_id=problem_id,
             stage="validate_request",
             decision="invalid_request",
@@ -187,18 +180,43 @@ def build_problem_package_and_wait(
     matched_by = "new_package"
     package_history: list[dict[str, Any]] = []
     current_stage = "initialize"
+    expected_duration = build_durations.expected(problem_id, full, verify)
+    schedule = AdaptivePollSchedule(
+        initial_interval=poll_interval_seconds,
+        max_interval=max_poll_interval_seconds,
+        expected_duration=expected_duration,
+    )
+    request_count = 0
+    poll_latencies_ms: list[float] = []
+    sleep_seconds = 0.0
+
+    def polling_summary() -> dict[str, Any]:
+        return _summarize_polling(
+            request_count=request_count,
+            poll_latencies_ms=poll_latencies_ms,
+            sleep_seconds=sleep_seconds,
+            expected_duration=expected_duration,
+        )
+
     try:
         current_stage = "load_session"
         session = get_problem_session(problem_id, pin)
         current_stage = "start_build"
-        existing_package_ids = {package.id for package in session.get_packages()}
-        build_result = session.build_package(full=full, verify=verify)
-        target_package_id = _extract_package_id(build_result)
+        with trace_span("build_problem_package_and_wait.start_build", full=full, verify=verify):
+            request_count += 1
+            existing_package_ids = {package.id for package in session.get_packages()}
+            request_count += 1
+            build_result = session.build_package(full=full, verify=verify)
+        target_package_id = extract_package_id(build_result)
         matched_by = "package_id" if target_package_id is not None else "new_package"
         start_time = time.monotonic()
         current_stage = "wait_package"
         while True:
-            packages = session.get_packages()
+            request_count += 1
+            poll_started = time.perf_counter()
+            with trace_span("build_problem_package_and_wait.poll", poll=polls):
+                packages = session.get_packages()
+            poll_latencies_ms.append(round((time.perf_counter() - poll_started) * 1000, 2))
             if target_package_id is not None:
                 matched_package = next(
                     (package for package in packages if package.id == target_package_id),
@@ -206,15 +224,16 @@ def build_problem_package_and_wait(
                 )
             else:
                 new_packages = [package for package in packages if package.id not in existing_package_ids]
-                matched_package = _pick_latest_package(new_packages)
+                matched_package = pick_latest_package(new_packages)
 
             elapsed_seconds = round(time.monotonic() - start_time, 2)
 
             if matched_package is not None:
-                serialized_package = _serialize_package(matched_package)
+                serialized_package = serialize_package(matched_package)
                 if not package_history or package_history[-1]["state"] != serialized_package["state"]:
                     package_history.append(serialized_package)
                 if matched_package.state == PackageState.READY:
+                    build_durations.record(problem_id, full, verify, elapsed_seconds)
                     response = build_operation_result(
                         action="build_problem_package_and_wait",
                         success=True,
@@ -224,6 +243,7 @@ def build_problem_package_and_wait(
                         package=serialized_package,
                         package_history=package_history,
                         polls=polls,
+                        polling=polling_summary(),
                         elapsed_seconds=elapsed_seconds,
                         target_package_id=target_package_id,
                         matched_by=matched_by,
@@ -247,6 +267,7 @@ def build_problem_package_and_wait(
                         package=serialized_package,
                         package_history=package_history,
                         polls=polls,
+                        polling=polling_summary(),
                         elapsed_seconds=elapsed_seconds,
                         target_package_id=target_package_id,
                         matched_by=matched_by,
@@ -273,9 +294,10 @@ def build_problem_package_and_wait(
                     result=build_result,
                     status_override="timeout",
                     build_result=build_result,
-                    package=_serialize_package(matched_package) if matched_package is not None else None,
+                    package=serialize_package(matched_package) if matched_package is not None else None,
                     package_history=package_history,
                     polls=polls,
+                    polling=polling_summary(),
                     elapsed_seconds=elapsed_seconds,
                     target_package_id=target_package_id,
                     matched_by=matched_by,
@@ -291,11 +313,14 @@ def build_problem_package_and_wait(
                     request=request,
                 )
                 response["target_package_id"] = target_package_id
-                response["package"] = _serialize_package(matched_package) if matched_package is not None else None
+                response["package"] = serialize_package(matched_package) if matched_package is not None else None
                 return response
 
             polls += 1
-            time.sleep(poll_interval_seconds)
+            delay = schedule.next_delay(elapsed_seconds, timeout_seconds - elapsed_seconds)
+            sleep_seconds += delay
+            with trace_span("build_problem_package_and_wait.wait", poll=polls, delay_seconds=delay):
+                time.sleep(delay)
     except Exception as exc:
         return build_operation_result(
             action="build_problem_package_and_wait",
@@ -315,6 +340,7 @@ def build_problem_package_and_wait(
             build_result=build_result,
             package_history=package_history,
             polls=polls,
+            polling=polling_summary(),
             target_package_id=target_package_id,
             matched_by=matched_by,
             initial_package_ids=sorted(existing_package_ids),
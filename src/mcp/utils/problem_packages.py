@@ -1,21 +1,35 @@
-from typing import Optional
+from typing import Any, Optional
 
 from src.mcp.utils.common import (
     build_download_result,
     call_problem_session_method,
     get_problem_session,
+    paginate_items,
     parse_enum,
     run_write_operation,
+    stream_download,
 )
-from src.polygon.models import Package, PackageType
+from src.polygon.models import Package, Page, PackageType
 
 
 def get_problem_packages(
     problem_id: int,
     pin: Optional[str] = None,
-) -> list[Package]:
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    filters: Optional[dict[str, Any]] = None,
+) -> Page[dict[str, Any]]:
     """获取题目的历史包列表。"""
-    return call_problem_session_method(problem_id, pin, "get_packages")
+    return paginate_items(
+        call_problem_session_method(problem_id, pin, "get_packages"),
+        scope=f"problem.packages:{problem_id}",
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        model=Package,
+    )
 
 
 def download_problem_package(
@@ -42,24 +56,46 @@ def download_problem_package_info(
     package_id: int,
     pin: Optional[str] = None,
     package_type: Optional[str] = None,
+    target_path: Optional[str] = None,
 ) -> dict[str, object]:
-    """下载题目包并返回元数据。"""
-    content = download_problem_package(
-        problem_id=problem_id,
-        package_id=package_id,
-        pin=pin,
-        package_type=package_type,
+    """流式下载题目包并返回元数据；提供 target_path 时文件保存到该路径。"""
+    package_type_enum = (
+        parse_enum(PackageType, package_type, "package_type") if package_type is not None else None
     )
+    # 不需要保留文件时，缓存命中直接使用索引里的元数据，不再把 blob 复制到临时目录重新计算 sha256。
+    downloaded = None
+    if target_path is None:
+        downloaded = call_problem_session_method(
+            problem_id,
+            pin,
+            "lookup_cached_package",
+            package_id=package_id,
+            package_type=package_type_enum,
+        )
+    if downloaded is None:
+        downloaded = stream_download(
+            lambda path: call_problem_session_method(
+                problem_id,
+                pin,
+                "download_package_to_file",
+                package_id=package_id,
+                target_path=path,
+                package_type=package_type_enum,
+            ),
+            filename="package.zip",
+            target_path=target_path,
+        )
     return build_download_result(
         action="download_problem_package_info",
         filename="package.zip",
         content_kind="zip",
-        content=content,
+        content=downloaded,
         source_kind="problem_package",
         source_ref=f"problem:{problem_id}/package:{package_id}",
         problem_id=problem_id,
         package_id=package_id,
         package_type=package_type,
+        path=downloaded.path if target_path is not None else None,
     )
 
 
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import re
 import shlex
+import time
 from collections import Counter
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 
-from src.mcp.utils.common import build_recovery_action, get_problem_session
+from src.mcp.utils.common import build_recovery_action, get_env_int, get_problem_session
 from src.polygon.models import PackageState, SolutionTag
+from src.polygon.tracing import propagate_trace_context, trace_span
 
 _STATEMENT_RESOURCE_PATTERNS = (
     re.compile(r"\\includegraphics(?:\[[^\]]*])?\{([^}]+)\}"),
@@ -63,6 +66,83 @@ _GENERIC_SCRIPT_COMMANDS = {
     "zip",
     "zsh",
 }
+DEFAULT_READINESS_FETCH_WORKERS = 8
+
+
+class _FetchedSection:
+    """并发拉取阶段单个 section 的结果，错误留到分析阶段再抛出。"""
+
+    __slots__ = ("value", "error", "elapsed_ms")
+
+    def __init__(self, value: Any, error: Optional[Exception], elapsed_ms: float):
+        self.value = value
+        self.error = error
+        self.elapsed_ms = elapsed_ms
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _get_fetch_workers() -> int:
+    max_workers = get_env_int("POLYGON_READINESS_FETCH_WORKERS", DEFAULT_READINESS_FETCH_WORKERS)
+    if max_workers <= 0:
+        raise ValueError("POLYGON_READINESS_FETCH_WORKERS 必须大于 0")
+    return max_workers
+
+
+def _run_fetch(name: str, fetch: Callable[[], Any]) -> _FetchedSection:
+    started = time.perf_counter()
+    try:
+        with trace_span("check_problem_readiness.fetch", section=name):
+            value = fetch()
+        error = None
+    except Exception as exc:
+        value = None
+        error = exc
+    return _FetchedSection(value, error, round((time.perf_counter() - started) * 1000, 2))
+
+
+def _fetch_sections(
+    fetchers: dict[str, Callable[[], Any]],
+    max_workers: int,
+) -> dict[str, _FetchedSection]:
+    if not fetchers:
+        return {}
+    with trace_span("check_problem_readiness.fetch_wave", sections=sorted(fetchers)), ThreadPoolExecutor(
+        max_workers=min(max_workers, len(fetchers)),
+        thread_name_prefix="polygon-readiness",
+    ) as executor:
+        run_fetch = propagate_trace_context(_run_fetch)
+        futures = {name: executor.submit(run_fetch, name, fetch) for name, fetch in fetchers.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _needs_follow_up_fetch(fetched: _FetchedSection, predicate: Callable[[Any], bool]) -> bool:
+    return fetched.error is None and predicate(fetched.value)
+
+
+def _build_fetch_timings(
+    fetched: dict[str, _FetchedSection],
+    *,
+    max_workers: int,
+    wave_elapsed_ms: list[float],
+) -> dict[str, Any]:
+    return {
+        "max_workers": max_workers,
+        "wave_count": len(wave_elapsed_ms),
+        "wave_elapsed_ms": wave_elapsed_ms,
+        "total_elapsed_ms": round(sum(wave_elapsed_ms), 2),
+        "sequential_elapsed_ms": round(sum(item.elapsed_ms for item in fetched.values()), 2),
+        "sections": {
+            name: {
+                "status": "error" if item.error is not None else "ok",
+                "elapsed_ms": item.elapsed_ms,
+            }
+            for name, item in fetched.items()
+        },
+    }
 
 
 def _append_check_error(
@@ -312,10 +392,64 @@ def check_problem_readiness(
     """
     检查题目是否具备基本的出题与发布条件。
 
+    各项检查需要的数据先在有界线程池中并发拉取（依赖前一轮结果的脚本、测试组和
+    validator/checker 测试在第二轮拉取），再按原有顺序逐项分析；单项拉取失败只影响对应检查。
+
     Returns:
-        dict: 包含 blocking_issues、warnings 和各项检查明细。
+        dict: 包含 blocking_issues、warnings、各项检查明细和 fetch_timings 拉取耗时。
     """
+    return _check_problem_readiness(problem_id, pin, testset, max_workers=_get_fetch_workers())
+
+
+def _check_problem_readiness(
+    problem_id: int,
+    pin: Optional[str],
+    testset: str,
+    *,
+    max_workers: int,
+) -> dict[str, Any]:
+    """check_problem_readiness 的实现；拉取线程数由调用方决定，便于外层也有线程池时控制总并发。"""
     session = get_problem_session(problem_id, pin)
+    wave_elapsed_ms: list[float] = []
+
+    wave_started = time.perf_counter()
+    fetched = _fetch_sections(
+        {
+            "info": session.get_info,
+            "problem": lambda: session.client.get_problems(problem_id=problem_id),
+            "statements": session.get_statements,
+            "validator": session.get_validator,
+            "checker": session.get_checker,
+            "interactor": session.get_interactor,
+            "extra_validators": session.get_extra_validators,
+            "files": session.get_files,
+            "statement_resources": session.get_statement_resources,
+            "tests": lambda: session.get_tests(testset=testset),
+            "solutions": session.get_solutions,
+            "packages": session.get_packages,
+            "general_tutorial": session.get_general_tutorial,
+        },
+        max_workers,
+    )
+    wave_elapsed_ms.append(round((time.perf_counter() - wave_started) * 1000, 2))
+
+    follow_up_fetchers: dict[str, Callable[[], Any]] = {}
+    if _needs_follow_up_fetch(fetched["tests"], lambda tests: any(not test.manual for test in tests)):
+        follow_up_fetchers["script"] = lambda: session.view_script(testset)
+    if _needs_follow_up_fetch(
+        fetched["tests"],
+        lambda tests: any(_normalize_text(test.group) is not None for test in tests),
+    ):
+        follow_up_fetchers["test_groups"] = lambda: session.view_test_groups(testset=testset)
+    if _needs_follow_up_fetch(fetched["validator"], bool):
+        follow_up_fetchers["validator_tests"] = session.get_validator_tests
+    if _needs_follow_up_fetch(fetched["checker"], bool):
+        follow_up_fetchers["checker_tests"] = session.get_checker_tests
+    if follow_up_fetchers:
+        wave_started = time.perf_counter()
+        fetched.update(_fetch_sections(follow_up_fetchers, max_workers))
+        wave_elapsed_ms.append(round((time.perf_counter() - wave_started) * 1000, 2))
+
     blocking_issues: list[str] = []
     warnings: list[str] = []
     details: dict[str, Any] = {"problem_id": problem_id, "testset": testset}
@@ -332,7 +466,7 @@ def check_problem_readiness(
     info = None
 
     try:
-        info = session.get_info()
+        info = fetched["info"].unwrap()
         details["info"] = {
             "input_file": info.inputFile,
             "output_file": info.outputFile,
@@ -352,7 +486,7 @@ def check_problem_readiness(
         _append_check_error("题目信息", exc, blocking_issues, details)
 
     try:
-        problems = session.client.get_problems(problem_id=problem_id)
+        problems = fetched["problem"].unwrap()
         if not problems:
             raise ValueError(f"无法获取题目 {problem_id} 的元数据")
         details["problem"] = _serialize_problem(problems[0])
@@ -360,7 +494,7 @@ def check_problem_readiness(
         _append_check_error("题目元数据", exc, blocking_issues, details)
 
     try:
-        statements = session.get_statements().as_dict()
+        statements = fetched["statements"].unwrap().as_dict()
         details["statements"] = {
             "languages": sorted(statements.keys()),
             "count": len(statements),
@@ -390,7 +524,7 @@ def check_problem_readiness(
         _append_check_error("题面", exc, blocking_issues, details)
 
     try:
-        validator = session.get_validator()
+        validator = fetched["validator"].unwrap()
         details["validator"] = validator
         if not validator:
             blocking_issues.append("未设置 validator")
@@ -399,7 +533,7 @@ def check_problem_readiness(
         validator = None
 
     try:
-        checker = session.get_checker()
+        checker = fetched["checker"].unwrap()
         details["checker"] = checker
         if not checker:
             warnings.append("未显式设置 checker，将依赖 Polygon 默认比较器")
@@ -407,7 +541,7 @@ def check_problem_readiness(
         _append_check_error("checker", exc, blocking_issues, details)
 
     try:
-        interactor = session.get_interactor()
+        interactor = fetched["interactor"].unwrap()
         details["interactor"] = interactor
         if info is not None and info.interactive and not interactor:
             blocking_issues.append("交互题未设置 interactor")
@@ -434,7 +568,7 @@ def check_problem_readiness(
     }
 
     try:
-        extra_validators = session.get_extra_validators()
+        extra_validators = fetched["extra_validators"].unwrap()
         details["extra_validators"] = {
             "count": len(extra_validators),
             "names": extra_validators,
@@ -443,7 +577,7 @@ def check_problem_readiness(
         _append_check_error("额外 validator", exc, blocking_issues, details)
 
     try:
-        files = session.get_files()
+        files = fetched["files"].unwrap()
         source_file_names = {file.name for file in files.sourceFiles}
         resource_file_names = {file.name for file in files.resourceFiles}
         aux_file_names = {file.name for file in files.auxFiles}
@@ -476,7 +610,7 @@ def check_problem_readiness(
         _append_check_error("题目文件", exc, blocking_issues, details)
 
     try:
-        statement_resources = session.get_statement_resources()
+        statement_resources = fetched["statement_resources"].unwrap()
         statement_resource_names = sorted(file.name for file in statement_resources)
         available_statement_resources = set(statement_resource_names) | resource_file_names
         missing_statement_resources = _find_missing_file_references(
@@ -506,7 +640,7 @@ def check_problem_readiness(
         _append_check_error("题面资源", exc, blocking_issues, details)
 
     try:
-        tests = session.get_tests(testset=testset)
+        tests = fetched["tests"].unwrap()
         statement_samples = [test for test in tests if test.useInStatements]
         generated_tests = [test for test in tests if not test.manual]
         samples_missing_input = [
@@ -566,7 +700,7 @@ def check_problem_readiness(
                     + ", ".join(missing_scoring_languages)
                 )
         if generated_tests:
-            script = session.view_script(testset)
+            script = fetched["script"].unwrap()
             script_text = (
                 script.decode("utf-8", errors="ignore") if isinstance(script, bytes) else str(script)
             )
@@ -621,7 +755,7 @@ def check_problem_readiness(
                 )
         group_names = details["tests"]["group_names"]
         if group_names:
-            test_groups = session.view_test_groups(testset=testset)
+            test_groups = fetched["test_groups"].unwrap()
             defined_group_names: set[str] = set()
             duplicate_group_names: set[str] = set()
             undefined_dependencies: list[str] = []
@@ -683,7 +817,7 @@ def check_problem_readiness(
         _append_check_error("测试", exc, blocking_issues, details)
 
     try:
-        solutions = session.get_solutions()
+        solutions = fetched["solutions"].unwrap()
         accepted_solution_count = sum(
             1 for solution in solutions if solution.tag in (SolutionTag.MA, SolutionTag.OK)
         )
@@ -720,7 +854,7 @@ def check_problem_readiness(
 
     if validator:
         try:
-            validator_tests = session.get_validator_tests()
+            validator_tests = fetched["validator_tests"].unwrap()
             details["validator_tests"] = {"count": len(validator_tests)}
             if not validator_tests:
                 warnings.append("未配置 validator 测试")
@@ -729,7 +863,7 @@ def check_problem_readiness(
 
     if checker:
         try:
-            checker_tests = session.get_checker_tests()
+            checker_tests = fetched["checker_tests"].unwrap()
             details["checker_tests"] = {"count": len(checker_tests)}
             if not checker_tests:
                 warnings.append("未配置 checker 测试")
@@ -737,7 +871,7 @@ def check_problem_readiness(
             _append_check_error("checker 测试", exc, blocking_issues, details)
 
     try:
-        packages = session.get_packages()
+        packages = fetched["packages"].unwrap()
         ready_packages = [package for package in packages if package.state == PackageState.READY]
         details["packages"] = {
             "count": len(packages),
@@ -749,7 +883,7 @@ def check_problem_readiness(
         _append_check_error("题目包", exc, blocking_issues, details)
 
     try:
-        tutorial = session.get_general_tutorial()
+        tutorial = fetched["general_tutorial"].unwrap()
         details["general_tutorial"] = {"present": _has_text(tutorial)}
         if not _has_text(tutorial):
             warnings.append("通用题解为空")
@@ -774,4 +908,9 @@ def check_problem_readiness(
         "warnings": warnings,
         "summary": summary,
         "details": details,
+        "fetch_timings": _build_fetch_timings(
+            fetched,
+            max_workers=max_workers,
+            wave_elapsed_ms=wave_elapsed_ms,
+        ),
     }
@@ -11,6 +11,7 @@ from src.mcp.utils.common import (
 )
 from src.mcp.utils.problem_package_workflow import build_problem_package_and_wait
 from src.mcp.utils.problem_readiness import check_problem_readiness
+from src.polygon.tracing import trace_span
 
 
 def _is_failed_response(result: Any) -> bool:
@@ -163,7 +164,8 @@ def prepare_problem_release(
     }
     try:
         session = get_problem_session(problem_id, pin)
-        update_result = session.update_working_copy()
+        with trace_span("prepare_problem_release.update_working_copy"):
+            update_result = session.update_working_copy()
         if _is_failed_response(update_result):
             return build_operation_result(
                 action="prepare_problem_release",
@@ -184,7 +186,8 @@ def prepare_problem_release(
                 release_options=release_options,
             )
 
-        readiness = check_problem_readiness(problem_id=problem_id, pin=pin, testset=testset)
+        with trace_span("prepare_problem_release.readiness", testset=testset):
+            readiness = check_problem_readiness(problem_id=problem_id, pin=pin, testset=testset)
         if readiness["blocking_issues"] and not force:
             return build_operation_result(
                 action="prepare_problem_release",
@@ -228,14 +231,15 @@ def prepare_problem_release(
                 release_options=release_options,
             )
 
-        build_result = build_problem_package_and_wait(
-            problem_id=problem_id,
-            full=full,
-            verify=verify,
-            pin=pin,
-            timeout_seconds=timeout_seconds,
-            poll_interval_seconds=poll_interval_seconds,
-        )
+        with trace_span("prepare_problem_release.build", full=full, verify=verify):
+            build_result = build_problem_package_and_wait(
+                problem_id=problem_id,
+                full=full,
+                verify=verify,
+                pin=pin,
+                timeout_seconds=timeout_seconds,
+                poll_interval_seconds=poll_interval_seconds,
+            )
         if build_result["status"] != "success":
             return build_operation_result(
                 action="prepare_problem_release",
@@ -263,14 +267,16 @@ def prepare_problem_release(
         release_warnings: list[str] = []
         pre_commit_snapshot = None
         try:
-            pre_commit_snapshot = _get_problem_snapshot(session)
+            with trace_span("prepare_problem_release.pre_commit_snapshot"):
+                pre_commit_snapshot = _get_problem_snapshot(session)
         except Exception as exc:
             release_warnings.append(f"提交前题目快照获取失败: {exc}")
 
-        commit_result = session.commit_changes(
-            minor_changes=minor_changes,
-            message=message,
-        )
+        with trace_span("prepare_problem_release.commit"):
+            commit_result = session.commit_changes(
+                minor_changes=minor_changes,
+                message=message,
+            )
         if _is_failed_response(commit_result):
             return build_operation_result(
                 action="prepare_problem_release",
@@ -300,7 +306,8 @@ def prepare_problem_release(
 
         post_commit_snapshot = None
         try:
-            post_commit_snapshot = _get_problem_snapshot(session)
+            with trace_span("prepare_problem_release.post_commit_snapshot"):
+                post_commit_snapshot = _get_problem_snapshot(session)
         except Exception as exc:
             release_warnings.append(f"提交后题目快照获取失败: {exc}")
 
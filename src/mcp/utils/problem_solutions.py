@@ -1,19 +1,30 @@
-from typing import List, Optional
+from typing import Any, Optional
 
-from src.mcp.utils.common import call_problem_session_method
-from src.polygon.models import Solution
+from src.mcp.utils.common import call_problem_session_method, paginate_items
+from src.polygon.models import Page, Solution
 
 
-def get_problem_solutions(problem_id: int, pin: Optional[str] = None) -> List[Solution]:
+def get_problem_solutions(
+    problem_id: int,
+    pin: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    filters: Optional[dict[str, Any]] = None,
+) -> Page[dict[str, Any]]:
     """
     获取Polygon题目的所有解决方案
     
     Args:
         problem_id: 题目ID
         pin: 题目的PIN码（如果有）
+        cursor: 上一页结果中的 next_cursor
+        limit: 每页条数
+        fields: 只返回这些字段
+        filters: 按字段值过滤，例如 {"tag": ["MA", "OK"]}
         
     Returns:
-        List[Solution]: 解决方案列表，每个Solution包含：
+        Page[dict]: 一页解决方案，每个条目包含：
             - name: 文件名
             - modificationTimeSeconds: 修改时间
             - length: 文件长度
@@ -33,13 +44,16 @@ def get_problem_solutions(problem_id: int, pin: Optional[str] = None) -> List[So
         AccessDeniedException: 当没有足够的访问权限时抛出
         
     Example:
-        >>> solutions = get_problem_solutions(12345)
-        >>> for solution in solutions:
-        >>>     print(f"Solution: {solution.name}")
-        >>>     print(f"Expected verdict: {solution.get_verdict()}")
-        >>>     if solution.is_correct():
-        >>>         print("This is a correct solution")
-        >>>     elif solution.is_uncertain():
-        >>>         print("This solution might be correct or might exceed time limit")
+        >>> page = get_problem_solutions(12345, filters={"tag": "WA"}, fields=["name"])
+        >>> for solution in page.items:
+        >>>     print(f"Solution: {solution['name']}")
     """
-    return call_problem_session_method(problem_id, pin, "get_solutions")
+    return paginate_items(
+        call_problem_session_method(problem_id, pin, "get_solutions"),
+        scope=f"problem.solutions:{problem_id}",
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        model=Solution,
+    )
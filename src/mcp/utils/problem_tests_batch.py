@@ -0,0 +1,139 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.mcp.test_uploads import RateLimitCooldown, load_tests_from_dir, resolve_upload_limits, upload_test
+from src.mcp.utils.common import build_operation_result, get_problem_session
+from src.polygon.tracing import propagate_trace_context
+
+_TEST_SPEC_FIELDS = frozenset(
+    {
+        "test_index",
+        "test_input",
+        "test_group",
+        "test_points",
+        "test_description",
+        "test_use_in_statements",
+        "test_input_for_statements",
+        "test_output_for_statements",
+        "verify_input_output_for_statements",
+    }
+)
+
+
+def _normalize_inline_tests(tests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    specs: list[dict[str, Any]] = []
+    for position, item in enumerate(tests):
+        if not isinstance(item, dict):
+            raise ValueError(f"tests[{position}] 必须是对象")
+        unknown_fields = sorted(set(item) - _TEST_SPEC_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"tests[{position}] 包含未知字段: {', '.join(unknown_fields)}")
+        if "test_index" not in item:
+            raise ValueError(f"tests[{position}] 缺少 test_index")
+        specs.append(dict(item))
+    return specs
+
+
+def _resolve_test_specs(
+    tests: Optional[list[dict[str, Any]]],
+    tests_dir: Optional[str],
+    test_group: Optional[str],
+) -> list[dict[str, Any]]:
+    if (tests is None) == (tests_dir is None):
+        raise ValueError("tests 和 tests_dir 必须且只能提供一个")
+
+    if tests is not None:
+        specs = _normalize_inline_tests(tests)
+        if test_group is not None:
+            for spec in specs:
+                spec.setdefault("test_group", test_group)
+    else:
+        specs = load_tests_from_dir(tests_dir, test_group)
+
+    seen_indices: set[int] = set()
+    for spec in specs:
+        index = spec["test_index"]
+        if not isinstance(index, int) or isinstance(index, bool) or index <= 0:
+            raise ValueError(f"test_index 必须是正整数: {index!r}")
+        if index in seen_indices:
+            raise ValueError(f"test_index 重复: {index}")
+        seen_indices.add(index)
+    return sorted(specs, key=lambda spec: spec["test_index"])
+
+
+def save_problem_tests_batch(
+    problem_id: int,
+    testset: str,
+    pin: Optional[str] = None,
+    tests: Optional[list[dict[str, Any]]] = None,
+    tests_dir: Optional[str] = None,
+    test_group: Optional[str] = None,
+    check_existing: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+    max_retries: Optional[int] = None,
+) -> dict[str, Any]:
+    """批量保存测试，在有界线程池中并发上传并返回逐项结果。"""
+    context: dict[str, Any] = {"problem_id": problem_id, "testset": testset}
+    try:
+        specs = _resolve_test_specs(tests, tests_dir, test_group)
+        resolved_max_workers, resolved_max_retries = resolve_upload_limits(max_workers, max_retries)
+
+        session = get_problem_session(problem_id, pin)
+        session.ensure_write_access()
+    except Exception as exc:
+        return build_operation_result(
+            action="save_problem_tests_batch",
+            success=False,
+            message="批量保存测试失败",
+            error=exc,
+            **context,
+        )
+
+    cooldown = RateLimitCooldown()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=min(resolved_max_workers, len(specs)),
+        thread_name_prefix="polygon-tests-batch",
+    ) as executor:
+        items = list(
+            executor.map(
+                propagate_trace_context(
+                    lambda spec: upload_test(
+                        session,
+                        testset,
+                        spec,
+                        check_existing=check_existing,
+                        max_retries=resolved_max_retries,
+                        cooldown=cooldown,
+                    )
+                ),
+                specs,
+            )
+        )
+
+    succeeded = sum(1 for item in items if item["status"] == "success")
+    failed = len(items) - succeeded
+    summary = {
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": failed,
+        "total_retries": sum(item["retries"] for item in items),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "max_workers": min(resolved_max_workers, len(specs)),
+        "failed_indices": [item["test_index"] for item in items if item["status"] != "success"],
+    }
+    if failed == 0:
+        message = f"已保存 {succeeded} 个测试"
+    elif succeeded == 0:
+        message = f"{failed} 个测试全部保存失败"
+    else:
+        message = f"已保存 {succeeded} 个测试，{failed} 个失败"
+    return build_operation_result(
+        action="save_problem_tests_batch",
+        success=failed == 0,
+        message=message,
+        result={"summary": summary, "items": items},
+        status_override="partial" if 0 < failed < len(items) else None,
+        **context,
+    )
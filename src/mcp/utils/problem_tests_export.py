@@ -0,0 +1,319 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from src.mcp.utils.common import build_operation_result, get_client, get_env_int, get_problem_session
+from src.polygon.rate_limit import PRIORITY_BULK, request_priority
+from src.polygon.streaming import RESOURCE_MARKER_SUFFIX, DownloadDigest, partial_path_for
+from src.polygon.tracing import propagate_trace_context
+
+DEFAULT_TEST_EXPORT_WORKERS = 8
+EXPORT_MANIFEST_FILENAME = ".polygon-tests-export.json"
+EXPORT_MANIFEST_VERSION = 1
+
+
+class _ExportProgress:
+    """一次测试导出的进度计数，供 get_problem_tests_export_progress 在导出进行中查询。"""
+
+    def __init__(self, problem_id: int, testset: str, total_files: int):
+        self.problem_id = problem_id
+        self.testset = testset
+        self.total_files = total_files
+        self.downloaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, status: str, size_bytes: int = 0) -> None:
+        with self._lock:
+            if status == "downloaded":
+                self.downloaded += 1
+                self.bytes_written += size_bytes
+            elif status == "skipped":
+                self.skipped += 1
+            else:
+                self.failed += 1
+
+    def finish(self) -> None:
+        self.finished_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            done = self.downloaded + self.skipped + self.failed
+            return {
+                "problem_id": self.problem_id,
+                "testset": self.testset,
+                "state": "finished" if self.finished_at is not None else "running",
+                "total_files": self.total_files,
+                "completed_files": done,
+                "downloaded": self.downloaded,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "bytes_written": self.bytes_written,
+                "percent": round(done * 100 / self.total_files, 1) if self.total_files else 100.0,
+                "elapsed_seconds": round((self.finished_at or time.time()) - self.started_at, 2),
+            }
+
+
+_export_progress: dict[tuple[int, str], _ExportProgress] = {}
+_export_progress_lock = threading.Lock()
+
+
+def _load_manifest(path: Path, problem_id: int, testset: str) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if (
+        data.get("version") != EXPORT_MANIFEST_VERSION
+        or data.get("problem_id") != problem_id
+        or data.get("testset") != testset
+        or not isinstance(data.get("files"), dict)
+    ):
+        return {}
+    return data
+
+
+def _save_manifest(
+    path: Path,
+    problem_id: int,
+    testset: str,
+    revision: Optional[int],
+    files: dict[str, str],
+    partial_revision: Optional[int],
+) -> None:
+    payload = json.dumps(
+        {
+            "version": EXPORT_MANIFEST_VERSION,
+            "problem_id": problem_id,
+            "testset": testset,
+            "revision": revision,
+            "partial_revision": partial_revision,
+            "files": dict(sorted(files.items())),
+        },
+        indent=2,
+    )
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".polygon-export-", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(payload)
+    os.replace(temp_name, path)
+
+
+def _discard_partials(targets: list[Path]) -> None:
+    """删除上一次导出中断留下的 .part 及其资源标识文件，使下载从头开始。"""
+    for target in targets:
+        partial = partial_path_for(target)
+        partial.unlink(missing_ok=True)
+        partial.with_name(partial.name + RESOURCE_MARKER_SUFFIX).unlink(missing_ok=True)
+
+
+def _current_revision(problem_id: int) -> Optional[int]:
+    """返回可用于判断本地文件是否过期的 revision；工作副本有未提交修改或查询失败时返回 None。"""
+    try:
+        problems = get_client().get_problems(problem_id=problem_id)
+    except Exception:
+        return None
+    if len(problems) != 1 or problems[0].modified:
+        return None
+    return problems[0].revision
+
+
+def _export_file(
+    session: Any,
+    testset: str,
+    test_index: int,
+    kind: str,
+    target: Path,
+    expected_sha256: Optional[str],
+    progress: _ExportProgress,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    item: dict[str, Any] = {"test_index": test_index, "kind": kind, "file": target.name}
+    try:
+        if (
+            expected_sha256 is not None
+            and target.is_file()
+            and DownloadDigest.from_file(target).sha256 == expected_sha256
+        ):
+            item.update({"status": "skipped", "sha256": expected_sha256})
+        else:
+            download = (
+                session.download_test_input_to_file
+                if kind == "input"
+                else session.download_test_answer_to_file
+            )
+            with request_priority(PRIORITY_BULK):
+                downloaded = download(testset, test_index, target)
+            item.update(
+                {"status": "downloaded", "size_bytes": downloaded.size_bytes, "sha256": downloaded.sha256}
+            )
+    except Exception as exc:
+        item.update({"status": "error", "error": str(exc), "error_type": type(exc).__name__})
+    progress.record(item["status"], item.get("size_bytes", 0))
+    item["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return item
+
+
+def export_problem_tests(
+    problem_id: int,
+    testset: str,
+    target_dir: str,
+    pin: Optional[str] = None,
+    include_answers: bool = True,
+    skip_unchanged: bool = True,
+    max_workers: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    把整个测试集的输入和答案并发导出到本地目录，文件按 NN / NN.a 命名。
+
+    先获取一次测试列表，再在有界线程池中并发流式下载每个测试的输入和答案。目录中的清单记录每个文件的
+    sha256 和导出时的题目 revision；skip_unchanged=True 且 revision 未变时，哈希一致的本地文件直接跳过。
+    中断留下的 .part 文件只在 revision 未变时续传，否则丢弃后重新下载。
+    """
+    context: dict[str, Any] = {"problem_id": problem_id, "testset": testset}
+    started = time.perf_counter()
+    try:
+        workers = (
+            get_env_int("POLYGON_TEST_EXPORT_WORKERS", DEFAULT_TEST_EXPORT_WORKERS)
+            if max_workers is None
+            else max_workers
+        )
+        if workers <= 0:
+            raise ValueError("max_workers 必须大于 0")
+        session = get_problem_session(problem_id, pin)
+        indices = sorted(test.index for test in session.get_tests(testset, no_inputs=True))
+    except Exception as exc:
+        return build_operation_result(
+            action="export_problem_tests",
+            success=False,
+            message="导出测试失败",
+            error=exc,
+            **context,
+        )
+    if not indices:
+        return build_operation_result(
+            action="export_problem_tests",
+            success=False,
+            message=f"测试集 {testset} 中没有测试",
+            **context,
+        )
+
+    directory = Path(target_dir).expanduser()
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / EXPORT_MANIFEST_FILENAME
+    manifest = _load_manifest(manifest_path, problem_id, testset)
+    revision = _current_revision(problem_id)
+    trusted_hashes: dict[str, str] = (
+        manifest["files"]
+        if skip_unchanged and revision is not None and manifest.get("revision") == revision
+        else {}
+    )
+
+    width = max(2, len(str(indices[-1])))
+    tasks: list[tuple[int, str, Path]] = []
+    for index in indices:
+        tasks.append((index, "input", directory / f"{index:0{width}d}"))
+        if include_answers:
+            tasks.append((index, "answer", directory / f"{index:0{width}d}.a"))
+
+    # .part 只有在属于同一个 revision 时才能续传；revision 未知或已变化时，测试内容可能不同，丢弃后重下。
+    if revision is None or manifest.get("partial_revision") != revision:
+        _discard_partials([task[2] for task in tasks])
+    try:
+        _save_manifest(
+            manifest_path,
+            problem_id,
+            testset,
+            manifest.get("revision"),
+            manifest.get("files", {}),
+            partial_revision=revision,
+        )
+    except OSError:
+        pass
+
+    progress = _ExportProgress(problem_id, testset, len(tasks))
+    with _export_progress_lock:
+        _export_progress[(problem_id, testset)] = progress
+    try:
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            thread_name_prefix="polygon-tests-export",
+        ) as executor:
+            items = list(
+                executor.map(
+                    propagate_trace_context(
+                        lambda task: _export_file(
+                            session,
+                            testset,
+                            task[0],
+                            task[1],
+                            task[2],
+                            trusted_hashes.get(task[2].name),
+                            progress,
+                        )
+                    ),
+                    tasks,
+                )
+            )
+    finally:
+        progress.finish()
+
+    files = {name: digest for name, digest in manifest.get("files", {}).items() if (directory / name).is_file()}
+    files.update({item["file"]: item["sha256"] for item in items if item["status"] != "error"})
+    for item in items:
+        if item["status"] == "error":
+            files.pop(item["file"], None)
+    failed = [item for item in items if item["status"] == "error"]
+    try:
+        _save_manifest(manifest_path, problem_id, testset, revision, files, partial_revision=revision)
+    except OSError:
+        pass
+
+    exported_names = {task[2].name for task in tasks}
+    summary = progress.snapshot()
+    summary.update(
+        {
+            "tests": len(indices),
+            "failed_files": [item["file"] for item in failed],
+            "stale_files": sorted(name for name in files if name not in exported_names),
+            "revision": revision,
+            "max_workers": min(workers, len(tasks)),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+    )
+    succeeded = len(items) - len(failed)
+    return build_operation_result(
+        action="export_problem_tests",
+        success=not failed,
+        message=(
+            f"已导出 {len(indices)} 个测试：下载 {summary['downloaded']} 个文件，跳过 {summary['skipped']} 个"
+            + (f"，{len(failed)} 个失败" if failed else "")
+        ),
+        result={"target_dir": str(directory), "summary": summary, "items": items},
+        status_override="partial" if failed and succeeded else None,
+        **context,
+    )
+
+
+def get_problem_tests_export_progress(problem_id: Optional[int] = None) -> dict[str, Any]:
+    """查看本进程内正在进行或最近完成的测试导出进度。"""
+    with _export_progress_lock:
+        exports = [
+            progress.snapshot()
+            for (export_problem_id, _), progress in sorted(_export_progress.items())
+            if problem_id is None or export_problem_id == problem_id
+        ]
+    return build_operation_result(
+        action="get_problem_tests_export_progress",
+        success=True,
+        message=f"共有 {len(exports)} 个测试导出记录",
+        result={"exports": exports},
+    )
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import Any, Optional
 
 from src.mcp.utils.common import (
+    call_problem_session,
     call_problem_session_method,
     get_problem_session,
+    paginate_items,
     parse_enum,
     run_write_operation,
 )
@@ -10,8 +12,9 @@ from src.polygon.models import (
     CheckerTest,
     CheckerTestVerdict,
     FeedbackPolicy,
+    LazyTest,
+    Page,
     PointsPolicy,
-    Test,
     TestGroup,
     ValidatorTest,
     ValidatorTestVerdict,
@@ -23,15 +26,42 @@ def get_problem_tests(
     testset: str,
     pin: Optional[str] = None,
     no_inputs: Optional[bool] = None,
-) -> list[Test]:
-    """获取题目测试列表。"""
-    return call_problem_session_method(
-        problem_id,
-        pin,
-        "get_tests",
-        testset=testset,
-        no_inputs=no_inputs,
-    )
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    filters: Optional[dict[str, Any]] = None,
+    input_indices: Optional[list[int]] = None,
+) -> Page[dict[str, Any]]:
+    """
+    分页获取题目测试列表。
+
+    默认只返回元数据，input_indices 中列出的测试才会单独下载输入；no_inputs=False 时一次性获取全部输入。
+    """
+
+    def fetch(session) -> Page[dict[str, Any]]:
+        tests = session.get_tests_lazy(testset, prefetch_inputs=no_inputs is False)
+        requested = set(input_indices or ())
+        missing = sorted(requested - {test.index for test in tests})
+        if missing:
+            raise ValueError(f"测试集 {testset} 中不存在这些测试: {', '.join(map(str, missing))}")
+
+        def load_requested_inputs(page_tests: list[LazyTest]) -> None:
+            for test in page_tests:
+                if test.index in requested and test.input is None:
+                    test.load_input()
+
+        return paginate_items(
+            tests,
+            scope=f"problem.tests:{problem_id}:{testset}",
+            cursor=cursor,
+            limit=limit,
+            fields=fields,
+            filters=filters,
+            prepare=load_requested_inputs,
+            model=LazyTest,
+        )
+
+    return call_problem_session(problem_id, pin, fetch)
 
 
 def view_problem_test_input(
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from src.mcp.test_uploads import RateLimitCooldown, load_tests_from_dir, resolve_upload_limits, upload_test
+from src.mcp.utils.common import build_operation_result, get_problem_session
+from src.polygon.rate_limit import PRIORITY_BULK, request_priority
+from src.polygon.tracing import propagate_trace_context
+
+SYNC_STATE_DIR_ENV = "POLYGON_TESTS_SYNC_STATE_DIR"
+SYNC_STATE_VERSION = 2
+
+
+def _content_hash(content: bytes) -> str:
+    """测试输入的内容哈希；统一换行符后计算，避免 CRLF/LF 差异被当成修改。"""
+    return hashlib.sha256(content.replace(b"\r\n", b"\n")).hexdigest()
+
+
+def _metadata_hash(test: Any) -> str:
+    """远端测试除输入以外的元数据（组、分值、描述等）的哈希，用于发现网页端对测试的修改。"""
+    metadata = test.model_dump(exclude={"index", "input"})
+    return hashlib.sha256(json.dumps(metadata, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _sync_state_root() -> Path:
+    configured = (os.getenv(SYNC_STATE_DIR_ENV) or "").strip()
+    if configured:
+        return Path(configured).expanduser()
+    cache_home = (os.getenv("XDG_CACHE_HOME") or "").strip()
+    base = Path(cache_home).expanduser() if cache_home else Path.home() / ".cache"
+    return base / "cf-polygon-mcp" / "tests-sync"
+
+
+def _sync_state_path(problem_id: int, testset: str) -> Path:
+    safe_testset = re.sub(r"[^A-Za-z0-9_.-]", "_", testset)
+    return _sync_state_root() / str(problem_id) / f"{safe_testset}.json"
+
+
+class _SyncState:
+    """
+    记录上次同步结果的状态文件，保存在缓存目录下按 problem_id/testset 区分，不写入用户的测试目录。
+
+    每个测试编号对应远端已确认的输入哈希和当时的远端元数据哈希，另记录同步后远端的测试编号集合。
+    Polygon 不提供测试哈希，只有同步过、且远端编号集合和该测试元数据都未变化的测试才能跳过下载远端输入；
+    远端测试在网页端被增删时整份状态作废。只改输入、不改元数据的网页端修改仍需 full_compare 才能发现。
+    """
+
+    def __init__(self, path: Path, problem_id: int, testset: str):
+        self.path = path
+        self.problem_id = problem_id
+        self.testset = testset
+        self.tests: dict[int, dict[str, str]] = {}
+        self.remote_indices: Optional[list[int]] = None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            data.get("version") == SYNC_STATE_VERSION
+            and data.get("problem_id") == problem_id
+            and data.get("testset") == testset
+            and isinstance(data.get("tests"), dict)
+            and isinstance(data.get("remote_indices"), list)
+        ):
+            self.tests = {int(index): entry for index, entry in data["tests"].items()}
+            self.remote_indices = [int(index) for index in data["remote_indices"]]
+
+    def trusted_hashes(self, remote_tests: dict[int, Any]) -> dict[int, str]:
+        """返回可以直接信任的远端输入哈希；远端编号集合变化时一个都不信任。"""
+        if self.remote_indices is None or sorted(remote_tests) != self.remote_indices:
+            return {}
+        return {
+            index: entry["input_sha256"]
+            for index, entry in self.tests.items()
+            if index in remote_tests and entry.get("metadata_sha256") == _metadata_hash(remote_tests[index])
+        }
+
+    def record(self, remote_tests: dict[int, Any], input_hashes: dict[int, str]) -> None:
+        """按同步后的远端测试元数据重建状态，只保留输入哈希已确认的测试。"""
+        self.remote_indices = sorted(remote_tests)
+        self.tests = {
+            index: {"input_sha256": digest, "metadata_sha256": _metadata_hash(remote_tests[index])}
+            for index, digest in sorted(input_hashes.items())
+            if index in remote_tests
+        }
+
+    def save(self) -> None:
+        payload = json.dumps(
+            {
+                "version": SYNC_STATE_VERSION,
+                "problem_id": self.problem_id,
+                "testset": self.testset,
+                "remote_indices": self.remote_indices or [],
+                "tests": {str(index): entry for index, entry in sorted(self.tests.items())},
+            },
+            indent=2,
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".polygon-sync-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(temp_name, self.path)
+
+
+def _fetch_remote_hash(
+    session: Any,
+    testset: str,
+    test_index: int,
+) -> tuple[int, Optional[str], Optional[Exception]]:
+    try:
+        with request_priority(PRIORITY_BULK):
+            content = session.view_test_input(testset, test_index)
+    except Exception as exc:
+        return test_index, None, exc
+    return test_index, _content_hash(content), None
+
+
+def _build_sync_plan(
+    session: Any,
+    testset: str,
+    specs: list[dict[str, Any]],
+    state: _SyncState,
+    *,
+    test_group: Optional[str],
+    full_compare: bool,
+    max_workers: int,
+) -> dict[str, Any]:
+    remote_tests = {test.index: test for test in session.get_tests(testset, no_inputs=True)}
+    local_hashes = {spec["test_index"]: _content_hash(spec["test_input"].encode("utf-8")) for spec in specs}
+    trusted_hashes = {} if full_compare else state.trusted_hashes(remote_tests)
+    confirmed_hashes = dict(trusted_hashes)
+
+    plan: dict[str, list[int]] = {
+        "add": [],
+        "update": [],
+        "unchanged": [],
+        "generated": [],
+        "remote_only": sorted(set(remote_tests) - set(local_hashes)),
+    }
+    reasons: dict[int, str] = {}
+    to_fetch: list[int] = []
+    for index, local_hash in local_hashes.items():
+        remote = remote_tests.get(index)
+        if remote is None:
+            plan["add"].append(index)
+        elif not remote.manual:
+            plan["generated"].append(index)
+        elif test_group is not None and remote.group != test_group:
+            plan["update"].append(index)
+            reasons[index] = "group"
+        elif trusted_hashes.get(index) == local_hash:
+            plan["unchanged"].append(index)
+        elif index in trusted_hashes:
+            plan["update"].append(index)
+            reasons[index] = "input"
+        else:
+            to_fetch.append(index)
+
+    fetch_errors: dict[int, str] = {}
+    if to_fetch:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(to_fetch)),
+            thread_name_prefix="polygon-tests-sync",
+        ) as executor:
+            fetch_remote_hash = propagate_trace_context(lambda index: _fetch_remote_hash(session, testset, index))
+            fetched = list(executor.map(fetch_remote_hash, to_fetch))
+        for index, remote_hash, error in fetched:
+            if error is not None:
+                fetch_errors[index] = str(error)
+                plan["update"].append(index)
+                reasons[index] = "remote_unreadable"
+            elif remote_hash == local_hashes[index]:
+                plan["unchanged"].append(index)
+                confirmed_hashes[index] = remote_hash
+            else:
+                plan["update"].append(index)
+                reasons[index] = "input"
+
+    for indices in plan.values():
+        indices.sort()
+    return {
+        "plan": plan,
+        "update_reasons": {str(index): reason for index, reason in sorted(reasons.items())},
+        "fetched_inputs": len(to_fetch),
+        "fetch_errors": {str(index): error for index, error in sorted(fetch_errors.items())},
+        "local_hashes": local_hashes,
+        "confirmed_hashes": confirmed_hashes,
+        "remote_tests": remote_tests,
+    }
+
+
+def sync_problem_tests(
+    problem_id: int,
+    testset: str,
+    tests_dir: str,
+    pin: Optional[str] = None,
+    test_group: Optional[str] = None,
+    dry_run: bool = False,
+    full_compare: bool = False,
+    max_workers: Optional[int] = None,
+    max_retries: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    按内容哈希把本地测试目录增量同步到 Polygon，只上传新增或变化的测试。
+
+    先用 noInputs=true 获取远端测试元数据；缓存目录中按 problem_id/testset 保存的状态文件记录上次同步时
+    远端已确认的输入哈希，远端测试编号和元数据未变化时据此跳过下载，其余测试并发下载远端输入比较。
+    dry_run=True 时只返回同步计划，不上传。
+    """
+    context: dict[str, Any] = {"problem_id": problem_id, "testset": testset, "dry_run": dry_run}
+    started = time.perf_counter()
+    try:
+        specs = load_tests_from_dir(tests_dir, test_group)
+        resolved_max_workers, resolved_max_retries = resolve_upload_limits(max_workers, max_retries)
+
+        session = get_problem_session(problem_id, pin)
+        state = _SyncState(_sync_state_path(problem_id, testset), problem_id, testset)
+        diff = _build_sync_plan(
+            session,
+            testset,
+            specs,
+            state,
+            test_group=test_group,
+            full_compare=full_compare,
+            max_workers=resolved_max_workers,
+        )
+        if not dry_run and (diff["plan"]["add"] or diff["plan"]["update"]):
+            session.ensure_write_access()
+    except Exception as exc:
+        return build_operation_result(
+            action="sync_problem_tests",
+            success=False,
+            message="同步测试失败",
+            error=exc,
+            **context,
+        )
+
+    plan = diff["plan"]
+    pending = set(plan["add"]) | set(plan["update"])
+    result: dict[str, Any] = {
+        "plan": plan,
+        "update_reasons": diff["update_reasons"],
+        "fetched_inputs": diff["fetched_inputs"],
+        "fetch_errors": diff["fetch_errors"],
+    }
+    if dry_run:
+        result["summary"] = {
+            "local": len(specs),
+            "to_upload": len(pending),
+            "unchanged": len(plan["unchanged"]),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        return build_operation_result(
+            action="sync_problem_tests",
+            success=True,
+            message=(
+                f"同步计划：新增 {len(plan['add'])} 个，更新 {len(plan['update'])} 个，"
+                f"未变化 {len(plan['unchanged'])} 个"
+            ),
+            result=result,
+            **context,
+        )
+
+    items: list[dict[str, Any]] = []
+    if pending:
+        cooldown = RateLimitCooldown()
+        with ThreadPoolExecutor(
+            max_workers=min(resolved_max_workers, len(pending)),
+            thread_name_prefix="polygon-tests-sync",
+        ) as executor:
+            items = list(
+                executor.map(
+                    propagate_trace_context(
+                        lambda spec: upload_test(
+                            session,
+                            testset,
+                            spec,
+                            check_existing=None,
+                            max_retries=resolved_max_retries,
+                            cooldown=cooldown,
+                        )
+                    ),
+                    [spec for spec in specs if spec["test_index"] in pending],
+                )
+            )
+    confirmed_hashes = diff["confirmed_hashes"]
+    for item in items:
+        if item["status"] == "success":
+            confirmed_hashes[item["test_index"]] = diff["local_hashes"][item["test_index"]]
+        else:
+            confirmed_hashes.pop(item["test_index"], None)
+    warnings: list[str] = []
+    try:
+        # 上传会改变远端元数据，状态按上传后的测试列表记录，下次同步才能与远端对得上。
+        remote_tests = (
+            {test.index: test for test in session.get_tests(testset, no_inputs=True)}
+            if items
+            else diff["remote_tests"]
+        )
+        state.record(remote_tests, confirmed_hashes)
+        state.save()
+    except Exception as exc:
+        warnings.append(f"同步状态未保存，下次同步会重新下载远端输入比较: {exc}")
+
+    failed = [item["test_index"] for item in items if item["status"] != "success"]
+    succeeded = len(items) - len(failed)
+    result["items"] = items
+    if warnings:
+        result["warnings"] = warnings
+    result["summary"] = {
+        "local": len(specs),
+        "uploaded": succeeded,
+        "failed": len(failed),
+        "unchanged": len(plan["unchanged"]),
+        "failed_indices": failed,
+        "total_retries": sum(item["retries"] for item in items),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    if not items:
+        message = f"{len(plan['unchanged'])} 个测试均未变化，无需上传"
+    elif not failed:
+        message = f"已上传 {succeeded} 个新增或变化的测试，{len(plan['unchanged'])} 个未变化"
+    else:
+        message = f"已上传 {succeeded} 个测试，{len(failed)} 个失败"
+    return build_operation_result(
+        action="sync_problem_tests",
+        success=not failed,
+        message=message,
+        result=result,
+        status_override="partial" if failed and succeeded else None,
+        **context,
+    )
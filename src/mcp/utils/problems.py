@@ -1,15 +1,19 @@
-from typing import List, Optional
+from typing import Any, Optional
 
-from src.mcp.utils.common import call_client_method
-from src.polygon.models import Problem
+from src.mcp.utils.common import call_client_method, paginate_items
+from src.polygon.models import Page, Problem
 
 
 def get_problems(
     show_deleted: Optional[bool] = None,
     problem_id: Optional[int] = None,
     name: Optional[str] = None,
-    owner: Optional[str] = None
-) -> List[Problem]:
+    owner: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    filters: Optional[dict[str, Any]] = None,
+) -> Page[dict[str, Any]]:
     """
     获取Polygon中用户的题目列表
     
@@ -18,17 +22,30 @@ def get_problems(
         problem_id: 按题目ID筛选
         name: 按题目名称筛选
         owner: 按题目所有者筛选
+        cursor: 上一页结果中的 next_cursor
+        limit: 每页条数
+        fields: 只返回这些字段
+        filters: 按字段值过滤，例如 {"accessType": ["WRITE", "OWNER"]}
         
     Returns:
-        List[Problem]: 题目列表
+        Page[dict]: 一页题目
         
     Raises:
         ValueError: 当环境变量未设置时抛出
     """
-    return call_client_method(
+    problems = call_client_method(
         "get_problems",
         show_deleted=show_deleted,
         problem_id=problem_id,
         name=name,
         owner=owner,
     )
+    return paginate_items(
+        problems,
+        scope=f"problems:{show_deleted}:{problem_id}:{name}:{owner}",
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        model=Problem,
+    )
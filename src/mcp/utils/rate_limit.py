@@ -0,0 +1,25 @@
+from typing import Any
+
+from src.mcp.utils.common import build_operation_result, get_client
+
+
+def get_rate_limit_stats() -> dict[str, Any]:
+    """查看当前凭证对应客户端的请求限速统计。"""
+    rate_limiter = get_client().rate_limiter
+    if rate_limiter is None:
+        return build_operation_result(
+            action="get_rate_limit_stats",
+            success=True,
+            message="当前客户端未配置限速器",
+            result={"enabled": False},
+            enabled=False,
+        )
+
+    stats = rate_limiter.stats()
+    return build_operation_result(
+        action="get_rate_limit_stats",
+        success=True,
+        message="已获取请求限速统计",
+        result={"enabled": True, **stats},
+        enabled=True,
+    )
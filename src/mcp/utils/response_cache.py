@@ -0,0 +1,25 @@
+from typing import Any
+
+from src.mcp.utils.common import build_operation_result, get_client
+
+
+def get_response_cache_stats() -> dict[str, Any]:
+    """查看当前凭证对应客户端的读接口响应缓存统计。"""
+    response_cache = get_client().response_cache
+    if response_cache is None:
+        return build_operation_result(
+            action="get_response_cache_stats",
+            success=True,
+            message="响应缓存未启用，设置 POLYGON_RESPONSE_CACHE=memory 或 disk 后生效",
+            result={"enabled": False},
+            enabled=False,
+        )
+
+    stats = response_cache.stats()
+    return build_operation_result(
+        action="get_response_cache_stats",
+        success=True,
+        message=f"响应缓存共 {stats['entries']} 个条目，命中 {stats['hits']} 次",
+        result={"enabled": True, **stats},
+        enabled=True,
+    )
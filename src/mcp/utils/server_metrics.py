@@ -0,0 +1,55 @@
+import time
+from typing import Any, Optional
+
+from src.mcp.utils.common import build_operation_result
+from src.polygon.metrics import POLYGON_METHOD_METRICS, TOOL_METRICS, get_metrics_registry
+
+METRIC_KINDS = (POLYGON_METHOD_METRICS, TOOL_METRICS)
+
+
+def get_server_metrics(
+    kind: Optional[str] = None,
+    top: Optional[int] = None,
+    reset: bool = False,
+    prometheus_path: Optional[str] = None,
+) -> dict[str, Any]:
+    """查看本进程内每个 Polygon 方法和每个 MCP 工具的调用次数、错误、重试、收发字节数和延迟分位数。"""
+    context: dict[str, Any] = {"kind": kind}
+    try:
+        if kind is not None and kind not in METRIC_KINDS:
+            raise ValueError(f"无效的 kind: {kind}，可选值: {', '.join(METRIC_KINDS)}")
+        if top is not None and top <= 0:
+            raise ValueError("top 必须大于 0")
+        registry = get_metrics_registry()
+        written = str(registry.write_prometheus(prometheus_path)) if prometheus_path else None
+    except Exception as exc:
+        return build_operation_result(
+            action="get_server_metrics",
+            success=False,
+            message="获取调用指标失败",
+            error=exc,
+            **context,
+        )
+
+    snapshot = registry.snapshot(kind)
+    result: dict[str, Any] = {"uptime_seconds": round(time.time() - registry.started_at, 3)}
+    for metric_kind in METRIC_KINDS if kind is None else (kind,):
+        entries = snapshot.get(metric_kind, {})
+        # 按累计耗时从高到低排列，最值得优化的方法排在最前面
+        ranked = sorted(entries.items(), key=lambda item: item[1]["latency_ms"]["total"], reverse=True)
+        result[metric_kind] = dict(ranked if top is None else ranked[:top])
+    if written is not None:
+        result["prometheus_path"] = written
+    if reset:
+        registry.reset()
+
+    return build_operation_result(
+        action="get_server_metrics",
+        success=True,
+        message=(
+            f"已统计 {len(snapshot.get(POLYGON_METHOD_METRICS, {}))} 个 Polygon 方法、"
+            f"{len(snapshot.get(TOOL_METRICS, {}))} 个工具"
+        ),
+        result=result,
+        **context,
+    )
@@ -0,0 +1,49 @@
+from typing import Any, Optional
+
+from src.mcp.profiling import DEFAULT_PROFILE_TOP, get_tool_profiler
+from src.mcp.utils.common import build_operation_result
+
+
+def get_profile_hotspots(
+    tool: Optional[str] = None,
+    top: int = DEFAULT_PROFILE_TOP,
+    sort: str = "tottime",
+    reset: bool = False,
+) -> dict[str, Any]:
+    """汇总最近被剖析的工具调用中最耗时的函数和新增内存分配最多的代码行。"""
+    context: dict[str, Any] = {"tool": tool, "sort": sort}
+    profiler = get_tool_profiler()
+    if profiler is None:
+        return build_operation_result(
+            action="get_profile_hotspots",
+            success=True,
+            message="未启用工具剖析；设置 POLYGON_PROFILE 或 POLYGON_PROFILE_TOOLS 后重启服务",
+            result={"enabled": False},
+            **context,
+        )
+
+    try:
+        hotspots = profiler.hotspots(tool=tool, top=top, sort=sort)
+    except Exception as exc:
+        return build_operation_result(
+            action="get_profile_hotspots",
+            success=False,
+            message="汇总剖析结果失败",
+            error=exc,
+            **context,
+        )
+    if reset:
+        profiler.clear()
+
+    return build_operation_result(
+        action="get_profile_hotspots",
+        success=True,
+        message=f"已汇总 {hotspots['calls_profiled']} 次被剖析的调用",
+        result={
+            "enabled": True,
+            "profiled_tools": sorted(profiler.tools) if profiler.tools is not None else None,
+            "profile_dir": str(profiler.profile_dir) if profiler.profile_dir is not None else None,
+            **hotspots,
+        },
+        **context,
+    )
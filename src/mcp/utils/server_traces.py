@@ -0,0 +1,67 @@
+from typing import Any, Optional
+
+from src.mcp.utils.common import build_operation_result
+from src.polygon.tracing import build_span_tree, build_trace_summaries, get_tracer
+
+DEFAULT_TRACE_LIMIT = 20
+
+
+def get_traces(
+    trace_id: Optional[str] = None,
+    name: Optional[str] = None,
+    min_duration_ms: Optional[float] = None,
+    errors_only: bool = False,
+    limit: Optional[int] = None,
+    clear: bool = False,
+) -> dict[str, Any]:
+    """查看本进程最近的调用追踪：工具 → 工作流阶段 → 会话方法 → HTTP 尝试，可展开单条 trace 的 span 树。"""
+    context: dict[str, Any] = {"trace_id": trace_id, "name": name}
+    try:
+        if limit is not None and limit <= 0:
+            raise ValueError("limit 必须大于 0")
+        if min_duration_ms is not None and min_duration_ms < 0:
+            raise ValueError("min_duration_ms 不能小于 0")
+        tracer = get_tracer()
+        spans = tracer.finished_spans()
+        if trace_id is not None:
+            spans = [span for span in spans if span.trace_id == trace_id]
+            if not spans:
+                raise ValueError(f"追踪缓冲区中没有 trace_id={trace_id} 的记录")
+    except Exception as exc:
+        return build_operation_result(
+            action="get_traces",
+            success=False,
+            message="获取调用追踪失败",
+            error=exc,
+            **context,
+        )
+
+    summaries = build_trace_summaries(spans)
+    if trace_id is not None:
+        result: dict[str, Any] = {"trace": summaries[0], "spans": build_span_tree(spans)}
+        message = f"trace 共 {len(spans)} 个 span"
+    else:
+        if name is not None:
+            summaries = [summary for summary in summaries if summary["name"] == name]
+        if min_duration_ms is not None:
+            summaries = [summary for summary in summaries if summary["duration_ms"] >= min_duration_ms]
+        if errors_only:
+            summaries = [summary for summary in summaries if summary["error_count"]]
+        total = len(summaries)
+        result = {
+            "total": total,
+            "traces": summaries[: limit or DEFAULT_TRACE_LIMIT],
+            "buffer_size": tracer.buffer_size,
+            "export_path": str(tracer.export_path) if tracer.export_path is not None else None,
+        }
+        message = f"共 {total} 条 trace"
+    if clear:
+        tracer.clear()
+
+    return build_operation_result(
+        action="get_traces",
+        success=True,
+        message=message,
+        result=result,
+        **context,
+    )
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .models import AccessType
+
+DEFAULT_ACCESS_TYPE_TTL_SECONDS = 300.0
+
+
+class AccessTypeCache:
+    """
+    按 problem_id 缓存访问权限的共享缓存。
+
+    同一个客户端创建的所有题目会话共用一份缓存，写操作前的权限检查只在首次或过期后
+    才调用 problems.list；写操作被 Polygon 拒绝时由会话主动失效对应条目。
+    ttl_seconds 为 0 时不缓存。
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_ACCESS_TYPE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds 不能小于 0")
+
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[int, tuple[AccessType, float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, problem_id: int) -> Optional[AccessType]:
+        """返回未过期的访问权限，未命中时返回 None。"""
+        with self._lock:
+            entry = self._entries.get(problem_id)
+            if entry is not None:
+                access_type, stored_at = entry
+                if self._clock() - stored_at <= self.ttl_seconds:
+                    self._hits += 1
+                    return access_type
+                del self._entries[problem_id]
+            self._misses += 1
+            return None
+
+    def set(self, problem_id: int, access_type: AccessType) -> None:
+        """记录题目的访问权限。"""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[problem_id] = (access_type, self._clock())
+
+    def invalidate(self, problem_id: Optional[int] = None) -> None:
+        """失效指定题目（不传时失效全部）的访问权限。"""
+        with self._lock:
+            if problem_id is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(problem_id, None) is not None:
+                self._invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """返回命中、未命中和失效计数。"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from src.polygon.models import PolygonException, Problem
 from src.polygon.utils.contest_utils import make_contest_request
+from src.polygon.transport import PolygonTransport
 
 
 def _is_letter_mapping(data: dict) -> bool:
@@ -40,12 +41,37 @@ def _extract_problem_records(payload) -> list[tuple[Optional[str], dict]]:
     raise PolygonException("Invalid problems data format: unable to extract problem records")
 
 
+def _parse_contest_problems(response) -> List[Problem]:
+    """把 contest.problems 的响应解析为按题号排序的题目列表，同步和异步客户端共用。"""
+    if not isinstance(response, dict):
+        raise PolygonException(
+            f"Invalid response format: expected dict, got {type(response)}"
+        )
+
+    payload = response.get("result", response)
+    records = _extract_problem_records(payload)
+
+    problems: list[Problem] = []
+    for contest_letter, problem_data in records:
+        try:
+            parsed = dict(problem_data)
+            if contest_letter is not None:
+                parsed["contestLetter"] = contest_letter
+            problems.append(Problem.from_dict(parsed))
+        except Exception:
+            continue
+
+    problems.sort(key=lambda problem: getattr(problem, "contestLetter", "Z"))
+    return problems
+
+
 def get_contest_problems(
     api_key: str,
     api_secret: str,
     base_url: str,
     contest_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> List[Problem]:
     """
     获取比赛中的所有题目。
@@ -61,28 +87,10 @@ def get_contest_problems(
             "contest.problems",
             contest_id,
             pin,
+            transport=transport,
         )
 
-        if not isinstance(response, dict):
-            raise PolygonException(
-                f"Invalid response format: expected dict, got {type(response)}"
-            )
-
-        payload = response.get("result", response)
-        records = _extract_problem_records(payload)
-
-        problems: list[Problem] = []
-        for contest_letter, problem_data in records:
-            try:
-                parsed = dict(problem_data)
-                if contest_letter is not None:
-                    parsed["contestLetter"] = contest_letter
-                problems.append(Problem.from_dict(parsed))
-            except Exception:
-                continue
-
-        problems.sort(key=lambda problem: getattr(problem, "contestLetter", "Z"))
-        return problems
+        return _parse_contest_problems(response)
     except PolygonException:
         raise
     except Exception as exc:
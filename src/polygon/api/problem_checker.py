@@ -1,12 +1,14 @@
 from typing import Optional
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 def get_problem_checker(
     api_key: str,
     api_secret: str,
     base_url: str,
     problem_id: int,
-    pin: Optional[str] = None
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> str:
     """
     获取当前设置的checker文件名
@@ -17,6 +19,7 @@ def get_problem_checker(
         base_url: API基础URL
         problem_id: 题目ID
         pin: 题目的PIN码（如果有）
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         str: checker文件名
@@ -27,6 +30,7 @@ def get_problem_checker(
     """
     response = make_problem_request(
         api_key, api_secret, base_url,
-        "problem.checker", problem_id, pin
+        "problem.checker", problem_id, pin,
+        transport=transport,
     )
     return response["result"] 
\ No newline at end of file
@@ -2,6 +2,7 @@ from typing import Optional
 
 from src.polygon.models import AccessType, File, FileType, ProblemFiles, SourceType
 from src.polygon.utils.problem_utils import check_write_access, make_problem_request
+from src.polygon.transport import PolygonTransport
 
 
 def _bool_to_api(value: bool) -> str:
@@ -20,6 +21,7 @@ def get_problem_statement_resources(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[File]:
     response = make_problem_request(
         api_key,
@@ -28,6 +30,7 @@ def get_problem_statement_resources(
         "problem.statementResources",
         problem_id,
         pin,
+        transport=transport,
     )
     return [File.from_dict(item) for item in response["result"]]
 
@@ -42,6 +45,7 @@ def save_problem_statement_resource(
     file_content: str,
     pin: Optional[str] = None,
     check_existing: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -61,6 +65,7 @@ def save_problem_statement_resource(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -71,6 +76,7 @@ def get_problem_files(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> ProblemFiles:
     response = make_problem_request(
         api_key,
@@ -79,6 +85,7 @@ def get_problem_files(
         "problem.files",
         problem_id,
         pin,
+        transport=transport,
     )
     return ProblemFiles.from_dict(response["result"])
 
@@ -98,6 +105,7 @@ def save_problem_file(
     stages: Optional[list[str]] = None,
     assets: Optional[list[str]] = None,
     check_existing: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -136,6 +144,7 @@ def save_problem_file(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -147,6 +156,7 @@ def view_problem_script(
     problem_id: int,
     testset: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> bytes:
     return make_problem_request(
         api_key,
@@ -157,6 +167,7 @@ def view_problem_script(
         pin,
         {"testset": testset},
         raw_response=True,
+        transport=transport,
     )
 
 
@@ -169,6 +180,7 @@ def save_problem_script(
     testset: str,
     source: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -184,6 +196,7 @@ def save_problem_script(
             "source": source,
         },
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -194,6 +207,7 @@ def get_problem_tags(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[str]:
     response = make_problem_request(
         api_key,
@@ -202,6 +216,7 @@ def get_problem_tags(
         "problem.viewTags",
         problem_id,
         pin,
+        transport=transport,
     )
     return list(response["result"])
 
@@ -214,6 +229,7 @@ def save_problem_tags(
     access_type: AccessType,
     tags: list[str],
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -234,6 +250,7 @@ def save_problem_tags(
         pin,
         {"tags": ",".join(deduped_tags)},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -244,6 +261,7 @@ def get_problem_general_description(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> str:
     response = make_problem_request(
         api_key,
@@ -252,6 +270,7 @@ def get_problem_general_description(
         "problem.viewGeneralDescription",
         problem_id,
         pin,
+        transport=transport,
     )
     return response["result"]
 
@@ -264,6 +283,7 @@ def save_problem_general_description(
     access_type: AccessType,
     description: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -276,6 +296,7 @@ def save_problem_general_description(
         pin,
         {"description": description},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -286,6 +307,7 @@ def get_problem_general_tutorial(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> str:
     response = make_problem_request(
         api_key,
@@ -294,6 +316,7 @@ def get_problem_general_tutorial(
         "problem.viewGeneralTutorial",
         problem_id,
         pin,
+        transport=transport,
     )
     return response["result"]
 
@@ -306,6 +329,7 @@ def save_problem_general_tutorial(
     access_type: AccessType,
     tutorial: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -318,5 +342,6 @@ def save_problem_general_tutorial(
         pin,
         {"tutorial": tutorial},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from src.polygon.models import Problem
 from src.polygon.utils.client_utils import make_api_request
+from src.polygon.transport import PolygonTransport
 
 
 def create_problem(
@@ -7,6 +10,7 @@ def create_problem(
     api_secret: str,
     base_url: str,
     name: str,
+    transport: Optional[PolygonTransport] = None,
 ) -> Problem:
     """
     创建一个新的空题目。
@@ -16,6 +20,7 @@ def create_problem(
         api_secret: API密钥对应的秘钥
         base_url: API基础URL
         name: 题目名称
+        transport: 复用连接的请求通道（可选）
 
     Returns:
         Problem: 新创建的题目对象
@@ -27,5 +32,6 @@ def create_problem(
         "problem.create",
         {"name": name},
         http_method="POST",
+        transport=transport,
     )
     return Problem.from_dict(response["result"])
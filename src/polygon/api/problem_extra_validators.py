@@ -1,6 +1,7 @@
 from typing import Optional
 
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 
 def get_problem_extra_validators(
@@ -9,6 +10,7 @@ def get_problem_extra_validators(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[str]:
     """
     获取当前设置的额外 validator 文件名列表。
@@ -19,6 +21,7 @@ def get_problem_extra_validators(
         base_url: API基础URL
         problem_id: 题目ID
         pin: 题目的PIN码（如果有）
+        transport: 复用连接的请求通道（可选）
 
     Returns:
         list[str]: 额外 validator 文件名列表
@@ -30,5 +33,6 @@ def get_problem_extra_validators(
         "problem.extraValidators",
         problem_id,
         pin,
+        transport=transport,
     )
     return list(response["result"])
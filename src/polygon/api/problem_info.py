@@ -1,5 +1,6 @@
 from src.polygon.models import ProblemInfo
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 def get_problem_info(
     api_key: str,
@@ -7,6 +8,7 @@ def get_problem_info(
     base_url: str,
     problem_id: int,
     pin: str | None = None,
+    transport: PolygonTransport | None = None,
 ) -> ProblemInfo:
     """
     获取题目的基本信息
@@ -16,6 +18,7 @@ def get_problem_info(
         api_secret: API密钥对应的秘钥
         base_url: API基础URL
         problem_id: 题目ID
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         ProblemInfo: 题目的基本信息
@@ -27,5 +30,6 @@ def get_problem_info(
         "problem.info",
         problem_id,
         pin,
+        transport=transport,
     )
     return ProblemInfo.from_dict(response["result"])
@@ -1,7 +1,14 @@
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Union
 
-from src.polygon.models import AccessType, Package, PackageType
-from src.polygon.utils.problem_utils import check_write_access, make_problem_request
+from src.polygon.models import AccessType, DownloadedFile, Package, PackageType
+from src.polygon.streaming import stream_to_file
+from src.polygon.utils.problem_utils import (
+    check_write_access,
+    make_problem_request,
+    open_problem_stream,
+)
+from src.polygon.transport import PolygonTransport
 
 
 def _bool_to_api(value: bool) -> str:
@@ -20,6 +27,7 @@ def get_problem_packages(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[Package]:
     response = make_problem_request(
         api_key,
@@ -28,6 +36,7 @@ def get_problem_packages(
         "problem.packages",
         problem_id,
         pin,
+        transport=transport,
     )
     return [Package.from_dict(item) for item in response["result"]]
 
@@ -40,6 +49,7 @@ def download_problem_package(
     package_id: int,
     pin: Optional[str] = None,
     package_type: Optional[PackageType] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> bytes:
     params = {"packageId": str(package_id)}
     if package_type is not None:
@@ -54,6 +64,39 @@ def download_problem_package(
         pin,
         params,
         raw_response=True,
+        transport=transport,
+    )
+
+
+def download_problem_package_to_file(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    problem_id: int,
+    package_id: int,
+    target_path: Union[str, Path],
+    pin: Optional[str] = None,
+    package_type: Optional[PackageType] = None,
+    transport: Optional[PolygonTransport] = None,
+) -> DownloadedFile:
+    params = {"packageId": str(package_id)}
+    if package_type is not None:
+        params["type"] = package_type.value
+
+    return stream_to_file(
+        lambda headers: open_problem_stream(
+            api_key,
+            api_secret,
+            base_url,
+            "problem.package",
+            problem_id,
+            pin,
+            params,
+            headers=headers,
+            transport=transport,
+        ),
+        target_path,
+        resource_id=f"problem.package/{problem_id}/{package_id}/{params.get('type', '')}",
     )
 
 
@@ -66,6 +109,7 @@ def build_problem_package(
     full: bool,
     verify: bool,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -81,6 +125,7 @@ def build_problem_package(
             "verify": _bool_to_api(verify),
         },
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -94,6 +139,7 @@ def commit_problem_changes(
     pin: Optional[str] = None,
     minor_changes: Optional[bool] = None,
     message: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -112,5 +158,6 @@ def commit_problem_changes(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
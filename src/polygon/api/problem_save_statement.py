@@ -1,6 +1,7 @@
 from typing import Optional
 from src.polygon.models import AccessType
 from src.polygon.utils.problem_utils import make_problem_request, check_write_access
+from src.polygon.transport import PolygonTransport
 
 
 def _unwrap_result(response):
@@ -24,7 +25,8 @@ def save_problem_statement(
     scoring: Optional[str] = None,
     interaction: Optional[str] = None,
     notes: Optional[str] = None,
-    tutorial: Optional[str] = None
+    tutorial: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> dict:
     """
     更新或创建题目的陈述
@@ -46,6 +48,7 @@ def save_problem_statement(
         interaction: 题目的交互协议说明（仅用于交互题）
         notes: 题目注释
         tutorial: 题目教程/题解
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         dict: API响应数据
@@ -85,6 +88,7 @@ def save_problem_statement(
         "problem.saveStatement", problem_id, pin,
         params,
         http_method="POST",
+        transport=transport,
     )
 
     return _unwrap_result(response)
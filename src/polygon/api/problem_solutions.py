@@ -1,13 +1,15 @@
 from typing import List, Optional
 from src.polygon.models import Solution
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 def get_problem_solutions(
     api_key: str,
     api_secret: str,
     base_url: str,
     problem_id: int,
-    pin: Optional[str] = None
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> List[Solution]:
     """
     获取题目的所有解决方案
@@ -18,6 +20,7 @@ def get_problem_solutions(
         base_url: API基础URL
         problem_id: 题目ID
         pin: 题目的PIN码（如果有）
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         List[Solution]: 解决方案列表，每个解决方案包含：
@@ -36,6 +39,7 @@ def get_problem_solutions(
     """
     response = make_problem_request(
         api_key, api_secret, base_url,
-        "problem.solutions", problem_id, pin
+        "problem.solutions", problem_id, pin,
+        transport=transport,
     )
     return [Solution.from_dict(sol) for sol in response["result"]] 
\ No newline at end of file
@@ -2,6 +2,7 @@ from typing import Optional
 
 from src.polygon.models import AccessType, SolutionTag, SourceType
 from src.polygon.utils.problem_utils import check_write_access, make_problem_request
+from src.polygon.transport import PolygonTransport
 
 
 def _bool_to_api(value: bool) -> str:
@@ -22,6 +23,7 @@ def set_problem_validator(
     access_type: AccessType,
     validator: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
     response = make_problem_request(
@@ -33,6 +35,7 @@ def set_problem_validator(
         pin,
         {"validator": validator},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -45,6 +48,7 @@ def set_problem_checker(
     access_type: AccessType,
     checker: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
     response = make_problem_request(
@@ -56,6 +60,7 @@ def set_problem_checker(
         pin,
         {"checker": checker},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -68,6 +73,7 @@ def set_problem_interactor(
     access_type: AccessType,
     interactor: str,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
     response = make_problem_request(
@@ -79,6 +85,7 @@ def set_problem_interactor(
         pin,
         {"interactor": interactor},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -95,6 +102,7 @@ def save_problem_solution(
     source_type: Optional[SourceType] = None,
     tag: Optional[SolutionTag] = None,
     check_existing: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -119,6 +127,7 @@ def save_problem_solution(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -135,6 +144,7 @@ def edit_problem_solution_extra_tags(
     testset: Optional[str] = None,
     test_group: Optional[str] = None,
     tag: Optional[SolutionTag] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -163,5 +173,6 @@ def edit_problem_solution_extra_tags(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
@@ -1,13 +1,15 @@
 from typing import Optional
 from src.polygon.models import LanguageMap, Statement
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 def get_problem_statements(
     api_key: str,
     api_secret: str,
     base_url: str,
     problem_id: int,
-    pin: Optional[str] = None
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> LanguageMap[Statement]:
     """
     获取题目的多语言陈述
@@ -18,6 +20,7 @@ def get_problem_statements(
         base_url: API基础URL
         problem_id: 题目ID
         pin: 题目的PIN码（如果有）
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         LanguageMap[Statement]: 语言到题目陈述的映射
@@ -34,6 +37,7 @@ def get_problem_statements(
     """
     response = make_problem_request(
         api_key, api_secret, base_url,
-        "problem.statements", problem_id, pin
+        "problem.statements", problem_id, pin,
+        transport=transport,
     )
     return LanguageMap.from_dict(response["result"], Statement) 
\ No newline at end of file
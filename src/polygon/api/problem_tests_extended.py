@@ -1,9 +1,11 @@
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Union
 
 from src.polygon.models import (
     AccessType,
     CheckerTest,
     CheckerTestVerdict,
+    DownloadedFile,
     FeedbackPolicy,
     PointsPolicy,
     Test,
@@ -11,7 +13,13 @@ from src.polygon.models import (
     ValidatorTest,
     ValidatorTestVerdict,
 )
-from src.polygon.utils.problem_utils import check_write_access, make_problem_request
+from src.polygon.streaming import stream_to_file
+from src.polygon.utils.problem_utils import (
+    check_write_access,
+    make_problem_request,
+    open_problem_stream,
+)
+from src.polygon.transport import PolygonTransport
 
 
 def _bool_to_api(value: bool) -> str:
@@ -30,6 +38,7 @@ def get_problem_validator_tests(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[ValidatorTest]:
     response = make_problem_request(
         api_key,
@@ -38,6 +47,7 @@ def get_problem_validator_tests(
         "problem.validatorTests",
         problem_id,
         pin,
+        transport=transport,
     )
     return [ValidatorTest.from_dict(item) for item in response["result"]]
 
@@ -55,6 +65,7 @@ def save_problem_validator_test(
     test_group: Optional[str] = None,
     testset: Optional[str] = None,
     check_existing: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -81,6 +92,7 @@ def save_problem_validator_test(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -91,6 +103,7 @@ def get_problem_checker_tests(
     base_url: str,
     problem_id: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[CheckerTest]:
     response = make_problem_request(
         api_key,
@@ -99,6 +112,7 @@ def get_problem_checker_tests(
         "problem.checkerTests",
         problem_id,
         pin,
+        transport=transport,
     )
     return [CheckerTest.from_dict(item) for item in response["result"]]
 
@@ -116,6 +130,7 @@ def save_problem_checker_test(
     test_output: Optional[str] = None,
     test_answer: Optional[str] = None,
     check_existing: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -142,6 +157,7 @@ def save_problem_checker_test(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -154,6 +170,7 @@ def get_problem_tests(
     testset: str,
     pin: Optional[str] = None,
     no_inputs: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[Test]:
     params = {"testset": testset}
     if no_inputs is not None:
@@ -167,6 +184,7 @@ def get_problem_tests(
         problem_id,
         pin,
         params,
+        transport=transport,
     )
     return [Test.from_dict(item) for item in response["result"]]
 
@@ -179,6 +197,7 @@ def view_problem_test_input(
     testset: str,
     test_index: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> bytes:
     return make_problem_request(
         api_key,
@@ -192,6 +211,7 @@ def view_problem_test_input(
             "testIndex": str(test_index),
         },
         raw_response=True,
+        transport=transport,
     )
 
 
@@ -203,6 +223,7 @@ def view_problem_test_answer(
     testset: str,
     test_index: int,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> bytes:
     return make_problem_request(
         api_key,
@@ -216,6 +237,87 @@ def view_problem_test_answer(
             "testIndex": str(test_index),
         },
         raw_response=True,
+        transport=transport,
+    )
+
+
+def _stream_test_file(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    problem_id: int,
+    testset: str,
+    test_index: int,
+    target_path: Union[str, Path],
+    pin: Optional[str],
+    transport: Optional[PolygonTransport],
+) -> DownloadedFile:
+    params = {"testset": testset, "testIndex": str(test_index)}
+    return stream_to_file(
+        lambda headers: open_problem_stream(
+            api_key,
+            api_secret,
+            base_url,
+            method,
+            problem_id,
+            pin,
+            params,
+            headers=headers,
+            transport=transport,
+        ),
+        target_path,
+        resource_id=f"{method}/{problem_id}/{testset}/{test_index}",
+    )
+
+
+def view_problem_test_input_to_file(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    problem_id: int,
+    testset: str,
+    test_index: int,
+    target_path: Union[str, Path],
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
+) -> DownloadedFile:
+    return _stream_test_file(
+        api_key,
+        api_secret,
+        base_url,
+        "problem.testInput",
+        problem_id,
+        testset,
+        test_index,
+        target_path,
+        pin,
+        transport,
+    )
+
+
+def view_problem_test_answer_to_file(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    problem_id: int,
+    testset: str,
+    test_index: int,
+    target_path: Union[str, Path],
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
+) -> DownloadedFile:
+    return _stream_test_file(
+        api_key,
+        api_secret,
+        base_url,
+        "problem.testAnswer",
+        problem_id,
+        testset,
+        test_index,
+        target_path,
+        pin,
+        transport,
     )
 
 
@@ -237,9 +339,50 @@ def save_problem_test(
     test_output_for_statements: Optional[str] = None,
     verify_input_output_for_statements: Optional[bool] = None,
     check_existing: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
+    params = _save_test_params(
+        testset,
+        test_index,
+        test_input,
+        test_group,
+        test_points,
+        test_description,
+        test_use_in_statements,
+        test_input_for_statements,
+        test_output_for_statements,
+        verify_input_output_for_statements,
+        check_existing,
+    )
+    response = make_problem_request(
+        api_key,
+        api_secret,
+        base_url,
+        "problem.saveTest",
+        problem_id,
+        pin,
+        params,
+        http_method="POST",
+        transport=transport,
+    )
+    return _unwrap_result(response)
+
+
+def _save_test_params(
+    testset: str,
+    test_index: int,
+    test_input: Optional[str] = None,
+    test_group: Optional[str] = None,
+    test_points: Optional[float] = None,
+    test_description: Optional[str] = None,
+    test_use_in_statements: Optional[bool] = None,
+    test_input_for_statements: Optional[str] = None,
+    test_output_for_statements: Optional[str] = None,
+    verify_input_output_for_statements: Optional[bool] = None,
+    check_existing: Optional[bool] = None,
+) -> dict[str, str]:
     params = {
         "testset": testset,
         "testIndex": str(test_index),
@@ -264,18 +407,7 @@ def save_problem_test(
         )
     if check_existing is not None:
         params["checkExisting"] = _bool_to_api(check_existing)
-
-    response = make_problem_request(
-        api_key,
-        api_secret,
-        base_url,
-        "problem.saveTest",
-        problem_id,
-        pin,
-        params,
-        http_method="POST",
-    )
-    return _unwrap_result(response)
+    return params
 
 
 def set_problem_test_group(
@@ -289,6 +421,7 @@ def set_problem_test_group(
     pin: Optional[str] = None,
     test_index: Optional[int] = None,
     test_indices: Optional[list[int]] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -313,6 +446,7 @@ def set_problem_test_group(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -326,6 +460,7 @@ def enable_problem_groups(
     testset: str,
     enable: bool,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -341,6 +476,7 @@ def enable_problem_groups(
             "enable": _bool_to_api(enable),
         },
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -353,6 +489,7 @@ def enable_problem_points(
     access_type: AccessType,
     enable: bool,
     pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -365,6 +502,7 @@ def enable_problem_points(
         pin,
         {"enable": _bool_to_api(enable)},
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
 
@@ -377,6 +515,7 @@ def view_problem_test_groups(
     testset: str,
     pin: Optional[str] = None,
     group: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> list[TestGroup]:
     params = {"testset": testset}
     if group is not None:
@@ -390,6 +529,7 @@ def view_problem_test_groups(
         problem_id,
         pin,
         params,
+        transport=transport,
     )
     return [TestGroup.from_dict(item) for item in response["result"]]
 
@@ -406,6 +546,7 @@ def save_problem_test_group(
     points_policy: Optional[PointsPolicy] = None,
     feedback_policy: Optional[FeedbackPolicy] = None,
     dependencies: Optional[list[str]] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     check_write_access(access_type)
 
@@ -429,5 +570,6 @@ def save_problem_test_group(
         pin,
         params,
         http_method="POST",
+        transport=transport,
     )
     return _unwrap_result(response)
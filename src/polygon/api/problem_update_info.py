@@ -2,6 +2,7 @@ from typing import Optional
 from src.polygon.models import ProblemInfo
 from src.polygon.utils.problem_utils import make_problem_request, check_write_access
 from src.polygon.models import AccessType
+from src.polygon.transport import PolygonTransport
 
 def update_problem_info(
     api_key: str,
@@ -14,7 +15,8 @@ def update_problem_info(
     output_file: Optional[str] = None,
     time_limit: Optional[int] = None,
     memory_limit: Optional[int] = None,
-    interactive: Optional[bool] = None
+    interactive: Optional[bool] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> dict:
     """
     更新题目信息
@@ -31,6 +33,7 @@ def update_problem_info(
         time_limit: 时间限制（毫秒）
         memory_limit: 内存限制（MB）
         interactive: 是否为交互题
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         ProblemInfo: 更新后的题目信息
@@ -54,5 +57,6 @@ def update_problem_info(
         api_key, api_secret, base_url,
         "problem.updateInfo", problem_id, pin, params,
         http_method="POST",
+        transport=transport,
     )
     return response
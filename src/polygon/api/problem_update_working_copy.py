@@ -1,6 +1,7 @@
 from typing import Optional
 from src.polygon.utils.problem_utils import make_problem_request, check_write_access
 from src.polygon.models import AccessType
+from src.polygon.transport import PolygonTransport
 
 def update_problem_working_copy(
     api_key: str,
@@ -8,7 +9,8 @@ def update_problem_working_copy(
     base_url: str,
     problem_id: int,
     pin: Optional[str],
-    access_type: AccessType
+    access_type: AccessType,
+    transport: Optional[PolygonTransport] = None,
 ) -> dict:
     """
     更新题目工作副本
@@ -20,6 +22,7 @@ def update_problem_working_copy(
         problem_id: 题目ID
         pin: 题目的PIN码（如果有）
         access_type: 用户对题目的访问权限
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         dict: API响应
@@ -31,6 +34,7 @@ def update_problem_working_copy(
         api_key, api_secret, base_url,
         "problem.updateWorkingCopy", problem_id, pin,
         http_method="POST",
+        transport=transport,
     )
     
     return response 
@@ -1,6 +1,7 @@
 from typing import Optional
 from src.polygon.models import FileType
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 def view_problem_file(
     api_key: str,
@@ -9,7 +10,8 @@ def view_problem_file(
     problem_id: int,
     file_type: FileType,
     name: str,
-    pin: Optional[str] = None
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> bytes:
     """
     获取文件内容
@@ -22,6 +24,7 @@ def view_problem_file(
         file_type: 文件类型（resource/source/aux）
         name: 文件名
         pin: 题目的PIN码（如果有）
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         bytes: 文件内容的原始数据
@@ -41,5 +44,6 @@ def view_problem_file(
     }
     return make_problem_request(
         api_key, api_secret, base_url,
-        "problem.viewFile", problem_id, pin, params, raw_response=True
+        "problem.viewFile", problem_id, pin, params, raw_response=True,
+        transport=transport,
     ) 
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Optional
 from src.polygon.utils.problem_utils import make_problem_request
+from src.polygon.transport import PolygonTransport
 
 def view_problem_solution(
     api_key: str,
@@ -7,7 +8,8 @@ def view_problem_solution(
     base_url: str,
     problem_id: int,
     name: str,
-    pin: Optional[str] = None
+    pin: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> bytes:
     """
     获取解决方案源代码
@@ -19,6 +21,7 @@ def view_problem_solution(
         problem_id: 题目ID
         name: 解决方案文件名
         pin: 题目的PIN码（如果有）
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         bytes: 解决方案源代码的原始内容
@@ -37,5 +40,6 @@ def view_problem_solution(
     }
     return make_problem_request(
         api_key, api_secret, base_url,
-        "problem.viewSolution", problem_id, pin, params, raw_response=True
+        "problem.viewSolution", problem_id, pin, params, raw_response=True,
+        transport=transport,
     ) 
\ No newline at end of file
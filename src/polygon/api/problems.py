@@ -1,6 +1,27 @@
 from typing import List, Optional
 from src.polygon.models import Problem
 from src.polygon.utils.client_utils import make_api_request
+from src.polygon.transport import PolygonTransport
+
+def _problems_list_params(
+    show_deleted: Optional[bool],
+    problem_id: Optional[int],
+    name: Optional[str],
+    owner: Optional[str],
+) -> dict[str, str]:
+    params = {}
+
+    # 添加可选参数
+    if show_deleted is not None:
+        params["showDeleted"] = "true" if show_deleted else "false"
+    if problem_id is not None:
+        params["id"] = str(problem_id)
+    if name is not None:
+        params["name"] = name
+    if owner is not None:
+        params["owner"] = owner
+    return params
+
 
 def get_problems(
     api_key: str,
@@ -9,7 +30,8 @@ def get_problems(
     show_deleted: Optional[bool] = None,
     problem_id: Optional[int] = None,
     name: Optional[str] = None,
-    owner: Optional[str] = None
+    owner: Optional[str] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> List[Problem]:
     """
     获取用户可访问的题目列表
@@ -22,21 +44,11 @@ def get_problems(
         problem_id: 按题目ID筛选
         name: 按题目名称筛选
         owner: 按题目所有者筛选
+        transport: 复用连接的请求通道（可选）
         
     Returns:
         List[Problem]: 题目列表
     """
-    params = {}
-    
-    # 添加可选参数
-    if show_deleted is not None:
-        params["showDeleted"] = "true" if show_deleted else "false"
-    if problem_id is not None:
-        params["id"] = str(problem_id)
-    if name is not None:
-        params["name"] = name
-    if owner is not None:
-        params["owner"] = owner
-        
-    response = make_api_request(api_key, api_secret, base_url, "problems.list", params)
+    params = _problems_list_params(show_deleted, problem_id, name, owner)
+    response = make_api_request(api_key, api_secret, base_url, "problems.list", params, transport=transport)
     return [Problem.from_dict(prob) for prob in response.get("result", [])] 
\ No newline at end of file
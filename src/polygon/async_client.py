@@ -0,0 +1,389 @@
+import functools
+from typing import Any, Callable, List, Optional, TypeVar
+
+from .access_cache import AccessTypeCache
+from .api.contest_problems import _parse_contest_problems
+from .api.problem_tests_extended import _bool_to_api, _save_test_params, _unwrap_result
+from .api.problems import _problems_list_params
+from .async_transport import AsyncPolygonTransport
+from .models import (
+    AccessDeniedException,
+    AccessType,
+    File,
+    FileType,
+    LanguageMap,
+    Package,
+    Problem,
+    ProblemFiles,
+    ProblemInfo,
+    Solution,
+    Statement,
+    Test,
+)
+from .utils.async_client_utils import (
+    make_async_api_request,
+    make_async_contest_request,
+    make_async_problem_request,
+)
+from .utils.problem_utils import check_write_access
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class AsyncPolygonClient:
+    """
+    PolygonClient 的原生 asyncio 版本。
+
+    所有请求都通过 AsyncPolygonTransport 在同一个事件循环上并发发出，不占用线程；
+    签名、重试退避和错误映射与同步客户端共用 client_utils 中的实现，参数构造和结果解析复用 api 模块的辅助函数。
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        transport: Optional[AsyncPolygonTransport] = None,
+        access_types: Optional[AccessTypeCache] = None,
+        optimistic_writes: bool = False,
+    ):
+        """
+        Args:
+            api_key: API密钥
+            api_secret: API密钥对应的秘钥
+            transport: 自定义异步请求通道；不传时创建一个带连接池的 AsyncPolygonTransport
+            access_types: 题目访问权限缓存，由该客户端创建的所有会话共享
+            optimistic_writes: 为 True 时写操作前不预先查询访问权限，直接依赖 Polygon 返回的权限错误
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = "https://polygon.codeforces.com/api/"
+        self.transport = transport if transport is not None else AsyncPolygonTransport()
+        self.access_types = access_types if access_types is not None else AccessTypeCache()
+        self.optimistic_writes = optimistic_writes
+
+    async def aclose(self) -> None:
+        """释放底层连接池。"""
+        await self.transport.aclose()
+
+    async def __aenter__(self) -> "AsyncPolygonClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def get_problems(
+        self,
+        show_deleted: Optional[bool] = None,
+        problem_id: Optional[int] = None,
+        name: Optional[str] = None,
+        owner: Optional[str] = None,
+    ) -> List[Problem]:
+        """
+        获取用户可访问的题目列表
+
+        Args:
+            show_deleted: 是否显示已删除的题目（默认为False）
+            problem_id: 按题目ID筛选
+            name: 按题目名称筛选
+            owner: 按题目所有者筛选
+
+        Returns:
+            List[Problem]: 题目列表
+        """
+        response = await make_async_api_request(
+            self.api_key,
+            self.api_secret,
+            self.base_url,
+            "problems.list",
+            _problems_list_params(show_deleted, problem_id, name, owner),
+            transport=self.transport,
+        )
+        return [Problem.from_dict(prob) for prob in response.get("result", [])]
+
+    async def create_problem(self, name: str) -> Problem:
+        """
+        创建一个新的空题目。
+
+        Args:
+            name: 题目名称
+
+        Returns:
+            Problem: 新创建的题目对象
+        """
+        response = await make_async_api_request(
+            self.api_key,
+            self.api_secret,
+            self.base_url,
+            "problem.create",
+            {"name": name},
+            http_method="POST",
+            transport=self.transport,
+        )
+        return Problem.from_dict(response["result"])
+
+    def create_problem_session(
+        self,
+        problem_id: int,
+        pin: Optional[str] = None,
+    ) -> "AsyncProblemSession":
+        """
+        创建一个异步题目会话
+
+        Args:
+            problem_id: 题目ID
+            pin: 题目的PIN码（如果有）
+
+        Returns:
+            AsyncProblemSession: 异步题目会话对象
+        """
+        return AsyncProblemSession(self, problem_id, pin)
+
+    def create_contest_session(
+        self,
+        contest_id: int,
+        pin: Optional[str] = None,
+    ) -> "AsyncContestSession":
+        """
+        创建一个异步比赛会话
+
+        Args:
+            contest_id: 比赛ID
+            pin: 比赛的PIN码（如果有）
+
+        Returns:
+            AsyncContestSession: 异步比赛会话对象
+        """
+        return AsyncContestSession(self, contest_id, pin)
+
+
+def _access_checked(method: F) -> F:
+    """写操作被拒绝时失效缓存的访问权限，下次写入前重新查询。"""
+
+    @functools.wraps(method)
+    async def wrapper(self: "AsyncProblemSession", *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await method(self, *args, **kwargs)
+        except AccessDeniedException:
+            self._invalidate_access_type()
+            raise
+
+    return wrapper  # type: ignore[return-value]
+
+
+class AsyncProblemSession:
+    """
+    ProblemSession 的异步版本。
+
+    覆盖并发场景最常用的读接口和测试写入，方法名和参数与 ProblemSession 一致，返回协程；
+    写操作前的访问权限与同步会话一样经由客户端共享的 access_types 缓存解析。
+    """
+
+    def __init__(self, client: AsyncPolygonClient, problem_id: int, pin: Optional[str] = None):
+        self.client = client
+        self.problem_id = problem_id
+        self.pin = pin
+        self._access_type: Optional[AccessType] = None
+
+    async def _request(self, method: str, params: Optional[dict] = None, **kwargs: Any) -> Any:
+        return await make_async_problem_request(
+            self.client.api_key,
+            self.client.api_secret,
+            self.client.base_url,
+            method,
+            self.problem_id,
+            self.pin,
+            params,
+            transport=self.client.transport,
+            **kwargs,
+        )
+
+    async def _ensure_access_type(self) -> AccessType:
+        if self._access_type is not None:
+            return self._access_type
+
+        access_type = self.client.access_types.get(self.problem_id)
+        if access_type is not None:
+            return access_type
+        if self.client.optimistic_writes:
+            return AccessType.WRITE
+
+        problems = await self.client.get_problems(problem_id=self.problem_id)
+        if not problems:
+            raise ValueError(f"无法获取题目 {self.problem_id} 的访问权限")
+        access_type = problems[0].accessType
+        self.client.access_types.set(self.problem_id, access_type)
+        return access_type
+
+    def _invalidate_access_type(self) -> None:
+        self._access_type = None
+        self.client.access_types.invalidate(self.problem_id)
+
+    @_access_checked
+    async def ensure_write_access(self) -> AccessType:
+        """预先确认当前凭证对题目有写权限，并把结果写入共享缓存。"""
+        access_type = await self._ensure_access_type()
+        check_write_access(access_type)
+        return access_type
+
+    async def get_info(self) -> ProblemInfo:
+        response = await self._request("problem.info")
+        return ProblemInfo.from_dict(response["result"])
+
+    async def get_statements(self) -> LanguageMap[Statement]:
+        response = await self._request("problem.statements")
+        return LanguageMap.from_dict(response["result"], Statement)
+
+    async def get_statement_resources(self) -> list[File]:
+        response = await self._request("problem.statementResources")
+        return [File.from_dict(item) for item in response["result"]]
+
+    async def get_checker(self) -> str:
+        response = await self._request("problem.checker")
+        return response["result"]
+
+    async def get_validator(self) -> str:
+        response = await self._request("problem.validator")
+        return response["result"]
+
+    async def get_extra_validators(self) -> list[str]:
+        response = await self._request("problem.extraValidators")
+        return list(response["result"])
+
+    async def get_interactor(self) -> str:
+        response = await self._request("problem.interactor")
+        return response["result"]
+
+    async def get_files(self) -> ProblemFiles:
+        response = await self._request("problem.files")
+        return ProblemFiles.from_dict(response["result"])
+
+    async def view_file(self, file_type: FileType, name: str) -> bytes:
+        return await self._request(
+            "problem.viewFile",
+            {"type": file_type.value, "name": name},
+            raw_response=True,
+        )
+
+    async def get_tests(self, testset: str, no_inputs: Optional[bool] = None) -> list[Test]:
+        params = {"testset": testset}
+        if no_inputs is not None:
+            params["noInputs"] = _bool_to_api(no_inputs)
+        response = await self._request("problem.tests", params)
+        return [Test.from_dict(item) for item in response["result"]]
+
+    async def view_test_input(self, testset: str, test_index: int) -> bytes:
+        return await self._request(
+            "problem.testInput",
+            {"testset": testset, "testIndex": str(test_index)},
+            raw_response=True,
+        )
+
+    async def view_test_answer(self, testset: str, test_index: int) -> bytes:
+        return await self._request(
+            "problem.testAnswer",
+            {"testset": testset, "testIndex": str(test_index)},
+            raw_response=True,
+        )
+
+    @_access_checked
+    async def save_test(
+        self,
+        testset: str,
+        test_index: int,
+        test_input: Optional[str] = None,
+        test_group: Optional[str] = None,
+        test_points: Optional[float] = None,
+        test_description: Optional[str] = None,
+        test_use_in_statements: Optional[bool] = None,
+        test_input_for_statements: Optional[str] = None,
+        test_output_for_statements: Optional[str] = None,
+        verify_input_output_for_statements: Optional[bool] = None,
+        check_existing: Optional[bool] = None,
+    ):
+        check_write_access(await self._ensure_access_type())
+        params = _save_test_params(
+            testset,
+            test_index,
+            test_input,
+            test_group,
+            test_points,
+            test_description,
+            test_use_in_statements,
+            test_input_for_statements,
+            test_output_for_statements,
+            verify_input_output_for_statements,
+            check_existing,
+        )
+        response = await self._request("problem.saveTest", params, http_method="POST")
+        return _unwrap_result(response)
+
+    async def get_solutions(self) -> list[Solution]:
+        response = await self._request("problem.solutions")
+        return [Solution.from_dict(sol) for sol in response["result"]]
+
+    async def view_solution(self, name: str) -> bytes:
+        return await self._request("problem.viewSolution", {"name": name}, raw_response=True)
+
+    async def get_tags(self) -> list[str]:
+        response = await self._request("problem.viewTags")
+        return list(response["result"])
+
+    async def get_general_description(self) -> str:
+        response = await self._request("problem.viewGeneralDescription")
+        return response["result"]
+
+    async def get_general_tutorial(self) -> str:
+        response = await self._request("problem.viewGeneralTutorial")
+        return response["result"]
+
+    async def get_packages(self) -> list[Package]:
+        response = await self._request("problem.packages")
+        return [Package.from_dict(item) for item in response["result"]]
+
+    def __repr__(self) -> str:
+        return (
+            f"AsyncProblemSession(problem_id={self.problem_id}, "
+            f"pin={'***' if self.pin else 'None'})"
+        )
+
+
+class AsyncContestSession:
+    """ContestSession 的异步版本"""
+
+    def __init__(self, client: AsyncPolygonClient, contest_id: int, pin: Optional[str] = None):
+        """
+        Args:
+            client: AsyncPolygonClient实例
+            contest_id: 比赛ID
+            pin: 比赛的PIN码（如果有）
+        """
+        self.client = client
+        self.contest_id = contest_id
+        self.pin = pin
+
+    async def get_problems(self) -> List[Problem]:
+        """
+        获取比赛中的所有题目
+
+        Returns:
+            List[Problem]: 题目列表
+
+        Raises:
+            PolygonException: 当API请求失败或返回数据格式不正确时
+        """
+        response = await make_async_contest_request(
+            self.client.api_key,
+            self.client.api_secret,
+            self.client.base_url,
+            "contest.problems",
+            self.contest_id,
+            self.pin,
+            transport=self.client.transport,
+        )
+        return _parse_contest_problems(response)
+
+    def __repr__(self) -> str:
+        return (
+            f"AsyncContestSession(contest_id={self.contest_id}, "
+            f"pin={'***' if self.pin else 'None'})"
+        )
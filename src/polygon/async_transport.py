@@ -0,0 +1,67 @@
+from typing import Any, Optional
+
+import httpx
+
+from .transport import (
+    DEFAULT_CONNECT_RETRIES,
+    DEFAULT_POOL_MAXSIZE,
+)
+
+
+class AsyncPolygonTransport:
+    """
+    基于 httpx.AsyncClient 的异步 Polygon 请求通道。
+
+    与 PolygonTransport 对应：内部持有一个复用 keep-alive 连接的连接池，
+    只在连接建立阶段做重试，HTTP 状态码重试和退避仍由 make_async_api_request 统一处理。
+    任何实现了 async request(method, url, **kwargs) 的对象都可以作为 transport 传给 make_async_api_request。
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connect_retries: int = DEFAULT_CONNECT_RETRIES,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        if pool_maxsize <= 0:
+            raise ValueError("pool_maxsize 必须大于 0")
+        if connect_retries < 0:
+            raise ValueError("connect_retries 不能小于 0")
+
+        self.pool_maxsize = pool_maxsize
+        self.connect_retries = connect_retries
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize,
+            )
+            client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    retries=connect_retries,
+                    limits=limits,
+                ),
+                headers={"Connection": "keep-alive"},
+            )
+        self.client = client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """通过连接池异步发送一次 HTTP 请求。"""
+        return await self.client.request(method, url, **kwargs)
+
+    async def aclose(self) -> None:
+        """关闭底层连接池。"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncPolygonTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def __repr__(self) -> str:
+        return (
+            "AsyncPolygonTransport("
+            f"pool_maxsize={self.pool_maxsize}, "
+            f"connect_retries={self.connect_retries})"
+        )
@@ -1,15 +1,71 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from .models import Problem
 from .problem import ProblemSession
 from .contest import ContestSession
 from .api.problem_create import create_problem
+from .transport import PolygonTransport
+from .access_cache import AccessTypeCache
+from .package_cache import PackageCache
+from .problem_snapshots import ProblemChangeReport, ProblemSnapshotTracker
+from .rate_limit import RateLimitedTransport, RateLimiter
+from .response_cache import ResponseCache
 
 class PolygonClient:
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        transport: Optional[PolygonTransport] = None,
+        access_types: Optional[AccessTypeCache] = None,
+        optimistic_writes: bool = False,
+        package_cache: Optional[PackageCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        problem_snapshots: Optional[ProblemSnapshotTracker] = None,
+    ):
+        """
+        Args:
+            api_key: API密钥
+            api_secret: API密钥对应的秘钥
+            transport: 自定义请求通道；不传时创建一个带连接池的 PolygonTransport
+            access_types: 题目访问权限缓存，由该客户端创建的所有会话共享
+            optimistic_writes: 为 True 时写操作前不预先查询访问权限，直接依赖 Polygon 返回的权限错误
+            package_cache: 题目包本地缓存；提供时 download_package 系列方法优先读取缓存
+            rate_limiter: 客户端级请求限速器；提供时该客户端发出的全部 API 请求都先经它排队放行
+            response_cache: 幂等读接口的响应缓存，由该客户端创建的所有题目会话共享；
+                get_problems 看到的 revision 变化和会话的写操作都会使对应题目的缓存失效
+            problem_snapshots: 题目快照（revision / modified / latestPackage），用于一次列表调用判断哪些题目有变化
+        """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = "https://polygon.codeforces.com/api/"
+        self.rate_limiter = rate_limiter
+        base_transport = transport if transport is not None else PolygonTransport()
+        self.transport = (
+            RateLimitedTransport(base_transport, rate_limiter)
+            if rate_limiter is not None
+            else base_transport
+        )
+        self.access_types = access_types if access_types is not None else AccessTypeCache()
+        self.optimistic_writes = optimistic_writes
+        self.package_cache = package_cache
+        self.response_cache = response_cache
+        self.problem_snapshots = (
+            problem_snapshots if problem_snapshots is not None else ProblemSnapshotTracker()
+        )
+        if response_cache is not None:
+            self.problem_snapshots.add_listener(response_cache.invalidate)
+
+    def close(self) -> None:
+        """释放底层连接池。"""
+        self.transport.close()
+
+    def __enter__(self) -> "PolygonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
         
     def get_problems(
         self,
@@ -31,7 +87,7 @@ class PolygonClient:
             List[Problem]: 题目列表
         """
         from .api.problems import get_problems
-        return get_problems(
+        problems = get_problems(
             self.api_key,
             self.api_secret,
             self.base_url,
@@ -39,7 +95,59 @@ class PolygonClient:
             problem_id,
             name,
             owner,
+            transport=self.transport,
         )
+        self.observe_problems(problems)
+        return problems
+
+    def observe_problems(
+        self,
+        problems: List[Problem],
+        expected_ids: Optional[Iterable[int]] = None,
+    ) -> ProblemChangeReport:
+        """
+        用题目列表更新本地快照；revision、modified 或 latestPackage 变化的题目，其响应缓存随之失效。
+
+        Args:
+            problems: problems.list 或 contest.problems 返回的题目
+            expected_ids: 期望出现在列表中的题目，缺失的题目按已变化处理
+        """
+        if self.response_cache is not None:
+            for problem in problems:
+                self.response_cache.observe_revision(problem.id, problem.revision)
+        return self.problem_snapshots.observe(problems, expected_ids)
+
+    def probe_problem_changes(
+        self,
+        problem_ids: Optional[Iterable[int]] = None,
+    ) -> ProblemChangeReport:
+        """
+        用一次 problems.list 调用检查多道题目自上次观察以来是否有变化。
+
+        快照一致的题目可以继续使用缓存，只有 changed 和 missing 中的题目需要重新读取；
+        变化的题目的响应缓存已被批量失效。
+
+        Args:
+            problem_ids: 需要检查的题目；不传时检查当前凭证可访问的全部题目
+
+        Returns:
+            ProblemChangeReport: 按 changed / unchanged / new / missing 分类的题目 ID
+        """
+        from .api.problems import get_problems
+
+        expected_ids = list(dict.fromkeys(problem_ids)) if problem_ids is not None else None
+        problems = get_problems(
+            self.api_key,
+            self.api_secret,
+            self.base_url,
+            problem_id=expected_ids[0] if expected_ids is not None and len(expected_ids) == 1 else None,
+            transport=self.transport,
+        )
+        self.problem_snapshots.record_probe()
+        if expected_ids is not None:
+            wanted = set(expected_ids)
+            problems = [problem for problem in problems if problem.id in wanted]
+        return self.observe_problems(problems, expected_ids)
 
     def create_problem(self, name: str) -> Problem:
         """
@@ -51,7 +159,13 @@ class PolygonClient:
         Returns:
             Problem: 新创建的题目对象
         """
-        return create_problem(self.api_key, self.api_secret, self.base_url, name)
+        return create_problem(
+            self.api_key,
+            self.api_secret,
+            self.base_url,
+            name,
+            transport=self.transport,
+        )
 
     def create_problem_session(self, problem_id: int, pin: Optional[str] = None) -> ProblemSession:
         """
@@ -1,7 +1,9 @@
 from typing import Optional, Dict, List
 from .models import Problem, AccessDeniedException, PolygonException
 from .api.contest_problems import get_contest_problems
+from .tracing import traced_methods
 
+@traced_methods(lambda session: {"contest_id": session.contest_id})
 class ContestSession:
     """处理特定比赛的会话类"""
     
@@ -40,13 +42,16 @@ class ContestSession:
         Raises:
             PolygonException: 当API请求失败或返回数据格式不正确时
         """
-        return get_contest_problems(
+        problems = get_contest_problems(
             self.client.api_key,
             self.client.api_secret,
             self.client.base_url,
             self.contest_id,
-            self.pin
+            self.pin,
+            transport=self.client.transport,
         )
+        self.client.observe_problems(problems)
+        return problems
             
     def __str__(self) -> str:
         """返回比赛会话的字符串表示"""
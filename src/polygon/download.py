@@ -1,18 +1,68 @@
-from typing import Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+from urllib.parse import urlencode
 
 import requests
 
+from src.polygon.models import DownloadedFile
+from src.polygon.package_cache import PackageCache, build_url_package_cache_key
+from src.polygon.streaming import stream_to_file
+from src.polygon.web_session import PolygonWebSession
 
-def _post_download(url: str, login: str, password: str, **extra_params) -> bytes:
-    params = {
-        "login": login,
-        "password": password,
-    }
-    params.update({key: value for key, value in extra_params.items() if value is not None})
 
-    response = requests.post(url, data=params, timeout=30)
-    response.raise_for_status()
-    return response.content
+def _build_download_params(**extra_params) -> dict[str, str]:
+    return {key: value for key, value in extra_params.items() if value is not None}
+
+
+@contextmanager
+def _web_session_for(
+    web_session: Optional[PolygonWebSession],
+    login: str,
+    password: str,
+) -> Iterator[PolygonWebSession]:
+    """
+    返回本次下载使用的会话。
+
+    未传入 web_session 时创建只用于本次下载的会话并在结束后关闭；需要跨调用复用登录状态时，
+    由调用方传入共享会话（MCP 工具使用 src.mcp.utils.common.get_web_session）。
+    """
+    if web_session is not None:
+        yield web_session
+        return
+    session = PolygonWebSession(login, password)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _post_download(
+    url: str,
+    login: str,
+    password: str,
+    web_session: Optional[PolygonWebSession] = None,
+    **extra_params,
+) -> bytes:
+    with _web_session_for(web_session, login, password) as session:
+        return session.post(url, _build_download_params(**extra_params)).content
+
+
+def _post_download_to_file(
+    url: str,
+    target_path: Union[str, Path],
+    login: str,
+    password: str,
+    web_session: Optional[PolygonWebSession] = None,
+    **extra_params,
+) -> DownloadedFile:
+    params = _build_download_params(**extra_params)
+    resource_id = f"{url}?{urlencode(sorted(params.items()))}"
+    with _web_session_for(web_session, login, password) as session:
+        def open_response(headers: dict[str, str]) -> requests.Response:
+            return session.post(url, params, headers=headers, stream=True)
+
+        return stream_to_file(open_response, target_path, resource_id=resource_id)
 
 
 def _with_suffix(url: str, suffix: str) -> str:
@@ -29,15 +79,26 @@ def download_problem_package(
     pin: Optional[str] = None,
     revision: Optional[int] = None,
     package_type: Optional[str] = None,
+    cache: Optional[PackageCache] = None,
+    web_session: Optional[PolygonWebSession] = None,
 ) -> bytes:
-    """下载题目包。"""
-    return _post_download(
-        problem_url.rstrip("/"),
-        login,
-        password,
-        pin=pin,
-        revision=str(revision) if revision is not None else None,
-        type=package_type,
+    """下载题目包；指定 revision 且提供 cache 时优先读取本地缓存。"""
+    def download() -> bytes:
+        return _post_download(
+            problem_url.rstrip("/"),
+            login,
+            password,
+            web_session,
+            pin=pin,
+            revision=str(revision) if revision is not None else None,
+            type=package_type,
+        )
+
+    if cache is None or revision is None:
+        return download()
+    return cache.fetch_bytes(
+        build_url_package_cache_key(problem_url, revision, package_type, account=login),
+        download,
     )
 
 
@@ -47,12 +108,14 @@ def download_problem_descriptor(
     password: str,
     pin: Optional[str] = None,
     revision: Optional[int] = None,
+    web_session: Optional[PolygonWebSession] = None,
 ) -> bytes:
     """下载 problem.xml。"""
     return _post_download(
         _with_suffix(problem_url, "problem.xml"),
         login,
         password,
+        web_session,
         pin=pin,
         revision=str(revision) if revision is not None else None,
     )
@@ -63,12 +126,14 @@ def download_contest_descriptor(
     login: str,
     password: str,
     pin: Optional[str] = None,
+    web_session: Optional[PolygonWebSession] = None,
 ) -> bytes:
     """下载 contest.xml。"""
     return _post_download(
         _with_suffix(contest_url, "contest.xml"),
         login,
         password,
+        web_session,
         pin=pin,
     )
 
@@ -79,11 +144,106 @@ def download_contest_statements_pdf(
     password: str,
     language: str = "english",
     pin: Optional[str] = None,
+    web_session: Optional[PolygonWebSession] = None,
 ) -> bytes:
     """下载比赛陈述 PDF。"""
     return _post_download(
         _with_suffix(contest_url, f"{language}/statements.pdf"),
         login,
         password,
+        web_session,
+        pin=pin,
+    )
+
+
+def download_problem_package_to_file(
+    problem_url: str,
+    target_path: Union[str, Path],
+    login: str,
+    password: str,
+    pin: Optional[str] = None,
+    revision: Optional[int] = None,
+    package_type: Optional[str] = None,
+    cache: Optional[PackageCache] = None,
+    web_session: Optional[PolygonWebSession] = None,
+) -> DownloadedFile:
+    """流式下载题目包到 target_path，支持断点续传；指定 revision 且提供 cache 时优先读取本地缓存。"""
+    def download() -> DownloadedFile:
+        return _post_download_to_file(
+            problem_url.rstrip("/"),
+            target_path,
+            login,
+            password,
+            web_session,
+            pin=pin,
+            revision=str(revision) if revision is not None else None,
+            type=package_type,
+        )
+
+    if cache is None or revision is None:
+        return download()
+    return cache.fetch_to_file(
+        build_url_package_cache_key(problem_url, revision, package_type, account=login),
+        target_path,
+        download,
+    )
+
+
+def download_problem_descriptor_to_file(
+    problem_url: str,
+    target_path: Union[str, Path],
+    login: str,
+    password: str,
+    pin: Optional[str] = None,
+    revision: Optional[int] = None,
+    web_session: Optional[PolygonWebSession] = None,
+) -> DownloadedFile:
+    """流式下载 problem.xml 到 target_path。"""
+    return _post_download_to_file(
+        _with_suffix(problem_url, "problem.xml"),
+        target_path,
+        login,
+        password,
+        web_session,
+        pin=pin,
+        revision=str(revision) if revision is not None else None,
+    )
+
+
+def download_contest_descriptor_to_file(
+    contest_url: str,
+    target_path: Union[str, Path],
+    login: str,
+    password: str,
+    pin: Optional[str] = None,
+    web_session: Optional[PolygonWebSession] = None,
+) -> DownloadedFile:
+    """流式下载 contest.xml 到 target_path。"""
+    return _post_download_to_file(
+        _with_suffix(contest_url, "contest.xml"),
+        target_path,
+        login,
+        password,
+        web_session,
+        pin=pin,
+    )
+
+
+def download_contest_statements_pdf_to_file(
+    contest_url: str,
+    target_path: Union[str, Path],
+    login: str,
+    password: str,
+    language: str = "english",
+    pin: Optional[str] = None,
+    web_session: Optional[PolygonWebSession] = None,
+) -> DownloadedFile:
+    """流式下载比赛陈述 PDF 到 target_path。"""
+    return _post_download_to_file(
+        _with_suffix(contest_url, f"{language}/statements.pdf"),
+        target_path,
+        login,
+        password,
+        web_session,
         pin=pin,
     )
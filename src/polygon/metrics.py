@@ -0,0 +1,254 @@
+import bisect
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+POLYGON_METHOD_METRICS = "polygon_method"
+TOOL_METRICS = "tool"
+
+# 延迟直方图的桶上界（毫秒），与 Prometheus histogram 的 le 标签一致；超过最后一个上界的样本计入 +Inf。
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+PERCENTILES = (50, 95, 99)
+
+def payload_size(value: Any) -> int:
+    """
+    返回请求参数或返回值中已知的字节数，用于统计收发数据量。
+
+    只计 bytes 和 str 的长度，dict 按顶层值累加；其他对象记 0，不做序列化——
+    每次调用都 json.dumps 一遍大结果的开销比统计本身更大。
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(
+            len(item) if isinstance(item, (bytes, bytearray)) else len(item.encode("utf-8"))
+            for item in value.values()
+            if isinstance(item, (bytes, bytearray, str))
+        )
+    return 0
+
+
+class LatencyHistogram:
+    """
+    固定桶的延迟直方图。
+
+    内存占用与调用次数无关；分位数在样本所在的桶内线性插值估算，落在 +Inf 桶的样本按观测到的最大值估算。
+    """
+
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count == 0:
+                continue
+            if seen + bucket_count >= rank:
+                lower = self.buckets_ms[index - 1] if index > 0 else 0.0
+                upper = self.buckets_ms[index] if index < len(self.buckets_ms) else self.max_ms
+                upper = min(upper, self.max_ms)
+                lower = min(lower, upper)
+                return round(lower + (upper - lower) * (rank - seen) / bucket_count, 3)
+            seen += bucket_count
+        return round(self.max_ms, 3)
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        result: list[tuple[str, int]] = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets_ms, self.counts):
+            running += bucket_count
+            result.append((str(bound / 1000), running))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class _CallStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors: dict[str, int] = {}
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> dict[str, Any]:
+        latency = self.latency
+        return {
+            "calls": self.calls,
+            "errors": sum(self.errors.values()),
+            "error_classes": dict(sorted(self.errors.items())),
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "latency_ms": {
+                **{f"p{percent}": latency.percentile(percent) for percent in PERCENTILES},
+                "mean": round(latency.sum_ms / latency.count, 3) if latency.count else None,
+                "max": round(latency.max_ms, 3) if latency.count else None,
+                "total": round(latency.sum_ms, 3),
+            },
+        }
+
+
+class CallObservation:
+    """一次调用的观测结果；在 observe_call 上下文内填写重试次数、收发字节数和错误类别。"""
+
+    def __init__(self, bytes_out: int = 0):
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = bytes_out
+        self.error: Optional[str] = None
+
+
+class MetricsRegistry:
+    """
+    进程级调用指标注册表。
+
+    按 (类别, 名称) 分别统计调用次数、按异常类型分类的错误次数、重试次数、收发字节数和延迟直方图；
+    类别为 polygon_method 时名称是 Polygon API 方法名，为 tool 时是 MCP 工具名。线程安全。
+    """
+
+    def __init__(self):
+        self._stats: dict[tuple[str, str], _CallStats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        *,
+        seconds: float,
+        error: Optional[str] = None,
+        retries: int = 0,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get((kind, name))
+            if stats is None:
+                stats = self._stats[(kind, name)] = _CallStats()
+            stats.calls += 1
+            if error is not None:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+            stats.retries += retries
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.latency.observe(seconds * 1000)
+
+    @contextlib.contextmanager
+    def observe_call(self, kind: str, name: str, *, bytes_out: int = 0) -> Iterator[CallObservation]:
+        """计时并记录一次调用；上下文内抛出的异常按类型名计为错误后继续向外抛出。"""
+        observation = CallObservation(bytes_out)
+        started = time.perf_counter()
+        try:
+            yield observation
+        except BaseException as exc:
+            observation.error = type(exc).__name__
+            raise
+        finally:
+            self.record(
+                kind,
+                name,
+                seconds=time.perf_counter() - started,
+                error=observation.error,
+                retries=observation.retries,
+                bytes_in=observation.bytes_in,
+                bytes_out=observation.bytes_out,
+            )
+
+    def snapshot(self, kind: Optional[str] = None) -> dict[str, dict[str, dict[str, Any]]]:
+        """返回 {类别: {名称: 指标}}；kind 不为 None 时只返回该类别。"""
+        with self._lock:
+            result: dict[str, dict[str, dict[str, Any]]] = {}
+            for (stats_kind, name), stats in sorted(self._stats.items()):
+                if kind is None or stats_kind == kind:
+                    result.setdefault(stats_kind, {})[name] = stats.snapshot()
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+    def render_prometheus(self) -> str:
+        """按 Prometheus 文本格式导出全部指标。"""
+        with self._lock:
+            rows = [
+                (
+                    _labels(kind, name),
+                    stats.calls,
+                    dict(stats.errors),
+                    {"retries": stats.retries, "bytes_in": stats.bytes_in, "bytes_out": stats.bytes_out},
+                    stats.latency.cumulative_counts(),
+                    stats.latency.sum_ms / 1000,
+                )
+                for (kind, name), stats in sorted(self._stats.items())
+            ]
+
+        lines = ["# HELP polygon_mcp_calls_total Number of calls.", "# TYPE polygon_mcp_calls_total counter"]
+        lines += [f"polygon_mcp_calls_total{{{labels}}} {calls}" for labels, calls, *_ in rows]
+        lines += [
+            "# HELP polygon_mcp_errors_total Number of failed calls by error class.",
+            "# TYPE polygon_mcp_errors_total counter",
+        ]
+        for labels, _, errors, *_ in rows:
+            lines += [
+                f'polygon_mcp_errors_total{{{labels},error="{error_class}"}} {count}'
+                for error_class, count in sorted(errors.items())
+            ]
+        for counter, help_text in (
+            ("retries", "Number of retried attempts."),
+            ("bytes_in", "Bytes received."),
+            ("bytes_out", "Bytes sent."),
+        ):
+            metric = f"polygon_mcp_{counter}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f"{metric}{{{labels}}} {counters[counter]}" for labels, _, _, counters, *_ in rows]
+        lines += ["# HELP polygon_mcp_latency_seconds Call latency.", "# TYPE polygon_mcp_latency_seconds histogram"]
+        for labels, calls, _, _, buckets, total_seconds in rows:
+            lines += [f'polygon_mcp_latency_seconds_bucket{{{labels},le="{bound}"}} {count}' for bound, count in buckets]
+            lines.append(f"polygon_mcp_latency_seconds_sum{{{labels}}} {total_seconds:.6f}")
+            lines.append(f"polygon_mcp_latency_seconds_count{{{labels}}} {calls}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path]) -> Path:
+        """把 Prometheus 文本原子写入 path，供 node_exporter textfile collector 等读取。"""
+        target = Path(path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=".polygon-metrics-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(self.render_prometheus())
+        os.replace(temp_name, target)
+        return target
+
+
+def _labels(kind: str, name: str) -> str:
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'kind="{kind}",name="{escaped}"'
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """返回进程级默认指标注册表；make_api_request 和 MCP 工具包装都记录到这里。"""
+    return _default_registry
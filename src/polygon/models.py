@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Generic, Optional, TypeVar
+from typing import Callable, Generic, Optional, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 def _to_datetime(value: int | str | datetime | None) -> datetime | None:
@@ -303,6 +303,19 @@ class AccessDeniedException(PolygonBusinessError):
 T = TypeVar("T")
 
 
+class Page(BaseModel, Generic[T]):
+    """
+    分页结果
+
+    total 为过滤后的总条数；next_cursor 用于获取下一页，没有下一页时为 None。
+    """
+
+    total: int
+    limit: Optional[int] = None
+    next_cursor: Optional[str] = None
+    items: list[T]
+
+
 class LanguageMap(BaseModel, Generic[T]):
     """
     语言到特定类型的映射
@@ -491,6 +504,32 @@ class Test(BaseModel):
         return cls(**parsed)
 
 
+class LazyTest(Test):
+    """
+    只携带元数据的测试。
+
+    输入在首次调用 load_input() 时才通过绑定的加载器下载，之后缓存在 input 字段中；
+    未加载前 input 为 None，序列化结果与 noInputs=true 返回的测试一致。
+    """
+
+    _input_loader: Optional[Callable[[], str]] = PrivateAttr(default=None)
+
+    def bind_input_loader(self, loader: Callable[[], str]) -> "LazyTest":
+        self._input_loader = loader
+        return self
+
+    @property
+    def input_loaded(self) -> bool:
+        return self.input is not None
+
+    def load_input(self) -> str:
+        if self.input is None:
+            if self._input_loader is None:
+                raise ValueError(f"测试 {self.index} 没有绑定输入加载器")
+            self.input = self._input_loader()
+        return self.input
+
+
 class TestGroup(BaseModel):
     """测试组。"""
 
@@ -529,6 +568,16 @@ class Package(BaseModel):
         return cls(**parsed)
 
 
+class DownloadedFile(BaseModel):
+    """流式下载写入磁盘后的文件信息。"""
+
+    path: str
+    size_bytes: int
+    sha256: str
+    detected_content_kind: Optional[str] = None
+    resumed_from: int = 0
+
+
 class ValidatorTest(BaseModel):
     """validator 测试。"""
 
@@ -0,0 +1,409 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，退化为只在进程内加锁
+    fcntl = None
+
+from src.polygon.models import DownloadedFile
+from src.polygon.streaming import SNIFF_BYTES, DownloadDigest, sniff_content_kind
+
+DEFAULT_PACKAGE_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+INDEX_FILENAME = "index.json"
+INDEX_LOCK_FILENAME = "index.lock"
+INDEX_VERSION = 1
+# 命中只更新内存中的最近使用时间，最多每隔这么久写回一次索引；put、淘汰和 flush 时立即写回。
+LAST_USED_FLUSH_SECONDS = 60.0
+# 只缓存识别为 zip 的内容；鉴权失败时返回的 HTML 登录页或 JSON 错误不能当作题目包复用。
+CACHEABLE_CONTENT_KIND = "zip"
+
+
+def _account_namespace(account: Optional[str]) -> str:
+    # 缓存目录可能被多个账号共用，键里只保留凭据的哈希前缀，避免读到其他账号下载的内容。
+    if account is None:
+        return ""
+    return f"account:{hashlib.sha256(account.encode('utf-8')).hexdigest()[:16]}/"
+
+
+def build_problem_package_cache_key(
+    problem_id: int,
+    package_id: int,
+    package_type: Optional[str] = None,
+    account: Optional[str] = None,
+) -> str:
+    """
+    按 (account, problem_id, package_id, package_type) 生成缓存键；READY 状态的包内容不会再变化。
+
+    account 传 API key，键中只保留其哈希，不同账号的缓存互不可见。
+    """
+    key = f"problem:{problem_id}/package:{package_id}/type:{package_type or 'default'}"
+    return _account_namespace(account) + key
+
+
+def build_url_package_cache_key(
+    problem_url: str,
+    revision: int,
+    package_type: Optional[str] = None,
+    account: Optional[str] = None,
+) -> str:
+    """
+    按 (account, 题目 URL, revision) 生成缓存键；不指定 revision 时下载的是最新包，不应缓存。
+
+    account 传登录名，键中只保留其哈希。
+    """
+    key = f"url:{problem_url.rstrip('/')}/revision:{revision}/type:{package_type or 'default'}"
+    return _account_namespace(account) + key
+
+
+class PackageCache:
+    """
+    按 sha256 寻址的本地题目包缓存。
+
+    内容存放在 ``<root>/blobs/<sha256 前两位>/<sha256>``，``<root>/index.json`` 记录缓存键到 blob 的映射
+    和最近使用时间；相同内容只保存一份。总大小超过 max_bytes 时按最近最少使用淘汰，
+    每个 blob 在本进程内首次命中（或文件大小、修改时间变化后）重新计算 sha256，与索引不一致的 blob
+    会被丢弃并按未命中处理。
+
+    多个进程可以共用同一个目录：写回索引时持有 ``index.lock`` 文件锁，先合并磁盘上其他进程写入的条目再保存。
+    命中时的最近使用时间批量写回，进程退出前可调用 flush() 保存。
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        *,
+        max_bytes: int = DEFAULT_PACKAGE_CACHE_MAX_BYTES,
+        verify_on_read: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            root: 缓存目录，首次写入时创建
+            max_bytes: blob 总大小上限（字节）
+            verify_on_read: 命中时是否重新校验 sha256
+            clock: 记录最近使用时间的时钟
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes 必须大于 0")
+
+        self.root = Path(root).expanduser()
+        self.max_bytes = max_bytes
+        self.verify_on_read = verify_on_read
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: Optional[dict[str, dict[str, Any]]] = None
+        self._removed: set[str] = set()
+        self._verified: dict[str, tuple[int, int]] = {}
+        self._index_mtime_ns: Optional[int] = None
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._corrupted = 0
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / INDEX_FILENAME
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def _read_index_file(self) -> dict[str, dict[str, Any]]:
+        try:
+            self._index_mtime_ns = self._index_path.stat().st_mtime_ns
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        entries = data.get("entries") if data.get("version") == INDEX_VERSION else None
+        return entries if isinstance(entries, dict) else {}
+
+    def _load_entries(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read_index_file()
+        return self._entries
+
+    def _merge_index_file(self) -> None:
+        """把磁盘上其他进程写入的条目合并进内存；本进程删除过的键不会被重新加回。"""
+        merged = self._read_index_file()
+        for key in self._removed:
+            merged.pop(key, None)
+        for key, entry in self._load_entries().items():
+            on_disk = merged.get(key)
+            if on_disk is not None and on_disk.get("sha256") == entry["sha256"]:
+                entry["last_used"] = max(entry["last_used"], on_disk.get("last_used", 0))
+            merged[key] = entry
+        self._entries = merged
+
+    def _index_changed_on_disk(self) -> bool:
+        try:
+            return self._index_path.stat().st_mtime_ns != self._index_mtime_ns
+        except FileNotFoundError:
+            return False
+
+    @contextlib.contextmanager
+    def _index_file_lock(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with (self.root / INDEX_LOCK_FILENAME).open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _save_entries(self, *, evict: bool = False) -> None:
+        with self._index_file_lock():
+            self._merge_index_file()
+            self._removed.clear()
+            if evict:
+                # 在合并后的完整索引上淘汰，其他进程新写入的包也计入总大小。
+                self._evict()
+            payload = json.dumps(
+                {"version": INDEX_VERSION, "entries": self._load_entries()},
+                ensure_ascii=False,
+                sort_keys=True,
+            )
+            fd, temp_name = tempfile.mkstemp(dir=self.root, prefix=".index-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(temp_name, self._index_path)
+            self._index_mtime_ns = self._index_path.stat().st_mtime_ns
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """把尚未写回的最近使用时间保存到索引。"""
+        with self._lock:
+            if self._dirty:
+                self._save_entries()
+
+    def _blob_sizes(self) -> dict[str, int]:
+        return {
+            entry["sha256"]: entry["size_bytes"]
+            for entry in self._load_entries().values()
+        }
+
+    def _remove_entry(self, key: str) -> None:
+        entries = self._load_entries()
+        entry = entries.pop(key, None)
+        if entry is None:
+            return
+        self._removed.add(key)
+        if not any(other["sha256"] == entry["sha256"] for other in entries.values()):
+            self._blob_path(entry["sha256"]).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        entries = self._load_entries()
+        blob_sizes = self._blob_sizes()
+        total_bytes = sum(blob_sizes.values())
+        if total_bytes <= self.max_bytes:
+            return
+        references = Counter(entry["sha256"] for entry in entries.values())
+        for key in sorted(entries, key=lambda key: entries[key]["last_used"]):
+            if total_bytes <= self.max_bytes:
+                break
+            sha256 = entries.pop(key)["sha256"]
+            self._removed.add(key)
+            references[sha256] -= 1
+            if references[sha256] == 0:
+                # 同一 blob 被多个键引用时，最后一个引用被淘汰才真正释放空间。
+                total_bytes -= blob_sizes[sha256]
+                self._blob_path(sha256).unlink(missing_ok=True)
+            self._evictions += 1
+
+    def _blob_is_valid(self, blob_path: Path, entry: dict[str, Any]) -> bool:
+        try:
+            blob_stat = blob_path.stat()
+        except FileNotFoundError:
+            return False
+        if blob_stat.st_size != entry["size_bytes"]:
+            return False
+        if not self.verify_on_read:
+            return True
+        signature = (blob_stat.st_size, blob_stat.st_mtime_ns)
+        if self._verified.get(entry["sha256"]) == signature:
+            return True
+        if DownloadDigest.from_file(blob_path).sha256 != entry["sha256"]:
+            return False
+        self._verified[entry["sha256"]] = signature
+        return True
+
+    def lookup(self, key: str) -> Optional[DownloadedFile]:
+        """
+        查找缓存键对应的 blob。
+
+        Returns:
+            Optional[DownloadedFile]: 命中时返回 blob 路径和元数据（path 指向缓存内文件，调用方不应修改），
+            未命中或校验失败时返回 None
+        """
+        with self._lock:
+            entry = self._load_entries().get(key)
+            if entry is None and self._index_changed_on_disk():
+                self._merge_index_file()
+                entry = self._load_entries().get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            blob_path = self._blob_path(entry["sha256"])
+            if not self._blob_is_valid(blob_path, entry):
+                self._corrupted += 1
+                self._misses += 1
+                blob_path.unlink(missing_ok=True)
+                self._verified.pop(entry["sha256"], None)
+                entries = self._load_entries()
+                for other_key in [
+                    other_key
+                    for other_key, other in entries.items()
+                    if other["sha256"] == entry["sha256"]
+                ]:
+                    entries.pop(other_key)
+                    self._removed.add(other_key)
+                self._save_entries()
+                return None
+
+            entry["last_used"] = self._clock()
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= LAST_USED_FLUSH_SECONDS:
+                self._save_entries()
+            self._hits += 1
+            return DownloadedFile(
+                path=str(blob_path),
+                size_bytes=entry["size_bytes"],
+                sha256=entry["sha256"],
+                detected_content_kind=entry.get("detected_content_kind"),
+            )
+
+    def _record_vanished_hit(self) -> None:
+        # lookup 返回后 blob 被其他线程或进程淘汰，这次读取按未命中计。
+        with self._lock:
+            self._hits -= 1
+            self._misses += 1
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """返回缓存内容的 bytes，未命中时返回 None。"""
+        cached = self.lookup(key)
+        if cached is None:
+            return None
+        try:
+            return Path(cached.path).read_bytes()
+        except FileNotFoundError:
+            self._record_vanished_hit()
+            return None
+
+    def copy_to(self, key: str, target_path: Union[str, Path]) -> Optional[DownloadedFile]:
+        """把缓存内容原子复制到 target_path，未命中时返回 None。"""
+        cached = self.lookup(key)
+        if cached is None:
+            return None
+        target = Path(target_path).expanduser()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}-", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(cached.path, temp_name)
+        except FileNotFoundError:
+            Path(temp_name).unlink(missing_ok=True)
+            self._record_vanished_hit()
+            return None
+        os.replace(temp_name, target)
+        return cached.model_copy(update={"path": str(target)})
+
+    def put_file(self, key: str, downloaded: DownloadedFile) -> None:
+        """把已下载到磁盘的文件登记到缓存（内容被复制，原文件保持不变）。"""
+        with self._lock:
+            blob_path = self._blob_path(downloaded.sha256)
+            if not blob_path.is_file():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, temp_name = tempfile.mkstemp(dir=blob_path.parent, suffix=".tmp")
+                os.close(fd)
+                shutil.copyfile(downloaded.path, temp_name)
+                os.replace(temp_name, blob_path)
+            self._removed.discard(key)
+            self._load_entries()[key] = {
+                "sha256": downloaded.sha256,
+                "size_bytes": downloaded.size_bytes,
+                "detected_content_kind": downloaded.detected_content_kind,
+                "last_used": self._clock(),
+            }
+            self._save_entries(evict=True)
+
+    def put_bytes(self, key: str, content: bytes) -> None:
+        """把内存中的内容登记到缓存。"""
+        digest = DownloadDigest.from_chunks([content])
+        with tempfile.TemporaryDirectory(prefix="polygon-cache-") as temp_dir:
+            temp_path = Path(temp_dir) / "content"
+            temp_path.write_bytes(content)
+            self.put_file(
+                key,
+                DownloadedFile(
+                    path=str(temp_path),
+                    size_bytes=digest.size_bytes,
+                    sha256=digest.sha256,
+                    detected_content_kind=digest.detected_content_kind,
+                ),
+            )
+
+    def fetch_bytes(self, key: str, download: Callable[[], bytes]) -> bytes:
+        """命中时返回缓存内容，否则调用 download 下载；只有识别为 zip 的内容才写入缓存。"""
+        cached = self.get_bytes(key)
+        if cached is not None:
+            return cached
+        content = download()
+        if sniff_content_kind(content[:SNIFF_BYTES]) == CACHEABLE_CONTENT_KIND:
+            self.put_bytes(key, content)
+        return content
+
+    def fetch_to_file(
+        self,
+        key: str,
+        target_path: Union[str, Path],
+        download: Callable[[], DownloadedFile],
+    ) -> DownloadedFile:
+        """命中时把缓存内容复制到 target_path，否则调用 download 流式下载；只有识别为 zip 的内容才写入缓存。"""
+        cached = self.copy_to(key, target_path)
+        if cached is not None:
+            return cached
+        downloaded = download()
+        if downloaded.detected_content_kind == CACHEABLE_CONTENT_KIND:
+            self.put_file(key, downloaded)
+        return downloaded
+
+    def clear(self) -> int:
+        """删除全部缓存内容，返回删除的条目数。"""
+        with self._lock:
+            entries = self._load_entries()
+            removed = len(entries)
+            for key in list(entries):
+                self._remove_entry(key)
+            self._save_entries()
+            return removed
+
+    def stats(self) -> dict[str, Any]:
+        """返回条目数、占用字节数以及命中、未命中、淘汰和校验失败计数。"""
+        with self._lock:
+            blob_sizes = self._blob_sizes()
+            return {
+                "root": str(self.root),
+                "entries": len(self._load_entries()),
+                "blobs": len(blob_sizes),
+                "total_bytes": sum(blob_sizes.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "corrupted": self._corrupted,
+            }
@@ -1,4 +1,7 @@
-from typing import Optional
+import functools
+import inspect
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
 
 from .api.problem_checker import get_problem_checker
 from .api.problem_content import (
@@ -23,6 +26,7 @@ from .api.problem_packages import (
     build_problem_package,
     commit_problem_changes,
     download_problem_package,
+    download_problem_package_to_file,
     get_problem_packages,
 )
 from .api.problem_save_statement import save_problem_statement
@@ -47,23 +51,33 @@ from .api.problem_tests_extended import (
     save_problem_validator_test,
     set_problem_test_group,
     view_problem_test_answer,
+    view_problem_test_answer_to_file,
     view_problem_test_groups,
     view_problem_test_input,
+    view_problem_test_input_to_file,
 )
 from .api.problem_update_info import update_problem_info
 from .api.problem_update_working_copy import update_problem_working_copy
 from .api.problem_validator import get_problem_validator
 from .api.problem_view_file import view_problem_file
 from .api.problem_view_solution import view_problem_solution
+from .package_cache import build_problem_package_cache_key
+from .response_cache import build_response_cache_key
+from .tracing import traced_methods
+from .utils.problem_utils import check_write_access
 from .models import (
+    AccessDeniedException,
     AccessType,
     CheckerTest,
     CheckerTestVerdict,
+    DownloadedFile,
     File,
     FileType,
     FeedbackPolicy,
     LanguageMap,
+    LazyTest,
     Package,
+    PackageState,
     PackageType,
     PointsPolicy,
     ProblemFiles,
@@ -79,6 +93,81 @@ from .models import (
 )
 
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _access_checked(method: F) -> F:
+    """写操作被拒绝时失效缓存的访问权限，下次写入前重新查询。"""
+
+    @functools.wraps(method)
+    def wrapper(self: "ProblemSession", *args: Any, **kwargs: Any) -> Any:
+        try:
+            return method(self, *args, **kwargs)
+        except AccessDeniedException:
+            self._invalidate_access_type()
+            raise
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _write_operation(method: F) -> F:
+    """在 _access_checked 的基础上，写操作结束后（无论成败）失效该题目的响应缓存。"""
+    checked = _access_checked(method)
+
+    @functools.wraps(method)
+    def wrapper(self: "ProblemSession", *args: Any, **kwargs: Any) -> Any:
+        try:
+            return checked(self, *args, **kwargs)
+        finally:
+            self._invalidate_responses()
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _cached_read(api_method: str, cacheable: Optional[Callable[[Any], bool]] = None) -> Callable[[F], F]:
+    """
+    客户端配置了 response_cache 时，按 (api_method, problem_id, pin, 参数) 缓存读接口的结果。
+
+    cacheable 用于排除会在没有写操作的情况下自行变化的结果，例如仍在构建中的题目包列表。
+    """
+
+    def decorator(method: F) -> F:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self: "ProblemSession", *args: Any, **kwargs: Any) -> Any:
+            cache = self.client.response_cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop("self")
+            key = build_response_cache_key(
+                api_method,
+                self.problem_id,
+                self.pin,
+                params,
+                namespace=self.client.api_key,
+            )
+            return cache.get_or_fetch(
+                self.problem_id,
+                key,
+                lambda: method(self, *args, **kwargs),
+                cacheable,
+            )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _packages_settled(packages: list[Package]) -> bool:
+    return all(package.state in (PackageState.READY, PackageState.FAILED) for package in packages)
+
+
+@traced_methods(lambda session: {"problem_id": session.problem_id})
 class ProblemSession:
     """处理特定题目的会话类。"""
 
@@ -89,13 +178,50 @@ class ProblemSession:
         self._access_type: Optional[AccessType] = None
 
     def _ensure_access_type(self) -> AccessType:
-        if self._access_type is None:
-            problems = self.client.get_problems(problem_id=self.problem_id)
-            if not problems:
-                raise ValueError(f"无法获取题目 {self.problem_id} 的访问权限")
-            self._access_type = problems[0].accessType
-        return self._access_type
+        """
+        返回写操作使用的访问权限。
+
+        优先使用会话上显式设置的权限，其次是客户端共享的 access_types 缓存；
+        乐观模式下未命中缓存时直接按 WRITE 处理，由 Polygon 自身拒绝无权限的写入。
+        """
+        if self._access_type is not None:
+            return self._access_type
+
+        access_type = self.client.access_types.get(self.problem_id)
+        if access_type is not None:
+            return access_type
+        if self.client.optimistic_writes:
+            return AccessType.WRITE
+
+        problems = self.client.get_problems(problem_id=self.problem_id)
+        if not problems:
+            raise ValueError(f"无法获取题目 {self.problem_id} 的访问权限")
+        access_type = problems[0].accessType
+        self.client.access_types.set(self.problem_id, access_type)
+        return access_type
+
+    def _invalidate_access_type(self) -> None:
+        self._access_type = None
+        self.client.access_types.invalidate(self.problem_id)
+
+    def _invalidate_responses(self) -> None:
+        cache = self.client.response_cache
+        if cache is not None:
+            cache.invalidate(self.problem_id)
+
+    @_access_checked
+    def ensure_write_access(self) -> AccessType:
+        """
+        预先确认当前凭证对题目有写权限，并把结果写入共享缓存。
+
+        适合在批量写入前调用一次，避免并发写入各自触发权限查询；
+        乐观模式下未命中缓存时直接返回 WRITE。
+        """
+        access_type = self._ensure_access_type()
+        check_write_access(access_type)
+        return access_type
 
+    @_cached_read("problem.info")
     def get_info(self) -> ProblemInfo:
         return get_problem_info(
             self.client.api_key,
@@ -103,8 +229,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def update_info(
         self,
         input_file: Optional[str] = None,
@@ -125,8 +253,10 @@ class ProblemSession:
             time_limit,
             memory_limit,
             interactive,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.statements")
     def get_statements(self) -> LanguageMap[Statement]:
         return get_problem_statements(
             self.client.api_key,
@@ -134,8 +264,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_statement(
         self,
         lang: str,
@@ -166,11 +298,13 @@ class ProblemSession:
             interaction,
             notes,
             tutorial,
+            transport=self.client.transport,
         )
         if not isinstance(response, dict):
             return {"result": response}
         return response
 
+    @_cached_read("problem.statementResources")
     def get_statement_resources(self) -> list[File]:
         return get_problem_statement_resources(
             self.client.api_key,
@@ -178,8 +312,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_statement_resource(
         self,
         name: str,
@@ -196,8 +332,10 @@ class ProblemSession:
             file_content,
             self.pin,
             check_existing,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.checker")
     def get_checker(self) -> str:
         return get_problem_checker(
             self.client.api_key,
@@ -205,8 +343,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def set_checker(self, checker: str):
         return set_problem_checker(
             self.client.api_key,
@@ -216,8 +356,10 @@ class ProblemSession:
             self._ensure_access_type(),
             checker,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.validator")
     def get_validator(self) -> str:
         return get_problem_validator(
             self.client.api_key,
@@ -225,8 +367,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.extraValidators")
     def get_extra_validators(self) -> list[str]:
         return get_problem_extra_validators(
             self.client.api_key,
@@ -234,8 +378,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def set_validator(self, validator: str):
         return set_problem_validator(
             self.client.api_key,
@@ -245,8 +391,10 @@ class ProblemSession:
             self._ensure_access_type(),
             validator,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.interactor")
     def get_interactor(self) -> str:
         return get_problem_interactor(
             self.client.api_key,
@@ -254,8 +402,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def set_interactor(self, interactor: str):
         return set_problem_interactor(
             self.client.api_key,
@@ -265,8 +415,10 @@ class ProblemSession:
             self._ensure_access_type(),
             interactor,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.files")
     def get_files(self) -> ProblemFiles:
         return get_problem_files(
             self.client.api_key,
@@ -274,8 +426,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.viewFile")
     def view_file(self, file_type: FileType, name: str) -> bytes:
         return view_problem_file(
             self.client.api_key,
@@ -285,8 +439,10 @@ class ProblemSession:
             file_type,
             name,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_file(
         self,
         file_type: FileType,
@@ -313,8 +469,10 @@ class ProblemSession:
             stages,
             assets,
             check_existing,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.script")
     def view_script(self, testset: str) -> bytes:
         return view_problem_script(
             self.client.api_key,
@@ -323,8 +481,10 @@ class ProblemSession:
             self.problem_id,
             testset,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_script(self, testset: str, source: str):
         return save_problem_script(
             self.client.api_key,
@@ -335,8 +495,10 @@ class ProblemSession:
             testset,
             source,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.tests")
     def get_tests(self, testset: str, no_inputs: Optional[bool] = None) -> list[Test]:
         return get_problem_tests(
             self.client.api_key,
@@ -346,8 +508,27 @@ class ProblemSession:
             testset,
             self.pin,
             no_inputs,
+            transport=self.client.transport,
         )
 
+    def get_tests_lazy(self, testset: str, prefetch_inputs: bool = False) -> list[LazyTest]:
+        """
+        获取测试列表，每个测试的输入在首次调用 load_input() 时才下载。
+
+        默认只请求元数据（noInputs=true）；prefetch_inputs=True 时一次性获取手动测试的输入，
+        生成测试仍按需下载。输入通过 view_test_input 获取，启用响应缓存时同一输入在缓存有效期内只下载一次。
+        """
+        return [
+            LazyTest(**test.model_dump()).bind_input_loader(
+                functools.partial(self._read_test_input, testset, test.index)
+            )
+            for test in self.get_tests(testset, no_inputs=not prefetch_inputs)
+        ]
+
+    def _read_test_input(self, testset: str, test_index: int) -> str:
+        return self.view_test_input(testset, test_index).decode("utf-8", errors="replace")
+
+    @_cached_read("problem.testInput")
     def view_test_input(self, testset: str, test_index: int) -> bytes:
         return view_problem_test_input(
             self.client.api_key,
@@ -357,8 +538,10 @@ class ProblemSession:
             testset,
             test_index,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.testAnswer")
     def view_test_answer(self, testset: str, test_index: int) -> bytes:
         return view_problem_test_answer(
             self.client.api_key,
@@ -368,8 +551,48 @@ class ProblemSession:
             testset,
             test_index,
             self.pin,
+            transport=self.client.transport,
         )
 
+    def download_test_input_to_file(
+        self,
+        testset: str,
+        test_index: int,
+        target_path: Union[str, Path],
+    ) -> DownloadedFile:
+        """流式下载测试输入到 target_path：分块写入临时文件后原子重命名，支持断点续传。"""
+        return view_problem_test_input_to_file(
+            self.client.api_key,
+            self.client.api_secret,
+            self.client.base_url,
+            self.problem_id,
+            testset,
+            test_index,
+            target_path,
+            self.pin,
+            transport=self.client.transport,
+        )
+
+    def download_test_answer_to_file(
+        self,
+        testset: str,
+        test_index: int,
+        target_path: Union[str, Path],
+    ) -> DownloadedFile:
+        """流式下载测试答案到 target_path：分块写入临时文件后原子重命名，支持断点续传。"""
+        return view_problem_test_answer_to_file(
+            self.client.api_key,
+            self.client.api_secret,
+            self.client.base_url,
+            self.problem_id,
+            testset,
+            test_index,
+            target_path,
+            self.pin,
+            transport=self.client.transport,
+        )
+
+    @_write_operation
     def save_test(
         self,
         testset: str,
@@ -402,8 +625,10 @@ class ProblemSession:
             test_output_for_statements,
             verify_input_output_for_statements,
             check_existing,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.validatorTests")
     def get_validator_tests(self) -> list[ValidatorTest]:
         return get_problem_validator_tests(
             self.client.api_key,
@@ -411,8 +636,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_validator_test(
         self,
         test_index: int,
@@ -435,8 +662,10 @@ class ProblemSession:
             test_group,
             testset,
             check_existing,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.checkerTests")
     def get_checker_tests(self) -> list[CheckerTest]:
         return get_problem_checker_tests(
             self.client.api_key,
@@ -444,8 +673,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_checker_test(
         self,
         test_index: int,
@@ -468,8 +699,10 @@ class ProblemSession:
             test_output,
             test_answer,
             check_existing,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.viewTestGroup")
     def view_test_groups(self, testset: str, group: Optional[str] = None) -> list[TestGroup]:
         return view_problem_test_groups(
             self.client.api_key,
@@ -479,8 +712,10 @@ class ProblemSession:
             testset,
             self.pin,
             group,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_test_group(
         self,
         testset: str,
@@ -501,8 +736,10 @@ class ProblemSession:
             points_policy,
             feedback_policy,
             dependencies,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def set_test_group(
         self,
         testset: str,
@@ -521,8 +758,10 @@ class ProblemSession:
             self.pin,
             test_index,
             test_indices,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def enable_groups(self, testset: str, enable: bool):
         return enable_problem_groups(
             self.client.api_key,
@@ -533,8 +772,10 @@ class ProblemSession:
             testset,
             enable,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def enable_points(self, enable: bool):
         return enable_problem_points(
             self.client.api_key,
@@ -544,8 +785,10 @@ class ProblemSession:
             self._ensure_access_type(),
             enable,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.solutions")
     def get_solutions(self) -> list[Solution]:
         return get_problem_solutions(
             self.client.api_key,
@@ -553,8 +796,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.viewSolution")
     def view_solution(self, name: str) -> bytes:
         return view_problem_solution(
             self.client.api_key,
@@ -563,8 +808,10 @@ class ProblemSession:
             self.problem_id,
             name,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_solution(
         self,
         name: str,
@@ -585,8 +832,10 @@ class ProblemSession:
             source_type,
             tag,
             check_existing,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def edit_solution_extra_tags(
         self,
         name: str,
@@ -607,8 +856,10 @@ class ProblemSession:
             testset,
             test_group,
             tag,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.viewTags")
     def get_tags(self) -> list[str]:
         return get_problem_tags(
             self.client.api_key,
@@ -616,8 +867,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_tags(self, tags: list[str]):
         return save_problem_tags(
             self.client.api_key,
@@ -627,8 +880,10 @@ class ProblemSession:
             self._ensure_access_type(),
             tags,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.viewGeneralDescription")
     def get_general_description(self) -> str:
         return get_problem_general_description(
             self.client.api_key,
@@ -636,8 +891,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_general_description(self, description: str):
         return save_problem_general_description(
             self.client.api_key,
@@ -647,8 +904,10 @@ class ProblemSession:
             self._ensure_access_type(),
             description,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.viewGeneralTutorial")
     def get_general_tutorial(self) -> str:
         return get_problem_general_tutorial(
             self.client.api_key,
@@ -656,8 +915,10 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def save_general_tutorial(self, tutorial: str):
         return save_problem_general_tutorial(
             self.client.api_key,
@@ -667,8 +928,10 @@ class ProblemSession:
             self._ensure_access_type(),
             tutorial,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_cached_read("problem.packages", cacheable=_packages_settled)
     def get_packages(self) -> list[Package]:
         return get_problem_packages(
             self.client.api_key,
@@ -676,6 +939,7 @@ class ProblemSession:
             self.client.base_url,
             self.problem_id,
             self.pin,
+            transport=self.client.transport,
         )
 
     def download_package(
@@ -683,16 +947,76 @@ class ProblemSession:
         package_id: int,
         package_type: Optional[PackageType] = None,
     ) -> bytes:
-        return download_problem_package(
-            self.client.api_key,
-            self.client.api_secret,
-            self.client.base_url,
+        def download() -> bytes:
+            return download_problem_package(
+                self.client.api_key,
+                self.client.api_secret,
+                self.client.base_url,
+                self.problem_id,
+                package_id,
+                self.pin,
+                package_type,
+                transport=self.client.transport,
+            )
+
+        cache = self.client.package_cache
+        if cache is None:
+            return download()
+        return cache.fetch_bytes(self._package_cache_key(package_id, package_type), download)
+
+    def download_package_to_file(
+        self,
+        package_id: int,
+        target_path: Union[str, Path],
+        package_type: Optional[PackageType] = None,
+    ) -> DownloadedFile:
+        """流式下载题目包到 target_path：分块写入临时文件后原子重命名，支持断点续传。"""
+        def download() -> DownloadedFile:
+            return download_problem_package_to_file(
+                self.client.api_key,
+                self.client.api_secret,
+                self.client.base_url,
+                self.problem_id,
+                package_id,
+                target_path,
+                self.pin,
+                package_type,
+                transport=self.client.transport,
+            )
+
+        cache = self.client.package_cache
+        if cache is None:
+            return download()
+        return cache.fetch_to_file(
+            self._package_cache_key(package_id, package_type),
+            target_path,
+            download,
+        )
+
+    def lookup_cached_package(
+        self,
+        package_id: int,
+        package_type: Optional[PackageType] = None,
+    ) -> Optional[DownloadedFile]:
+        """
+        返回本地缓存中题目包的元数据，未配置缓存或未命中时返回 None。
+
+        返回的 path 指向缓存内的 blob，调用方只能读取；只需要大小和 sha256 时不必再复制一份。
+        """
+        cache = self.client.package_cache
+        if cache is None:
+            return None
+        return cache.lookup(self._package_cache_key(package_id, package_type))
+
+    def _package_cache_key(self, package_id: int, package_type: Optional[PackageType]) -> str:
+        return build_problem_package_cache_key(
             self.problem_id,
             package_id,
-            self.pin,
-            package_type,
+            package_type.value if package_type is not None else None,
+            account=self.client.api_key,
         )
 
+    @_write_operation
     def build_package(self, full: bool, verify: bool):
         return build_problem_package(
             self.client.api_key,
@@ -703,8 +1027,10 @@ class ProblemSession:
             full,
             verify,
             self.pin,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def update_working_copy(self) -> dict:
         return update_problem_working_copy(
             self.client.api_key,
@@ -713,8 +1039,10 @@ class ProblemSession:
             self.problem_id,
             self.pin,
             self._ensure_access_type(),
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def commit_changes(
         self,
         minor_changes: Optional[bool] = None,
@@ -729,8 +1057,10 @@ class ProblemSession:
             self.pin,
             minor_changes,
             message,
+            transport=self.client.transport,
         )
 
+    @_write_operation
     def discard_working_copy(self) -> dict:
         return discard_problem_working_copy(
             self.client.api_key,
@@ -739,4 +1069,5 @@ class ProblemSession:
             self.problem_id,
             self.pin,
             self._ensure_access_type(),
+            transport=self.client.transport,
         )
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+
+from .models import Problem
+
+
+class ProblemSnapshot(NamedTuple):
+    """problems.list 中能反映题目内容是否变化的字段。"""
+
+    revision: Optional[int]
+    modified: bool
+    latest_package: Optional[int]
+
+    @classmethod
+    def from_problem(cls, problem: Problem) -> "ProblemSnapshot":
+        return cls(problem.revision, problem.modified, problem.latestPackage)
+
+
+class ProblemChangeReport(BaseModel):
+    """
+    一次变化探测的结果。
+
+    Attributes:
+        changed: revision、modified 或 latestPackage 与上次快照不同的题目
+        unchanged: 与上次快照一致的题目
+        new: 此前没有快照的题目（首次探测时全部归入此类）
+        missing: 期望检查但不在 problems.list 结果中的题目（已删除或失去访问权限）
+        checked_at: 探测时间（Unix 秒）
+    """
+
+    changed: list[int] = Field(default_factory=list)
+    unchanged: list[int] = Field(default_factory=list)
+    new: list[int] = Field(default_factory=list)
+    missing: list[int] = Field(default_factory=list)
+    checked_at: float = 0.0
+
+    @property
+    def stale(self) -> list[int]:
+        """需要刷新本地数据的题目：发生变化或已无法访问。"""
+        return sorted(self.changed + self.missing)
+
+
+class ProblemSnapshotTracker:
+    """
+    记录每道题最近一次在 problems.list / contest.problems 中看到的快照。
+
+    一次列表调用即可判断大量题目是否有变化：快照一致的题目可以继续使用本地缓存，
+    只需对 changed 和 missing 中的题目做定向刷新。快照变化时依次通知已注册的监听者，
+    例如 ResponseCache 借此批量失效对应题目的缓存。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, ProblemSnapshot] = {}
+        self._listeners: list[Callable[[int], Any]] = []
+        self._probes = 0
+        self._changes = 0
+
+    def add_listener(self, listener: Callable[[int], Any]) -> None:
+        """注册快照变化（或题目消失）时的回调，参数为 problem_id。"""
+        self._listeners.append(listener)
+
+    def get(self, problem_id: int) -> Optional[ProblemSnapshot]:
+        with self._lock:
+            return self._snapshots.get(problem_id)
+
+    def observe(
+        self,
+        problems: Iterable[Problem],
+        expected_ids: Optional[Iterable[int]] = None,
+    ) -> ProblemChangeReport:
+        """
+        用一次列表调用的结果更新快照。
+
+        Args:
+            problems: problems.list 或 contest.problems 返回的题目
+            expected_ids: 期望出现在结果中的题目；不传时不判断 missing
+
+        Returns:
+            ProblemChangeReport: 按 changed / unchanged / new / missing 分类的题目 ID
+        """
+        report = ProblemChangeReport(checked_at=self._clock())
+        seen: set[int] = set()
+        with self._lock:
+            for problem in problems:
+                seen.add(problem.id)
+                snapshot = ProblemSnapshot.from_problem(problem)
+                previous = self._snapshots.get(problem.id)
+                self._snapshots[problem.id] = snapshot
+                if previous is None:
+                    report.new.append(problem.id)
+                elif previous != snapshot:
+                    report.changed.append(problem.id)
+                else:
+                    report.unchanged.append(problem.id)
+
+            if expected_ids is not None:
+                for problem_id in dict.fromkeys(expected_ids):
+                    if problem_id not in seen:
+                        report.missing.append(problem_id)
+                        self._snapshots.pop(problem_id, None)
+
+            self._changes += len(report.changed) + len(report.missing)
+
+        for problem_id in report.stale:
+            for listener in self._listeners:
+                listener(problem_id)
+        return report
+
+    def record_probe(self) -> None:
+        with self._lock:
+            self._probes += 1
+
+    def stats(self) -> dict[str, Any]:
+        """返回已跟踪的题目数、探测次数和检测到的变化次数。"""
+        with self._lock:
+            return {
+                "tracked_problems": len(self._snapshots),
+                "probes": self._probes,
+                "changes": self._changes,
+            }
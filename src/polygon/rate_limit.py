@@ -0,0 +1,216 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+READ_BUCKET = "read"
+WRITE_BUCKET = "write"
+
+_request_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "polygon_request_priority",
+    default=PRIORITY_INTERACTIVE,
+)
+
+
+@contextlib.contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    在上下文内为发出的请求设置排队优先级，数值越小越先放行。
+
+    批量上传等后台任务使用 PRIORITY_BULK，交互式读取保持默认的 PRIORITY_INTERACTIVE。
+    contextvars 不会自动传进线程池 worker，需要在 worker 内部进入该上下文。
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_request_priority() -> int:
+    return _request_priority.get()
+
+
+def bucket_for_http_method(http_method: str) -> str:
+    """POST 请求计入写预算，其余请求计入读预算。"""
+    return WRITE_BUCKET if http_method.upper() == "POST" else READ_BUCKET
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+        self.waiters: list[tuple[int, int]] = []
+        self.acquired = 0
+        self.throttled = 0
+        self.server_throttled = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def refill(self, now: float) -> None:
+        if self.unlimited:
+            return
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until_token(self) -> float:
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """
+    按令牌桶限制 Polygon API 请求速率。
+
+    读请求和写请求（POST）各有独立的速率和突发容量；同一个桶内的等待者按
+    (优先级, 到达顺序) 排队，交互式请求会排在批量任务前面。收到 429 时清空对应桶的令牌，
+    让共用同一 API key 的其他请求一起放慢。速率为 0 表示不限速，但仍然统计请求。
+    """
+
+    def __init__(
+        self,
+        *,
+        read_rate: float = 0.0,
+        write_rate: float = 0.0,
+        read_burst: Optional[float] = None,
+        write_burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            read_rate: 读请求每秒放行数，0 表示不限速
+            write_rate: 写请求每秒放行数，0 表示不限速
+            read_burst: 读请求突发容量，默认等于 max(1, read_rate)
+            write_burst: 写请求突发容量，默认等于 max(1, write_rate)
+            clock: 计算令牌补充的时钟
+        """
+        if read_rate < 0 or write_rate < 0:
+            raise ValueError("限速速率不能小于 0")
+        for burst in (read_burst, write_burst):
+            if burst is not None and burst < 1:
+                raise ValueError("突发容量不能小于 1")
+
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        now = clock()
+        self._buckets = {
+            READ_BUCKET: _Bucket(read_rate, read_burst or max(1.0, read_rate), now),
+            WRITE_BUCKET: _Bucket(write_rate, write_burst or max(1.0, write_rate), now),
+        }
+
+    def acquire(self, bucket_name: str, priority: Optional[int] = None) -> float:
+        """
+        等待并取得一个令牌。
+
+        Args:
+            bucket_name: read 或 write
+            priority: 排队优先级；不传时使用 request_priority 上下文中的值
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        bucket = self._buckets[bucket_name]
+        ticket = (current_request_priority() if priority is None else priority, next(self._sequence))
+        started = self._clock()
+        with self._condition:
+            if bucket.unlimited:
+                bucket.acquired += 1
+                return 0.0
+
+            heapq.heappush(bucket.waiters, ticket)
+            bucket.max_queue_depth = max(bucket.max_queue_depth, len(bucket.waiters))
+            blocked = False
+            try:
+                while True:
+                    bucket.refill(self._clock())
+                    if bucket.waiters[0] == ticket and bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        break
+                    timeout = bucket.seconds_until_token() if bucket.waiters[0] == ticket else None
+                    blocked = True
+                    self._condition.wait(timeout)
+            finally:
+                bucket.waiters.remove(ticket)
+                heapq.heapify(bucket.waiters)
+                self._condition.notify_all()
+
+            waited = max(0.0, self._clock() - started) if blocked else 0.0
+            bucket.acquired += 1
+            if blocked:
+                bucket.throttled += 1
+                bucket.total_wait_seconds += waited
+                bucket.max_wait_seconds = max(bucket.max_wait_seconds, waited)
+            return waited
+
+    def record_server_throttle(self, bucket_name: str) -> None:
+        """记录一次服务端限流（429），并清空该桶的令牌。"""
+        bucket = self._buckets[bucket_name]
+        with self._condition:
+            bucket.server_throttled += 1
+            if not bucket.unlimited:
+                bucket.refill(self._clock())
+                bucket.tokens = 0.0
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """返回每个桶的速率、当前令牌、排队深度、等待时间和限流次数。"""
+        with self._condition:
+            now = self._clock()
+            result: dict[str, dict[str, Any]] = {}
+            for name, bucket in self._buckets.items():
+                bucket.refill(now)
+                result[name] = {
+                    "rate_per_second": bucket.rate,
+                    "burst": bucket.burst,
+                    "available_tokens": None if bucket.unlimited else round(bucket.tokens, 3),
+                    "queue_depth": len(bucket.waiters),
+                    "max_queue_depth": bucket.max_queue_depth,
+                    "acquired": bucket.acquired,
+                    "throttled": bucket.throttled,
+                    "server_throttled": bucket.server_throttled,
+                    "total_wait_seconds": round(bucket.total_wait_seconds, 3),
+                    "max_wait_seconds": round(bucket.max_wait_seconds, 3),
+                }
+            return result
+
+
+class RateLimitedTransport:
+    """在任意 transport 外层按 RateLimiter 排队放行请求，并把 429 响应反馈给限速器。"""
+
+    def __init__(self, transport: Any, rate_limiter: RateLimiter):
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        bucket_name = bucket_for_http_method(method)
+        self.rate_limiter.acquire(bucket_name)
+        response = self.transport.request(method, url, **kwargs)
+        if getattr(response, "status_code", None) == 429:
+            self.rate_limiter.record_server_throttle(bucket_name)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def __enter__(self) -> "RateLimitedTransport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"RateLimitedTransport({self.transport!r})"
@@ -0,0 +1,23 @@
+from typing import Any
+
+SENSITIVE_FIELD_NAMES = frozenset({"pin", "password", "api_secret", "apisig"})
+REDACTED_VALUE = "***"
+
+
+def is_sensitive_field_name(field_name: str) -> bool:
+    """判断字段名是否属于需要脱敏的凭证字段（不区分大小写）。"""
+    return field_name.lower() in SENSITIVE_FIELD_NAMES
+
+
+def sanitize_sensitive_data(value: Any) -> Any:
+    """递归脱敏常见敏感字段，避免工具结果回显凭证。"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED_VALUE if is_sensitive_field_name(str(key)) else sanitize_sensitive_data(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize_sensitive_data(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(sanitize_sensitive_data(item) for item in value)
+    return value
@@ -0,0 +1,149 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from .client import PolygonClient
+from .problem import ProblemSession
+
+DEFAULT_SESSION_CACHE_SIZE = 128
+DEFAULT_SESSION_TTL_SECONDS = 600.0
+
+CredentialKey = tuple[str, str]
+
+
+def build_credential_key(api_key: str, api_secret: str) -> CredentialKey:
+    """生成凭证键；secret 只保留摘要，避免明文出现在缓存键里。"""
+    return api_key, hashlib.sha256(api_secret.encode("utf-8")).hexdigest()
+
+
+class PolygonClientRegistry:
+    """
+    按凭证复用 PolygonClient 的进程级注册表。
+
+    同一组凭证只会创建一个客户端，连接池和 keep-alive 连接在所有工具调用之间共享。
+    """
+
+    def __init__(self, factory: Callable[[str, str], PolygonClient]):
+        """
+        Args:
+            factory: 根据 (api_key, api_secret) 创建客户端的函数
+        """
+        self._factory = factory
+        self._clients: dict[CredentialKey, PolygonClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str, api_secret: str) -> PolygonClient:
+        """返回凭证对应的客户端，不存在时创建。"""
+        key = build_credential_key(api_key, api_secret)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._factory(api_key, api_secret)
+                self._clients[key] = client
+            return client
+
+    def clear(self) -> None:
+        """关闭并移除全部客户端。"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+class ProblemSessionCache:
+    """
+    按 (凭证, problem_id, pin) 复用 ProblemSession 的 LRU 缓存。
+
+    复用会话可以保留会话上显式设置的状态；超过 ttl_seconds 未使用的会话会被淘汰，
+    条目数超过 max_size 时淘汰最久未使用的会话。max_size 或 ttl_seconds 为 0 时不缓存。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_SESSION_CACHE_SIZE,
+        ttl_seconds: float = DEFAULT_SESSION_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 0:
+            raise ValueError("max_size 不能小于 0")
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds 不能小于 0")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[ProblemSession, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get_or_create(
+        self,
+        client: PolygonClient,
+        problem_id: int,
+        pin: Optional[str] = None,
+    ) -> ProblemSession:
+        """返回可复用的题目会话，未命中或已过期时新建。"""
+        if not self.enabled:
+            return client.create_problem_session(problem_id, pin)
+
+        key = (build_credential_key(client.api_key, client.api_secret), problem_id, pin)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                session, last_used = entry
+                if now - last_used <= self.ttl_seconds and session.client is client:
+                    self._entries[key] = (session, now)
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return session
+                del self._entries[key]
+                self._evictions += 1
+
+            self._misses += 1
+            session = client.create_problem_session(problem_id, pin)
+            self._entries[key] = (session, now)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return session
+
+    def invalidate(self, problem_id: Optional[int] = None) -> int:
+        """移除指定题目（不传时移除全部）的会话，返回移除数量。"""
+        with self._lock:
+            if problem_id is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key in self._entries if key[1] == problem_id]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+            self._evictions += removed
+            return removed
+
+    def stats(self) -> dict[str, Any]:
+        """返回命中、未命中和淘汰计数。"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
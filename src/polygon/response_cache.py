@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Protocol, TypeVar, Union
+
+DEFAULT_RESPONSE_CACHE_TTL_SECONDS = 300.0
+DEFAULT_RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+T = TypeVar("T")
+
+
+def hash_cache_secret(value: Optional[str]) -> str:
+    """把 pin、API key 这类敏感值压缩成不可逆的短摘要，用于缓存键。"""
+    if not value:
+        return "none"
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_param(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_normalize_param(item) for item in value]
+    return value
+
+
+def build_response_cache_key(
+    method: str,
+    problem_id: int,
+    pin: Optional[str],
+    params: dict[str, Any],
+    namespace: Optional[str] = None,
+) -> str:
+    """
+    按 (method, problemId, pin 摘要, 参数) 生成响应缓存键。
+
+    namespace 用来隔离不同凭证的缓存（通常传 API key），同样只保留摘要。
+    """
+    normalized = {name: _normalize_param(value) for name, value in params.items()}
+    encoded_params = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return (
+        f"{hash_cache_secret(namespace)}|{method}|problem:{problem_id}"
+        f"|pin:{hash_cache_secret(pin)}|{encoded_params}"
+    )
+
+
+class CachedResponse(NamedTuple):
+    """缓存中的一条响应：写入时间、写入时已知的题目 revision 和 pickle 后的内容。"""
+
+    stored_at: float
+    revision: Optional[int]
+    payload: bytes
+
+
+class ResponseCacheBackend(Protocol):
+    def load(self, problem_id: int, key: str) -> Optional[CachedResponse]: ...
+
+    def store(self, problem_id: int, key: str, entry: CachedResponse) -> None: ...
+
+    def delete(self, problem_id: int, key: str) -> None: ...
+
+    def drop_problem(self, problem_id: int) -> int: ...
+
+    def clear(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+
+class MemoryResponseBackend:
+    """进程内 LRU 后端，条目数超过 max_entries 时淘汰最久未使用的响应。"""
+
+    def __init__(self, max_entries: int = DEFAULT_RESPONSE_CACHE_MAX_ENTRIES):
+        if max_entries <= 0:
+            raise ValueError("max_entries 必须大于 0")
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple[int, str], CachedResponse]" = OrderedDict()
+
+    def load(self, problem_id: int, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get((problem_id, key))
+        if entry is not None:
+            self._entries.move_to_end((problem_id, key))
+        return entry
+
+    def store(self, problem_id: int, key: str, entry: CachedResponse) -> None:
+        self._entries[(problem_id, key)] = entry
+        self._entries.move_to_end((problem_id, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, problem_id: int, key: str) -> None:
+        self._entries.pop((problem_id, key), None)
+
+    def drop_problem(self, problem_id: int) -> int:
+        keys = [entry_key for entry_key in self._entries if entry_key[0] == problem_id]
+        for entry_key in keys:
+            del self._entries[entry_key]
+        return len(keys)
+
+    def clear(self) -> int:
+        removed = len(self._entries)
+        self._entries.clear()
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _is_private(stat_result: os.stat_result) -> bool:
+    """属于当前用户且组和其他用户不可写；没有 POSIX 属主信息的平台（Windows）不做检查。"""
+    if not hasattr(os, "getuid"):
+        return True
+    return stat_result.st_uid == os.getuid() and not stat_result.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class DiskResponseBackend:
+    """
+    磁盘后端，响应保存在 ``<root>/<problem_id>/<sha256(key)>.pickle``。
+
+    同一台机器上同一用户的多个进程可以共用同一个目录；过期条目在读取时删除，失效一道题时删除整个题目目录。
+    条目用 pickle 序列化，反序列化不可信内容可以执行任意代码，因此目录以 0700 创建，
+    读取前确认文件属于当前用户且其他用户不可写，不满足时按未命中处理。
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Raises:
+            ValueError: root 不属于当前用户，或组和其他用户可写
+        """
+        self.root = Path(root).expanduser()
+        self.root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private(self.root.stat()):
+            raise ValueError(f"响应缓存目录必须属于当前用户且组和其他用户不可写: {self.root}")
+
+    def _entry_path(self, problem_id: int, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / str(problem_id) / f"{digest}.pickle"
+
+    def load(self, problem_id: int, key: str) -> Optional[CachedResponse]:
+        path = self._entry_path(problem_id, key)
+        try:
+            with path.open("rb") as handle:
+                if not _is_private(os.fstat(handle.fileno())):
+                    # 可能被其他用户写入或替换过，不能反序列化。
+                    return None
+                content = handle.read()
+        except FileNotFoundError:
+            return None
+        try:
+            stored_key, stored_at, revision, payload = pickle.loads(content)
+        except (pickle.UnpicklingError, EOFError, TypeError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+        if stored_key != key:
+            return None
+        return CachedResponse(stored_at, revision, payload)
+
+    def store(self, problem_id: int, key: str, entry: CachedResponse) -> None:
+        path = self._entry_path(problem_id, key)
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump((key, *entry), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_name, path)
+
+    def delete(self, problem_id: int, key: str) -> None:
+        self._entry_path(problem_id, key).unlink(missing_ok=True)
+
+    def drop_problem(self, problem_id: int) -> int:
+        problem_dir = self.root / str(problem_id)
+        removed = len(list(problem_dir.glob("*.pickle"))) if problem_dir.is_dir() else 0
+        shutil.rmtree(problem_dir, ignore_errors=True)
+        return removed
+
+    def clear(self) -> int:
+        removed = len(self)
+        if self.root.is_dir():
+            for problem_dir in self.root.iterdir():
+                if problem_dir.is_dir():
+                    shutil.rmtree(problem_dir, ignore_errors=True)
+        return removed
+
+    def __len__(self) -> int:
+        if not self.root.is_dir():
+            return 0
+        return sum(1 for _ in self.root.glob("*/*.pickle"))
+
+
+class ResponseCache:
+    """
+    幂等读接口的读穿透缓存。
+
+    条目按题目分组，并记录写入时已知的题目 revision：观察到新的 revision 时该题的缓存全部失效，
+    会话执行写操作后也会失效该题的缓存。ttl_seconds 兜底处理在网页端或其他客户端发生的修改。
+    命中时返回反序列化后的新对象，调用方修改返回值不会影响缓存。
+    """
+
+    def __init__(
+        self,
+        backend: Optional[ResponseCacheBackend] = None,
+        *,
+        ttl_seconds: float = DEFAULT_RESPONSE_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            backend: 存储后端，默认使用 MemoryResponseBackend
+            ttl_seconds: 条目有效期（秒）
+            clock: 记录写入时间的时钟；磁盘后端跨进程共享，因此默认使用 time.time
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds 必须大于 0")
+
+        self.backend = backend if backend is not None else MemoryResponseBackend()
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._revisions: dict[int, int] = {}
+        self._generations: dict[int, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._invalidations = 0
+        self._revision_changes = 0
+
+    def get_or_fetch(
+        self,
+        problem_id: int,
+        key: str,
+        fetch: Callable[[], T],
+        cacheable: Optional[Callable[[T], bool]] = None,
+    ) -> T:
+        """
+        命中时返回缓存内容，否则调用 fetch 并在结果可缓存时写入。
+
+        fetch 执行期间如果该题被失效（例如并发的写操作），结果不会写入缓存，避免把旧数据放回去。
+
+        Args:
+            problem_id: 题目 ID
+            key: build_response_cache_key 生成的键
+            fetch: 实际发请求的函数
+            cacheable: 判断结果能否缓存，例如构建中的题目包列表不应缓存
+        """
+        with self._lock:
+            generation = self._generations.get(problem_id, 0)
+            revision = self._revisions.get(problem_id)
+            entry = self.backend.load(problem_id, key)
+            if entry is not None:
+                if (
+                    entry.revision == revision
+                    and self._clock() - entry.stored_at <= self.ttl_seconds
+                ):
+                    try:
+                        value = pickle.loads(entry.payload)
+                    except Exception:
+                        self.backend.delete(problem_id, key)
+                    else:
+                        self._hits += 1
+                        return value
+                else:
+                    self.backend.delete(problem_id, key)
+            self._misses += 1
+
+        value = fetch()
+        if cacheable is not None and not cacheable(value):
+            return value
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return value
+
+        with self._lock:
+            if self._generations.get(problem_id, 0) == generation:
+                self.backend.store(
+                    problem_id,
+                    key,
+                    CachedResponse(self._clock(), self._revisions.get(problem_id), payload),
+                )
+                self._stores += 1
+        return value
+
+    def invalidate(self, problem_id: Optional[int] = None) -> int:
+        """失效指定题目（不传时失效全部）的缓存，返回删除的条目数。"""
+        with self._lock:
+            if problem_id is None:
+                for known_problem_id in list(self._generations):
+                    self._generations[known_problem_id] += 1
+                removed = self.backend.clear()
+            else:
+                self._generations[problem_id] = self._generations.get(problem_id, 0) + 1
+                removed = self.backend.drop_problem(problem_id)
+            self._invalidations += removed
+            return removed
+
+    def observe_revision(self, problem_id: int, revision: Optional[int]) -> bool:
+        """
+        记录从 problems.list 等接口看到的题目 revision。
+
+        Returns:
+            bool: revision 与此前记录的不同、该题缓存被失效时返回 True
+        """
+        if revision is None:
+            return False
+        with self._lock:
+            previous = self._revisions.get(problem_id)
+            self._revisions[problem_id] = revision
+            if previous is None or previous == revision:
+                return False
+            self._revision_changes += 1
+            self.invalidate(problem_id)
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        """返回条目数、命中、未命中、写入、失效和 revision 变化计数。"""
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "ttl_seconds": self.ttl_seconds,
+                "tracked_revisions": len(self._revisions),
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "invalidations": self._invalidations,
+                "revision_changes": self._revision_changes,
+            }
@@ -0,0 +1,224 @@
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+import requests
+
+from src.polygon.models import DownloadedFile, PolygonNetworkError
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_RESUME_ATTEMPTS = 3
+PARTIAL_SUFFIX = ".part"
+RESOURCE_MARKER_SUFFIX = ".id"
+
+_CONTENT_RANGE_PATTERN = re.compile(r"^bytes\s+(\d+)-\d+/(?:\d+|\*)$")
+
+# 传输中断后可以用 Range 续传的异常；其余异常直接抛出。
+_RESUMABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+# 按文件头识别内容类型；Polygon 在鉴权失败时常返回 HTML 登录页或 JSON 错误而不是预期的文件。
+_CONTENT_SIGNATURES = (
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),
+    (b"%PDF", "pdf"),
+    (b"<?xml", "xml"),
+)
+SNIFF_BYTES = 512
+
+
+def sniff_content_kind(head: bytes) -> Optional[str]:
+    """根据文件开头的字节判断内容类型，无法识别时返回 None。"""
+    for signature, kind in _CONTENT_SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    stripped = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if stripped.startswith((b"<!doctype html", b"<html")):
+        return "html"
+    if stripped.startswith(b"<"):
+        return "xml"
+    if stripped.startswith((b"{", b"[")):
+        return "json"
+    return None
+
+
+class DownloadDigest:
+    """逐块累计下载内容的字节数、sha256 和文件头，用于在不保留完整内容的情况下生成元数据。"""
+
+    def __init__(self):
+        self._hasher = hashlib.sha256()
+        self._head = b""
+        self.size_bytes = 0
+
+    def update(self, chunk: bytes) -> None:
+        self._hasher.update(chunk)
+        if len(self._head) < SNIFF_BYTES:
+            self._head += chunk[: SNIFF_BYTES - len(self._head)]
+        self.size_bytes += len(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    @property
+    def detected_content_kind(self) -> Optional[str]:
+        return sniff_content_kind(self._head)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes]) -> "DownloadDigest":
+        digest = cls()
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE) -> "DownloadDigest":
+        return cls.from_chunks(iter_file_chunks(path, chunk_size))
+
+
+def iter_file_chunks(path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """按块读取文件内容。"""
+    with Path(path).open("rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def partial_path_for(target_path: Union[str, Path]) -> Path:
+    """返回下载过程中使用的临时文件路径。"""
+    target = Path(target_path)
+    return target.with_name(target.name + PARTIAL_SUFFIX)
+
+
+def _resource_marker_path(partial: Path) -> Path:
+    """``.part`` 旁记录资源标识的文件，用于判断已有内容是否属于同一个资源。"""
+    return partial.with_name(partial.name + RESOURCE_MARKER_SUFFIX)
+
+
+def _resource_fingerprint(resource_id: str) -> str:
+    # 只落盘哈希，避免把 pin 等参数明文写到下载目录。
+    return hashlib.sha256(resource_id.encode("utf-8")).hexdigest()
+
+
+def _read_marker(marker: Path) -> Optional[str]:
+    try:
+        return marker.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _prepare_partial(partial: Path, resource_id: Optional[str]) -> None:
+    """丢弃无法确认来源的 ``.part``，并为本次下载写入资源标识。"""
+    marker = _resource_marker_path(partial)
+    fingerprint = _resource_fingerprint(resource_id) if resource_id is not None else None
+    if partial.exists() and (fingerprint is None or _read_marker(marker) != fingerprint):
+        # 上一次中断的可能是另一个资源（例如换了题目包），拼接后内容会损坏，只能从头下载。
+        partial.unlink()
+    if fingerprint is None:
+        marker.unlink(missing_ok=True)
+    else:
+        marker.write_text(fingerprint, encoding="utf-8")
+
+
+def _resume_offset(response: Any) -> Optional[int]:
+    """206 响应返回续传起点；其余响应返回 None，表示服务端发回了完整内容。"""
+    if response.status_code != 206:
+        return None
+    content_range = response.headers.get("Content-Range")
+    if content_range is None:
+        return None
+    match = _CONTENT_RANGE_PATTERN.match(content_range.strip())
+    return int(match.group(1)) if match else None
+
+
+def stream_to_file(
+    open_response: Callable[[dict[str, str]], Any],
+    target_path: Union[str, Path],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_resume_attempts: int = DEFAULT_RESUME_ATTEMPTS,
+    resource_id: Optional[str] = None,
+) -> DownloadedFile:
+    """
+    把 HTTP 响应分块写入 target_path。
+
+    内容先写入同目录下的 ``<target>.part``，边写边计算 sha256，完整写完后通过 os.replace
+    原子替换到目标路径，因此目标路径上不会出现写了一半的文件。传输中途断开时会带上
+    ``Range: bytes=N-`` 重新请求；服务端返回 206 时在已有内容后追加，返回 200 时从头重写。
+
+    上一次调用留下的 ``.part`` 只有在 ``<target>.part.id`` 记录的资源标识与 resource_id
+    一致时才会续传，否则先截断再下载；未提供 resource_id 时不会跨调用续传。
+
+    Args:
+        open_response: 接收额外请求头、返回已发出的流式响应（requests.Response 兼容对象）的函数；
+            返回前应已处理 HTTP 错误
+        target_path: 目标文件路径，父目录不存在时自动创建
+        chunk_size: 每次读取和写入的字节数
+        max_resume_attempts: 传输中断后的最大续传次数
+        resource_id: 唯一标识下载内容的字符串（如题目 id + 包 id），内容变化时必须随之变化
+
+    Returns:
+        DownloadedFile: 目标路径、总字节数、sha256、按文件头识别的内容类型和续传起点
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 必须大于 0")
+    if max_resume_attempts < 0:
+        raise ValueError("max_resume_attempts 不能小于 0")
+
+    target = Path(target_path).expanduser()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = partial_path_for(target)
+    _prepare_partial(partial, resource_id)
+
+    digest = DownloadDigest.from_file(partial, chunk_size) if partial.exists() else DownloadDigest()
+    resumed_from = digest.size_bytes
+    attempts = 0
+
+    while True:
+        offset = digest.size_bytes
+        headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+        response = open_response(headers)
+        try:
+            if offset > 0 and _resume_offset(response) != offset:
+                # 服务端不支持 Range（或返回了对不上的区间），丢弃已有内容从头写。
+                digest, offset, resumed_from = DownloadDigest(), 0, 0
+            mode = "ab" if offset > 0 else "wb"
+            with partial.open(mode) as handle:
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if not chunk:
+                            continue
+                        handle.write(chunk)
+                        digest.update(chunk)
+                except _RESUMABLE_ERRORS as exc:
+                    if attempts >= max_resume_attempts:
+                        raise PolygonNetworkError(
+                            f"下载中断且续传次数已用尽 ({target.name}): {exc}"
+                        ) from exc
+                    attempts += 1
+                    continue
+                handle.flush()
+                os.fsync(handle.fileno())
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
+        break
+
+    os.replace(partial, target)
+    _resource_marker_path(partial).unlink(missing_ok=True)
+    return DownloadedFile(
+        path=str(target),
+        size_bytes=digest.size_bytes,
+        sha256=digest.sha256,
+        detected_content_kind=digest.detected_content_kind,
+        resumed_from=resumed_from,
+    )
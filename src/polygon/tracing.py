@@ -0,0 +1,419 @@
+import contextlib
+import contextvars
+import functools
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TypeVar, Union
+
+from .redaction import REDACTED_VALUE, is_sensitive_field_name, sanitize_sensitive_data
+
+T = TypeVar("T")
+
+# span 的层级类别：MCP 工具 → 工作流阶段 → 会话方法 → 单次 HTTP 尝试，重试前的退避等待单独记录。
+TOOL_SPAN = "tool"
+STAGE_SPAN = "stage"
+SESSION_METHOD_SPAN = "session_method"
+HTTP_ATTEMPT_SPAN = "http_attempt"
+BACKOFF_SPAN = "backoff"
+
+DEFAULT_TRACE_BUFFER_SIZE = 4096
+MAX_ATTRIBUTE_LENGTH = 256
+SERVICE_NAME = "cf-polygon-mcp"
+
+# OTLP 的 SpanKind 与 StatusCode 取值
+_OTLP_KIND_INTERNAL = 1
+_OTLP_KIND_CLIENT = 3
+_OTLP_STATUS_OK = 1
+_OTLP_STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "polygon_current_span",
+    default=None,
+)
+
+
+def _attribute_value(key: str, value: Any) -> Any:
+    """按 sanitize_sensitive_data 的规则脱敏，并把属性值压成长度有限的标量。"""
+    # 带命名空间的属性名（例如 tool.arg.pin）按最后一段判断是否敏感
+    if is_sensitive_field_name(key.rsplit(".", 1)[-1]):
+        return REDACTED_VALUE
+    value = sanitize_sensitive_data(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, default=str, sort_keys=True)
+    if len(value) > MAX_ATTRIBUTE_LENGTH:
+        return f"{value[:MAX_ATTRIBUTE_LENGTH]}...(共 {len(value)} 字符)"
+    return value
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span:
+    """
+    一段被计时的操作。
+
+    属性和事件在写入时即按 sanitize_sensitive_data 的规则脱敏，之后才会进入环形缓冲区或导出文件。
+    """
+
+    __slots__ = (
+        "name",
+        "span_type",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "events",
+        "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        span_type: str,
+        *,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        attributes: dict[str, Any],
+    ):
+        self.name = name
+        self.span_type = span_type
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: dict[str, Any] = {}
+        self.events: list[tuple[str, int, dict[str, Any]]] = []
+        self.error: Optional[str] = None
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = _attribute_value(key, value)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append(
+            (name, time.time_ns(), {key: _attribute_value(key, value) for key, value in attributes.items()})
+        )
+
+    def set_error(self, message: str) -> None:
+        """把 span 标记为失败。"""
+        self.error = _attribute_value("error", message)
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.add_event("exception", type=type(exc).__name__, message=str(exc))
+        self.set_error(f"{type(exc).__name__}: {exc}")
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return round((self.end_ns - self.start_ns) / 1_000_000, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_type": self.span_type,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_ms": self.start_ns // 1_000_000,
+            "duration_ms": self.duration_ms,
+            "status": "error" if self.error is not None else "ok",
+            "error": self.error,
+            "attributes": dict(self.attributes),
+            "events": [
+                {"name": name, "offset_ms": round((at_ns - self.start_ns) / 1_000_000, 3), "attributes": attributes}
+                for name, at_ns, attributes in self.events
+            ],
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_KIND_CLIENT if self.span_type == HTTP_ATTEMPT_SPAN else _OTLP_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns if self.end_ns is not None else self.start_ns),
+            "attributes": _otlp_attributes({"polygon.span_type": self.span_type, **self.attributes}),
+            "events": [
+                {"timeUnixNano": str(at_ns), "name": name, "attributes": _otlp_attributes(attributes)}
+                for name, at_ns, attributes in self.events
+            ],
+            "status": (
+                {"code": _OTLP_STATUS_ERROR, "message": self.error}
+                if self.error is not None
+                else {"code": _OTLP_STATUS_OK}
+            ),
+        }
+        if self.parent_span_id is not None:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    """追踪关闭或被抑制时使用的空 span，接口与 Span 相同但不记录任何内容。"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        return None
+
+    def set_error(self, message: str) -> None:
+        return None
+
+    def record_exception(self, exc: BaseException) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    进程内的分层追踪器。
+
+    当前 span 保存在 contextvar 中，同一线程或协程内嵌套的 span 自动成为子 span；
+    跨线程时用 propagate_trace_context 传递父 span。结束的 span 进入容量为 buffer_size 的环形缓冲区，
+    配置了 export_path 时，每条 trace 的根 span 结束后以 OTLP JSON 格式追加一行到该文件。
+    buffer_size 为 0 且未配置 export_path 时不创建任何 span。
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_TRACE_BUFFER_SIZE,
+        export_path: Optional[Union[str, Path]] = None,
+    ):
+        if buffer_size < 0:
+            raise ValueError("buffer_size 不能小于 0")
+        self.buffer_size = buffer_size
+        self.export_path = Path(export_path).expanduser() if export_path else None
+        self._spans: deque[Span] = deque(maxlen=buffer_size)
+        self._pending_exports: dict[str, list[Span]] = {}
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.buffer_size > 0 or self.export_path is not None
+
+    @contextlib.contextmanager
+    def span(self, name: str, *, span_type: str = STAGE_SPAN, **attributes: Any) -> Iterator[Any]:
+        """
+        创建一个 span 并设为当前 span；上下文内抛出的异常会记录在 span 上后继续向外抛出。
+
+        追踪关闭时返回 NOOP_SPAN。
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name,
+            span_type,
+            trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+            parent_span_id=parent.span_id if parent is not None else None,
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        finished_trace: Optional[list[Span]] = None
+        with self._lock:
+            if self.buffer_size > 0:
+                self._spans.append(span)
+            if self.export_path is not None:
+                self._pending_exports.setdefault(span.trace_id, []).append(span)
+                if span.parent_span_id is None:
+                    finished_trace = self._pending_exports.pop(span.trace_id)
+        if finished_trace is not None:
+            self._export(finished_trace)
+
+    def _export(self, spans: list[Span]) -> None:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(request, ensure_ascii=False, separators=(",", ":"))
+        with self._export_lock:
+            self.export_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.export_path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def finished_spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._pending_exports.clear()
+
+
+def current_span() -> Optional[Span]:
+    """返回当前上下文中正在进行的 span。"""
+    return _current_span.get()
+
+
+def propagate_trace_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    把调用时的当前 span 绑定到 func 上，供线程池中的 worker 使用。
+
+    ThreadPoolExecutor 不会复制 contextvar，不绑定时 worker 内的 span 会变成各自独立的 trace。
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _current_span.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+
+    return wrapper
+
+
+def traced_methods(
+    span_attributes: Callable[[Any], dict[str, Any]],
+    *,
+    span_type: str = SESSION_METHOD_SPAN,
+) -> Callable[[type], type]:
+    """
+    类装饰器：为类的全部公开方法包上一层 span，span 名为 ``类名.方法名``。
+
+    span_attributes 接收实例，返回附加在 span 上的属性，例如题目 ID。
+    """
+
+    def decorator(cls: type) -> type:
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not callable(member) or isinstance(member, (staticmethod, classmethod)):
+                continue
+            setattr(cls, name, _traced_method(f"{cls.__name__}.{name}", member, span_attributes, span_type))
+        return cls
+
+    return decorator
+
+
+def _traced_method(
+    span_name: str,
+    method: Callable[..., Any],
+    span_attributes: Callable[[Any], dict[str, Any]],
+    span_type: str,
+) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with get_tracer().span(span_name, span_type=span_type, **span_attributes(self)):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def build_trace_summaries(spans: list[Span]) -> list[dict[str, Any]]:
+    """把 span 按 trace 聚合成摘要，按开始时间从新到旧排列。"""
+    traces: dict[str, list[Span]] = {}
+    for span in spans:
+        traces.setdefault(span.trace_id, []).append(span)
+
+    summaries = []
+    for trace_id, trace_spans in traces.items():
+        span_ids = {span.span_id for span in trace_spans}
+        roots = [span for span in trace_spans if span.parent_span_id not in span_ids]
+        root = min(roots, key=lambda span: span.start_ns)
+        started = min(span.start_ns for span in trace_spans)
+        ended = max(span.end_ns or span.start_ns for span in trace_spans)
+        summaries.append(
+            {
+                "trace_id": trace_id,
+                "name": root.name,
+                "span_type": root.span_type,
+                "start_time_unix_ms": started // 1_000_000,
+                "duration_ms": round((ended - started) / 1_000_000, 3),
+                "span_count": len(trace_spans),
+                "error_count": sum(1 for span in trace_spans if span.error is not None),
+                "http_attempts": sum(1 for span in trace_spans if span.span_type == HTTP_ATTEMPT_SPAN),
+                # 根 span 被环形缓冲区淘汰后，trace 只剩部分 span
+                "complete": root.parent_span_id is None,
+            }
+        )
+    summaries.sort(key=lambda summary: summary["start_time_unix_ms"], reverse=True)
+    return summaries
+
+
+def build_span_tree(spans: list[Span]) -> list[dict[str, Any]]:
+    """把同一 trace 的 span 组装成按开始时间排序的树，子 span 放在 children 中。"""
+    nodes = {span.span_id: {**span.to_dict(), "children": []} for span in spans}
+    roots: list[dict[str, Any]] = []
+    for span in sorted(spans, key=lambda item: item.start_ns):
+        node = nodes[span.span_id]
+        parent = nodes.get(span.parent_span_id) if span.parent_span_id is not None else None
+        (parent["children"] if parent is not None else roots).append(node)
+    return roots
+
+
+_default_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """返回进程级追踪器；make_api_request、ProblemSession 和 MCP 工具包装都记录到这里。"""
+    return _default_tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """替换进程级追踪器，返回被替换的旧追踪器。"""
+    global _default_tracer
+    previous = _default_tracer
+    _default_tracer = tracer
+    return previous
+
+
+def trace_span(name: str, *, span_type: str = STAGE_SPAN, **attributes: Any) -> Any:
+    """在进程级追踪器上创建 span 的快捷方式，默认用于标记工作流阶段。"""
+    return get_tracer().span(name, span_type=span_type, **attributes)
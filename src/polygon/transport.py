@@ -0,0 +1,79 @@
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_CONNECT_RETRIES = 2
+
+
+class PolygonTransport:
+    """
+    复用 HTTP 连接的 Polygon 请求通道。
+
+    内部持有一个 requests.Session，并挂载带连接池和连接级重试的 HTTPAdapter，
+    同一个 PolygonClient 发出的所有请求都会复用 keep-alive 连接，避免每次调用都重新握手。
+    任何实现了 request(method, url, **kwargs) 的对象都可以作为 transport 传给 make_api_request。
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connect_retries: int = DEFAULT_CONNECT_RETRIES,
+        session: Optional[requests.Session] = None,
+    ):
+        if pool_connections <= 0:
+            raise ValueError("pool_connections 必须大于 0")
+        if pool_maxsize <= 0:
+            raise ValueError("pool_maxsize 必须大于 0")
+        if connect_retries < 0:
+            raise ValueError("connect_retries 不能小于 0")
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_retries = connect_retries
+        self.session = session if session is not None else requests.Session()
+        self.session.headers.setdefault("Connection", "keep-alive")
+
+        # 只在连接建立阶段重试（例如复用到已被服务端关闭的 keep-alive 连接），
+        # HTTP 状态码重试和退避仍由 make_api_request 统一处理，避免两层重试叠加。
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=connect_retries,
+                connect=connect_retries,
+                read=0,
+                status=0,
+                other=0,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """通过连接池发送一次 HTTP 请求。"""
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        """关闭底层连接池。"""
+        self.session.close()
+
+    def __enter__(self) -> "PolygonTransport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            "PolygonTransport("
+            f"pool_connections={self.pool_connections}, "
+            f"pool_maxsize={self.pool_maxsize}, "
+            f"connect_retries={self.connect_retries})"
+        )
@@ -0,0 +1,199 @@
+import asyncio
+from typing import Any, Dict, Optional, Union
+
+import httpx
+
+from src.polygon.metrics import POLYGON_METHOD_METRICS, get_metrics_registry, payload_size
+from src.polygon.models import PolygonNetworkError
+from src.polygon.utils.client_utils import (
+    _build_http_error,
+    _build_request_kwargs,
+    _compute_retry_delay,
+    _parse_api_response,
+    _prepare_request_params,
+    _resolve_retry_options,
+    _response_size,
+    _trace_backoff,
+    _trace_http_attempt,
+)
+
+
+async def _sleep_before_retry(
+    attempt_index: int,
+    *,
+    response: Optional[httpx.Response],
+    retry_backoff_seconds: float,
+    max_backoff_seconds: float,
+) -> None:
+    delay = _compute_retry_delay(
+        attempt_index,
+        response=response,
+        retry_backoff_seconds=retry_backoff_seconds,
+        max_backoff_seconds=max_backoff_seconds,
+    )
+    with _trace_backoff(attempt_index, delay):
+        await asyncio.sleep(delay)
+
+
+async def make_async_api_request(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    params: Optional[Dict] = None,
+    raw_response: bool = False,
+    http_method: str = "GET",
+    max_retries: Optional[int] = None,
+    retry_backoff_seconds: Optional[float] = None,
+    retry_status_codes: Optional[set[int]] = None,
+    max_backoff_seconds: Optional[float] = None,
+    *,
+    transport: Any,
+) -> Union[Dict, bytes]:
+    """
+    异步发送请求到 Polygon API。
+
+    签名、重试退避（含 Retry-After）、HTTP 错误映射、业务错误映射、指标和追踪与 make_api_request 共用同一组辅助函数，
+    区别只在于请求通过异步 transport 发出，退避等待使用 asyncio.sleep，不会阻塞事件循环。
+
+    Args:
+        api_key: API 密钥
+        api_secret: API 密钥对应的秘钥
+        base_url: API 基础 URL
+        method: API 方法名
+        params: 请求参数
+        raw_response: 是否返回原始响应内容
+        http_method: HTTP 方法
+        max_retries: 可重试次数，不含首次请求；未提供时使用 request_max_retries 上下文或 DEFAULT_MAX_RETRIES
+        retry_backoff_seconds: 指数退避的基础秒数
+        retry_status_codes: 允许重试的 HTTP 状态码集合
+        max_backoff_seconds: 单次最大退避等待秒数
+        transport: 异步请求通道，例如 AsyncPolygonTransport
+
+    Returns:
+        Union[Dict, bytes]: 如果 raw_response 为 True，返回原始响应内容；
+        否则返回解析后的 JSON 数据
+    """
+    (
+        resolved_max_retries,
+        resolved_retry_backoff,
+        resolved_retry_status_codes,
+        resolved_max_backoff,
+    ) = _resolve_retry_options(
+        max_retries,
+        retry_backoff_seconds,
+        retry_status_codes,
+        max_backoff_seconds,
+    )
+    request_method = http_method.upper()
+
+    with get_metrics_registry().observe_call(POLYGON_METHOD_METRICS, method) as observation:
+        for attempt_index in range(resolved_max_retries + 1):
+            observation.retries = attempt_index
+            request_params = _prepare_request_params(api_key, api_secret, method, params)
+            request_kwargs = _build_request_kwargs(request_method, request_params)
+            observation.bytes_out += payload_size(request_params)
+
+            try:
+                with _trace_http_attempt(request_method, method, attempt_index, params) as attempt_span:
+                    response = await transport.request(request_method, f"{base_url}{method}", **request_kwargs)
+                    attempt_span.set_attribute("http.response.status_code", response.status_code)
+                    if response.status_code >= 400:
+                        attempt_span.set_error(f"HTTP {response.status_code}")
+                    else:
+                        observation.bytes_in = _response_size(response)
+                        attempt_span.set_attribute("http.response.body.size", observation.bytes_in)
+            except httpx.TransportError as exc:
+                if attempt_index < resolved_max_retries:
+                    await _sleep_before_retry(
+                        attempt_index,
+                        response=None,
+                        retry_backoff_seconds=resolved_retry_backoff,
+                        max_backoff_seconds=resolved_max_backoff,
+                    )
+                    continue
+                raise PolygonNetworkError(f"Polygon 网络请求失败 ({method}): {exc}") from exc
+            except httpx.HTTPError as exc:
+                raise PolygonNetworkError(f"Polygon 请求失败 ({method}): {exc}") from exc
+
+            if response.status_code >= 400:
+                if (
+                    response.status_code in resolved_retry_status_codes
+                    and attempt_index < resolved_max_retries
+                ):
+                    await _sleep_before_retry(
+                        attempt_index,
+                        response=response,
+                        retry_backoff_seconds=resolved_retry_backoff,
+                        max_backoff_seconds=resolved_max_backoff,
+                    )
+                    continue
+                raise _build_http_error(method, response)
+
+            if raw_response:
+                return response.content
+            return _parse_api_response(method, response)
+
+        raise PolygonNetworkError(f"Polygon 请求失败 ({method}): 已耗尽所有重试")
+
+
+async def make_async_problem_request(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    problem_id: int,
+    pin: Optional[str] = None,
+    params: Optional[Dict] = None,
+    raw_response: bool = False,
+    http_method: str = "GET",
+    *,
+    transport: Any,
+):
+    """
+    异步发送题目相关的API请求，参数含义同 make_problem_request
+    """
+    request_params = dict(params or {})
+    request_params["problemId"] = str(problem_id)
+    if pin is not None:
+        request_params["pin"] = pin
+
+    return await make_async_api_request(
+        api_key,
+        api_secret,
+        base_url,
+        method,
+        request_params,
+        raw_response,
+        http_method,
+        transport=transport,
+    )
+
+
+async def make_async_contest_request(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    contest_id: int,
+    pin: Optional[str] = None,
+    params: Optional[Dict] = None,
+    *,
+    transport: Any,
+):
+    """
+    异步发送比赛相关的API请求，参数含义同 make_contest_request
+    """
+    request_params = dict(params or {})
+    request_params["contestId"] = str(contest_id)
+    if pin is not None:
+        request_params["pin"] = pin
+
+    return await make_async_api_request(
+        api_key,
+        api_secret,
+        base_url,
+        method,
+        request_params,
+        transport=transport,
+    )
@@ -1,16 +1,21 @@
+import contextlib
+import contextvars
 import hashlib
 import random
 import time
-from typing import Any, Dict, Mapping, Optional, Union
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
 
 import requests
 
+from src.polygon.metrics import POLYGON_METHOD_METRICS, get_metrics_registry, payload_size
 from src.polygon.models import (
     AccessDeniedException,
     PolygonBusinessError,
     PolygonHTTPError,
     PolygonNetworkError,
 )
+from src.polygon.tracing import BACKOFF_SPAN, HTTP_ATTEMPT_SPAN, get_tracer
+from src.polygon.transport import PolygonTransport
 
 DEFAULT_RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
 DEFAULT_MAX_RETRIES = 2
@@ -19,6 +24,33 @@ DEFAULT_MAX_BACKOFF_SECONDS = 8.0
 DEFAULT_TIMEOUT_SECONDS = 30
 MAX_RESPONSE_TEXT_LENGTH = 300
 
+_request_max_retries: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "polygon_request_max_retries",
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def request_max_retries(max_retries: int) -> Iterator[None]:
+    """
+    在上下文内覆盖请求层的默认重试次数，对未显式传入 max_retries 的调用生效。
+
+    调用方自己实现重试（例如批量上传共享限流冷却的重试循环）时设为 0，避免与请求层的重试叠加。
+    contextvars 不会自动传进线程池 worker，需要在 worker 内部进入该上下文。
+    """
+    if max_retries < 0:
+        raise ValueError("max_retries 不能小于 0")
+    token = _request_max_retries.set(max_retries)
+    try:
+        yield
+    finally:
+        _request_max_retries.reset(token)
+
+
+def current_request_max_retries() -> int:
+    override = _request_max_retries.get()
+    return DEFAULT_MAX_RETRIES if override is None else override
+
 
 def generate_api_signature(api_secret: str, method_name: str, params: Mapping[str, Any]) -> str:
     """
@@ -57,6 +89,38 @@ def _prepare_request_params(
     return request_params
 
 
+def _build_request_kwargs(
+    request_method: str,
+    request_params: dict[str, Any],
+    headers: Optional[Mapping[str, str]] = None,
+) -> dict[str, Any]:
+    """GET 请求把参数放在查询串里，其余方法放在表单里；同步和异步请求通道共用。"""
+    request_kwargs: dict[str, Any] = {"timeout": DEFAULT_TIMEOUT_SECONDS}
+    if headers:
+        request_kwargs["headers"] = dict(headers)
+    if request_method == "GET":
+        request_kwargs["params"] = request_params
+    else:
+        request_kwargs["data"] = request_params
+    return request_kwargs
+
+
+def _parse_api_response(method: str, response: Any) -> dict[str, Any]:
+    """解析 JSON 响应并把 status != OK 映射为业务错误。"""
+    try:
+        data = response.json()
+    except ValueError as exc:
+        raise PolygonHTTPError(
+            f"Polygon 响应解析失败 ({method})",
+            status_code=response.status_code,
+            response_text=_truncate_response_text(response),
+        ) from exc
+
+    if data.get("status") != "OK":
+        raise _build_business_error(method, data)
+    return data
+
+
 def _truncate_response_text(response: Optional[requests.Response]) -> Optional[str]:
     if response is None:
         return None
@@ -68,6 +132,18 @@ def _truncate_response_text(response: Optional[requests.Response]) -> Optional[s
     return f"{text[:MAX_RESPONSE_TEXT_LENGTH]}..."
 
 
+def _response_size(response: Any, *, streamed: bool = False) -> int:
+    """返回响应体字节数；流式响应不能提前读取响应体，只使用 Content-Length，未知时为 0。"""
+    if not streamed:
+        content = getattr(response, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            return len(content)
+    try:
+        return int(response.headers.get("Content-Length") or 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
 def _build_business_error(method: str, data: dict[str, Any]) -> PolygonBusinessError:
     comment = str(data.get("comment") or data.get("message") or "Unknown error")
     context_value = data.get("context")
@@ -82,13 +158,48 @@ def _build_business_error(method: str, data: dict[str, Any]) -> PolygonBusinessE
     return PolygonBusinessError(message, comment=comment, context=rendered_context)
 
 
-def _sleep_before_retry(
+def _resolve_retry_options(
+    max_retries: Optional[int],
+    retry_backoff_seconds: Optional[float],
+    retry_status_codes: Optional[set[int]],
+    max_backoff_seconds: Optional[float],
+) -> tuple[int, float, set[int], float]:
+    resolved_max_retries = current_request_max_retries() if max_retries is None else max_retries
+    if resolved_max_retries < 0:
+        raise ValueError("max_retries 不能小于 0")
+
+    resolved_retry_backoff = (
+        DEFAULT_RETRY_BACKOFF_SECONDS
+        if retry_backoff_seconds is None
+        else retry_backoff_seconds
+    )
+    if resolved_retry_backoff <= 0:
+        raise ValueError("retry_backoff_seconds 必须大于 0")
+
+    resolved_max_backoff = (
+        DEFAULT_MAX_BACKOFF_SECONDS if max_backoff_seconds is None else max_backoff_seconds
+    )
+    if resolved_max_backoff <= 0:
+        raise ValueError("max_backoff_seconds 必须大于 0")
+
+    resolved_retry_status_codes = (
+        DEFAULT_RETRY_STATUS_CODES if retry_status_codes is None else set(retry_status_codes)
+    )
+    return (
+        resolved_max_retries,
+        resolved_retry_backoff,
+        resolved_retry_status_codes,
+        resolved_max_backoff,
+    )
+
+
+def _compute_retry_delay(
     attempt_index: int,
     *,
-    response: Optional[requests.Response],
+    response: Any,
     retry_backoff_seconds: float,
     max_backoff_seconds: float,
-) -> None:
+) -> float:
     retry_after = response.headers.get("Retry-After") if response is not None else None
     if retry_after is not None:
         try:
@@ -100,7 +211,158 @@ def _sleep_before_retry(
 
     if delay is None:
         delay = min(max_backoff_seconds, retry_backoff_seconds * (2 ** attempt_index))
-    time.sleep(delay)
+    return delay
+
+
+def _trace_http_attempt(
+    http_method: str,
+    method: str,
+    attempt_index: int,
+    params: Optional[Mapping[str, Any]],
+) -> Any:
+    """为单次 HTTP 尝试创建 span；记录的是签名前的业务参数，pin 等凭证字段会被脱敏。"""
+    return get_tracer().span(
+        f"{http_method} {method}",
+        span_type=HTTP_ATTEMPT_SPAN,
+        **{
+            "polygon.method": method,
+            "http.request.method": http_method,
+            "attempt": attempt_index,
+            "polygon.params": dict(params or {}),
+        },
+    )
+
+
+def _trace_backoff(attempt_index: int, delay: float) -> Any:
+    return get_tracer().span("retry backoff", span_type=BACKOFF_SPAN, attempt=attempt_index, delay_seconds=delay)
+
+
+def _sleep_before_retry(
+    attempt_index: int,
+    *,
+    response: Optional[requests.Response],
+    retry_backoff_seconds: float,
+    max_backoff_seconds: float,
+) -> None:
+    delay = _compute_retry_delay(
+        attempt_index,
+        response=response,
+        retry_backoff_seconds=retry_backoff_seconds,
+        max_backoff_seconds=max_backoff_seconds,
+    )
+    with _trace_backoff(attempt_index, delay):
+        time.sleep(delay)
+
+
+def _build_http_error(method: str, response: Any) -> PolygonHTTPError:
+    status_code = response.status_code if response is not None else None
+    response_text = _truncate_response_text(response)
+    message = f"Polygon HTTP 错误 ({method})"
+    if status_code is not None:
+        message += f": status={status_code}"
+    if response_text is not None:
+        message += f", response={response_text}"
+
+    if status_code == 403:
+        return AccessDeniedException(message, comment=response_text)
+    return PolygonHTTPError(
+        message,
+        status_code=status_code,
+        response_text=response_text,
+    )
+
+
+def _send_api_request(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    params: Optional[Mapping[str, Any]],
+    *,
+    raw_response: bool,
+    http_method: str,
+    stream: bool,
+    headers: Optional[Mapping[str, str]],
+    max_retries: Optional[int],
+    retry_backoff_seconds: Optional[float],
+    retry_status_codes: Optional[set[int]],
+    max_backoff_seconds: Optional[float],
+    transport: Optional[PolygonTransport],
+) -> Any:
+    """
+    make_api_request 和 open_api_stream 共用的签名、重试退避、错误映射、指标和追踪循环。
+
+    stream 为 True 时返回尚未读取响应体的响应对象，重试或报错前都会关闭已打开的响应，避免占住连接池；
+    否则按 raw_response 返回原始内容或解析后的 JSON。
+    """
+    (
+        resolved_max_retries,
+        resolved_retry_backoff,
+        resolved_retry_status_codes,
+        resolved_max_backoff,
+    ) = _resolve_retry_options(
+        max_retries,
+        retry_backoff_seconds,
+        retry_status_codes,
+        max_backoff_seconds,
+    )
+    request_method = http_method.upper()
+    send_request = transport.request if transport is not None else requests.request
+
+    with get_metrics_registry().observe_call(POLYGON_METHOD_METRICS, method) as observation:
+        for attempt_index in range(resolved_max_retries + 1):
+            observation.retries = attempt_index
+            request_params = _prepare_request_params(api_key, api_secret, method, params)
+            request_kwargs = _build_request_kwargs(request_method, request_params, headers)
+            if stream:
+                request_kwargs["stream"] = True
+            observation.bytes_out += payload_size(request_params)
+
+            try:
+                with _trace_http_attempt(request_method, method, attempt_index, params) as attempt_span:
+                    response = send_request(request_method, f"{base_url}{method}", **request_kwargs)
+                    attempt_span.set_attribute("http.response.status_code", response.status_code)
+                    response.raise_for_status()
+                    observation.bytes_in = _response_size(response, streamed=stream)
+                    attempt_span.set_attribute("http.response.body.size", observation.bytes_in)
+
+                if stream:
+                    return response
+                if raw_response:
+                    return response.content
+                return _parse_api_response(method, response)
+            except requests.HTTPError as exc:
+                response = exc.response
+                if stream and response is not None:
+                    response.close()
+                status_code = response.status_code if response is not None else None
+                if (
+                    status_code in resolved_retry_status_codes
+                    and attempt_index < resolved_max_retries
+                ):
+                    _sleep_before_retry(
+                        attempt_index,
+                        response=response,
+                        retry_backoff_seconds=resolved_retry_backoff,
+                        max_backoff_seconds=resolved_max_backoff,
+                    )
+                    continue
+
+                raise _build_http_error(method, response) from exc
+            except (requests.Timeout, requests.ConnectionError) as exc:
+                if attempt_index < resolved_max_retries:
+                    _sleep_before_retry(
+                        attempt_index,
+                        response=None,
+                        retry_backoff_seconds=resolved_retry_backoff,
+                        max_backoff_seconds=resolved_max_backoff,
+                    )
+                    continue
+                raise PolygonNetworkError(f"Polygon 网络请求失败 ({method}): {exc}") from exc
+            except requests.RequestException as exc:
+                raise PolygonNetworkError(f"Polygon 请求失败 ({method}): {exc}") from exc
+
+        raise PolygonNetworkError(f"Polygon 请求失败 ({method}): 已耗尽所有重试")
 
 
 def make_api_request(
@@ -115,6 +377,7 @@ def make_api_request(
     retry_backoff_seconds: Optional[float] = None,
     retry_status_codes: Optional[set[int]] = None,
     max_backoff_seconds: Optional[float] = None,
+    transport: Optional[PolygonTransport] = None,
 ) -> Union[Dict, bytes]:
     """
     发送请求到 Polygon API。
@@ -127,106 +390,71 @@ def make_api_request(
         params: 请求参数
         raw_response: 是否返回原始响应内容
         http_method: HTTP 方法
-        max_retries: 可重试次数，不含首次请求
+        max_retries: 可重试次数，不含首次请求；未提供时使用 request_max_retries 上下文或 DEFAULT_MAX_RETRIES
         retry_backoff_seconds: 指数退避的基础秒数
         retry_status_codes: 允许重试的 HTTP 状态码集合
         max_backoff_seconds: 单次最大退避等待秒数
+        transport: 复用连接的请求通道；未提供时每次请求单独建立连接
 
     Returns:
         Union[Dict, bytes]: 如果 raw_response 为 True，返回原始响应内容；
         否则返回解析后的 JSON 数据
     """
-    resolved_max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
-    if resolved_max_retries < 0:
-        raise ValueError("max_retries 不能小于 0")
-
-    resolved_retry_backoff = (
-        DEFAULT_RETRY_BACKOFF_SECONDS
-        if retry_backoff_seconds is None
-        else retry_backoff_seconds
+    return _send_api_request(
+        api_key,
+        api_secret,
+        base_url,
+        method,
+        params,
+        raw_response=raw_response,
+        http_method=http_method,
+        stream=False,
+        headers=None,
+        max_retries=max_retries,
+        retry_backoff_seconds=retry_backoff_seconds,
+        retry_status_codes=retry_status_codes,
+        max_backoff_seconds=max_backoff_seconds,
+        transport=transport,
     )
-    if resolved_retry_backoff <= 0:
-        raise ValueError("retry_backoff_seconds 必须大于 0")
 
-    resolved_max_backoff = (
-        DEFAULT_MAX_BACKOFF_SECONDS if max_backoff_seconds is None else max_backoff_seconds
-    )
-    if resolved_max_backoff <= 0:
-        raise ValueError("max_backoff_seconds 必须大于 0")
 
-    resolved_retry_status_codes = (
-        DEFAULT_RETRY_STATUS_CODES if retry_status_codes is None else set(retry_status_codes)
-    )
-    request_method = http_method.upper()
-
-    for attempt_index in range(resolved_max_retries + 1):
-        request_params = _prepare_request_params(api_key, api_secret, method, params)
-        request_kwargs: dict[str, Any] = {"timeout": DEFAULT_TIMEOUT_SECONDS}
-        if request_method == "GET":
-            request_kwargs["params"] = request_params
-        else:
-            request_kwargs["data"] = request_params
-
-        try:
-            response = requests.request(request_method, f"{base_url}{method}", **request_kwargs)
-            response.raise_for_status()
+def open_api_stream(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    params: Optional[Dict] = None,
+    http_method: str = "GET",
+    headers: Optional[Mapping[str, str]] = None,
+    max_retries: Optional[int] = None,
+    retry_backoff_seconds: Optional[float] = None,
+    retry_status_codes: Optional[set[int]] = None,
+    max_backoff_seconds: Optional[float] = None,
+    transport: Optional[PolygonTransport] = None,
+) -> Any:
+    """
+    以流式方式发送 Polygon API 请求，返回尚未读取响应体的响应对象。
 
-            if raw_response:
-                return response.content
+    签名、状态码重试退避和 HTTP 错误映射与 make_api_request 一致；
+    调用方负责读取并关闭返回的响应。
 
-            try:
-                data = response.json()
-            except ValueError as exc:
-                raise PolygonHTTPError(
-                    f"Polygon 响应解析失败 ({method})",
-                    status_code=response.status_code,
-                    response_text=_truncate_response_text(response),
-                ) from exc
-
-            if data.get("status") != "OK":
-                raise _build_business_error(method, data)
-
-            return data
-        except requests.HTTPError as exc:
-            response = exc.response
-            status_code = response.status_code if response is not None else None
-            if (
-                status_code in resolved_retry_status_codes
-                and attempt_index < resolved_max_retries
-            ):
-                _sleep_before_retry(
-                    attempt_index,
-                    response=response,
-                    retry_backoff_seconds=resolved_retry_backoff,
-                    max_backoff_seconds=resolved_max_backoff,
-                )
-                continue
-
-            response_text = _truncate_response_text(response)
-            message = f"Polygon HTTP 错误 ({method})"
-            if status_code is not None:
-                message += f": status={status_code}"
-            if response_text is not None:
-                message += f", response={response_text}"
-
-            if status_code == 403:
-                raise AccessDeniedException(message, comment=response_text) from exc
-            raise PolygonHTTPError(
-                message,
-                status_code=status_code,
-                response_text=response_text,
-            ) from exc
-        except (requests.Timeout, requests.ConnectionError) as exc:
-            if attempt_index < resolved_max_retries:
-                _sleep_before_retry(
-                    attempt_index,
-                    response=None,
-                    retry_backoff_seconds=resolved_retry_backoff,
-                    max_backoff_seconds=resolved_max_backoff,
-                )
-                continue
-            raise PolygonNetworkError(f"Polygon 网络请求失败 ({method}): {exc}") from exc
-        except requests.RequestException as exc:
-            raise PolygonNetworkError(f"Polygon 请求失败 ({method}): {exc}") from exc
-
-    raise PolygonNetworkError(f"Polygon 请求失败 ({method}): 已耗尽所有重试")
+    Args:
+        headers: 额外请求头，例如续传使用的 Range
+        其余参数同 make_api_request
+    """
+    return _send_api_request(
+        api_key,
+        api_secret,
+        base_url,
+        method,
+        params,
+        raw_response=False,
+        http_method=http_method,
+        stream=True,
+        headers=headers,
+        max_retries=max_retries,
+        retry_backoff_seconds=retry_backoff_seconds,
+        retry_status_codes=retry_status_codes,
+        max_backoff_seconds=max_backoff_seconds,
+        transport=transport,
+    )
@@ -1,5 +1,6 @@
 from typing import Dict, Optional
 
+from src.polygon.transport import PolygonTransport
 from src.polygon.utils.client_utils import make_api_request
 
 def make_contest_request(
@@ -9,7 +10,8 @@ def make_contest_request(
     method: str,
     contest_id: int,
     pin: Optional[str] = None,
-    params: Optional[Dict] = None
+    params: Optional[Dict] = None,
+    transport: Optional[PolygonTransport] = None,
 ):
     """
     发送比赛相关的API请求
@@ -22,6 +24,7 @@ def make_contest_request(
         contest_id: 比赛ID
         pin: 比赛的PIN码（如果有）
         params: 额外的请求参数
+        transport: 复用连接的请求通道
         
     Returns:
         API响应数据
@@ -38,5 +41,6 @@ def make_contest_request(
         api_secret, 
         base_url, 
         method, 
-        request_params
+        request_params,
+        transport=transport,
     )
@@ -1,7 +1,8 @@
 from typing import Dict, Optional
 
-from src.polygon.utils.client_utils import make_api_request
+from src.polygon.utils.client_utils import make_api_request, open_api_stream
 from src.polygon.models import FileType, AccessDeniedException, AccessType
+from src.polygon.transport import PolygonTransport
 
 def make_problem_request(
     api_key: str,
@@ -13,6 +14,7 @@ def make_problem_request(
     params: Optional[Dict] = None,
     raw_response: bool = False,
     http_method: str = "GET",
+    transport: Optional[PolygonTransport] = None,
 ):
     """
     发送题目相关的API请求
@@ -26,6 +28,8 @@ def make_problem_request(
         pin: 题目的PIN码（如果有）
         params: 额外的请求参数
         raw_response: 是否返回原始响应内容
+        http_method: HTTP 方法
+        transport: 复用连接的请求通道
         
     Returns:
         API响应数据
@@ -44,7 +48,41 @@ def make_problem_request(
         method, 
         request_params,
         raw_response,
-        http_method
+        http_method,
+        transport=transport,
+    )
+
+def open_problem_stream(
+    api_key: str,
+    api_secret: str,
+    base_url: str,
+    method: str,
+    problem_id: int,
+    pin: Optional[str] = None,
+    params: Optional[Dict] = None,
+    headers: Optional[Dict[str, str]] = None,
+    transport: Optional[PolygonTransport] = None,
+):
+    """
+    以流式方式发送题目相关的API请求，返回尚未读取响应体的响应对象
+
+    Args:
+        headers: 额外请求头，例如续传使用的 Range
+        其余参数同 make_problem_request
+    """
+    request_params = dict(params or {})
+    request_params["problemId"] = str(problem_id)
+    if pin is not None:
+        request_params["pin"] = pin
+
+    return open_api_stream(
+        api_key,
+        api_secret,
+        base_url,
+        method,
+        request_params,
+        headers=headers,
+        transport=transport,
     )
 
 def check_write_access(access_type: AccessType):
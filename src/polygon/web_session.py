@@ -0,0 +1,205 @@
+import re
+import threading
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .models import AccessDeniedException
+from .registry import CredentialKey, build_credential_key
+from .streaming import SNIFF_BYTES, sniff_content_kind
+from .transport import PolygonTransport
+
+DEFAULT_DOWNLOAD_TIMEOUT = 30
+# 仅凭 cookie 的请求连续被要求登录达到该次数后，认为服务端不接受 cookie 鉴权，之后每次都携带凭证。
+MAX_COOKIE_REJECTIONS = 2
+# 登录页的特征：密码输入框，或 action 指向 login 的表单。
+_LOGIN_FORM_PATTERN = re.compile(
+    rb"""<input[^>]*type\s*=\s*["']?password|<form[^>]*action\s*=\s*["']?[^"'>\s]*\blogin\b""",
+    re.IGNORECASE,
+)
+
+
+def _is_login_url(url: Any) -> bool:
+    return isinstance(url, str) and urlparse(url).path.rstrip("/").endswith("/login")
+
+
+def _has_login_form(content: bytes) -> bool:
+    """HTML 正文中是否包含登录表单：密码输入框或提交到 login 的表单。"""
+    if sniff_content_kind(content[:SNIFF_BYTES]) != "html":
+        return False
+    return _LOGIN_FORM_PATTERN.search(content) is not None
+
+
+def is_login_response(response: requests.Response, *, inspect_body: bool = False) -> bool:
+    """
+    判断响应是否表示需要（重新）登录。
+
+    依据 403、被重定向到登录页（最终 URL、重定向历史或未跟随的 Location），以及 inspect_body 为 True 时正文中的登录表单；
+    只看 Content-Type 不足以判断，普通的 HTML 页面（如题面预览）不会被当作登录页。
+    """
+    if response.status_code == 403:
+        return True
+    if _is_login_url(getattr(response, "url", None)):
+        return True
+    for previous in [*response.history, response]:
+        if 300 <= previous.status_code < 400 and _is_login_url(previous.headers.get("Location")):
+            return True
+    return inspect_body and _has_login_form(response.content)
+
+
+class PolygonWebSession:
+    """
+    复用登录状态的 Polygon 账号密码下载会话。
+
+    首次请求携带 login/password 完成登录，之后的请求只依赖 cookie 和 keep-alive 连接；
+    仅凭 cookie 的请求遇到登录页或 403 时携带凭证重试一次。若重新登录后 cookie 仍连续被拒，
+    说明服务端不接受 cookie 鉴权，会话退回到每次都携带凭证，避免每次下载都多发一次请求。
+    """
+
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        *,
+        transport: Optional[PolygonTransport] = None,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    ):
+        self.login = login
+        self._password = password
+        self.transport = transport if transport is not None else PolygonTransport()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._authenticated = False
+        self._cookie_auth = True
+        self._cookie_rejections = 0
+        self.requests = 0
+        self.logins = 0
+        self.reauthentications = 0
+
+    def _needs_credentials(self) -> bool:
+        with self._lock:
+            return not self._authenticated or not self._cookie_auth
+
+    def _send(
+        self,
+        url: str,
+        data: dict[str, str],
+        *,
+        with_credentials: bool,
+        headers: Optional[dict[str, str]],
+        stream: bool,
+    ) -> requests.Response:
+        payload = dict(data)
+        if with_credentials:
+            payload = {"login": self.login, "password": self._password, **payload}
+        kwargs: dict[str, Any] = {"data": payload, "timeout": self.timeout}
+        if headers:
+            kwargs["headers"] = headers
+        if stream:
+            kwargs["stream"] = True
+        with self._lock:
+            self.requests += 1
+            if with_credentials:
+                self.logins += 1
+        return self.transport.request("POST", url, **kwargs)
+
+    def post(
+        self,
+        url: str,
+        data: Optional[dict[str, str]] = None,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        发送一次下载请求；需要时自动登录，返回已检查 HTTP 状态的响应。
+
+        Raises:
+            AccessDeniedException: 携带账号密码（重新）登录后仍返回登录页或 403
+        """
+        data = data or {}
+        with_credentials = self._needs_credentials()
+        response = self._send(url, data, with_credentials=with_credentials, headers=headers, stream=stream)
+        if not with_credentials:
+            if is_login_response(response, inspect_body=not stream):
+                response.close()
+                with self._lock:
+                    self._authenticated = False
+                    self.reauthentications += 1
+                    self._cookie_rejections += 1
+                    if self._cookie_rejections >= MAX_COOKIE_REJECTIONS:
+                        self._cookie_auth = False
+                with_credentials = True
+                response = self._send(url, data, with_credentials=True, headers=headers, stream=stream)
+            else:
+                with self._lock:
+                    self._cookie_rejections = 0
+        if with_credentials:
+            if is_login_response(response, inspect_body=not stream):
+                # 携带凭证后仍是登录页或 403，说明账号密码本身被拒绝；不能把登录页当作下载内容返回。
+                response.close()
+                with self._lock:
+                    self._authenticated = False
+                raise AccessDeniedException(
+                    f"Polygon 登录失败：携带账号密码后仍返回登录页或 403 (login={self.login})"
+                )
+            with self._lock:
+                self._authenticated = True
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
+
+    def stats(self) -> dict[str, Any]:
+        """返回请求数、携带凭证的登录次数和重新登录次数。"""
+        with self._lock:
+            return {
+                "login": self.login,
+                "authenticated": self._authenticated,
+                "cookie_auth": self._cookie_auth,
+                "requests": self.requests,
+                "logins": self.logins,
+                "reauthentications": self.reauthentications,
+            }
+
+    def close(self) -> None:
+        """关闭底层连接池。"""
+        self.transport.close()
+
+    def __repr__(self) -> str:
+        return f"PolygonWebSession(login={self.login!r}, authenticated={self._authenticated})"
+
+
+class WebSessionRegistry:
+    """按账号复用 PolygonWebSession 的注册表，同一账号的下载共享 cookie 和连接池。"""
+
+    def __init__(self, factory: Optional[Callable[[str, str], PolygonWebSession]] = None):
+        self._factory = factory or (lambda login, password: PolygonWebSession(login, password))
+        self._sessions: dict[CredentialKey, PolygonWebSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, login: str, password: str) -> PolygonWebSession:
+        """返回账号对应的下载会话，不存在时创建。"""
+        key = build_credential_key(login, password)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._factory(login, password)
+                self._sessions[key] = session
+            return session
+
+    def clear(self) -> None:
+        """关闭并移除全部下载会话。"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
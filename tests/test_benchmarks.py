@@ -0,0 +1,139 @@
+import io
+import json
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import requests
+
+from benchmarks.polygon_stand_in import POLYGON_API_PREFIX, PolygonStandIn
+from benchmarks.runner import BenchmarkConfig, compare_results, main, run_benchmarks
+from benchmarks.scenarios import build_scenarios
+
+SMALL_CONFIG = BenchmarkConfig(
+    latency_ms=0.0,
+    test_count=5,
+    test_input_bytes=256,
+    build_seconds=0.0,
+    package_sizes_mb=(0.25,),
+)
+
+
+class PolygonStandInTest(unittest.TestCase):
+    def _session(self, stand_in: PolygonStandIn) -> requests.Session:
+        session = requests.Session()
+        self.addCleanup(session.close)
+        return stand_in.install(session)
+
+    def test_injects_latency_and_bandwidth(self):
+        stand_in = PolygonStandIn(latency_ms=50, bandwidth_mbps=8, package_bytes=100_000)
+        session = self._session(stand_in)
+
+        started = time.perf_counter()
+        response = session.get(f"{POLYGON_API_PREFIX}problem.package", params={"packageId": "1"})
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(response.content), 100_000)
+        self.assertTrue(response.content.startswith(b"PK\x03\x04"))
+        # 50ms 延迟 + 100KB 在 8Mbps 下约 100ms
+        self.assertGreaterEqual(elapsed, 0.14)
+        self.assertEqual(stand_in.request_counts, {"problem.package": 1})
+        self.assertEqual(stand_in.bytes_sent, 100_000)
+
+    def test_package_download_honours_range_and_unknown_methods_fail(self):
+        stand_in = PolygonStandIn(package_bytes=1000)
+        session = self._session(stand_in)
+
+        full = session.get(f"{POLYGON_API_PREFIX}problem.package").content
+        partial = session.get(f"{POLYGON_API_PREFIX}problem.package", headers={"Range": "bytes=600-"})
+        unknown = session.post(f"{POLYGON_API_PREFIX}problem.unknown", data={"problemId": "1"})
+
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.headers["Content-Range"], "bytes 600-999/1000")
+        self.assertEqual(partial.content, full[600:])
+        self.assertEqual(unknown.status_code, 400)
+        self.assertEqual(unknown.json()["status"], "FAILED")
+        self.assertEqual(stand_in.total_requests(), 3)
+
+
+class BenchmarkRunnerTest(unittest.TestCase):
+    def test_scenarios_cover_key_flows_and_package_sizes(self):
+        names = [scenario.name for scenario in build_scenarios((1, 2.5))]
+
+        self.assertEqual(
+            names,
+            [
+                "check_problem_readiness",
+                "build_problem_package_and_wait",
+                "prepare_problem_release",
+                "get_problem_tests",
+                "export_problem_tests",
+                "download_problem_package_info_1mb",
+                "download_problem_package_info_2_5mb",
+            ],
+        )
+        with self.assertRaises(ValueError):
+            build_scenarios((0,))
+
+    def test_run_benchmarks_in_process_reports_metrics(self):
+        document = run_benchmarks(SMALL_CONFIG, isolate=False)
+
+        scenarios = document["scenarios"]
+        self.assertTrue(all(result["succeeded"] for result in scenarios.values()), scenarios)
+        self.assertEqual(scenarios["check_problem_readiness"]["request_count"], 16)
+        self.assertEqual(
+            scenarios["export_problem_tests"]["requests_by_method"],
+            {"problem.testAnswer": 5, "problem.testInput": 5, "problem.tests": 1, "problems.list": 1},
+        )
+        self.assertEqual(
+            scenarios["prepare_problem_release"]["runs"][0]["outcome"],
+            {"status": "success", "revision": 11},
+        )
+        download = scenarios["download_problem_package_info_0_25mb"]
+        self.assertEqual(download["runs"][0]["outcome"]["size_bytes"], 256 * 1024)
+        for result in scenarios.values():
+            self.assertGreater(result["wall_time_seconds"], 0)
+            self.assertGreaterEqual(result["cpu_seconds"], 0)
+        self.assertEqual(document["config"]["package_sizes_mb"], [0.25])
+        self.assertFalse(document["isolated"])
+
+    def test_compare_results_flags_regressions(self):
+        baseline = {"scenarios": {"flow": {"wall_time_seconds": 1.0, "request_count": 10, "peak_rss_bytes": 100}}}
+        current = {
+            "scenarios": {
+                "flow": {"wall_time_seconds": 1.1, "request_count": 11, "peak_rss_bytes": 200},
+                "new_flow": {"wall_time_seconds": 5.0, "request_count": 1, "peak_rss_bytes": 1},
+            }
+        }
+
+        regressions = compare_results(baseline, current, threshold=0.2)
+
+        self.assertEqual(
+            [(item["scenario"], item["metric"]) for item in regressions],
+            [("flow", "peak_rss_bytes"), ("flow", "request_count")],
+        )
+        self.assertEqual(compare_results(current, current), [])
+
+    def test_cli_writes_json_and_fails_on_regression(self):
+        with TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "results" / "current.json"
+            baseline = Path(temp_dir) / "baseline.json"
+            argv = ["check_problem_readiness", "--in-process", "--latency-ms", "0", "--tests", "3"]
+
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main([*argv, "--output", str(output)]), 0)
+            document = json.loads(output.read_text(encoding="utf-8"))
+            document["scenarios"]["check_problem_readiness"]["request_count"] = 1
+            baseline.write_text(json.dumps(document), encoding="utf-8")
+
+            stderr = io.StringIO()
+            with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+                self.assertEqual(main([*argv, "--compare", str(baseline)]), 1)
+            self.assertIn("request_count 1 -> 16", stderr.getvalue())
+        self.assertEqual(list(document["scenarios"]), ["check_problem_readiness"])
+
+
+if __name__ == "__main__":
+    unittest.main()
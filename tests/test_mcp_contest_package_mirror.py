@@ -0,0 +1,177 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.contest_package_mirror import mirror_contest_packages
+from src.polygon.models import DownloadedFile, PackageState, PackageType
+from src.polygon.streaming import DownloadDigest
+from tests.fake_problem_session import make_package, make_problem
+
+ZIP_BYTES = b"PK\x03\x04mirror-package"
+
+
+class _MirrorSession:
+    def __init__(self, packages, content: bytes = ZIP_BYTES):
+        self.packages = packages
+        self.content = content
+        self.downloads: list[tuple[int, object]] = []
+
+    def get_packages(self):
+        return self.packages
+
+    def download_package_to_file(self, package_id, target_path, package_type=None):
+        self.downloads.append((package_id, package_type))
+        path = Path(target_path)
+        path.write_bytes(self.content + str(package_id).encode())
+        digest = DownloadDigest.from_file(path)
+        return DownloadedFile(
+            path=str(path),
+            size_bytes=digest.size_bytes,
+            sha256=digest.sha256,
+            detected_content_kind=digest.detected_content_kind,
+        )
+
+
+class MirrorContestPackagesTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.target_dir = Path(temp_dir.name) / "mirror"
+
+    def _setup_contest(self, client_mock, session_mock, sessions: dict[int, _MirrorSession]):
+        client = Mock()
+        client.create_contest_session.return_value.get_problems.return_value = [
+            make_problem(problem_id=problem_id, contest_letter=chr(ord("A") + index))
+            for index, problem_id in enumerate(sessions)
+        ]
+        client_mock.return_value = client
+        session_mock.side_effect = lambda problem_id: sessions[problem_id]
+
+    @patch("src.mcp.utils.contest_package_mirror.get_problem_session")
+    @patch("src.mcp.utils.contest_package_mirror.get_client")
+    def test_downloads_latest_ready_package_and_writes_manifest(self, client_mock, session_mock):
+        sessions = {
+            1: _MirrorSession(
+                [
+                    make_package(10, PackageState.READY, revision=3),
+                    make_package(11, PackageState.READY, revision=4),
+                    make_package(12, PackageState.RUNNING, revision=5),
+                ]
+            ),
+            2: _MirrorSession([make_package(20, PackageState.FAILED)]),
+        }
+        self._setup_contest(client_mock, session_mock, sessions)
+
+        result = mirror_contest_packages(100, str(self.target_dir), pin="secret", max_workers=2)
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual([item["status"] for item in result["problems"]], ["downloaded", "no_ready_package"])
+        self.assertEqual(sessions[1].downloads, [(11, None)])
+        self.assertEqual(result["summary"]["no_ready_package_problems"], ["B"])
+        self.assertEqual(result["recovery_actions"][0]["tool"], "build_contest_packages_and_wait")
+        self.assertNotIn("pin", result)
+
+        manifest = json.loads((self.target_dir / "manifest.json").read_text(encoding="utf-8"))
+        entry = manifest["problems"]["1"]
+        self.assertEqual(entry["package_id"], 11)
+        self.assertEqual(entry["sha256"], result["problems"][0]["sha256"])
+        self.assertTrue((self.target_dir / entry["file"]).is_file())
+
+    @patch("src.mcp.utils.contest_package_mirror.get_problem_session")
+    @patch("src.mcp.utils.contest_package_mirror.get_client")
+    def test_rerun_only_fetches_problems_whose_package_changed(self, client_mock, session_mock):
+        sessions = {
+            1: _MirrorSession([make_package(11, PackageState.READY)]),
+            2: _MirrorSession([make_package(21, PackageState.READY)]),
+        }
+        self._setup_contest(client_mock, session_mock, sessions)
+        first = mirror_contest_packages(100, str(self.target_dir))
+        sessions[2].packages = [make_package(21, PackageState.READY), make_package(22, PackageState.READY)]
+
+        second = mirror_contest_packages(100, str(self.target_dir))
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(second["summary"]["unchanged_problems"], ["A"])
+        self.assertEqual(second["summary"]["downloaded_problems"], ["B"])
+        self.assertEqual(second["problems"][1]["previous_package_id"], 21)
+        self.assertEqual(len(sessions[1].downloads), 1)
+        self.assertEqual([package_id for package_id, _ in sessions[2].downloads], [21, 22])
+
+    @patch("src.mcp.utils.contest_package_mirror.get_problem_session")
+    @patch("src.mcp.utils.contest_package_mirror.get_client")
+    def test_new_package_gets_its_own_file_and_drops_partial_of_previous_package(self, client_mock, session_mock):
+        sessions = {1: _MirrorSession([make_package(11, PackageState.READY)])}
+        self._setup_contest(client_mock, session_mock, sessions)
+        first = mirror_contest_packages(100, str(self.target_dir))
+        sessions[1].packages = [make_package(12, PackageState.READY)]
+        first_path = Path(first["problems"][0]["path"])
+        stem = first_path.name.removesuffix("-package11.zip")
+        (self.target_dir / f"{stem}-package13.zip.part").write_bytes(b"PK\x03\x04half")
+        (self.target_dir / f"{stem}-package13.zip.part.id").write_text("other", encoding="utf-8")
+
+        second = mirror_contest_packages(100, str(self.target_dir))
+
+        self.assertEqual(second["problems"][0]["path"], str(self.target_dir / f"{stem}-package12.zip"))
+        self.assertFalse(first_path.exists())
+        self.assertEqual(
+            sorted(path.name for path in self.target_dir.iterdir()),
+            [f"{stem}-package12.zip", "manifest.json"],
+        )
+
+    @patch("src.mcp.utils.contest_package_mirror.get_problem_session")
+    @patch("src.mcp.utils.contest_package_mirror.get_client")
+    def test_redownloads_when_local_file_no_longer_matches_manifest(self, client_mock, session_mock):
+        sessions = {1: _MirrorSession([make_package(11, PackageState.READY)])}
+        self._setup_contest(client_mock, session_mock, sessions)
+        first = mirror_contest_packages(100, str(self.target_dir))
+        Path(first["problems"][0]["path"]).write_bytes(b"PK\x03\x04tampered-content")
+
+        second = mirror_contest_packages(100, str(self.target_dir))
+
+        self.assertEqual(second["problems"][0]["status"], "downloaded")
+        self.assertEqual(second["problems"][0]["sha256"], first["problems"][0]["sha256"])
+
+    @patch("src.mcp.utils.contest_package_mirror.get_problem_session")
+    @patch("src.mcp.utils.contest_package_mirror.get_client")
+    def test_full_package_type_skips_standard_packages_and_rejects_non_zip(self, client_mock, session_mock):
+        sessions = {
+            1: _MirrorSession(
+                [
+                    make_package(11, PackageState.READY, package_type=PackageType.LINUX),
+                    make_package(12, PackageState.READY),
+                ]
+            ),
+            2: _MirrorSession(
+                [make_package(21, PackageState.READY, package_type=PackageType.LINUX)],
+                content=b"<html>login</html>",
+            ),
+        }
+        sessions[1].packages[1].creationTimeSeconds = sessions[1].packages[0].creationTimeSeconds
+        self._setup_contest(client_mock, session_mock, sessions)
+
+        result = mirror_contest_packages(100, str(self.target_dir), package_type="linux")
+
+        self.assertEqual(sessions[1].downloads, [(11, PackageType.LINUX)])
+        self.assertEqual(result["problems"][1]["status"], "error")
+        self.assertIn("不是 zip", result["problems"][1]["error"])
+        self.assertEqual(sorted(path.name for path in self.target_dir.iterdir()), sorted(
+            ["manifest.json", Path(result["problems"][0]["path"]).name]
+        ))
+        self.assertEqual(result["recovery_actions"][0]["tool"], "mirror_contest_packages")
+
+    @patch("src.mcp.utils.contest_package_mirror.get_client")
+    def test_reports_invalid_parameters_and_empty_contest(self, client_mock):
+        client_mock.return_value.create_contest_session.return_value.get_problems.return_value = []
+
+        invalid = mirror_contest_packages(100, str(self.target_dir), package_type="zip")
+        empty = mirror_contest_packages(100, str(self.target_dir))
+
+        self.assertEqual(invalid["error_type"], "ValueError")
+        self.assertEqual(empty["decision"], "contest_unavailable")
+        self.assertFalse(self.target_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
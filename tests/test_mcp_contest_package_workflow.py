@@ -0,0 +1,154 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from src.mcp.package_builds import build_durations
+from src.mcp.utils.contest_package_workflow import build_contest_packages_and_wait
+from src.polygon.models import PackageState
+from tests.fake_problem_session import make_package, make_problem
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _BuildingSession:
+    """每次 get_packages 推进一步状态的假会话；build_package 返回新 package 的 ID。"""
+
+    def __init__(self, package_id: int, states: list[PackageState], events: list[str], label: str):
+        self.package_id = package_id
+        self.states = list(states)
+        self.events = events
+        self.label = label
+        self.built = False
+
+    def build_package(self, full, verify):
+        self.events.append(f"build {self.label}")
+        self.built = True
+        return {"packageId": self.package_id}
+
+    def get_packages(self):
+        if not self.built:
+            return []
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        if state in (PackageState.READY, PackageState.FAILED):
+            self.events.append(f"finish {self.label}")
+        return [make_package(self.package_id, state)]
+
+
+class BuildContestPackagesAndWaitTest(unittest.TestCase):
+    def setUp(self):
+        build_durations.clear()
+        self.clock = _Clock()
+        self.events: list[str] = []
+        patchers = [
+            patch("src.mcp.utils.contest_package_workflow.time.monotonic", self.clock.monotonic),
+            patch("src.mcp.utils.contest_package_workflow.time.sleep", self.clock.sleep),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        build_durations.clear()
+
+    def _setup_contest(self, client_mock, session_mock, sessions: dict[int, _BuildingSession]):
+        problems = [
+            make_problem(problem_id=problem_id, contest_letter=session.label)
+            for problem_id, session in sessions.items()
+        ]
+        client = Mock()
+        client.create_contest_session.return_value.get_problems.return_value = problems
+        client_mock.return_value = client
+        session_mock.side_effect = lambda problem_id: sessions[problem_id]
+
+    @patch("src.mcp.utils.contest_package_workflow.get_problem_session")
+    @patch("src.mcp.utils.contest_package_workflow.get_client")
+    def test_limits_in_flight_builds_and_reports_completion_order(self, client_mock, session_mock):
+        sessions = {
+            1: _BuildingSession(11, [PackageState.RUNNING, PackageState.READY], self.events, "A"),
+            2: _BuildingSession(21, [PackageState.RUNNING] * 3 + [PackageState.READY], self.events, "B"),
+            3: _BuildingSession(31, [PackageState.READY], self.events, "C"),
+        }
+        self._setup_contest(client_mock, session_mock, sessions)
+
+        result = build_contest_packages_and_wait(
+            100,
+            full=True,
+            verify=False,
+            max_in_flight=2,
+            poll_interval_seconds=1.0,
+        )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["decision"], "packages_ready")
+        self.assertLess(self.events.index("finish A"), self.events.index("build C"))
+        self.assertEqual([item["letter"] for item in result["completion_order"]], ["A", "C", "B"])
+        self.assertEqual([item["package_id"] for item in result["problems"]], [11, 21, 31])
+        self.assertTrue(all(item["duration_seconds"] is not None for item in result["problems"]))
+        self.assertEqual(result["polling"]["max_in_flight"], 2)
+        self.assertIsNotNone(build_durations.expected(1, True, False))
+
+    @patch("src.mcp.utils.contest_package_workflow.get_problem_session")
+    @patch("src.mcp.utils.contest_package_workflow.get_client")
+    def test_reports_partial_result_with_failures_and_timeouts(self, client_mock, session_mock):
+        sessions = {
+            1: _BuildingSession(11, [PackageState.READY], self.events, "A"),
+            2: _BuildingSession(21, [PackageState.FAILED], self.events, "B"),
+            3: _BuildingSession(31, [PackageState.RUNNING], self.events, "C"),
+        }
+        self._setup_contest(client_mock, session_mock, sessions)
+
+        result = build_contest_packages_and_wait(
+            100,
+            full=True,
+            verify=True,
+            timeout_seconds=10,
+            max_poll_interval_seconds=2.0,
+        )
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["decision"], "build_timeout")
+        summary = result["summary"]
+        self.assertEqual(
+            (summary["ready_problems"], summary["failed_problems"], summary["timeout_problems"]),
+            (["A"], ["B"], ["C"]),
+        )
+        tools = [action.get("tool") for action in result["recovery_actions"]]
+        self.assertIn("build_problem_package_and_wait", tools)
+        self.assertIn("build_contest_packages_and_wait", tools)
+
+    @patch("src.mcp.utils.contest_package_workflow.get_problem_session")
+    @patch("src.mcp.utils.contest_package_workflow.get_client")
+    def test_trigger_error_frees_slot_for_next_problem(self, client_mock, session_mock):
+        broken = _BuildingSession(11, [PackageState.READY], self.events, "A")
+        broken.build_package = Mock(side_effect=RuntimeError("no write access"))
+        sessions = {1: broken, 2: _BuildingSession(21, [PackageState.READY], self.events, "B")}
+        self._setup_contest(client_mock, session_mock, sessions)
+
+        result = build_contest_packages_and_wait(100, full=True, verify=True, max_in_flight=1)
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["problems"][0]["status"], "error")
+        self.assertEqual(result["problems"][0]["error"], "no write access")
+        self.assertEqual(result["problems"][1]["status"], "ready")
+
+    @patch("src.mcp.utils.contest_package_workflow.get_client")
+    def test_rejects_invalid_parameters_and_empty_contest(self, client_mock):
+        invalid = build_contest_packages_and_wait(100, full=True, verify=True, max_in_flight=0)
+        client_mock.return_value.create_contest_session.return_value.get_problems.return_value = []
+        empty = build_contest_packages_and_wait(100, full=True, verify=True)
+
+        self.assertEqual(invalid["decision"], "invalid_request")
+        self.assertEqual(empty["decision"], "contest_unavailable")
+        self.assertEqual(empty["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
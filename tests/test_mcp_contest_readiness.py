@@ -0,0 +1,142 @@
+import os
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.contest_readiness import check_contest_readiness
+from tests.fake_problem_session import make_problem
+
+
+def _contest_problem(problem_id: int, letter: str):
+    return make_problem(problem_id=problem_id, contest_letter=letter)
+
+
+def _readiness(status: str, blocking=(), warnings=()):
+    return {
+        "ready": not blocking,
+        "blocking_issues": list(blocking),
+        "warnings": list(warnings),
+        "summary": {
+            "status": status,
+            "blocking_issue_count": len(blocking),
+            "warning_count": len(warnings),
+        },
+        "details": {"problem_id": 0},
+        "fetch_timings": {"total_elapsed_ms": 1.0},
+    }
+
+
+class CheckContestReadinessTest(unittest.TestCase):
+    def _client(self, problems):
+        client = Mock()
+        client.create_contest_session.return_value.get_problems.return_value = problems
+        return client
+
+    @patch("src.mcp.utils.contest_readiness._check_problem_readiness")
+    @patch("src.mcp.utils.contest_readiness.get_client")
+    def test_rolls_up_per_problem_results(self, client_mock, readiness_mock):
+        client_mock.return_value = self._client(
+            [_contest_problem(1, "A"), _contest_problem(2, "B"), _contest_problem(3, "C")]
+        )
+        results = {
+            1: _readiness("ready"),
+            2: _readiness("warnings", warnings=["通用题解为空"]),
+            3: _readiness("blocked", blocking=["缺少 validator"], warnings=["未配置 checker 测试"]),
+        }
+        readiness_mock.side_effect = lambda problem_id, pin, testset, max_workers: results[problem_id]
+
+        result = check_contest_readiness(100, pin="secret")
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual([item["letter"] for item in result["problems"]], ["A", "B", "C"])
+        self.assertEqual([item["status"] for item in result["problems"]], ["ready", "warnings", "blocked"])
+        self.assertNotIn("details", result["problems"][0])
+        summary = result["summary"]
+        self.assertEqual(summary["status"], "blocked")
+        self.assertEqual(summary["blocked_problems"], ["C"])
+        self.assertEqual(summary["warning_problems"], ["B"])
+        self.assertEqual((summary["blocking_issue_count"], summary["warning_count"]), (1, 2))
+        self.assertFalse(result["ready"])
+        self.assertEqual(result["recovery_actions"][0]["params"], {"problem_id": 3, "testset": "tests"})
+        self.assertNotIn("pin", result)
+        client_mock.return_value.create_contest_session.assert_called_once_with(100, "secret")
+
+    @patch("src.mcp.utils.contest_readiness._check_problem_readiness")
+    @patch("src.mcp.utils.contest_readiness.get_client")
+    def test_checks_problems_concurrently(self, client_mock, readiness_mock):
+        client_mock.return_value = self._client(
+            [_contest_problem(index, letter) for index, letter in enumerate("ABC", 1)]
+        )
+        barrier = threading.Barrier(3, timeout=2)
+
+        def check(problem_id, pin, testset, max_workers):
+            barrier.wait()
+            return _readiness("ready")
+
+        readiness_mock.side_effect = check
+
+        result = check_contest_readiness(100, max_workers=3, include_details=True)
+
+        self.assertEqual(result["summary"]["ready_count"], 3)
+        self.assertTrue(result["ready"])
+        self.assertEqual(result["decision"], "ready_for_release")
+        self.assertIn("fetch_timings", result["problems"][0])
+        self.assertEqual(result["timings"]["max_workers"], 3)
+
+    @patch("src.mcp.utils.contest_readiness._check_problem_readiness")
+    @patch("src.mcp.utils.contest_readiness.get_client")
+    def test_total_fetch_threads_fit_the_connection_pool(self, client_mock, readiness_mock):
+        client_mock.return_value = self._client(
+            [_contest_problem(index, letter) for index, letter in enumerate("ABCDEF", 1)]
+        )
+        readiness_mock.return_value = _readiness("ready")
+
+        with patch.dict(os.environ, {"POLYGON_HTTP_POOL_MAXSIZE": "16", "POLYGON_READINESS_FETCH_WORKERS": "8"}):
+            default = check_contest_readiness(100)
+            wide = check_contest_readiness(100, max_workers=6)
+        with patch.dict(os.environ, {"POLYGON_HTTP_POOL_MAXSIZE": "2"}):
+            tiny_pool = check_contest_readiness(100)
+
+        self.assertEqual((default["timings"]["max_workers"], default["timings"]["fetch_workers"]), (4, 4))
+        self.assertEqual((wide["timings"]["max_workers"], wide["timings"]["fetch_workers"]), (6, 2))
+        self.assertEqual((tiny_pool["timings"]["max_workers"], tiny_pool["timings"]["fetch_workers"]), (2, 1))
+        self.assertEqual({call.kwargs["max_workers"] for call in readiness_mock.call_args_list}, {4, 2, 1})
+
+    @patch("src.mcp.utils.contest_readiness._check_problem_readiness")
+    @patch("src.mcp.utils.contest_readiness.get_client")
+    def test_problem_failure_is_isolated(self, client_mock, readiness_mock):
+        client_mock.return_value = self._client([_contest_problem(1, "A"), _contest_problem(2, "B")])
+        def check(problem_id, pin, testset, max_workers):
+            if problem_id == 2:
+                raise RuntimeError("boom")
+            return _readiness("ready")
+
+        readiness_mock.side_effect = check
+
+        result = check_contest_readiness(100)
+
+        self.assertEqual(result["problems"][1]["status"], "error")
+        self.assertEqual(result["problems"][1]["error"], "boom")
+        self.assertEqual(result["summary"]["error_problems"], ["B"])
+        self.assertEqual(result["summary"]["status"], "blocked")
+
+    @patch("src.mcp.utils.contest_readiness.get_client")
+    def test_reports_empty_or_unavailable_contest(self, client_mock):
+        client_mock.return_value = self._client([])
+        empty = check_contest_readiness(100)
+        client_mock.return_value.create_contest_session.side_effect = RuntimeError("denied")
+        unavailable = check_contest_readiness(100)
+
+        self.assertEqual(empty["status"], "error")
+        self.assertEqual(empty["decision"], "contest_unavailable")
+        self.assertEqual(unavailable["error"], "denied")
+
+    def test_rejects_non_positive_workers(self):
+        result = check_contest_readiness(100, max_workers=0)
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "ValueError")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.mcp.utils.common import paginate_items
+from src.mcp.utils.problem_content import get_problem_files
+from src.mcp.utils.problem_packages import get_problem_packages
+from src.polygon.models import File, PackageState, ProblemFiles, Test
+from tests.fake_problem_session import make_package, make_test
+
+
+def _file(name: str) -> File:
+    return File(name=name, modificationTimeSeconds=datetime(2024, 1, 1), length=len(name))
+
+
+class PaginateItemsTest(unittest.TestCase):
+    def test_cursor_walks_all_pages_in_order(self):
+        tests = [make_test(index=index) for index in range(1, 8)]
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = paginate_items(tests, scope="tests", cursor=cursor, limit=3, fields=["index"])
+            seen.extend(item["index"] for item in page.items)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, list(range(1, 8)))
+        self.assertEqual(pages, 3)
+        self.assertEqual(page.total, 7)
+
+    def test_filters_match_scalars_and_lists_and_bind_the_cursor(self):
+        tests = [make_test(index=index, group="odd" if index % 2 else "even") for index in range(1, 7)]
+
+        first = paginate_items(tests, scope="tests", limit=2, filters={"group": "odd"})
+        membership = paginate_items(tests, scope="tests", filters={"index": [2, 5, 9]}, fields=["index"])
+
+        self.assertEqual(first.total, 3)
+        self.assertEqual([item["index"] for item in first.items], [1, 3])
+        self.assertEqual(membership.items, [{"index": 2}, {"index": 5}])
+        with self.assertRaisesRegex(ValueError, "不匹配"):
+            paginate_items(tests, scope="tests", cursor=first.next_cursor, filters={"group": "even"})
+        with self.assertRaisesRegex(ValueError, "不匹配"):
+            paginate_items(tests, scope="other", cursor=first.next_cursor, filters={"group": "odd"})
+
+    def test_unknown_fields_are_rejected_with_allowed_list(self):
+        tests = [make_test(index=1)]
+
+        with self.assertRaisesRegex(ValueError, "unknown.*index"):
+            paginate_items(tests, scope="tests", fields=["unknown"])
+        with self.assertRaisesRegex(ValueError, "filters"):
+            paginate_items(tests, scope="tests", filters={"unknown": 1})
+
+    def test_model_fields_are_checked_even_when_nothing_matches(self):
+        tests = [make_test(index=1, group="samples")]
+
+        for items, filters in (([], None), (tests, {"group": "missing"}), (tests, None)):
+            with self.assertRaisesRegex(ValueError, "fields.*unknown"):
+                paginate_items(items, scope="tests", fields=["unknown"], filters=filters, model=Test)
+        with self.assertRaisesRegex(ValueError, "filters.*unknown"):
+            paginate_items([], scope="tests", filters={"unknown": 1}, model=Test)
+        empty = paginate_items([], scope="tests", fields=["index"], filters={"group": "samples"}, model=Test)
+
+        self.assertEqual((empty.total, empty.items), (0, []))
+
+    def test_default_page_size_comes_from_environment(self):
+        tests = [make_test(index=index) for index in range(1, 6)]
+
+        with patch.dict(os.environ, {"POLYGON_LIST_PAGE_SIZE": "2"}):
+            limited = paginate_items(tests, scope="tests")
+        with patch.dict(os.environ, {"POLYGON_LIST_PAGE_SIZE": "0"}):
+            unlimited = paginate_items(tests, scope="tests")
+
+        self.assertEqual((len(limited.items), limited.limit), (2, 2))
+        self.assertIsNotNone(limited.next_cursor)
+        self.assertEqual((len(unlimited.items), unlimited.limit, unlimited.next_cursor), (5, None, None))
+
+
+class ListToolsPaginationTest(unittest.TestCase):
+    @patch("src.mcp.utils.problem_content.call_problem_session_method")
+    def test_get_problem_files_flattens_file_groups(self, session_call_mock):
+        session_call_mock.return_value = ProblemFiles(
+            resourceFiles=[_file("olymp.sty")],
+            sourceFiles=[_file("gen.cpp"), _file("val.cpp")],
+            auxFiles=[],
+        )
+
+        page = get_problem_files(1, filters={"fileType": "source"}, fields=["name", "fileType"])
+
+        self.assertEqual(
+            page.items,
+            [{"name": "gen.cpp", "fileType": "source"}, {"name": "val.cpp", "fileType": "source"}],
+        )
+        session_call_mock.assert_called_once_with(1, None, "get_files")
+
+    @patch("src.mcp.utils.problem_packages.call_problem_session_method")
+    def test_get_problem_packages_filters_by_state(self, session_call_mock):
+        session_call_mock.return_value = [
+            make_package(1, PackageState.READY),
+            make_package(2, PackageState.FAILED),
+            make_package(3, PackageState.READY),
+        ]
+
+        page = get_problem_packages(1, filters={"state": "READY"}, fields=["id"])
+
+        self.assertEqual(page.items, [{"id": 1}, {"id": 3}])
+
+    @patch("src.mcp.utils.problem_packages.call_problem_session_method", return_value=[])
+    def test_get_problem_packages_rejects_unknown_field_on_empty_list(self, _session_call_mock):
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            get_problem_packages(1, fields=["unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,50 @@
 import unittest
 from unittest.mock import patch
 
+from src.mcp.package_builds import AdaptivePollSchedule, build_durations
 from src.mcp.utils.problem_package_workflow import build_problem_package_and_wait
 from src.polygon.models import PackageState
 from tests.fake_problem_session import FakeProblemSession, SequenceValue, make_package
 
 
+class AdaptivePollScheduleTest(unittest.TestCase):
+    def test_backs_off_exponentially_up_to_cap(self):
+        schedule = AdaptivePollSchedule(initial_interval=1.0, max_interval=5.0, uniform=lambda a, b: 1.0)
+
+        delays = [schedule.next_delay(0.0, 100.0) for _ in range(5)]
+
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 5.0, 5.0])
+
+    def test_applies_bounded_jitter_and_respects_remaining_time(self):
+        low = AdaptivePollSchedule(initial_interval=1.0, max_interval=5.0, uniform=lambda a, b: a)
+        high = AdaptivePollSchedule(initial_interval=4.5, max_interval=5.0, uniform=lambda a, b: b)
+        short = AdaptivePollSchedule(initial_interval=4.0, max_interval=5.0, uniform=lambda a, b: 1.0)
+
+        self.assertAlmostEqual(low.next_delay(0.0, 100.0), 0.8)
+        self.assertEqual(high.next_delay(0.0, 100.0), 5.0)
+        self.assertEqual(short.next_delay(9.0, 1.5), 1.5)
+
+    def test_waits_for_expected_duration_before_polling_fast(self):
+        schedule = AdaptivePollSchedule(
+            initial_interval=1.0,
+            max_interval=30.0,
+            expected_duration=50.0,
+            uniform=lambda a, b: 1.0,
+        )
+
+        self.assertEqual(schedule.next_delay(0.0, 600.0), 30.0)
+        self.assertEqual(schedule.next_delay(30.0, 570.0), 10.0)
+        self.assertEqual(schedule.next_delay(40.0, 560.0), 1.0)
+        self.assertEqual(schedule.next_delay(41.0, 559.0), 2.0)
+
+
 class MpcPackageWorkflowTest(unittest.TestCase):
+    def setUp(self):
+        build_durations.clear()
+
+    def tearDown(self):
+        build_durations.clear()
+
     @patch("src.mcp.utils.problem_package_workflow.time.sleep")
     @patch("src.mcp.utils.problem_package_workflow.get_problem_session")
     def test_build_problem_package_and_wait_returns_ready_package(self, session_mock, _sleep_mock):
@@ -162,6 +200,79 @@ class MpcPackageWorkflowTest(unittest.TestCase):
         self.assertIn("poll failed", result["error"])
         self.assertEqual(result["target_package_id"], 3)
 
+    @patch("src.mcp.utils.problem_package_workflow.time.sleep")
+    @patch("src.mcp.utils.problem_package_workflow.get_problem_session")
+    def test_build_problem_package_and_wait_reports_polling_and_backs_off(self, session_mock, sleep_mock):
+        session = FakeProblemSession(
+            packages=SequenceValue(
+                [],
+                [make_package(4, PackageState.PENDING)],
+                [make_package(4, PackageState.RUNNING)],
+                [make_package(4, PackageState.RUNNING)],
+                [make_package(4, PackageState.READY)],
+            ),
+            build_package_result={"packageId": 4},
+        )
+        session_mock.return_value = session
+
+        result = build_problem_package_and_wait(
+            problem_id=5,
+            full=True,
+            verify=True,
+            timeout_seconds=600,
+            poll_interval_seconds=1.0,
+            max_poll_interval_seconds=30.0,
+        )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["request"]["max_poll_interval_seconds"], 30.0)
+        polling = result["polling"]
+        self.assertEqual(polling["request_count"], 6)
+        self.assertEqual(polling["poll_requests"], 4)
+        self.assertEqual(len(polling["poll_latencies_ms"]), 4)
+        self.assertIsNone(polling["expected_duration_seconds"])
+        delays = [call.args[0] for call in sleep_mock.call_args_list]
+        self.assertEqual(len(delays), 3)
+        self.assertLess(delays[0], delays[2])
+        self.assertTrue(all(0.8 <= delay <= 30.0 for delay in delays))
+        self.assertIsNotNone(build_durations.expected(5, True, True))
+
+    @patch("src.mcp.utils.problem_package_workflow.time.sleep")
+    @patch("src.mcp.utils.problem_package_workflow.get_problem_session")
+    def test_build_problem_package_and_wait_uses_learned_build_duration(self, session_mock, sleep_mock):
+        build_durations.record(5, True, False, 100.0)
+        session = FakeProblemSession(
+            packages=SequenceValue(
+                [],
+                [make_package(4, PackageState.RUNNING)],
+                [make_package(4, PackageState.READY)],
+            ),
+            build_package_result={"packageId": 4},
+        )
+        session_mock.return_value = session
+
+        result = build_problem_package_and_wait(
+            problem_id=5,
+            full=True,
+            verify=False,
+            max_poll_interval_seconds=60.0,
+        )
+
+        self.assertEqual(result["polling"]["expected_duration_seconds"], 100.0)
+        self.assertGreaterEqual(sleep_mock.call_args_list[0].args[0], 60.0 * 0.8)
+
+    def test_build_problem_package_and_wait_rejects_cap_below_initial_interval(self):
+        result = build_problem_package_and_wait(
+            problem_id=1,
+            full=True,
+            verify=True,
+            poll_interval_seconds=10.0,
+            max_poll_interval_seconds=5.0,
+        )
+
+        self.assertEqual(result["decision"], "invalid_request")
+        self.assertIn("max_poll_interval_seconds", result["error"])
+
 
 if __name__ == "__main__":
     unittest.main()
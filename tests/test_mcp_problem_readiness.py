@@ -1,3 +1,4 @@
+import threading
 import unittest
 from unittest.mock import Mock, patch
 
@@ -452,6 +453,74 @@ class MpcProblemReadinessTest(unittest.TestCase):
         self.assertIn("题目文件 检查失败: files broken", result["blocking_issues"])
         self.assertEqual(result["details"]["题目文件"]["status"], "error")
         self.assertIn("题目文件", result["summary"]["sections_with_errors"])
+        self.assertEqual(result["fetch_timings"]["sections"]["files"]["status"], "error")
+        self.assertEqual(result["fetch_timings"]["sections"]["tests"]["status"], "ok")
+
+    @patch("src.mcp.utils.problem_readiness.get_problem_session")
+    def test_check_problem_readiness_fetches_sections_concurrently(self, session_mock):
+        session = FakeProblemSession(
+            problems=[make_problem(modified=False)],
+            info=make_problem_info(),
+            statements={"english": make_statement()},
+            validator="validator.cpp",
+            checker="",
+            files=make_problem_files("validator.cpp"),
+            tests=[
+                make_test(index=1, manual=False, input_text="", script_line="gen 1", group="g1"),
+            ],
+            scripts={"tests": b"gen 1"},
+            test_groups={"tests": [make_test_group("g1")]},
+            solutions=[make_solution("main.cpp", SolutionTag.MA)],
+            validator_tests=[Mock()],
+            packages=[make_package(1, PackageState.READY)],
+            general_tutorial="tutorial",
+        )
+        barrier = threading.Barrier(2, timeout=5)
+        original_get_info = session.get_info
+        original_get_solutions = session.get_solutions
+
+        def get_info():
+            barrier.wait()
+            return original_get_info()
+
+        def get_solutions():
+            barrier.wait()
+            return original_get_solutions()
+
+        session.get_info = get_info
+        session.get_solutions = get_solutions
+        session_mock.return_value = session
+
+        result = check_problem_readiness(problem_id=1)
+
+        self.assertNotIn("题目信息", result["summary"]["sections_with_errors"])
+        self.assertNotIn("解法", result["summary"]["sections_with_errors"])
+        timings = result["fetch_timings"]
+        self.assertEqual(timings["wave_count"], 2)
+        self.assertEqual(
+            set(timings["sections"]),
+            {
+                "info",
+                "problem",
+                "statements",
+                "validator",
+                "checker",
+                "interactor",
+                "extra_validators",
+                "files",
+                "statement_resources",
+                "tests",
+                "solutions",
+                "packages",
+                "general_tutorial",
+                "script",
+                "test_groups",
+                "validator_tests",
+            },
+        )
+        self.assertEqual(session.calls["view_script"], [{"testset": "tests"}])
+        self.assertEqual(session.calls["get_checker_tests"], [])
+        self.assertEqual(result["details"]["test_groups"]["defined_names"], ["g1"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.problem_tests_batch import save_problem_tests_batch
+from src.polygon.models import AccessDeniedException, PolygonHTTPError
+from src.polygon.utils.client_utils import current_request_max_retries
+
+
+class _BatchSession:
+    def __init__(self, failures: dict[int, list[Exception]] | None = None):
+        self.failures = {index: list(errors) for index, errors in (failures or {}).items()}
+        self.saved: list[dict] = []
+        self.request_max_retries: list[int] = []
+        self.ensure_write_access = Mock()
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def save_test(self, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.request_max_retries.append(current_request_max_retries())
+        try:
+            pending = self.failures.get(kwargs["test_index"])
+            if pending:
+                raise pending.pop(0)
+            with self._lock:
+                self.saved.append(kwargs)
+            return {"status": "OK"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class MpcProblemTestsBatchTest(unittest.TestCase):
+    @patch("src.mcp.utils.problem_tests_batch.get_problem_session")
+    def test_uploads_inline_tests_with_per_item_results(self, session_mock):
+        session = _BatchSession()
+        session_mock.return_value = session
+
+        result = save_problem_tests_batch(
+            problem_id=1,
+            testset="tests",
+            pin="1234",
+            tests=[
+                {"test_index": 2, "test_input": "2 3"},
+                {"test_index": 1, "test_input": "1 2", "test_use_in_statements": True},
+            ],
+            test_group="samples",
+            max_workers=2,
+        )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["result"]["summary"]["total"], 2)
+        self.assertEqual(result["result"]["summary"]["succeeded"], 2)
+        self.assertEqual([item["test_index"] for item in result["result"]["items"]], [1, 2])
+        self.assertTrue(all(item["retries"] == 0 for item in result["result"]["items"]))
+        self.assertIn("latency_ms", result["result"]["items"][0])
+        session.ensure_write_access.assert_called_once_with()
+        saved = {item["test_index"]: item for item in session.saved}
+        self.assertEqual(saved[1]["test_group"], "samples")
+        self.assertEqual(saved[1]["testset"], "tests")
+        self.assertIs(saved[1]["test_use_in_statements"], True)
+        self.assertNotIn("pin", result)
+
+    @patch("src.mcp.utils.problem_tests_batch.get_problem_session")
+    def test_loads_tests_from_directory_and_skips_answers(self, session_mock):
+        session = _BatchSession()
+        session_mock.return_value = session
+
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "01").write_text("1 2\n", encoding="utf-8")
+            (root / "01.a").write_text("3\n", encoding="utf-8")
+            (root / "2.in").write_text("5 6\n", encoding="utf-8")
+            (root / "README.md").write_text("notes", encoding="utf-8")
+
+            result = save_problem_tests_batch(problem_id=1, testset="tests", tests_dir=temp_dir)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(
+            sorted((item["test_index"], item["test_input"]) for item in session.saved),
+            [(1, "1 2\n"), (2, "5 6\n")],
+        )
+
+    @patch("src.mcp.test_uploads.time.sleep")
+    @patch("src.mcp.utils.problem_tests_batch.get_problem_session")
+    def test_retries_rate_limited_items_and_reports_partial_failure(self, session_mock, sleep_mock):
+        session = _BatchSession(
+            failures={
+                1: [PolygonHTTPError("busy", status_code=429)],
+                2: [PolygonHTTPError("bad", status_code=400)],
+            }
+        )
+        session_mock.return_value = session
+
+        result = save_problem_tests_batch(
+            problem_id=1,
+            testset="tests",
+            tests=[{"test_index": 1}, {"test_index": 2}, {"test_index": 3}],
+            max_workers=1,
+        )
+
+        self.assertEqual(result["status"], "partial")
+        summary = result["result"]["summary"]
+        self.assertEqual(summary["succeeded"], 2)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(summary["total_retries"], 1)
+        self.assertEqual(summary["failed_indices"], [2])
+        items = {item["test_index"]: item for item in result["result"]["items"]}
+        self.assertEqual(items[1]["retries"], 1)
+        self.assertEqual(items[2]["error_type"], "PolygonHTTPError")
+        sleep_mock.assert_called()
+        # 请求层不再叠加重试：每次 save_test 都只发一次 HTTP 请求。
+        self.assertEqual(session.request_max_retries, [0, 0, 0, 0])
+
+    @patch("src.mcp.utils.problem_tests_batch.get_problem_session")
+    def test_bounds_concurrency(self, session_mock):
+        session = _BatchSession()
+        session_mock.return_value = session
+
+        result = save_problem_tests_batch(
+            problem_id=1,
+            testset="tests",
+            tests=[{"test_index": index} for index in range(1, 21)],
+            max_workers=3,
+        )
+
+        self.assertEqual(result["result"]["summary"]["succeeded"], 20)
+        self.assertLessEqual(session.max_active, 3)
+
+    @patch("src.mcp.utils.problem_tests_batch.get_problem_session")
+    def test_rejects_invalid_input_and_missing_write_access(self, session_mock):
+        session = _BatchSession()
+        session.ensure_write_access.side_effect = AccessDeniedException("read only")
+        session_mock.return_value = session
+
+        both_inputs = save_problem_tests_batch(
+            problem_id=1,
+            testset="tests",
+            tests=[{"test_index": 1}],
+            tests_dir="/tmp",
+        )
+        duplicate = save_problem_tests_batch(
+            problem_id=1,
+            testset="tests",
+            tests=[{"test_index": 1}, {"test_index": 1}],
+        )
+        unknown_field = save_problem_tests_batch(
+            problem_id=1,
+            testset="tests",
+            tests=[{"test_index": 1, "answer": "3"}],
+        )
+        denied = save_problem_tests_batch(problem_id=1, testset="tests", tests=[{"test_index": 1}])
+
+        self.assertEqual(both_inputs["error_type"], "ValueError")
+        self.assertIn("重复", duplicate["error"])
+        self.assertIn("answer", unknown_field["error"])
+        self.assertEqual(denied["status"], "error")
+        self.assertEqual(denied["error_type"], "AccessDeniedException")
+        self.assertEqual(session.saved, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.problem_tests_export import (
+    EXPORT_MANIFEST_FILENAME,
+    export_problem_tests,
+    get_problem_tests_export_progress,
+)
+from src.polygon.models import DownloadedFile
+from tests.fake_problem_session import make_problem, make_test
+
+
+class _ExportSession:
+    def __init__(self, inputs: dict[int, bytes], failing: tuple[str, ...] = ()):
+        self.inputs = inputs
+        self.failing = set(failing)
+        self.downloads: list[str] = []
+        self._lock = threading.Lock()
+
+    def get_tests(self, testset, no_inputs=None):
+        assert no_inputs is True
+        return [make_test(index=index) for index in self.inputs]
+
+    def _write(self, name: str, content: bytes, target) -> DownloadedFile:
+        with self._lock:
+            self.downloads.append(name)
+        if name in self.failing:
+            raise RuntimeError(f"{name} unavailable")
+        Path(target).write_bytes(content)
+        return DownloadedFile(
+            path=str(target),
+            size_bytes=len(content),
+            sha256=hashlib.sha256(content).hexdigest(),
+        )
+
+    def download_test_input_to_file(self, testset, test_index, target_path):
+        return self._write(Path(target_path).name, self.inputs[test_index], target_path)
+
+    def download_test_answer_to_file(self, testset, test_index, target_path):
+        return self._write(Path(target_path).name, self.inputs[test_index] + b"=ans", target_path)
+
+
+class ExportProblemTestsTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name) / "tests"
+        client_patcher = patch("src.mcp.utils.problem_tests_export.get_client")
+        self.client = client_patcher.start().return_value
+        self.addCleanup(client_patcher.stop)
+        self.client.get_problems.return_value = [make_problem(problem_id=1, revision=5)]
+
+    @patch("src.mcp.utils.problem_tests_export.get_problem_session")
+    def test_exports_inputs_and_answers_with_nn_layout(self, session_mock):
+        session = _ExportSession({1: b"1 2\n", 2: b"3 4\n", 10: b"big\n"})
+        session_mock.return_value = session
+
+        result = export_problem_tests(1, "tests", str(self.root), pin="1234", max_workers=3)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual((self.root / "01").read_bytes(), b"1 2\n")
+        self.assertEqual((self.root / "10.a").read_bytes(), b"big\n=ans")
+        summary = result["result"]["summary"]
+        self.assertEqual((summary["downloaded"], summary["skipped"], summary["total_files"]), (6, 0, 6))
+        self.assertEqual(summary["percent"], 100.0)
+        self.assertNotIn("pin", result)
+        manifest = json.loads((self.root / EXPORT_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        self.assertEqual(manifest["revision"], 5)
+        self.assertEqual(sorted(manifest["files"]), ["01", "01.a", "02", "02.a", "10", "10.a"])
+
+        progress = get_problem_tests_export_progress(problem_id=1)["result"]["exports"]
+        self.assertEqual(progress[0]["state"], "finished")
+        self.assertEqual(progress[0]["completed_files"], 6)
+
+    @patch("src.mcp.utils.problem_tests_export.get_problem_session")
+    def test_skips_files_whose_hash_matches_for_same_revision(self, session_mock):
+        session = _ExportSession({1: b"1\n", 2: b"2\n"})
+        session_mock.return_value = session
+        export_problem_tests(1, "tests", str(self.root))
+        (self.root / "02").write_bytes(b"locally edited\n")
+        session.downloads.clear()
+
+        second = export_problem_tests(1, "tests", str(self.root))
+
+        self.assertEqual(session.downloads, ["02"])
+        self.assertEqual(second["result"]["summary"]["skipped"], 3)
+        self.assertEqual((self.root / "02").read_bytes(), b"2\n")
+
+    @patch("src.mcp.utils.problem_tests_export.get_problem_session")
+    def test_revision_change_or_modified_working_copy_disables_skipping(self, session_mock):
+        session = _ExportSession({1: b"1\n"})
+        session_mock.return_value = session
+        export_problem_tests(1, "tests", str(self.root), include_answers=False)
+
+        self.client.get_problems.return_value = [make_problem(problem_id=1, revision=6)]
+        session.downloads.clear()
+        export_problem_tests(1, "tests", str(self.root), include_answers=False)
+        after_revision_change = list(session.downloads)
+
+        self.client.get_problems.return_value = [make_problem(problem_id=1, revision=6, modified=True)]
+        session.downloads.clear()
+        export_problem_tests(1, "tests", str(self.root), include_answers=False)
+
+        self.assertEqual(after_revision_change, ["01"])
+        self.assertEqual(session.downloads, ["01"])
+
+    @patch("src.mcp.utils.problem_tests_export.get_problem_session")
+    def test_partial_files_are_kept_only_for_the_same_revision(self, session_mock):
+        session_mock.return_value = _ExportSession({1: b"1\n", 2: b"2\n"}, failing=("02",))
+        export_problem_tests(1, "tests", str(self.root), include_answers=False)
+        (self.root / "02.part").write_bytes(b"half of revision 5")
+        (self.root / "02.part.id").write_text("marker", encoding="utf-8")
+
+        export_problem_tests(1, "tests", str(self.root), include_answers=False)
+        kept_for_same_revision = (self.root / "02.part").exists()
+        self.client.get_problems.return_value = [make_problem(problem_id=1, revision=6)]
+        export_problem_tests(1, "tests", str(self.root), include_answers=False)
+
+        self.assertTrue(kept_for_same_revision)
+        self.assertFalse((self.root / "02.part").exists())
+        self.assertFalse((self.root / "02.part.id").exists())
+        manifest = json.loads((self.root / EXPORT_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        self.assertEqual(manifest["partial_revision"], 6)
+
+    @patch("src.mcp.utils.problem_tests_export.get_problem_session")
+    def test_failed_files_are_reported_and_left_out_of_manifest(self, session_mock):
+        session_mock.return_value = _ExportSession({1: b"1\n", 2: b"2\n"}, failing=("02.a",))
+
+        result = export_problem_tests(1, "tests", str(self.root))
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["result"]["summary"]["failed_files"], ["02.a"])
+        manifest = json.loads((self.root / EXPORT_MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        self.assertNotIn("02.a", manifest["files"])
+
+    @patch("src.mcp.utils.problem_tests_export.get_problem_session")
+    def test_rejects_invalid_workers_and_empty_testset(self, session_mock):
+        session_mock.return_value = Mock(get_tests=Mock(return_value=[]))
+
+        invalid = export_problem_tests(1, "tests", str(self.root), max_workers=0)
+        empty = export_problem_tests(1, "tests", str(self.root))
+
+        self.assertEqual(invalid["error_type"], "ValueError")
+        self.assertEqual(empty["status"], "error")
+        self.assertFalse(self.root.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.problem_tests_sync import SYNC_STATE_DIR_ENV, sync_problem_tests
+from src.polygon.utils.client_utils import current_request_max_retries
+from tests.fake_problem_session import make_test
+
+
+class _SyncSession:
+    """远端测试保存在 inputs 中；save_test 会更新它，view_test_input 记录被下载的编号。"""
+
+    def __init__(self, inputs: dict[int, str], generated: tuple[int, ...] = (), groups=None):
+        self.inputs = dict(inputs)
+        self.generated = set(generated)
+        self.groups = dict(groups or {})
+        self.descriptions: dict[int, str] = {}
+        self.fetched: list[int] = []
+        self.saved: list[dict] = []
+        self.request_max_retries: list[int] = []
+        self.ensure_write_access = Mock()
+        self._lock = threading.Lock()
+
+    def get_tests(self, testset, no_inputs=None):
+        assert no_inputs is True
+        return [
+            make_test(index=index, manual=index not in self.generated, group=self.groups.get(index)).model_copy(
+                update={"description": self.descriptions.get(index)}
+            )
+            for index in sorted(self.inputs)
+        ]
+
+    def view_test_input(self, testset, test_index):
+        with self._lock:
+            self.fetched.append(test_index)
+        return self.inputs[test_index].encode("utf-8")
+
+    def save_test(self, **kwargs):
+        with self._lock:
+            self.saved.append(kwargs)
+            self.request_max_retries.append(current_request_max_retries())
+            self.inputs[kwargs["test_index"]] = kwargs["test_input"]
+            if kwargs.get("test_group") is not None:
+                self.groups[kwargs["test_index"]] = kwargs["test_group"]
+        return {"status": "OK"}
+
+
+class McpProblemTestsSyncTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name) / "tests"
+        self.root.mkdir()
+        self.state_root = Path(temp_dir.name) / "state"
+        env_patch = patch.dict(os.environ, {SYNC_STATE_DIR_ENV: str(self.state_root)})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+
+    def _state_path(self, problem_id: int = 1, testset: str = "tests") -> Path:
+        return self.state_root / str(problem_id) / f"{testset}.json"
+
+    def _write_tests(self, tests: dict[str, str]) -> None:
+        for name, content in tests.items():
+            (self.root / name).write_text(content, encoding="utf-8")
+
+    @patch("src.mcp.utils.problem_tests_sync.get_problem_session")
+    def test_dry_run_reports_plan_without_uploading(self, session_mock):
+        session = _SyncSession({1: "1 2\n", 2: "old\n", 3: "remote only\n", 4: "gen\n"}, generated=(4,))
+        session_mock.return_value = session
+        self._write_tests({"01": "1 2\r\n", "02": "new\n", "04": "local\n", "05": "added\n"})
+
+        result = sync_problem_tests(1, "tests", str(self.root), dry_run=True)
+
+        plan = result["result"]["plan"]
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(plan["add"], [5])
+        self.assertEqual(plan["update"], [2])
+        self.assertEqual(plan["unchanged"], [1])
+        self.assertEqual(plan["generated"], [4])
+        self.assertEqual(plan["remote_only"], [3])
+        self.assertEqual(sorted(session.fetched), [1, 2])
+        self.assertEqual(session.saved, [])
+        session.ensure_write_access.assert_not_called()
+        self.assertFalse(self._state_path().exists())
+
+    @patch("src.mcp.utils.problem_tests_sync.get_problem_session")
+    def test_second_sync_uses_state_file_instead_of_fetching_inputs(self, session_mock):
+        session = _SyncSession({1: "1\n", 2: "2\n"})
+        session_mock.return_value = session
+        self._write_tests({"1.in": "1\n", "2.in": "changed\n", "3.in": "3\n"})
+
+        first = sync_problem_tests(1, "tests", str(self.root), pin="1234", max_workers=2)
+        session.fetched.clear()
+        session.saved.clear()
+        self._write_tests({"3.in": "three\n"})
+        second = sync_problem_tests(1, "tests", str(self.root), pin="1234")
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(first["result"]["summary"]["uploaded"], 2)
+        self.assertEqual(first["result"]["summary"]["unchanged"], 1)
+        self.assertEqual(session.fetched, [])
+        self.assertEqual(second["result"]["plan"]["update"], [3])
+        self.assertEqual(second["result"]["update_reasons"], {"3": "input"})
+        self.assertEqual([item["test_index"] for item in session.saved], [3])
+        self.assertEqual(session.inputs[3], "three\n")
+        self.assertEqual(session.request_max_retries, [0, 0, 0])
+        self.assertNotIn("pin", second)
+        state = json.loads(self._state_path().read_text(encoding="utf-8"))
+        self.assertEqual(sorted(state["tests"]), ["1", "2", "3"])
+        self.assertEqual(state["remote_indices"], [1, 2, 3])
+        self.assertEqual(sorted(path.name for path in self.root.iterdir()), ["1.in", "2.in", "3.in"])
+
+    @patch("src.mcp.utils.problem_tests_sync.get_problem_session")
+    def test_remote_testset_changes_invalidate_saved_state(self, session_mock):
+        session = _SyncSession({1: "1\n", 2: "2\n"})
+        session_mock.return_value = session
+        self._write_tests({"1": "1\n", "2": "2\n"})
+        sync_problem_tests(1, "tests", str(self.root))
+
+        session.fetched.clear()
+        session.descriptions[2] = "edited on polygon"
+        described = sync_problem_tests(1, "tests", str(self.root), dry_run=True)
+        self.assertEqual(session.fetched, [2])
+        self.assertEqual(described["result"]["fetched_inputs"], 1)
+
+        session.fetched.clear()
+        session.inputs[3] = "added on polygon\n"
+        added = sync_problem_tests(1, "tests", str(self.root), dry_run=True)
+        self.assertEqual(sorted(session.fetched), [1, 2])
+        self.assertEqual(added["result"]["plan"]["remote_only"], [3])
+
+    @patch("src.mcp.utils.problem_tests_sync.get_problem_session")
+    def test_state_save_failure_is_reported_as_warning(self, session_mock):
+        session = _SyncSession({1: "1\n"})
+        session_mock.return_value = session
+        self._write_tests({"1": "new\n"})
+        self.state_root.write_text("not a directory", encoding="utf-8")
+
+        result = sync_problem_tests(1, "tests", str(self.root))
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["result"]["summary"]["uploaded"], 1)
+        self.assertEqual(len(result["result"]["warnings"]), 1)
+        self.assertIn("同步状态未保存", result["result"]["warnings"][0])
+
+    @patch("src.mcp.utils.problem_tests_sync.get_problem_session")
+    def test_full_compare_detects_remote_edits_and_group_changes(self, session_mock):
+        session = _SyncSession({1: "1\n", 2: "2\n"}, groups={1: "main", 2: "samples"})
+        session_mock.return_value = session
+        self._write_tests({"1": "1\n", "2": "2\n"})
+        sync_problem_tests(1, "tests", str(self.root), test_group="main")
+        session.inputs[1] = "edited on polygon\n"
+        session.saved.clear()
+
+        trusted = sync_problem_tests(1, "tests", str(self.root), test_group="main", dry_run=True)
+        full = sync_problem_tests(1, "tests", str(self.root), test_group="main", full_compare=True)
+
+        self.assertEqual(trusted["result"]["plan"]["unchanged"], [1, 2])
+        self.assertEqual(full["result"]["plan"]["update"], [1])
+        self.assertEqual(session.inputs[1], "1\n")
+
+    @patch("src.mcp.utils.problem_tests_sync.get_problem_session")
+    def test_nothing_to_upload_skips_write_access_check(self, session_mock):
+        session = _SyncSession({1: "1\n"})
+        session_mock.return_value = session
+        self._write_tests({"1": "1\n"})
+
+        result = sync_problem_tests(1, "tests", str(self.root))
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["result"]["items"], [])
+        session.ensure_write_access.assert_not_called()
+
+    def test_rejects_missing_directory(self):
+        result = sync_problem_tests(1, "tests", str(self.root / "missing"))
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "ValueError")
+
+
+if __name__ == "__main__":
+    unittest.main()
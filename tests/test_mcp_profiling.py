@@ -0,0 +1,161 @@
+import asyncio
+import inspect
+import json
+import os
+import pstats
+import tracemalloc
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from src.mcp.profiling import ToolProfiler, set_tool_profiler
+from src.mcp.server import register_tools
+from src.mcp.utils.common import build_tool_profiler
+from src.mcp.utils.server_profiles import get_profile_hotspots
+from tests.test_mcp_server_registry import _FakeMCP
+
+
+def _busy_helper(n: int) -> int:
+    return sum(index * index for index in range(n))
+
+
+def compute_answer(n: int = 20000) -> int:
+    """Sample tool."""
+    return _busy_helper(n)
+
+
+def build_table(rows: int = 20000) -> int:
+    table = [str(index) * 4 for index in range(rows)]
+    return len(table)
+
+
+class ToolProfilerTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.profile_dir = Path(temp_dir.name)
+        self.addCleanup(set_tool_profiler, None)
+
+    def test_cpu_profile_ranks_hot_functions_and_writes_prof_files(self):
+        profiler = ToolProfiler(["cpu"], profile_dir=self.profile_dir)
+        tool = profiler.wrap(compute_answer)
+
+        self.assertEqual(tool(n=1000), _busy_helper(1000))
+        tool(n=1000)
+
+        self.assertEqual(inspect.signature(tool), inspect.signature(compute_answer))
+        hotspots = profiler.hotspots(sort="cumtime", top=5)
+        self.assertEqual(hotspots["calls_profiled"], 2)
+        self.assertEqual(hotspots["tools"], {"compute_answer": 2})
+        self.assertTrue(any("_busy_helper" in item["function"] for item in hotspots["functions"]))
+        self.assertLessEqual(len(hotspots["functions"]), 5)
+        prof_files = sorted(self.profile_dir.glob("*-compute_answer.prof"))
+        self.assertEqual(len(prof_files), 2)
+        self.assertTrue(pstats.Stats(str(prof_files[0])).stats)
+
+    def test_memory_profile_reports_allocation_sites(self):
+        was_tracing = tracemalloc.is_tracing()
+        self.addCleanup(lambda: None if was_tracing else tracemalloc.stop())
+        profiler = ToolProfiler(["memory"], profile_dir=self.profile_dir)
+
+        profiler.wrap(build_table)()
+
+        hotspots = profiler.hotspots()
+        self.assertEqual(hotspots["functions"], [])
+        self.assertTrue(any(__file__ in item["location"] for item in hotspots["allocations"]))
+        self.assertGreater(hotspots["recent_calls"][0]["peak_bytes"], 0)
+        [memory_file] = self.profile_dir.glob("*.memory.json")
+        self.assertEqual(json.loads(memory_file.read_text(encoding="utf-8"))["tool"], "build_table")
+
+    def test_history_limit_evicts_records_and_their_files(self):
+        profiler = ToolProfiler(["cpu"], profile_dir=self.profile_dir, history=2)
+        tool = profiler.wrap(compute_answer)
+
+        for _ in range(4):
+            tool(n=10)
+
+        self.assertEqual(len(profiler.records()), 2)
+        self.assertEqual(len(list(self.profile_dir.glob("*.prof"))), 2)
+
+    def test_failed_calls_are_still_recorded(self):
+        def broken_tool():
+            raise RuntimeError("boom")
+
+        profiler = ToolProfiler(["cpu"])
+        with self.assertRaises(RuntimeError):
+            profiler.wrap(broken_tool)()
+
+        self.assertEqual(profiler.records()[0].error, "RuntimeError")
+        with self.assertRaises(ValueError):
+            profiler.hotspots(sort="ncalls")
+
+    def test_environment_configuration(self):
+        with patch.dict(os.environ, {"POLYGON_PROFILE": "", "POLYGON_PROFILE_TOOLS": ""}):
+            self.assertIsNone(build_tool_profiler())
+        allowlist = {"POLYGON_PROFILE": "", "POLYGON_PROFILE_TOOLS": "get_problem_info, get_problems"}
+        with patch.dict(os.environ, allowlist):
+            profiler = build_tool_profiler()
+        self.assertEqual(profiler.modes, {"cpu"})
+        self.assertEqual(profiler.tools, {"get_problem_info", "get_problems"})
+        with patch.dict(os.environ, {"POLYGON_PROFILE": "all", "POLYGON_PROFILE_DIR": str(self.profile_dir)}):
+            profiler = build_tool_profiler()
+        self.assertEqual(profiler.modes, {"cpu", "memory"})
+        self.assertEqual(profiler.profile_dir, self.profile_dir)
+        with patch.dict(os.environ, {"POLYGON_PROFILE": "gpu"}), self.assertRaises(ValueError):
+            build_tool_profiler()
+
+    def test_register_tools_profiles_only_allowlisted_tools(self):
+        environ = {"POLYGON_PROFILE": "cpu", "POLYGON_PROFILE_TOOLS": "get_problem_info"}
+        fake_mcp = _FakeMCP()
+        with patch.dict(os.environ, {**environ, "POLYGON_PROFILE_DIR": str(self.profile_dir)}):
+            register_tools(fake_mcp)
+        tools = dict(zip(fake_mcp.registered_names, fake_mcp.registered_funcs))
+
+        with patch("src.mcp.utils.problem_info.call_problem_session_method", return_value={"ok": True}):
+            asyncio.run(tools["get_problem_info"](problem_id=7))
+        with patch("src.mcp.utils.problems.call_client_method", return_value=[]):
+            asyncio.run(tools["get_problems"]())
+
+        result = get_profile_hotspots(top=3)["result"]
+        self.assertTrue(result["enabled"])
+        self.assertEqual(result["tools"], {"get_problem_info": 1})
+        self.assertEqual(result["profiled_tools"], ["get_problem_info"])
+        self.assertEqual(len(result["functions"]), 3)
+
+        with patch.dict(os.environ, {"POLYGON_PROFILE_TOOLS": "no_such_tool"}), self.assertRaises(ValueError):
+            register_tools(_FakeMCP())
+
+    def test_records_use_the_registered_tool_name(self):
+        profiler = ToolProfiler(["cpu"])
+        set_tool_profiler(profiler)
+        tool = profiler.wrap(compute_answer, "registered_name")
+
+        tool(n=10)
+
+        self.assertEqual(tool.__name__, "compute_answer")
+        self.assertEqual([record.tool for record in profiler.records()], ["registered_name"])
+        self.assertEqual(get_profile_hotspots(tool="registered_name")["result"]["calls_profiled"], 1)
+        self.assertEqual(get_profile_hotspots(tool="compute_answer")["result"]["calls_profiled"], 0)
+
+    def test_hotspots_tool_reports_disabled_profiling(self):
+        set_tool_profiler(None)
+
+        result = get_profile_hotspots()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["result"], {"enabled": False})
+
+    def test_hotspots_tool_validates_arguments_and_resets(self):
+        profiler = ToolProfiler(["cpu"])
+        set_tool_profiler(profiler)
+        profiler.wrap(compute_answer)(n=10)
+
+        self.assertEqual(get_profile_hotspots(top=0)["error_type"], "ValueError")
+        self.assertEqual(get_profile_hotspots(tool="other")["result"]["calls_profiled"], 0)
+        get_profile_hotspots(reset=True)
+        self.assertEqual(profiler.records(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
+import asyncio
 import importlib
 import inspect
+import threading
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from src.mcp.server import register_tools
 from src.mcp.tool_registry import TOOL_REGISTRY, get_registered_tool_names, validate_tool_registry
@@ -15,10 +18,12 @@ from src.mcp.utils.problem_tests_extended import save_problem_checker_test, save
 class _FakeMCP:
     def __init__(self):
         self.registered_names: list[str] = []
+        self.registered_funcs: list = []
 
     def tool(self):
         def decorator(func):
             self.registered_names.append(func.__name__)
+            self.registered_funcs.append(func)
             return func
 
         return decorator
@@ -33,6 +38,33 @@ class MpcServerRegistryTest(unittest.TestCase):
         self.assertEqual(returned_names, get_registered_tool_names())
         self.assertEqual(fake_mcp.registered_names, get_registered_tool_names())
 
+    def test_register_tools_registers_coroutines_with_original_signature(self):
+        fake_mcp = _FakeMCP()
+
+        register_tools(fake_mcp)
+
+        for registration, func in zip(TOOL_REGISTRY, fake_mcp.registered_funcs):
+            self.assertTrue(inspect.iscoroutinefunction(func), msg=registration.name)
+            self.assertEqual(inspect.signature(func), inspect.signature(registration.func))
+            self.assertEqual(inspect.getdoc(func), inspect.getdoc(registration.func))
+
+    def test_registered_coroutine_runs_tool_off_the_event_loop(self):
+        fake_mcp = _FakeMCP()
+        register_tools(fake_mcp)
+        tool = fake_mcp.registered_funcs[fake_mcp.registered_names.index("get_problem_info")]
+        caller_threads: list = []
+
+        def fake_call(problem_id, pin, method_name):
+            caller_threads.append(threading.current_thread())
+            return {"method": method_name, "problem_id": problem_id}
+
+        with patch("src.mcp.utils.problem_info.call_problem_session_method", side_effect=fake_call):
+            result = asyncio.run(tool(problem_id=7))
+
+        self.assertEqual(result, {"method": "get_info", "problem_id": 7})
+        self.assertEqual(len(caller_threads), 1)
+        self.assertTrue(caller_threads[0].name.startswith("polygon-tool"))
+
     def test_tool_registry_covers_all_public_utils_functions(self):
         utils_dir = Path(__file__).resolve().parents[1] / "src" / "mcp" / "utils"
         discovered_names: set[str] = set()
@@ -29,10 +29,12 @@ from src.polygon.models import (
     PointsPolicy,
     Problem,
     ProblemInfo,
+    Solution,
     Statement,
     SolutionTag,
     SourceType,
 )
+from tests.fake_problem_session import make_problem
 
 
 class MpcUtilsExtensionsTest(unittest.TestCase):
@@ -243,22 +245,23 @@ class MpcUtilsExtensionsTest(unittest.TestCase):
 
     @patch("src.mcp.utils.problem_solutions.call_problem_session_method")
     def test_get_problem_solutions_uses_common_session_helper(self, session_call_mock):
-        solutions = [Mock()]
-        session_call_mock.return_value = solutions
+        session_call_mock.return_value = [
+            Solution(name="main.cpp", modificationTimeSeconds=0, length=10, tag="MA"),
+            Solution(name="wa.cpp", modificationTimeSeconds=0, length=20, tag="WA"),
+        ]
 
-        result = get_problem_solutions(1, pin="1111")
+        result = get_problem_solutions(1, pin="1111", fields=["name"], filters={"tag": ["WA", "TL"]})
 
-        self.assertEqual(result, solutions)
+        self.assertEqual((result.total, result.items), (1, [{"name": "wa.cpp"}]))
         session_call_mock.assert_called_once_with(1, "1111", "get_solutions")
 
     @patch("src.mcp.utils.problems.call_client_method")
     def test_get_problems_uses_common_client_helper(self, client_call_mock):
-        problems = [Mock()]
-        client_call_mock.return_value = problems
+        client_call_mock.return_value = [make_problem(problem_id=1)]
 
         result = get_problems(show_deleted=True, problem_id=1, name="A", owner="owner")
 
-        self.assertEqual(result, problems)
+        self.assertEqual([problem["id"] for problem in result.items], [1])
         client_call_mock.assert_called_once_with(
             "get_problems",
             show_deleted=True,
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from src.polygon.access_cache import AccessTypeCache
+from src.polygon.client import PolygonClient
+from src.polygon.models import AccessDeniedException, AccessType
+from tests.fake_problem_session import make_problem
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_client(**kwargs) -> PolygonClient:
+    client = PolygonClient("key", "secret", transport=Mock(), **kwargs)
+    client.get_problems = Mock(return_value=[make_problem(access_type=AccessType.WRITE)])
+    return client
+
+
+@patch("src.polygon.problem.save_problem_tags", return_value={"status": "OK"})
+class AccessTypeCacheTest(unittest.TestCase):
+    def test_sessions_share_access_type_lookup(self, save_tags_mock):
+        client = _make_client()
+
+        client.create_problem_session(1).save_tags(["a"])
+        client.create_problem_session(1).save_tags(["b"])
+
+        client.get_problems.assert_called_once_with(problem_id=1)
+        self.assertEqual(save_tags_mock.call_args.args[4], AccessType.WRITE)
+        self.assertEqual(client.access_types.stats()["hits"], 1)
+
+    def test_expired_entry_is_fetched_again(self, _save_tags_mock):
+        clock = _Clock()
+        client = _make_client(access_types=AccessTypeCache(ttl_seconds=30, clock=clock))
+
+        client.create_problem_session(1).save_tags(["a"])
+        clock.now = 31.0
+        client.create_problem_session(1).save_tags(["b"])
+
+        self.assertEqual(client.get_problems.call_count, 2)
+
+    def test_access_denied_invalidates_entry(self, save_tags_mock):
+        client = _make_client()
+        session = client.create_problem_session(1)
+        save_tags_mock.side_effect = [AccessDeniedException("denied"), {"status": "OK"}]
+
+        with self.assertRaises(AccessDeniedException):
+            session.save_tags(["a"])
+        self.assertIsNone(client.access_types.get(1))
+
+        session.save_tags(["a"])
+        self.assertEqual(client.get_problems.call_count, 2)
+
+    def test_optimistic_writes_skip_pre_check(self, save_tags_mock):
+        client = _make_client(optimistic_writes=True)
+
+        client.create_problem_session(1).save_tags(["a"])
+
+        client.get_problems.assert_not_called()
+        self.assertEqual(save_tags_mock.call_args.args[4], AccessType.WRITE)
+
+    def test_optimistic_writes_prefer_cached_read_access(self, save_tags_mock):
+        client = _make_client(optimistic_writes=True)
+        client.access_types.set(1, AccessType.READ)
+
+        client.create_problem_session(1).save_tags(["a"])
+
+        self.assertEqual(save_tags_mock.call_args.args[4], AccessType.READ)
+
+    def test_zero_ttl_disables_cache(self, _save_tags_mock):
+        client = _make_client(access_types=AccessTypeCache(ttl_seconds=0))
+
+        client.create_problem_session(1).save_tags(["a"])
+        client.create_problem_session(1).save_tags(["b"])
+
+        self.assertEqual(client.get_problems.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,11 +28,14 @@ from src.polygon.models import (
     AccessDeniedException,
     AccessType,
     FileType,
+    PolygonHTTPError,
     PolygonNetworkError,
     SolutionTag,
     SourceType,
 )
-from src.polygon.utils.client_utils import make_api_request
+from src.polygon.client import PolygonClient
+from src.polygon.transport import PolygonTransport
+from src.polygon.utils.client_utils import make_api_request, request_max_retries
 
 
 class PolygonApiExtensionsTest(unittest.TestCase):
@@ -112,6 +115,22 @@ class PolygonApiExtensionsTest(unittest.TestCase):
         self.assertEqual(request_mock.call_count, 2)
         sleep_mock.assert_called_once()
 
+    @patch("src.polygon.utils.client_utils.time.sleep")
+    @patch("src.polygon.utils.client_utils.requests.request")
+    def test_request_max_retries_context_disables_default_retries(self, request_mock, sleep_mock):
+        retry_response = Mock()
+        retry_response.status_code = 503
+        retry_response.text = "temporary failure"
+        retry_response.headers = {}
+        retry_response.raise_for_status.side_effect = requests.HTTPError(response=retry_response)
+        request_mock.return_value = retry_response
+
+        with request_max_retries(0), self.assertRaises(PolygonHTTPError):
+            make_api_request("key", "secret", "https://polygon.codeforces.com/api/", "problem.saveTest")
+
+        self.assertEqual(request_mock.call_count, 1)
+        sleep_mock.assert_not_called()
+
     @patch("src.polygon.utils.client_utils.requests.request")
     def test_make_api_request_raises_access_denied_on_business_error(self, request_mock):
         response = Mock()
@@ -144,6 +163,52 @@ class PolygonApiExtensionsTest(unittest.TestCase):
             )
         request_mock.assert_called_once()
 
+    @patch("src.polygon.utils.client_utils.requests.request")
+    def test_make_api_request_routes_through_transport(self, request_mock):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"status": "OK", "result": []}
+        transport = Mock()
+        transport.request.return_value = response
+
+        make_api_request(
+            "key",
+            "secret",
+            "https://polygon.codeforces.com/api/",
+            "problems.list",
+            transport=transport,
+        )
+
+        request_mock.assert_not_called()
+        transport.request.assert_called_once()
+        self.assertEqual(transport.request.call_args.args[0], "GET")
+        self.assertEqual(
+            transport.request.call_args.args[1],
+            "https://polygon.codeforces.com/api/problems.list",
+        )
+
+    def test_polygon_transport_mounts_pooled_adapter(self):
+        with PolygonTransport(pool_connections=2, pool_maxsize=7, connect_retries=3) as transport:
+            adapter = transport.session.get_adapter("https://polygon.codeforces.com/api/")
+
+            self.assertEqual(adapter._pool_maxsize, 7)
+            self.assertEqual(adapter._pool_connections, 2)
+            self.assertEqual(adapter.max_retries.connect, 3)
+            self.assertEqual(adapter.max_retries.status, 0)
+
+    def test_polygon_transport_rejects_invalid_pool_size(self):
+        with self.assertRaisesRegex(ValueError, "pool_maxsize"):
+            PolygonTransport(pool_maxsize=0)
+
+    @patch("src.polygon.problem.get_problem_extra_validators", return_value=[])
+    def test_problem_session_passes_client_transport(self, api_mock):
+        transport = Mock()
+        client = PolygonClient("key", "secret", transport=transport)
+
+        client.create_problem_session(5, pin="1234").get_extra_validators()
+
+        self.assertIs(api_mock.call_args.kwargs["transport"], transport)
+
     def test_save_problem_file_requires_complete_resource_properties(self):
         with self.assertRaisesRegex(ValueError, "需要同时提供"):
             save_problem_file(
@@ -450,6 +515,7 @@ class PolygonApiExtensionsTest(unittest.TestCase):
             "problem.extraValidators",
             1,
             "9999",
+            transport=None,
         )
 
     @patch(
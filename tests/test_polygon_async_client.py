@@ -0,0 +1,291 @@
+import asyncio
+import inspect
+import unittest
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs
+
+import httpx
+
+from src.polygon.async_client import AsyncPolygonClient, AsyncProblemSession
+from src.polygon.async_transport import AsyncPolygonTransport
+from src.polygon.models import (
+    AccessDeniedException,
+    AccessType,
+    PolygonBusinessError,
+    PolygonException,
+    PolygonNetworkError,
+)
+from src.polygon.problem import ProblemSession
+from src.polygon.utils.async_client_utils import make_async_api_request
+
+BASE_URL = "https://polygon.codeforces.com/api/"
+
+
+def _problem_record(access_type: str = "WRITE") -> dict:
+    return {
+        "id": 1,
+        "owner": "tourist",
+        "name": "a-plus-b",
+        "deleted": False,
+        "favourite": False,
+        "accessType": access_type,
+        "revision": 3,
+        "modified": False,
+    }
+
+
+class _RecordingHandler:
+    def __init__(self, responses: dict[str, list[httpx.Response]]):
+        self.responses = {method: list(items) for method, items in responses.items()}
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        method = request.url.path.rsplit("/", 1)[-1]
+        return self.responses[method].pop(0)
+
+    def methods(self) -> list[str]:
+        return [request.url.path.rsplit("/", 1)[-1] for request in self.requests]
+
+    def params(self, index: int) -> dict[str, str]:
+        request = self.requests[index]
+        if request.method == "GET":
+            return dict(request.url.params)
+        return {key: values[0] for key, values in parse_qs(request.content.decode()).items()}
+
+
+def _ok(result) -> httpx.Response:
+    return httpx.Response(200, json={"status": "OK", "result": result})
+
+
+def _make_client(handler: _RecordingHandler) -> AsyncPolygonClient:
+    transport = AsyncPolygonTransport(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return AsyncPolygonClient("key", "secret", transport=transport)
+
+
+class MakeAsyncApiRequestTest(unittest.TestCase):
+    def run_request(self, handler: _RecordingHandler, **kwargs):
+        transport = AsyncPolygonTransport(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        return asyncio.run(
+            make_async_api_request(
+                "key",
+                "secret",
+                BASE_URL,
+                kwargs.pop("method", "problem.info"),
+                kwargs.pop("params", {"problemId": 1}),
+                transport=transport,
+                **kwargs,
+            )
+        )
+
+    @patch("src.polygon.utils.client_utils.random.randint", return_value=123456)
+    @patch("src.polygon.utils.client_utils.time.time", return_value=1700000000)
+    def test_signs_request_like_sync_client(self, _time_mock, _rand_mock):
+        handler = _RecordingHandler({"problem.info": [_ok({"ok": True})]})
+
+        result = self.run_request(handler)
+
+        self.assertEqual(result["result"], {"ok": True})
+        params = handler.params(0)
+        self.assertEqual(params["apiKey"], "key")
+        self.assertEqual(params["time"], "1700000000")
+        self.assertTrue(params["apiSig"].startswith("123456"))
+        self.assertEqual(params["problemId"], "1")
+
+    @patch("src.polygon.utils.async_client_utils.asyncio.sleep", new_callable=AsyncMock)
+    def test_retries_retryable_status_with_retry_after(self, sleep_mock):
+        handler = _RecordingHandler(
+            {
+                "problem.info": [
+                    httpx.Response(503, headers={"Retry-After": "3"}, text="busy"),
+                    _ok({"ok": True}),
+                ]
+            }
+        )
+
+        result = self.run_request(handler)
+
+        self.assertEqual(result["result"], {"ok": True})
+        self.assertEqual(len(handler.requests), 2)
+        sleep_mock.assert_awaited_once_with(3.0)
+
+    def test_maps_forbidden_to_access_denied(self):
+        handler = _RecordingHandler({"problem.info": [httpx.Response(403, text="denied")]})
+
+        with self.assertRaises(AccessDeniedException):
+            self.run_request(handler)
+
+    def test_maps_failed_status_to_business_error(self):
+        handler = _RecordingHandler(
+            {"problem.info": [httpx.Response(200, json={"status": "FAILED", "comment": "bad"})]}
+        )
+
+        with self.assertRaises(PolygonBusinessError) as context:
+            self.run_request(handler)
+        self.assertEqual(context.exception.comment, "bad")
+
+    @patch("src.polygon.utils.async_client_utils.asyncio.sleep", new_callable=AsyncMock)
+    def test_raises_network_error_after_retries(self, sleep_mock):
+        def handler(request):
+            raise httpx.ConnectError("boom", request=request)
+
+        transport = AsyncPolygonTransport(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        with self.assertRaises(PolygonNetworkError):
+            asyncio.run(
+                make_async_api_request(
+                    "key",
+                    "secret",
+                    BASE_URL,
+                    "problem.info",
+                    transport=transport,
+                    max_retries=1,
+                )
+            )
+        self.assertEqual(sleep_mock.await_count, 1)
+
+
+class AsyncPolygonClientTest(unittest.TestCase):
+    def test_problem_session_methods_are_native_coroutines(self):
+        public_methods = [
+            name
+            for name, member in inspect.getmembers(AsyncProblemSession, inspect.isfunction)
+            if not name.startswith("_")
+        ]
+
+        self.assertIn("get_info", public_methods)
+        self.assertIn("save_test", public_methods)
+        for name in public_methods:
+            self.assertTrue(inspect.iscoroutinefunction(getattr(AsyncProblemSession, name)), name)
+            self.assertTrue(hasattr(ProblemSession, name), name)
+
+    @patch("src.polygon.utils.client_utils.make_api_request", side_effect=AssertionError("sync path"))
+    def test_requests_do_not_go_through_sync_client(self, _sync_mock):
+        handler = _RecordingHandler({"problem.viewTags": [_ok(["math"])]})
+        session = _make_client(handler).create_problem_session(1)
+
+        self.assertEqual(asyncio.run(session.get_tags()), ["math"])
+
+    def test_get_info_parses_result(self):
+        handler = _RecordingHandler(
+            {
+                "problem.info": [
+                    _ok(
+                        {
+                            "inputFile": "stdin",
+                            "outputFile": "stdout",
+                            "interactive": False,
+                            "timeLimit": 1000,
+                            "memoryLimit": 256,
+                        }
+                    )
+                ]
+            }
+        )
+        session = _make_client(handler).create_problem_session(1, pin="1234")
+
+        info = asyncio.run(session.get_info())
+
+        self.assertEqual(info.timeLimit, 1000)
+        self.assertEqual(handler.params(0)["pin"], "1234")
+
+    def test_write_method_resolves_access_type_once(self):
+        handler = _RecordingHandler(
+            {
+                "problems.list": [_ok([_problem_record("OWNER")])],
+                "problem.saveTest": [_ok(None), _ok(None)],
+            }
+        )
+        client = _make_client(handler)
+        session = client.create_problem_session(1)
+
+        async def scenario():
+            await session.save_test("tests", 1, test_input="1 2\n")
+            await session.save_test("tests", 2, test_input="3 4\n", check_existing=True)
+
+        asyncio.run(scenario())
+
+        self.assertEqual(
+            handler.methods(),
+            ["problems.list", "problem.saveTest", "problem.saveTest"],
+        )
+        self.assertEqual(client.access_types.get(1), AccessType.OWNER)
+        self.assertEqual(handler.requests[1].method, "POST")
+        params = handler.params(2)
+        self.assertEqual(params["testIndex"], "2")
+        self.assertEqual(params["testInput"], "3 4\n")
+        self.assertEqual(params["checkExisting"], "true")
+
+    def test_write_method_rejects_read_access(self):
+        handler = _RecordingHandler({"problems.list": [_ok([_problem_record("READ")])]})
+        client = _make_client(handler)
+        session = client.create_problem_session(1)
+
+        with self.assertRaises(AccessDeniedException):
+            asyncio.run(session.save_test("tests", 1, test_input="1\n"))
+        self.assertEqual(handler.methods(), ["problems.list"])
+        self.assertIsNone(client.access_types.get(1))
+
+    def test_optimistic_writes_skip_access_lookup(self):
+        handler = _RecordingHandler({"problem.saveTest": [_ok(None)]})
+        client = AsyncPolygonClient(
+            "key",
+            "secret",
+            transport=_make_client(handler).transport,
+            optimistic_writes=True,
+        )
+
+        asyncio.run(client.create_problem_session(1).save_test("tests", 1, test_input="1\n"))
+
+        self.assertEqual(handler.methods(), ["problem.saveTest"])
+
+    def test_concurrent_calls_share_event_loop(self):
+        handler = _RecordingHandler(
+            {"problem.viewTags": [_ok(["a"]), _ok(["b"]), _ok(["c"])]},
+        )
+        client = _make_client(handler)
+
+        async def scenario():
+            sessions = [client.create_problem_session(problem_id) for problem_id in (1, 2, 3)]
+            return await asyncio.gather(*(session.get_tags() for session in sessions))
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(sorted(tag for tags in results for tag in tags), ["a", "b", "c"])
+        self.assertEqual(len(handler.requests), 3)
+
+    def test_contest_session_parses_letter_mapping(self):
+        handler = _RecordingHandler(
+            {"contest.problems": [_ok({"B": _problem_record(), "A": dict(_problem_record(), id=2)})]}
+        )
+        contest = _make_client(handler).create_contest_session(7, pin="secret")
+
+        problems = asyncio.run(contest.get_problems())
+
+        self.assertEqual([(problem.contestLetter, problem.id) for problem in problems], [("A", 2), ("B", 1)])
+        self.assertEqual(handler.params(0)["contestId"], "7")
+
+    def test_contest_session_maps_http_errors(self):
+        handler = _RecordingHandler({"contest.problems": [httpx.Response(500, text="oops")]})
+        contest = _make_client(handler).create_contest_session(7)
+
+        with self.assertRaises(PolygonException):
+            asyncio.run(contest.get_problems())
+
+    def test_get_problems_passes_filters(self):
+        handler = _RecordingHandler({"problems.list": [_ok([_problem_record()])]})
+
+        problems = asyncio.run(_make_client(handler).get_problems(problem_id=1))
+
+        self.assertEqual([problem.id for problem in problems], [1])
+        self.assertEqual(handler.params(0)["id"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
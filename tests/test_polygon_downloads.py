@@ -1,6 +1,12 @@
 import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import Mock, patch
 
+from src.mcp.utils.common import build_download_result
+
+from src.polygon.models import DownloadedFile
+
 from src.mcp.utils.downloads import (
     DOWNLOAD_INFO_FIXED_FIELDS,
     download_contest_statements_pdf_info,
@@ -13,58 +19,93 @@ from src.polygon.download import (
     download_contest_statements_pdf,
     download_problem_descriptor,
 )
+from src.polygon.web_session import PolygonWebSession
+
+
+def _web_session(response: Mock) -> PolygonWebSession:
+    transport = Mock()
+    transport.request.return_value = response
+    return PolygonWebSession("login", "password", transport=transport)
+
+
+def _streamed_response(content: bytes) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.history = []
+    response.raise_for_status.return_value = None
+    response.iter_content.side_effect = lambda chunk_size: iter([content[:4], content[4:]])
+    return response
+
+
+def _write_package(content: bytes):
+    def download(problem_id, pin, method_name, *, target_path=None, **kwargs):
+        if method_name == "lookup_cached_package":
+            return None
+        target_path.write_bytes(content)
+        return DownloadedFile(path=str(target_path), size_bytes=len(content), sha256="0" * 64)
+
+    return download
 
 
 class PolygonDownloadsTest(unittest.TestCase):
-    @patch("src.polygon.download.requests.post")
-    def test_download_problem_descriptor_builds_problem_xml_url(self, post_mock):
-        response = Mock()
+    def test_download_problem_descriptor_builds_problem_xml_url(self):
+        response = _streamed_response(b"<problem />")
         response.content = b"<problem />"
-        response.raise_for_status.return_value = None
-        post_mock.return_value = response
+        web_session = _web_session(response)
 
         content = download_problem_descriptor(
             "https://polygon.codeforces.com/p/demo/a-plus-b",
             "login",
             "password",
             revision=12,
+            web_session=web_session,
         )
 
         self.assertEqual(content, b"<problem />")
-        post_mock.assert_called_once_with(
+        web_session.transport.request.assert_called_once_with(
+            "POST",
             "https://polygon.codeforces.com/p/demo/a-plus-b/problem.xml",
             data={"login": "login", "password": "password", "revision": "12"},
             timeout=30,
         )
 
-    @patch("src.polygon.download.requests.post")
-    def test_download_contest_helpers_append_suffixes(self, post_mock):
-        response = Mock()
+    def test_download_contest_helpers_append_suffixes(self):
+        response = _streamed_response(b"ok")
         response.content = b"ok"
-        response.raise_for_status.return_value = None
-        post_mock.return_value = response
+        web_session = _web_session(response)
 
-        download_contest_descriptor("https://polygon.codeforces.com/c/contest-uid", "login", "password")
+        download_contest_descriptor(
+            "https://polygon.codeforces.com/c/contest-uid",
+            "login",
+            "password",
+            web_session=web_session,
+        )
         download_contest_statements_pdf(
             "https://polygon.codeforces.com/c/contest-uid",
             "login",
             "password",
             language="english",
+            web_session=web_session,
         )
 
-        self.assertEqual(post_mock.call_count, 2)
-        self.assertEqual(
-            post_mock.call_args_list[0].args[0],
-            "https://polygon.codeforces.com/c/contest-uid/contest.xml",
-        )
-        self.assertEqual(
-            post_mock.call_args_list[1].args[0],
-            "https://polygon.codeforces.com/c/contest-uid/english/statements.pdf",
-        )
+        calls = web_session.transport.request.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0].args[1], "https://polygon.codeforces.com/c/contest-uid/contest.xml")
+        self.assertEqual(calls[1].args[1], "https://polygon.codeforces.com/c/contest-uid/english/statements.pdf")
+        self.assertNotIn("password", calls[1].kwargs["data"])
 
+    @patch("src.mcp.utils.downloads.get_web_session")
+    @patch("src.mcp.utils.downloads.get_package_cache", return_value=None)
     @patch("src.mcp.utils.downloads.get_account_credentials", return_value=("env-login", "env-password"))
     @patch("src.mcp.utils.downloads._download_problem_package", return_value=b"zip")
-    def test_mcp_download_problem_package_uses_account_credentials(self, download_mock, creds_mock):
+    def test_mcp_download_problem_package_uses_account_credentials(
+        self,
+        download_mock,
+        creds_mock,
+        _cache_mock,
+        web_session_mock,
+    ):
         content = download_problem_package_by_url(
             "https://polygon.codeforces.com/p/demo/a-plus-b",
             package_type="linux",
@@ -76,13 +117,20 @@ class PolygonDownloadsTest(unittest.TestCase):
             problem_url="https://polygon.codeforces.com/p/demo/a-plus-b",
             login="env-login",
             password="env-password",
+            web_session=web_session_mock.return_value,
             pin=None,
             revision=None,
             package_type="linux",
+            cache=None,
         )
+        web_session_mock.assert_called_once_with("env-login", "env-password")
+
+    @patch("src.mcp.utils.downloads.get_web_session")
+    @patch("src.mcp.utils.downloads.get_account_credentials", return_value=("login", "password"))
+    def test_download_problem_package_info_by_url_returns_metadata(self, _creds_mock, web_session_mock):
+        web_session_mock.return_value = _web_session(_streamed_response(b"zip-bytes"))
+        download_mock = web_session_mock.return_value.transport.request
 
-    @patch("src.mcp.utils.downloads.download_problem_package_by_url", return_value=b"zip-bytes")
-    def test_download_problem_package_info_by_url_returns_metadata(self, download_mock):
         result = download_problem_package_info_by_url(
             "https://polygon.codeforces.com/p/demo/a-plus-b",
             pin="1234",
@@ -117,10 +165,14 @@ class PolygonDownloadsTest(unittest.TestCase):
             result["sha256"],
             "4b9a4ac59f3c3aa32273260df6cf4bf358d1c46f8415126aa35b6380d0abb8f7",
         )
+        self.assertNotIn("path", result)
         download_mock.assert_called_once()
+        self.assertIs(download_mock.call_args.kwargs["stream"], True)
 
-    @patch("src.mcp.utils.problem_packages.download_problem_package", return_value=b"zip-bytes")
+    @patch("src.mcp.utils.problem_packages.call_problem_session_method")
     def test_download_problem_package_info_returns_metadata(self, download_mock):
+        download_mock.side_effect = _write_package(b"zip-bytes")
+
         result = download_problem_package_info(
             problem_id=321,
             package_id=9,
@@ -140,15 +192,36 @@ class PolygonDownloadsTest(unittest.TestCase):
         self.assertEqual(result["package_type"], "standard")
         self.assertNotIn("pin", result)
         self.assertNotIn("pin", result["result"])
-        download_mock.assert_called_once_with(
-            problem_id=321,
-            package_id=9,
-            pin="4321",
-            package_type="standard",
+        self.assertEqual(result["size_bytes"], 9)
+        self.assertEqual(
+            [call.args for call in download_mock.call_args_list],
+            [(321, "4321", "lookup_cached_package"), (321, "4321", "download_package_to_file")],
         )
+        self.assertEqual(download_mock.call_args.kwargs["package_id"], 9)
+
+    @patch("src.mcp.utils.problem_packages.call_problem_session_method")
+    def test_download_problem_package_info_uses_cached_metadata(self, session_mock):
+        session_mock.return_value = DownloadedFile(
+            path="/cache/blobs/ab/abcd",
+            size_bytes=5,
+            sha256="a" * 64,
+            detected_content_kind="zip",
+        )
+
+        result = download_problem_package_info(problem_id=321, package_id=9)
+
+        self.assertEqual(result["size_bytes"], 5)
+        self.assertEqual(result["sha256"], "a" * 64)
+        self.assertNotIn("path", result)
+        session_mock.assert_called_once()
+        self.assertEqual(session_mock.call_args.args, (321, None, "lookup_cached_package"))
+
+    @patch("src.mcp.utils.downloads.get_web_session")
+    @patch("src.mcp.utils.downloads.get_account_credentials", return_value=("login", "password"))
+    def test_download_contest_statements_pdf_info_returns_metadata(self, _creds_mock, web_session_mock):
+        web_session_mock.return_value = _web_session(_streamed_response(b"%PDF-1.7"))
+        download_mock = web_session_mock.return_value.transport.request
 
-    @patch("src.mcp.utils.downloads.download_contest_statements_pdf", return_value=b"%PDF-1.7")
-    def test_download_contest_statements_pdf_info_returns_metadata(self, download_mock):
         result = download_contest_statements_pdf_info(
             "https://polygon.codeforces.com/c/demo-contest",
             language="english",
@@ -167,6 +240,30 @@ class PolygonDownloadsTest(unittest.TestCase):
         )
         download_mock.assert_called_once()
 
+    def test_build_download_result_accepts_bytes_path_and_chunks(self):
+        content = b"<html><body>login</body></html>"
+        common = {
+            "action": "demo",
+            "filename": "package.zip",
+            "content_kind": "zip",
+            "source_kind": "url",
+            "source_ref": "https://example.com",
+        }
+
+        with TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "package.zip"
+            path.write_bytes(content)
+            from_path = build_download_result(content=path, **common)
+        from_bytes = build_download_result(content=content, **common)
+        from_chunks = build_download_result(content=iter([content[:5], content[5:]]), **common)
+
+        for result in (from_path, from_chunks):
+            self.assertEqual(result["sha256"], from_bytes["sha256"])
+            self.assertEqual(result["size_bytes"], len(content))
+        self.assertEqual(from_bytes["content_kind"], "zip")
+        self.assertEqual(from_bytes["detected_content_kind"], "html")
+        self.assertEqual(from_chunks["result"]["detected_content_kind"], "html")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.problem_tests_extended import get_problem_tests
+from src.polygon.client import PolygonClient
+from src.polygon.models import LazyTest
+from tests.fake_problem_session import make_test
+
+
+class ProblemSessionLazyTestsTest(unittest.TestCase):
+    def setUp(self):
+        self.session = PolygonClient("key", "secret", transport=Mock()).create_problem_session(1, pin="1234")
+
+    @patch("src.polygon.problem.view_problem_test_input", return_value=b"1 2\n")
+    @patch("src.polygon.problem.get_problem_tests")
+    def test_loads_input_once_on_first_access(self, tests_mock, input_mock):
+        tests_mock.return_value = [make_test(index=1), make_test(index=2, manual=False, script_line="gen 2")]
+
+        tests = self.session.get_tests_lazy("tests")
+
+        self.assertIs(tests_mock.call_args.args[6], True)
+        self.assertTrue(all(isinstance(test, LazyTest) for test in tests))
+        self.assertFalse(tests[0].input_loaded)
+        input_mock.assert_not_called()
+        self.assertEqual(tests[0].load_input(), "1 2\n")
+        self.assertEqual(tests[0].load_input(), "1 2\n")
+        self.assertEqual(tests[0].model_dump()["input"], "1 2\n")
+        input_mock.assert_called_once()
+        self.assertEqual(input_mock.call_args.args[4:7], ("tests", 1, "1234"))
+
+    @patch("src.polygon.problem.view_problem_test_input", return_value=b"generated\n")
+    @patch("src.polygon.problem.get_problem_tests")
+    def test_prefetch_keeps_manual_inputs_and_loads_generated_on_demand(self, tests_mock, input_mock):
+        tests_mock.return_value = [make_test(index=1, input_text="manual\n"), make_test(index=2, manual=False)]
+
+        tests = self.session.get_tests_lazy("tests", prefetch_inputs=True)
+
+        self.assertIs(tests_mock.call_args.args[6], False)
+        self.assertEqual(tests[0].load_input(), "manual\n")
+        self.assertEqual(tests[1].load_input(), "generated\n")
+        self.assertEqual(input_mock.call_count, 1)
+
+    def test_unbound_lazy_test_raises(self):
+        with self.assertRaises(ValueError):
+            LazyTest(index=3, manual=True, useInStatements=False).load_input()
+
+
+class GetProblemTestsToolTest(unittest.TestCase):
+    def _session(self, count: int):
+        session = Mock()
+        loader = Mock(side_effect=lambda index: f"input {index}\n")
+        session.get_tests_lazy.side_effect = lambda testset, prefetch_inputs=False: [
+            LazyTest(**make_test(index=index).model_dump()).bind_input_loader(lambda index=index: loader(index))
+            for index in range(1, count + 1)
+        ]
+        return session, loader
+
+    @patch("src.mcp.utils.common.get_problem_session")
+    def test_returns_paginated_metadata_and_requested_inputs(self, session_mock):
+        session, loader = self._session(5)
+        session_mock.return_value = session
+
+        first = get_problem_tests(1, "tests", limit=2, input_indices=[4, 1])
+        second = get_problem_tests(1, "tests", cursor=first.next_cursor, limit=2, input_indices=[4, 1])
+
+        self.assertEqual((second.total, second.limit), (5, 2))
+        self.assertEqual([test["index"] for test in second.items], [3, 4])
+        self.assertEqual([test["input"] for test in second.items], [None, "input 4\n"])
+        self.assertEqual([call.args for call in loader.call_args_list], [(1,), (4,)])
+        session.get_tests_lazy.assert_called_with("tests", prefetch_inputs=False)
+
+    @patch("src.mcp.utils.common.get_problem_session")
+    def test_last_page_has_no_next_cursor_and_no_inputs_false_prefetches(self, session_mock):
+        session, _ = self._session(3)
+        session_mock.return_value = session
+
+        page = get_problem_tests(1, "tests", no_inputs=False, fields=["index"])
+
+        self.assertIsNone(page.next_cursor)
+        self.assertEqual(page.items, [{"index": 1}, {"index": 2}, {"index": 3}])
+        session.get_tests_lazy.assert_called_once_with("tests", prefetch_inputs=True)
+
+    @patch("src.mcp.utils.common.get_problem_session")
+    def test_rejects_unknown_indices_and_invalid_paging(self, session_mock):
+        session_mock.return_value = self._session(2)[0]
+
+        with self.assertRaisesRegex(ValueError, "3"):
+            get_problem_tests(1, "tests", input_indices=[3])
+        with self.assertRaises(ValueError):
+            get_problem_tests(1, "tests", limit=0)
+        with self.assertRaises(ValueError):
+            get_problem_tests(1, "tests", cursor="not-a-cursor")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+import requests
+
+from src.mcp.server import _with_metrics
+from src.mcp.utils import common
+from src.mcp.utils.server_metrics import get_server_metrics
+from src.polygon.metrics import LatencyHistogram, MetricsRegistry, payload_size
+from src.polygon.models import PolygonBusinessError
+from src.polygon.utils.client_utils import make_api_request
+
+BASE_URL = "https://polygon.codeforces.com/api/"
+
+
+def _json_response(payload: bytes, status_code: int = 200) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.content = payload
+    response.json.side_effect = lambda: json.loads(payload)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        response.headers = {}
+    else:
+        response.raise_for_status.return_value = None
+    return response
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_percentiles_interpolate_within_buckets(self):
+        histogram = LatencyHistogram(buckets_ms=(10, 100, 1000))
+        for value in [5] * 90 + [50] * 9 + [500]:
+            histogram.observe(value)
+
+        self.assertLessEqual(histogram.percentile(50), 10)
+        self.assertTrue(10 <= histogram.percentile(95) <= 100)
+        self.assertTrue(100 <= histogram.percentile(99) <= 500)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        patcher = patch("src.polygon.utils.client_utils.get_metrics_registry", return_value=self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("src.polygon.utils.client_utils.time.sleep")
+    def test_make_api_request_records_retries_bytes_and_error_classes(self, _sleep_mock):
+        transport = Mock()
+        ok = b'{"status": "OK", "result": {}}'
+        transport.request.side_effect = [
+            _json_response(b"busy", status_code=503),
+            _json_response(ok),
+            _json_response(b'{"status": "FAILED", "comment": "bad"}'),
+        ]
+
+        make_api_request("key", "secret", BASE_URL, "problem.info", {"problemId": 1}, transport=transport)
+        with self.assertRaises(PolygonBusinessError):
+            make_api_request("key", "secret", BASE_URL, "problem.info", {"problemId": 1}, transport=transport)
+
+        stats = self.registry.snapshot("polygon_method")["polygon_method"]["problem.info"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["error_classes"], {"PolygonBusinessError": 1})
+        self.assertEqual(stats["bytes_in"], len(ok) + len(b'{"status": "FAILED", "comment": "bad"}'))
+        self.assertGreater(stats["bytes_out"], 0)
+        self.assertIsNotNone(stats["latency_ms"]["p99"])
+
+    def test_prometheus_text_contains_counters_and_histogram(self):
+        self.registry.record("tool", 'get_"x"', seconds=0.02, error="ValueError", bytes_in=5)
+
+        with TemporaryDirectory() as temp_dir:
+            path = self.registry.write_prometheus(Path(temp_dir) / "metrics" / "polygon.prom")
+            text = path.read_text(encoding="utf-8")
+
+        self.assertIn('polygon_mcp_calls_total{kind="tool",name="get_\\"x\\""} 1', text)
+        self.assertIn('error="ValueError"} 1', text)
+        self.assertIn('polygon_mcp_latency_seconds_bucket{kind="tool",name="get_\\"x\\"",le="0.025"} 1', text)
+        self.assertIn('le="+Inf"} 1', text)
+        self.assertIn("polygon_mcp_bytes_in_total", text)
+
+
+class ToolMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        for target in ("src.mcp.server.get_metrics_registry", "src.mcp.utils.server_metrics.get_metrics_registry"):
+            patcher = patch(target, return_value=self.registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_wrapper_records_exceptions_and_error_results(self):
+        def get_demo(problem_id: int):
+            if problem_id < 0:
+                raise ValueError("bad")
+            if problem_id == 0:
+                return {"status": "error", "error_type": "AccessDeniedException"}
+            return {"status": "success", "result": "x" * 100}
+
+        tool = _with_metrics(get_demo)
+        tool(problem_id=1)
+        tool(problem_id=0)
+        with self.assertRaises(ValueError):
+            tool(problem_id=-1)
+
+        stats = self.registry.snapshot("tool")["tool"]["get_demo"]
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["error_classes"], {"AccessDeniedException": 1, "ValueError": 1})
+        self.assertGreater(stats["bytes_out"], 100)
+        self.assertEqual(tool.__name__, "get_demo")
+
+    def test_wrapper_does_not_serialize_structured_results(self):
+        result = Mock()
+        result.model_dump_json.side_effect = AssertionError("serialized")
+
+        tool = _with_metrics(lambda problem_id, content: result)
+        self.assertIs(tool(problem_id=1, content="abc"), result)
+
+        stats = self.registry.snapshot("tool")["tool"]["<lambda>"]
+        self.assertEqual((stats["bytes_in"], stats["bytes_out"]), (3, 0))
+
+    def test_payload_size_counts_only_known_lengths(self):
+        self.assertEqual(payload_size(b"abc"), 3)
+        self.assertEqual(payload_size("测试"), 6)
+        self.assertEqual(payload_size({"result": "xy", "items": [1, 2], "raw": b"z"}), 3)
+        self.assertEqual(payload_size([{"a": "b"}]), 0)
+        self.assertEqual(payload_size(None), 0)
+
+    def test_get_server_metrics_ranks_filters_and_resets(self):
+        self.registry.record("tool", "fast", seconds=0.001)
+        self.registry.record("tool", "slow", seconds=2.0)
+        self.registry.record("polygon_method", "problem.info", seconds=0.1)
+
+        with TemporaryDirectory() as temp_dir:
+            prometheus_path = str(Path(temp_dir) / "metrics.prom")
+            result = get_server_metrics(kind="tool", top=1, reset=True, prometheus_path=prometheus_path)
+            self.assertTrue(Path(prometheus_path).is_file())
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(list(result["result"]["tool"]), ["slow"])
+        self.assertNotIn("polygon_method", result["result"])
+        self.assertEqual(self.registry.snapshot(), {})
+        self.assertEqual(get_server_metrics(kind="http")["error_type"], "ValueError")
+
+    def test_prometheus_file_export_is_throttled(self):
+        self.registry.record("tool", "demo", seconds=0.01)
+        with TemporaryDirectory() as temp_dir, patch.object(common, "_last_metrics_export", 0.0), patch(
+            "src.mcp.utils.common.get_metrics_registry", return_value=self.registry
+        ):
+            path = Path(temp_dir) / "metrics.prom"
+            with patch.dict(os.environ, {"POLYGON_METRICS_PROMETHEUS_FILE": str(path)}):
+                first = common.export_metrics_if_configured()
+                second = common.export_metrics_if_configured()
+                forced = common.export_metrics_if_configured(force=True)
+
+            self.assertEqual(first, str(path))
+            self.assertIsNone(second)
+            self.assertEqual(forced, str(path))
+            self.assertIn('name="demo"', path.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
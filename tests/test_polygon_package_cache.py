@@ -0,0 +1,223 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.common import reset_client_cache
+from src.mcp.utils.package_cache import get_package_cache_stats
+from src.polygon.client import PolygonClient
+from src.polygon.download import download_problem_package
+from src.polygon.models import PackageType
+from src.polygon.package_cache import PackageCache
+from src.polygon.streaming import DownloadDigest
+
+ZIP_CONTENT = b"PK\x03\x04zip"
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+class PackageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_round_trip_deduplicates_blobs_and_counts_hits(self):
+        cache = PackageCache(self.root)
+
+        self.assertIsNone(cache.get_bytes("a"))
+        cache.put_bytes("a", b"PK\x03\x04zip")
+        cache.put_bytes("b", b"PK\x03\x04zip")
+
+        self.assertEqual(cache.get_bytes("a"), b"PK\x03\x04zip")
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["blobs"]), (2, 1))
+        self.assertEqual(stats["total_bytes"], 7)
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(cache.lookup("b").detected_content_kind, "zip")
+
+    def test_index_survives_new_instance(self):
+        PackageCache(self.root).put_bytes("a", b"zip")
+
+        self.assertEqual(PackageCache(self.root).get_bytes("a"), b"zip")
+
+    def test_evicts_least_recently_used_entries_over_size_limit(self):
+        cache = PackageCache(self.root, max_bytes=8, clock=_Clock())
+
+        cache.put_bytes("a", b"1111")
+        cache.put_bytes("b", b"2222")
+        cache.get_bytes("a")
+        cache.put_bytes("c", b"3333")
+
+        self.assertIsNotNone(cache.lookup("a"))
+        self.assertIsNone(cache.lookup("b"))
+        self.assertIsNotNone(cache.lookup("c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["total_bytes"], 8)
+
+    def test_eviction_frees_shared_blob_only_after_last_reference(self):
+        cache = PackageCache(self.root, max_bytes=8, clock=_Clock())
+
+        cache.put_bytes("a", b"1111")
+        cache.put_bytes("b", b"1111")
+        cache.put_bytes("c", b"2222")
+        cache.put_bytes("d", b"3333")
+
+        self.assertEqual([key for key in "abcd" if cache.lookup(key) is not None], ["c", "d"])
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_corrupted_blob_is_dropped_on_read(self):
+        cache = PackageCache(self.root)
+        cache.put_bytes("a", b"zip")
+        Path(cache.lookup("a").path).write_bytes(b"tampered")
+
+        self.assertIsNone(cache.get_bytes("a"))
+        self.assertEqual(cache.stats()["corrupted"], 1)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_hits_verify_blob_once_and_do_not_rewrite_index(self):
+        cache = PackageCache(self.root)
+        cache.put_bytes("a", b"zip")
+        index_before = (self.root / "index.json").read_text(encoding="utf-8")
+
+        with patch(
+            "src.polygon.package_cache.DownloadDigest.from_file",
+            wraps=DownloadDigest.from_file,
+        ) as digest_mock:
+            for _ in range(3):
+                self.assertEqual(cache.get_bytes("a"), b"zip")
+
+        self.assertEqual(digest_mock.call_count, 1)
+        self.assertEqual((self.root / "index.json").read_text(encoding="utf-8"), index_before)
+        cache.flush()
+        self.assertNotEqual((self.root / "index.json").read_text(encoding="utf-8"), index_before)
+
+    def test_blob_removed_after_lookup_counts_as_miss(self):
+        cache = PackageCache(self.root)
+        cache.put_bytes("a", b"zip")
+        original_lookup = cache.lookup
+
+        def lookup_then_evict(key):
+            cached = original_lookup(key)
+            Path(cached.path).unlink()
+            return cached
+
+        with patch.object(cache, "lookup", side_effect=lookup_then_evict):
+            self.assertIsNone(cache.get_bytes("a"))
+            cache.put_bytes("a", b"zip")
+            self.assertIsNone(cache.copy_to("a", self.root / "out" / "package.zip"))
+
+        self.assertFalse((self.root / "out" / "package.zip").exists())
+        self.assertEqual(list((self.root / "out").iterdir()), [])
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (0, 2))
+
+    def test_instances_sharing_a_directory_keep_each_others_entries(self):
+        first = PackageCache(self.root)
+        second = PackageCache(self.root)
+        first.lookup("warm-up")
+        second.lookup("warm-up")
+
+        first.put_bytes("a", b"zip-a")
+        second.put_bytes("b", b"zip-b")
+
+        self.assertEqual(PackageCache(self.root).stats()["entries"], 2)
+        self.assertEqual(first.get_bytes("b"), b"zip-b")
+
+    def test_copy_to_materializes_cached_content(self):
+        cache = PackageCache(self.root)
+        cache.put_bytes("a", b"zip")
+        target = self.root / "out" / "package.zip"
+
+        copied = cache.copy_to("a", target)
+
+        self.assertEqual(target.read_bytes(), b"zip")
+        self.assertEqual(copied.path, str(target))
+
+
+class PackageCacheIntegrationTest(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self.cache = PackageCache(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @patch("src.polygon.problem.download_problem_package", return_value=ZIP_CONTENT)
+    def test_problem_session_reuses_cached_package(self, download_mock):
+        client = PolygonClient("key", "secret", transport=Mock(), package_cache=self.cache)
+
+        first = client.create_problem_session(1).download_package(9, PackageType.LINUX)
+        second = client.create_problem_session(1, pin="1234").download_package(9, PackageType.LINUX)
+        other_type = client.create_problem_session(1).download_package(9)
+
+        self.assertEqual((first, second, other_type), (ZIP_CONTENT, ZIP_CONTENT, ZIP_CONTENT))
+        self.assertEqual(download_mock.call_count, 2)
+
+    @patch("src.polygon.problem.download_problem_package", return_value=ZIP_CONTENT)
+    def test_problem_session_cache_is_scoped_to_api_key(self, download_mock):
+        for api_key in ("key", "other-key", "key"):
+            client = PolygonClient(api_key, "secret", transport=Mock(), package_cache=self.cache)
+            client.create_problem_session(1).download_package(9)
+
+        self.assertEqual(download_mock.call_count, 2)
+        self.assertFalse(any("key" in key for key in self.cache._load_entries()))
+
+    @patch("src.polygon.problem.download_problem_package", return_value=b"<html>login</html>")
+    def test_non_zip_content_is_not_cached(self, download_mock):
+        client = PolygonClient("key", "secret", transport=Mock(), package_cache=self.cache)
+        session = client.create_problem_session(1)
+
+        self.assertEqual(session.download_package(9), b"<html>login</html>")
+        self.assertEqual(session.download_package(9), b"<html>login</html>")
+        self.assertEqual(download_mock.call_count, 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    @patch("src.polygon.download._post_download", return_value=ZIP_CONTENT)
+    def test_url_download_is_cached_only_for_pinned_revision(self, post_mock):
+        url = "https://polygon.codeforces.com/p/demo/a-plus-b"
+
+        download_problem_package(url, "login", "password", cache=self.cache)
+        download_problem_package(url, "login", "password", cache=self.cache)
+        download_problem_package(url, "login", "password", revision=3, cache=self.cache)
+        download_problem_package(url + "/", "login", "password", revision=3, cache=self.cache)
+        download_problem_package(url, "other", "password", revision=3, cache=self.cache)
+
+        self.assertEqual(post_mock.call_count, 4)
+
+
+class PackageCacheStatsToolTest(unittest.TestCase):
+    def tearDown(self):
+        reset_client_cache()
+
+    def test_reports_disabled_cache(self):
+        reset_client_cache()
+        with patch.dict(os.environ, {"POLYGON_PACKAGE_CACHE_DIR": ""}):
+            result = get_package_cache_stats()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["result"], {"enabled": False})
+
+    def test_reports_configured_cache_stats(self):
+        reset_client_cache()
+        with TemporaryDirectory() as temp_dir, patch.dict(
+            os.environ,
+            {"POLYGON_PACKAGE_CACHE_DIR": temp_dir, "POLYGON_PACKAGE_CACHE_MAX_BYTES": "1024"},
+        ):
+            result = get_package_cache_stats()
+
+        self.assertTrue(result["result"]["enabled"])
+        self.assertEqual(result["result"]["max_bytes"], 1024)
+        self.assertEqual(result["result"]["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
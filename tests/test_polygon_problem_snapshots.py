@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.problem_changes import check_problem_changes
+from src.polygon.client import PolygonClient
+from src.polygon.models import AccessType, Problem
+from src.polygon.problem_snapshots import ProblemSnapshotTracker
+from src.polygon.response_cache import ResponseCache
+
+
+def _problem(problem_id: int, revision: int = 1, modified: bool = False, latest_package: int = 1) -> Problem:
+    return Problem(
+        id=problem_id,
+        owner="owner",
+        name=f"problem-{problem_id}",
+        accessType=AccessType.WRITE,
+        revision=revision,
+        modified=modified,
+        latestPackage=latest_package,
+    )
+
+
+class ProblemSnapshotTrackerTest(unittest.TestCase):
+    def test_classifies_problems_against_previous_snapshot(self):
+        tracker = ProblemSnapshotTracker()
+        first = tracker.observe([_problem(1), _problem(2), _problem(3)])
+
+        report = tracker.observe(
+            [_problem(1), _problem(2, revision=2), _problem(3, modified=True)],
+            expected_ids=[1, 2, 3, 4],
+        )
+
+        self.assertEqual(first.new, [1, 2, 3])
+        self.assertEqual(report.unchanged, [1])
+        self.assertEqual(report.changed, [2, 3])
+        self.assertEqual(report.missing, [4])
+        self.assertEqual(report.stale, [2, 3, 4])
+
+    def test_notifies_listeners_for_stale_problems_only(self):
+        tracker = ProblemSnapshotTracker()
+        listener = Mock()
+        tracker.add_listener(listener)
+        tracker.observe([_problem(1), _problem(2)])
+
+        tracker.observe([_problem(1), _problem(2, latest_package=2)], expected_ids=[1, 2, 3])
+
+        self.assertEqual([call.args[0] for call in listener.call_args_list], [2, 3])
+
+
+class ProbeProblemChangesTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.client = PolygonClient("key", "secret", transport=Mock(), response_cache=self.cache)
+
+    @patch("src.polygon.problem.get_problem_info", return_value="info")
+    @patch("src.polygon.api.problems.get_problems")
+    def test_single_list_call_invalidates_only_changed_problems(self, problems_mock, info_mock):
+        problems_mock.return_value = [_problem(1), _problem(2), _problem(3)]
+        self.client.probe_problem_changes()
+        for problem_id in (1, 2):
+            self.client.create_problem_session(problem_id).get_info()
+
+        problems_mock.return_value = [_problem(1), _problem(2, modified=True), _problem(3)]
+        report = self.client.probe_problem_changes([1, 2])
+        for problem_id in (1, 2):
+            self.client.create_problem_session(problem_id).get_info()
+
+        self.assertEqual(report.unchanged, [1])
+        self.assertEqual(report.changed, [2])
+        self.assertEqual(problems_mock.call_count, 2)
+        self.assertIsNone(problems_mock.call_args.kwargs["problem_id"])
+        self.assertEqual(info_mock.call_count, 3)
+        self.assertEqual(self.client.problem_snapshots.stats()["probes"], 2)
+
+    @patch("src.polygon.api.problems.get_problems", return_value=[_problem(7)])
+    def test_single_problem_probe_uses_id_filter(self, problems_mock):
+        self.client.probe_problem_changes([7])
+
+        self.assertEqual(problems_mock.call_args.kwargs["problem_id"], 7)
+
+    @patch("src.mcp.utils.problem_changes.get_client")
+    def test_tool_reports_stale_problems(self, client_mock):
+        client_mock.return_value = self.client
+        with patch("src.polygon.api.problems.get_problems", return_value=[_problem(1), _problem(2)]):
+            check_problem_changes()
+        with patch("src.polygon.api.problems.get_problems", return_value=[_problem(1, revision=5)]):
+            result = check_problem_changes([1, 2])
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["result"]["changed"], [1])
+        self.assertEqual(result["result"]["missing"], [2])
+        self.assertEqual(result["result"]["stale"], [1, 2])
+
+    def test_tool_rejects_empty_problem_ids(self):
+        with self.assertRaises(ValueError):
+            check_problem_changes([])
+
+
+if __name__ == "__main__":
+    unittest.main()
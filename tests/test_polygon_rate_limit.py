@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.rate_limit import get_rate_limit_stats
+from src.polygon.client import PolygonClient
+from src.polygon.rate_limit import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    RateLimitedTransport,
+    RateLimiter,
+    request_priority,
+)
+
+
+def _wait_for_queue_depth(limiter: RateLimiter, bucket: str, depth: int) -> None:
+    deadline = time.monotonic() + 2
+    while limiter.stats()[bucket]["queue_depth"] < depth:
+        if time.monotonic() > deadline:
+            raise AssertionError("等待者没有进入队列")
+        time.sleep(0.001)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_unlimited_bucket_never_waits_but_counts(self):
+        limiter = RateLimiter()
+
+        waits = [limiter.acquire("read") for _ in range(5)]
+
+        self.assertEqual(waits, [0.0] * 5)
+        stats = limiter.stats()["read"]
+        self.assertEqual(stats["acquired"], 5)
+        self.assertEqual(stats["throttled"], 0)
+        self.assertIsNone(stats["available_tokens"])
+
+    def test_token_bucket_spaces_requests_after_burst(self):
+        limiter = RateLimiter(write_rate=20.0, write_burst=1)
+
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.acquire("write")
+        elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.09)
+        stats = limiter.stats()
+        self.assertEqual(stats["write"]["acquired"], 3)
+        self.assertEqual(stats["write"]["throttled"], 2)
+        self.assertGreater(stats["write"]["total_wait_seconds"], 0)
+        self.assertEqual(stats["read"]["acquired"], 0)
+
+    def test_interactive_requests_jump_ahead_of_bulk_requests(self):
+        limiter = RateLimiter(read_rate=10.0, read_burst=1)
+        limiter.acquire("read")
+        order: list[str] = []
+
+        def worker(name: str, priority: int) -> None:
+            with request_priority(priority):
+                limiter.acquire("read")
+            order.append(name)
+
+        bulk = threading.Thread(target=worker, args=("bulk", PRIORITY_BULK))
+        bulk.start()
+        _wait_for_queue_depth(limiter, "read", 1)
+        interactive = threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE))
+        interactive.start()
+        bulk.join(2)
+        interactive.join(2)
+
+        self.assertEqual(order, ["interactive", "bulk"])
+        self.assertEqual(limiter.stats()["read"]["max_queue_depth"], 2)
+
+    def test_server_throttle_drains_bucket(self):
+        limiter = RateLimiter(read_rate=1000.0, read_burst=5)
+
+        limiter.record_server_throttle("read")
+
+        stats = limiter.stats()["read"]
+        self.assertEqual(stats["server_throttled"], 1)
+        self.assertLess(stats["available_tokens"], 5)
+
+    def test_rejects_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(read_rate=-1)
+        with self.assertRaises(ValueError):
+            RateLimiter(write_burst=0.5)
+
+
+class RateLimitedTransportTest(unittest.TestCase):
+    def test_routes_post_to_write_budget_and_records_429(self):
+        inner = Mock()
+        inner.request.return_value = Mock(status_code=429)
+        limiter = RateLimiter()
+        transport = RateLimitedTransport(inner, limiter)
+
+        transport.request("POST", "https://polygon.codeforces.com/api/problem.saveTest", data={})
+        transport.request("GET", "https://polygon.codeforces.com/api/problem.info", params={})
+
+        stats = limiter.stats()
+        self.assertEqual(stats["write"]["acquired"], 1)
+        self.assertEqual(stats["write"]["server_throttled"], 1)
+        self.assertEqual(stats["read"]["acquired"], 1)
+        inner.request.assert_called_with("GET", "https://polygon.codeforces.com/api/problem.info", params={})
+
+    def test_client_owns_limiter_and_wraps_transport(self):
+        inner = Mock()
+        limiter = RateLimiter()
+
+        client = PolygonClient("key", "secret", transport=inner, rate_limiter=limiter)
+        client.close()
+
+        self.assertIs(client.rate_limiter, limiter)
+        self.assertIsInstance(client.transport, RateLimitedTransport)
+        inner.close.assert_called_once_with()
+
+    @patch("src.mcp.utils.rate_limit.get_client")
+    def test_stats_tool_reports_both_budgets(self, client_mock):
+        client_mock.return_value = PolygonClient(
+            "key",
+            "secret",
+            transport=Mock(),
+            rate_limiter=RateLimiter(read_rate=5.0),
+        )
+
+        result = get_rate_limit_stats()
+
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(result["result"]["enabled"])
+        self.assertEqual(result["result"]["read"]["rate_per_second"], 5.0)
+        self.assertIn("queue_depth", result["result"]["write"])
+
+
+if __name__ == "__main__":
+    unittest.main()
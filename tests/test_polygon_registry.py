@@ -0,0 +1,136 @@
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+from src.mcp.utils import common
+from src.mcp.utils.common import (
+    call_problem_session_method,
+    get_client,
+    get_problem_session,
+    reset_client_cache,
+    run_write_operation,
+)
+from src.polygon.client import PolygonClient
+from src.polygon.models import AccessDeniedException, AccessType
+from src.polygon.registry import PolygonClientRegistry, ProblemSessionCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_client(api_key: str = "key", api_secret: str = "secret") -> PolygonClient:
+    return PolygonClient(api_key, api_secret, transport=Mock())
+
+
+class PolygonClientRegistryTest(unittest.TestCase):
+    def test_reuses_client_per_credentials(self):
+        factory = Mock(side_effect=_make_client)
+        registry = PolygonClientRegistry(factory)
+
+        first = registry.get("key", "secret")
+        second = registry.get("key", "secret")
+        other = registry.get("key", "other-secret")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(factory.call_count, 2)
+        self.assertEqual(len(registry), 2)
+
+    def test_clear_closes_clients(self):
+        registry = PolygonClientRegistry(_make_client)
+        client = registry.get("key", "secret")
+
+        registry.clear()
+
+        client.transport.close.assert_called_once_with()
+        self.assertEqual(len(registry), 0)
+
+
+class ProblemSessionCacheTest(unittest.TestCase):
+    def test_reuses_session_and_keeps_access_type(self):
+        cache = ProblemSessionCache(max_size=4, ttl_seconds=60, clock=_Clock())
+        client = _make_client()
+
+        session = cache.get_or_create(client, 1, "pin")
+        session._access_type = AccessType.WRITE
+        reused = cache.get_or_create(client, 1, "pin")
+
+        self.assertIs(session, reused)
+        self.assertEqual(reused._access_type, AccessType.WRITE)
+        self.assertIsNot(cache.get_or_create(client, 1, None), session)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_expires_idle_sessions(self):
+        clock = _Clock()
+        cache = ProblemSessionCache(max_size=4, ttl_seconds=10, clock=clock)
+        client = _make_client()
+
+        session = cache.get_or_create(client, 1)
+        clock.now = 11.0
+
+        self.assertIsNot(cache.get_or_create(client, 1), session)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = ProblemSessionCache(max_size=2, ttl_seconds=60, clock=_Clock())
+        client = _make_client()
+
+        first = cache.get_or_create(client, 1)
+        cache.get_or_create(client, 2)
+        cache.get_or_create(client, 1)
+        cache.get_or_create(client, 3)
+
+        self.assertIs(cache.get_or_create(client, 1), first)
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_zero_size_disables_cache(self):
+        cache = ProblemSessionCache(max_size=0)
+        client = _make_client()
+
+        self.assertIsNot(cache.get_or_create(client, 1), cache.get_or_create(client, 1))
+
+
+@patch.dict(os.environ, {"POLYGON_API_KEY": "key", "POLYGON_API_SECRET": "secret"})
+class CommonClientReuseTest(unittest.TestCase):
+    def setUp(self):
+        reset_client_cache()
+        self.addCleanup(reset_client_cache)
+
+    def test_get_client_and_session_are_reused(self):
+        self.assertIs(get_client(), get_client())
+        self.assertIs(get_problem_session(5, "pin"), get_problem_session(5, "pin"))
+
+    def test_access_denied_drops_cached_session(self):
+        session = get_problem_session(5)
+
+        with patch.object(session, "get_info", side_effect=AccessDeniedException("denied")):
+            with self.assertRaises(AccessDeniedException):
+                call_problem_session_method(5, None, "get_info")
+
+        self.assertIsNot(get_problem_session(5), session)
+
+    def test_write_operation_access_denied_drops_cached_session(self):
+        session = get_problem_session(5)
+
+        result = run_write_operation(
+            action="save_problem_tags",
+            success_message="ok",
+            failure_message="failed",
+            operation=Mock(side_effect=AccessDeniedException("denied")),
+            problem_id=5,
+        )
+
+        self.assertEqual(result["status"], "error")
+        self.assertIsNot(get_problem_session(5), session)
+        self.assertEqual(common.get_session_cache().stats()["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+import os
+import unittest
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from src.mcp.utils.common import build_response_cache
+from src.mcp.utils.response_cache import get_response_cache_stats
+from src.polygon.client import PolygonClient
+from src.polygon.models import AccessType, Package, PackageState, PackageType, Problem
+from src.polygon.response_cache import (
+    DiskResponseBackend,
+    MemoryResponseBackend,
+    ResponseCache,
+    build_response_cache_key,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _problem(problem_id: int, revision: int) -> Problem:
+    return Problem(id=problem_id, owner="owner", name="a-plus-b", accessType=AccessType.WRITE, revision=revision)
+
+
+def _package(state: PackageState) -> Package:
+    return Package(
+        id=1,
+        revision=3,
+        creationTimeSeconds=datetime(2024, 1, 1),
+        state=state,
+        comment="",
+        type=PackageType.STANDARD,
+    )
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_hits_return_independent_copies(self):
+        cache = ResponseCache()
+        fetch = Mock(return_value={"tags": ["math"]})
+
+        first = cache.get_or_fetch(1, "key", fetch)
+        first["tags"].append("mutated")
+        second = cache.get_or_fetch(1, "key", fetch)
+
+        self.assertEqual(second, {"tags": ["math"]})
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+
+    def test_entries_expire_after_ttl(self):
+        clock = _Clock()
+        cache = ResponseCache(ttl_seconds=10, clock=clock)
+        fetch = Mock(return_value="value")
+
+        cache.get_or_fetch(1, "key", fetch)
+        clock.now += 11
+        cache.get_or_fetch(1, "key", fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_revision_change_invalidates_only_that_problem(self):
+        cache = ResponseCache()
+        cache.observe_revision(1, 5)
+        cache.observe_revision(2, 7)
+        cache.get_or_fetch(1, "a", lambda: "a")
+        cache.get_or_fetch(2, "b", lambda: "b")
+
+        self.assertFalse(cache.observe_revision(1, 5))
+        self.assertTrue(cache.observe_revision(1, 6))
+
+        self.assertEqual(len(cache.backend), 1)
+        self.assertEqual(cache.stats()["revision_changes"], 1)
+
+    def test_invalidation_during_fetch_discards_result(self):
+        cache = ResponseCache()
+
+        def fetch():
+            cache.invalidate(1)
+            return "stale"
+
+        cache.get_or_fetch(1, "key", fetch)
+
+        self.assertEqual(len(cache.backend), 0)
+
+    def test_uncacheable_results_are_not_stored(self):
+        cache = ResponseCache()
+
+        cache.get_or_fetch(1, "key", lambda: [], cacheable=bool)
+
+        self.assertEqual(cache.stats()["stores"], 0)
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryResponseBackend(max_entries=2)
+        cache = ResponseCache(backend)
+        for key in ("a", "b"):
+            cache.get_or_fetch(1, key, lambda: key)
+        cache.get_or_fetch(1, "a", Mock())
+        cache.get_or_fetch(1, "c", lambda: "c")
+
+        self.assertIsNotNone(backend.load(1, "a"))
+        self.assertIsNone(backend.load(1, "b"))
+        self.assertEqual(backend.evictions, 1)
+
+    def test_disk_backend_is_shared_between_instances(self):
+        with TemporaryDirectory() as temp_dir:
+            ResponseCache(DiskResponseBackend(temp_dir)).get_or_fetch(1, "key", lambda: b"input")
+            fetch = Mock()
+
+            value = ResponseCache(DiskResponseBackend(temp_dir)).get_or_fetch(1, "key", fetch)
+            removed = ResponseCache(DiskResponseBackend(temp_dir)).invalidate(1)
+
+        self.assertEqual(value, b"input")
+        fetch.assert_not_called()
+        self.assertEqual(removed, 1)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "需要 POSIX 文件属主")
+    def test_disk_backend_creates_private_directories(self):
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "responses"
+            backend = DiskResponseBackend(root)
+            ResponseCache(backend).get_or_fetch(1, "key", lambda: b"input")
+
+            self.assertEqual(root.stat().st_mode & 0o777, 0o700)
+            self.assertEqual((root / "1").stat().st_mode & 0o777, 0o700)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "需要 POSIX 文件属主")
+    def test_disk_backend_refuses_entries_writable_by_others(self):
+        with TemporaryDirectory() as temp_dir:
+            backend = DiskResponseBackend(temp_dir)
+            ResponseCache(backend).get_or_fetch(1, "key", lambda: b"input")
+            os.chmod(backend._entry_path(1, "key"), 0o666)
+            fetch = Mock(return_value=b"fresh")
+
+            value = ResponseCache(backend).get_or_fetch(1, "key", fetch)
+
+        self.assertEqual(value, b"fresh")
+        fetch.assert_called_once_with()
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "需要 POSIX 文件属主")
+    def test_disk_backend_rejects_world_writable_root(self):
+        with TemporaryDirectory() as temp_dir:
+            os.chmod(temp_dir, 0o777)
+
+            with self.assertRaises(ValueError):
+                DiskResponseBackend(temp_dir)
+
+    def test_key_hashes_pin_and_namespace(self):
+        key = build_response_cache_key("problem.tests", 1, "secret-pin", {"testset": "tests"}, "api-key")
+
+        self.assertNotIn("secret-pin", key)
+        self.assertNotIn("api-key", key)
+        self.assertNotEqual(key, build_response_cache_key("problem.tests", 1, None, {"testset": "tests"}, "api-key"))
+
+
+class ProblemSessionResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.client = PolygonClient(
+            "key",
+            "secret",
+            transport=Mock(),
+            optimistic_writes=True,
+            response_cache=self.cache,
+        )
+
+    @patch("src.polygon.problem.get_problem_tests", return_value=["test"])
+    def test_reads_are_cached_per_params_and_pin(self, tests_mock):
+        session = self.client.create_problem_session(1)
+
+        session.get_tests("tests")
+        session.get_tests("tests")
+        session.get_tests("tests", no_inputs=True)
+        self.client.create_problem_session(1, pin="1234").get_tests("tests")
+
+        self.assertEqual(tests_mock.call_count, 3)
+
+    @patch("src.polygon.problem.save_problem_tags", return_value={})
+    @patch("src.polygon.problem.get_problem_tags", return_value=["math"])
+    def test_write_invalidates_problem_cache(self, tags_mock, save_mock):
+        session = self.client.create_problem_session(1)
+
+        session.get_tags()
+        session.save_tags(["dp"])
+        session.get_tags()
+
+        self.assertEqual(tags_mock.call_count, 2)
+
+    @patch("src.polygon.problem.save_problem_tags", side_effect=RuntimeError("boom"))
+    @patch("src.polygon.problem.get_problem_tags", return_value=["math"])
+    def test_failed_write_also_invalidates(self, tags_mock, save_mock):
+        session = self.client.create_problem_session(1)
+
+        session.get_tags()
+        with self.assertRaises(RuntimeError):
+            session.save_tags(["dp"])
+        session.get_tags()
+
+        self.assertEqual(tags_mock.call_count, 2)
+
+    @patch("src.polygon.api.problems.get_problems")
+    @patch("src.polygon.problem.get_problem_info", return_value="info")
+    def test_new_revision_from_problem_list_invalidates(self, info_mock, problems_mock):
+        session = self.client.create_problem_session(1)
+        problems_mock.return_value = [_problem(1, 3)]
+        self.client.get_problems()
+        session.get_info()
+        session.get_info()
+
+        problems_mock.return_value = [_problem(1, 4)]
+        self.client.get_problems()
+        session.get_info()
+
+        self.assertEqual(info_mock.call_count, 2)
+
+    @patch("src.polygon.problem.get_problem_packages")
+    def test_packages_are_cached_only_when_settled(self, packages_mock):
+        session = self.client.create_problem_session(1)
+        packages_mock.return_value = [_package(PackageState.RUNNING)]
+        session.get_packages()
+        packages_mock.return_value = [_package(PackageState.READY)]
+        session.get_packages()
+        session.get_packages()
+
+        self.assertEqual(packages_mock.call_count, 2)
+
+    @patch("src.polygon.problem.get_problem_info", return_value="info")
+    def test_client_without_cache_always_fetches(self, info_mock):
+        session = PolygonClient("key", "secret", transport=Mock()).create_problem_session(1)
+
+        session.get_info()
+        session.get_info()
+
+        self.assertEqual(info_mock.call_count, 2)
+
+
+class ResponseCacheConfigTest(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, {"POLYGON_RESPONSE_CACHE": ""}):
+            self.assertIsNone(build_response_cache())
+
+    def test_memory_backend_from_env(self):
+        with patch.dict(
+            os.environ,
+            {"POLYGON_RESPONSE_CACHE": "memory", "POLYGON_RESPONSE_CACHE_TTL_SECONDS": "30"},
+        ):
+            cache = build_response_cache()
+
+        self.assertIsInstance(cache.backend, MemoryResponseBackend)
+        self.assertEqual(cache.ttl_seconds, 30.0)
+
+    def test_disk_backend_requires_directory(self):
+        with patch.dict(
+            os.environ,
+            {"POLYGON_RESPONSE_CACHE": "disk", "POLYGON_RESPONSE_CACHE_DIR": ""},
+        ):
+            with self.assertRaises(ValueError):
+                build_response_cache()
+
+    @patch("src.mcp.utils.response_cache.get_client")
+    def test_stats_tool(self, client_mock):
+        client_mock.return_value = PolygonClient(
+            "key",
+            "secret",
+            transport=Mock(),
+            response_cache=ResponseCache(),
+        )
+
+        result = get_response_cache_stats()
+
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(result["result"]["enabled"])
+        self.assertEqual(result["result"]["backend"], "MemoryResponseBackend")
+
+
+if __name__ == "__main__":
+    unittest.main()
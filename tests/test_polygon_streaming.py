@@ -0,0 +1,310 @@
+import hashlib
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+import requests
+
+from src.mcp.utils.downloads import download_problem_descriptor_info
+from src.polygon.api.problem_packages import download_problem_package_to_file
+from src.polygon.api.problem_tests_extended import view_problem_test_answer_to_file
+from src.polygon.models import PackageType, PolygonHTTPError, PolygonNetworkError
+from src.polygon.streaming import (
+    DownloadDigest,
+    partial_path_for,
+    sniff_content_kind,
+    stream_to_file,
+)
+from src.polygon.utils.client_utils import open_api_stream
+from src.polygon.web_session import PolygonWebSession
+
+
+def _response(chunks, *, status_code=200, headers=None, error=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.history = []
+
+    def iter_content(chunk_size):
+        yield from chunks
+        if error is not None:
+            raise error
+
+    response.iter_content.side_effect = iter_content
+    return response
+
+
+class DownloadDigestTest(unittest.TestCase):
+    def test_sniffs_common_content_kinds(self):
+        self.assertEqual(sniff_content_kind(b"PK\x03\x04rest"), "zip")
+        self.assertEqual(sniff_content_kind(b"%PDF-1.7"), "pdf")
+        self.assertEqual(sniff_content_kind(b"<?xml version='1.0'?>"), "xml")
+        self.assertEqual(sniff_content_kind(b"\n<problem />"), "xml")
+        self.assertEqual(sniff_content_kind(b"<!DOCTYPE html><html>"), "html")
+        self.assertEqual(sniff_content_kind(b'{"status": "FAILED"}'), "json")
+        self.assertIsNone(sniff_content_kind(b"1 2\n"))
+
+    def test_digest_matches_single_pass_hash_across_chunk_boundaries(self):
+        content = b"%PDF" + bytes(range(256)) * 8
+        digest = DownloadDigest.from_chunks(content[start:start + 7] for start in range(0, len(content), 7))
+
+        self.assertEqual(digest.size_bytes, len(content))
+        self.assertEqual(digest.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(digest.detected_content_kind, "pdf")
+
+
+class StreamToFileTest(unittest.TestCase):
+    def test_writes_target_atomically_and_hashes_incrementally(self):
+        opened_headers = []
+
+        def open_response(headers):
+            opened_headers.append(headers)
+            return _response([b"PK\x03\x04", b"", b"def"])
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "nested" / "package.zip"
+            downloaded = stream_to_file(open_response, target)
+
+            self.assertEqual(target.read_bytes(), b"PK\x03\x04def")
+            self.assertFalse(partial_path_for(target).exists())
+
+        self.assertEqual(opened_headers, [{}])
+        self.assertEqual(downloaded.size_bytes, 7)
+        self.assertEqual(downloaded.sha256, hashlib.sha256(b"PK\x03\x04def").hexdigest())
+        self.assertEqual(downloaded.detected_content_kind, "zip")
+        self.assertEqual(downloaded.resumed_from, 0)
+
+    def _interrupt(self, target, resource_id, content=b"abc"):
+        def open_response(headers):
+            return _response([content], error=requests.ConnectionError("reset"))
+
+        with self.assertRaises(PolygonNetworkError):
+            stream_to_file(open_response, target, max_resume_attempts=0, resource_id=resource_id)
+
+    def test_resumes_partial_file_of_same_resource_with_range_request(self):
+        opened_headers = []
+
+        def open_response(headers):
+            opened_headers.append(headers)
+            return _response([b"def"], status_code=206, headers={"Content-Range": "bytes 3-5/6"})
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            self._interrupt(target, "problem.package/1/7/")
+            downloaded = stream_to_file(open_response, target, resource_id="problem.package/1/7/")
+
+            self.assertEqual(target.read_bytes(), b"abcdef")
+            self.assertEqual(sorted(path.name for path in Path(temp_dir).iterdir()), ["package.zip"])
+
+        self.assertEqual(opened_headers, [{"Range": "bytes=3-"}])
+        self.assertEqual(downloaded.resumed_from, 3)
+        self.assertEqual(downloaded.sha256, hashlib.sha256(b"abcdef").hexdigest())
+
+    def test_discards_stale_partial_file_left_by_another_package(self):
+        opened_headers = []
+
+        def open_response(headers):
+            opened_headers.append(headers)
+            return _response([b"PK\x03\x04new"])
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            self._interrupt(target, "problem.package/1/7/", content=b"PK\x03\x04old")
+            downloaded = stream_to_file(open_response, target, resource_id="problem.package/1/8/")
+
+            self.assertEqual(target.read_bytes(), b"PK\x03\x04new")
+
+        self.assertEqual(opened_headers, [{}])
+        self.assertEqual(downloaded.resumed_from, 0)
+        self.assertEqual(downloaded.sha256, hashlib.sha256(b"PK\x03\x04new").hexdigest())
+
+    def test_does_not_resume_partial_file_without_resource_id(self):
+        opened_headers = []
+
+        def open_response(headers):
+            opened_headers.append(headers)
+            return _response([b"fresh"])
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            partial_path_for(target).write_bytes(b"abc")
+            downloaded = stream_to_file(open_response, target)
+
+            self.assertEqual(target.read_bytes(), b"fresh")
+
+        self.assertEqual(opened_headers, [{}])
+        self.assertEqual(downloaded.resumed_from, 0)
+
+    def test_restarts_when_server_ignores_range(self):
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            self._interrupt(target, "problem.package/1/7/", content=b"stale")
+            downloaded = stream_to_file(
+                lambda headers: _response([b"fresh"]), target, resource_id="problem.package/1/7/"
+            )
+
+            self.assertEqual(target.read_bytes(), b"fresh")
+
+        self.assertEqual(downloaded.size_bytes, 5)
+        self.assertEqual(downloaded.resumed_from, 0)
+
+    def test_resumes_after_connection_drop(self):
+        responses = [
+            _response([b"abc"], error=requests.exceptions.ChunkedEncodingError("reset")),
+            _response([b"def"], status_code=206, headers={"Content-Range": "bytes 3-5/6"}),
+        ]
+        opened_headers = []
+
+        def open_response(headers):
+            opened_headers.append(headers)
+            return responses.pop(0)
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            downloaded = stream_to_file(open_response, target)
+
+            self.assertEqual(target.read_bytes(), b"abcdef")
+
+        self.assertEqual(opened_headers, [{}, {"Range": "bytes=3-"}])
+        self.assertEqual(downloaded.sha256, hashlib.sha256(b"abcdef").hexdigest())
+
+    def test_keeps_partial_file_when_resume_attempts_run_out(self):
+        def open_response(headers):
+            return _response([b"x"], error=requests.ConnectionError("reset"))
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            with self.assertRaises(PolygonNetworkError):
+                stream_to_file(open_response, target, max_resume_attempts=1)
+
+            self.assertFalse(target.exists())
+            self.assertEqual(partial_path_for(target).read_bytes(), b"x")
+
+
+class StreamingDownloadApiTest(unittest.TestCase):
+    def test_problem_package_is_streamed_through_transport(self):
+        transport = Mock()
+        transport.request.return_value = _response([b"zip"])
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "package.zip"
+            downloaded = download_problem_package_to_file(
+                "key",
+                "secret",
+                "https://polygon.codeforces.com/api/",
+                7,
+                9,
+                target,
+                pin="1234",
+                package_type=PackageType.LINUX,
+                transport=transport,
+            )
+
+            self.assertEqual(target.read_bytes(), b"zip")
+
+        self.assertEqual(downloaded.size_bytes, 3)
+        method, url = transport.request.call_args.args
+        kwargs = transport.request.call_args.kwargs
+        self.assertEqual((method, url), ("GET", "https://polygon.codeforces.com/api/problem.package"))
+        self.assertIs(kwargs["stream"], True)
+        self.assertEqual(kwargs["params"]["packageId"], "9")
+        self.assertEqual(kwargs["params"]["problemId"], "7")
+        self.assertEqual(kwargs["params"]["type"], "linux")
+
+    def test_test_answer_is_streamed_through_transport(self):
+        transport = Mock()
+        transport.request.return_value = _response([b"3\n"])
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "01.a"
+            downloaded = view_problem_test_answer_to_file(
+                "key",
+                "secret",
+                "https://polygon.codeforces.com/api/",
+                7,
+                "tests",
+                1,
+                target,
+                transport=transport,
+            )
+
+            self.assertEqual(target.read_bytes(), b"3\n")
+
+        self.assertEqual(downloaded.sha256, hashlib.sha256(b"3\n").hexdigest())
+        _, url = transport.request.call_args.args
+        kwargs = transport.request.call_args.kwargs
+        self.assertEqual(url, "https://polygon.codeforces.com/api/problem.testAnswer")
+        self.assertIs(kwargs["stream"], True)
+        self.assertEqual(kwargs["params"]["testset"], "tests")
+        self.assertEqual(kwargs["params"]["testIndex"], "1")
+
+    def _error_response(self, status_code, headers=None):
+        response = _response([], status_code=status_code, headers=headers)
+        response.text = "error"
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        return response
+
+    def test_stream_closes_response_before_raising_http_error(self):
+        transport = Mock()
+        response = self._error_response(404)
+        transport.request.return_value = response
+
+        with self.assertRaises(PolygonHTTPError):
+            open_api_stream(
+                "key",
+                "secret",
+                "https://polygon.codeforces.com/api/",
+                "problem.package",
+                transport=transport,
+            )
+
+        response.close.assert_called_once_with()
+
+    @patch("src.polygon.utils.client_utils.time.sleep")
+    def test_stream_closes_retried_responses(self, _sleep_mock):
+        transport = Mock()
+        busy = self._error_response(503, headers={"Retry-After": "0"})
+        ok = _response([b"zip"])
+        transport.request.side_effect = [busy, ok]
+
+        response = open_api_stream(
+            "key",
+            "secret",
+            "https://polygon.codeforces.com/api/",
+            "problem.package",
+            transport=transport,
+        )
+
+        self.assertIs(response, ok)
+        busy.close.assert_called_once_with()
+        ok.close.assert_not_called()
+
+    @patch("src.mcp.utils.downloads.get_web_session")
+    @patch("src.mcp.utils.downloads.get_account_credentials", return_value=("login", "password"))
+    def test_info_tool_keeps_file_at_target_path(self, _creds_mock, web_session_mock):
+        transport = Mock()
+        transport.request.return_value = _response([b"<problem />"])
+        web_session_mock.return_value = PolygonWebSession("login", "password", transport=transport)
+        post_mock = transport.request
+
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "problem.xml"
+            result = download_problem_descriptor_info(
+                "https://polygon.codeforces.com/p/demo/a-plus-b",
+                target_path=str(target),
+            )
+
+            self.assertEqual(target.read_bytes(), b"<problem />")
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["path"], str(target))
+        self.assertEqual(result["size_bytes"], 11)
+        self.assertEqual(
+            post_mock.call_args.kwargs["data"],
+            {"login": "login", "password": "password"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import json
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+import requests
+
+from src.mcp.server import _with_tracing
+from src.mcp.utils.common import configure_tracing
+from src.mcp.utils.problem_release import prepare_problem_release
+from src.mcp.utils.server_traces import get_traces
+from src.polygon.client import PolygonClient
+from src.polygon.tracing import Tracer, get_tracer, propagate_trace_context, set_tracer, trace_span
+from tests.fake_problem_session import FakeProblemSession, SequenceValue, make_problem
+
+INFO_PAYLOAD = {
+    "status": "OK",
+    "result": {
+        "inputFile": "stdin",
+        "outputFile": "stdout",
+        "interactive": False,
+        "timeLimit": 1000,
+        "memoryLimit": 256,
+    },
+}
+
+
+def _response(status_code: int, payload: dict) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {}
+    response.content = json.dumps(payload).encode()
+    response.json.return_value = payload
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    else:
+        response.raise_for_status.return_value = None
+    return response
+
+
+def _by_name(tree: list[dict]) -> dict:
+    return {node["name"]: node for node in tree}
+
+
+class TracingTest(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer(buffer_size=256)
+        previous = set_tracer(self.tracer)
+        self.addCleanup(set_tracer, previous)
+
+    def _single_tree(self) -> list[dict]:
+        summaries = get_traces()["result"]["traces"]
+        self.assertEqual(len(summaries), 1)
+        return get_traces(trace_id=summaries[0]["trace_id"])["result"]["spans"]
+
+    @patch("src.polygon.utils.client_utils.time.sleep")
+    def test_tool_session_method_attempts_and_backoff_form_one_tree(self, _sleep_mock):
+        transport = Mock()
+        transport.request.side_effect = [_response(503, {}), _response(200, INFO_PAYLOAD)]
+        session = PolygonClient("key", "secret", transport=transport).create_problem_session(7, pin="1234")
+
+        def get_problem_info(problem_id: int, pin: str):
+            return {"status": "success", "result": session.get_info().model_dump()}
+
+        _with_tracing(get_problem_info)(problem_id=7, pin="1234")
+
+        [tool] = self._single_tree()
+        self.assertEqual((tool["name"], tool["span_type"]), ("get_problem_info", "tool"))
+        self.assertEqual(tool["attributes"]["tool.arg.pin"], "***")
+        [method] = tool["children"]
+        self.assertEqual((method["name"], method["span_type"]), ("ProblemSession.get_info", "session_method"))
+        self.assertEqual(method["attributes"]["problem_id"], 7)
+        self.assertEqual(
+            [(child["span_type"], child["status"]) for child in method["children"]],
+            [("http_attempt", "error"), ("backoff", "ok"), ("http_attempt", "ok")],
+        )
+        first_attempt, backoff, second_attempt = method["children"]
+        self.assertEqual(first_attempt["attributes"]["http.response.status_code"], 503)
+        self.assertEqual(backoff["attributes"]["delay_seconds"], 1.0)
+        self.assertEqual(second_attempt["attributes"]["attempt"], 1)
+        self.assertIn('"pin": "***"', second_attempt["attributes"]["polygon.params"])
+        self.assertNotIn("1234", json.dumps(tool))
+
+    def test_worker_threads_inherit_parent_span(self):
+        def work(index: int) -> None:
+            with trace_span("worker", index=index):
+                pass
+
+        with trace_span("parent"):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(propagate_trace_context(work), range(3)))
+
+        [parent] = self._single_tree()
+        self.assertEqual([child["name"] for child in parent["children"]], ["worker"] * 3)
+
+    @patch("src.mcp.utils.problem_release.build_problem_package_and_wait")
+    @patch("src.mcp.utils.problem_release.check_problem_readiness")
+    @patch("src.mcp.utils.problem_release.get_problem_session")
+    def test_release_workflow_records_stages(self, session_mock, readiness_mock, build_mock):
+        session_mock.return_value = FakeProblemSession(
+            problems_sequence=SequenceValue([make_problem(revision=10)], [make_problem(revision=11)]),
+        )
+        readiness_mock.return_value = {"blocking_issues": [], "warnings": []}
+        build_mock.return_value = {"status": "success", "package": {"id": 1, "revision": 11}}
+
+        _with_tracing(prepare_problem_release)(problem_id=1)
+
+        [tool] = self._single_tree()
+        self.assertEqual(
+            [child["name"] for child in tool["children"]],
+            [
+                "prepare_problem_release.update_working_copy",
+                "prepare_problem_release.readiness",
+                "prepare_problem_release.build",
+                "prepare_problem_release.pre_commit_snapshot",
+                "prepare_problem_release.commit",
+                "prepare_problem_release.post_commit_snapshot",
+            ],
+        )
+        self.assertEqual(tool["attributes"]["tool.status"], "success")
+
+    def test_errors_are_recorded_and_queryable(self):
+        def failing_tool():
+            return {"status": "error", "error": "boom"}
+
+        with self.assertRaises(ValueError):
+            with trace_span("explodes"):
+                raise ValueError("password=hunter2")
+        _with_tracing(failing_tool)()
+        with trace_span("fine"):
+            pass
+
+        result = get_traces(errors_only=True)["result"]
+        self.assertEqual(sorted(trace["name"] for trace in result["traces"]), ["explodes", "failing_tool"])
+        self.assertEqual([trace["name"] for trace in get_traces(name="fine")["result"]["traces"]], ["fine"])
+        self.assertEqual(len(get_traces(limit=1)["result"]["traces"]), 1)
+        self.assertEqual(get_traces(trace_id="missing")["error_type"], "ValueError")
+        self.assertEqual(get_traces(limit=0)["error_type"], "ValueError")
+
+        get_traces(clear=True)
+        self.assertEqual(get_traces()["result"]["total"], 0)
+
+    def test_otlp_file_export_and_env_configuration(self):
+        with TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "traces" / "polygon.jsonl"
+            with patch.dict(os.environ, {"POLYGON_TRACE_BUFFER_SIZE": "0", "POLYGON_TRACE_FILE": str(path)}):
+                tracer = configure_tracing()
+            self.assertIs(get_tracer(), tracer)
+
+            with trace_span("root", pin="9999"):
+                with trace_span("child", params={"password": "secret", "problemId": 1}):
+                    pass
+            with trace_span("second"):
+                pass
+
+            lines = path.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(tracer.finished_spans(), [])
+        self.assertEqual(len(lines), 2)
+        spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        child, root = spans
+        self.assertEqual(child["parentSpanId"], root["spanId"])
+        self.assertEqual(child["traceId"], root["traceId"])
+        self.assertNotIn("parentSpanId", root)
+        self.assertNotIn("secret", lines[0])
+        self.assertNotIn("9999", lines[0])
+
+    def test_disabled_tracer_records_nothing(self):
+        set_tracer(Tracer(buffer_size=0))
+
+        with trace_span("ignored") as span:
+            span.set_attribute("key", "value")
+
+        self.assertEqual(get_tracer().finished_spans(), [])
+        self.assertFalse(get_tracer().enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
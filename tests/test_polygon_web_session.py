@@ -0,0 +1,195 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+from src.mcp.utils.common import get_web_session, reset_client_cache
+from src.polygon.download import download_problem_descriptor
+from src.polygon.models import AccessDeniedException
+from src.polygon.web_session import PolygonWebSession, WebSessionRegistry
+
+PROBLEM_URL = "https://polygon.codeforces.com/p/demo/a-plus-b"
+LOGIN_URL = "https://polygon.codeforces.com/login"
+
+
+def _response(content: bytes = b"<problem />", *, status_code: int = 200, url: str = PROBLEM_URL, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.url = url
+    response.headers = headers or {"Content-Type": "application/xml"}
+    response.history = []
+    response.content = content
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} error")
+    else:
+        response.raise_for_status.return_value = None
+    return response
+
+
+LOGIN_FORM = (
+    b'<!DOCTYPE html><form method="post" action="/login">'
+    b'<input name="login" type="text"><input name="password" type="password"></form>'
+)
+
+
+def _login_page() -> Mock:
+    return _response(LOGIN_FORM, url=LOGIN_URL, headers={"Content-Type": "text/html"})
+
+
+class PolygonWebSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = Mock()
+        self.session = PolygonWebSession("login", "password", transport=self.transport)
+
+    def _sent_credentials(self) -> list[bool]:
+        return ["password" in call.kwargs["data"] for call in self.transport.request.call_args_list]
+
+    def test_logs_in_once_for_many_downloads(self):
+        self.transport.request.return_value = _response()
+
+        for revision in range(20):
+            download_problem_descriptor(
+                PROBLEM_URL,
+                "login",
+                "password",
+                revision=revision,
+                web_session=self.session,
+            )
+
+        self.assertEqual(self.transport.request.call_count, 20)
+        self.assertEqual(self._sent_credentials(), [True] + [False] * 19)
+        self.assertEqual(self.transport.request.call_args.kwargs["data"], {"revision": "19"})
+        self.assertEqual(self.session.stats()["logins"], 1)
+
+    def test_reauthenticates_after_login_page_or_forbidden(self):
+        self.transport.request.side_effect = [
+            _response(),
+            _login_page(),
+            _response(b"<problem revision='2' />"),
+            _response(b"forbidden", status_code=403),
+            _response(b"<problem revision='3' />"),
+        ]
+
+        first = self.session.post(PROBLEM_URL).content
+        second = self.session.post(PROBLEM_URL).content
+        third = self.session.post(PROBLEM_URL).content
+
+        self.assertEqual(first, b"<problem />")
+        self.assertEqual(second, b"<problem revision='2' />")
+        self.assertEqual(third, b"<problem revision='3' />")
+        self.assertEqual(self._sent_credentials(), [True, False, True, False, True])
+        self.assertEqual(self.session.stats()["reauthentications"], 2)
+
+    def test_falls_back_to_credentials_when_cookies_are_never_accepted(self):
+        self.transport.request.side_effect = [_response(), _login_page(), _response(), _login_page()] + [
+            _response() for _ in range(3)
+        ]
+
+        for _ in range(5):
+            self.session.post(PROBLEM_URL)
+
+        stats = self.session.stats()
+        self.assertFalse(stats["cookie_auth"])
+        self.assertEqual(self._sent_credentials(), [True, False, True, False, True, True, True])
+
+    def test_html_content_is_not_treated_as_login_page(self):
+        statement = _response(b"<!DOCTYPE html><p>statement</p>", headers={"Content-Type": "text/html"})
+        self.transport.request.side_effect = [_response(), statement]
+
+        self.session.post(PROBLEM_URL)
+        content = self.session.post(PROBLEM_URL).content
+
+        self.assertEqual(content, b"<!DOCTYPE html><p>statement</p>")
+        self.assertEqual(self._sent_credentials(), [True, False])
+        self.assertEqual(self.session.stats()["reauthentications"], 0)
+
+    def test_login_redirect_or_form_body_triggers_reauthentication(self):
+        redirect = _response(b"", status_code=302, headers={"Location": "/login"})
+        form_at_problem_url = _response(LOGIN_FORM, headers={"Content-Type": "text/html"})
+        self.transport.request.side_effect = [
+            _response(),
+            redirect,
+            _response(),
+            form_at_problem_url,
+            _response(),
+        ]
+
+        for _ in range(3):
+            self.session.post(PROBLEM_URL)
+
+        self.assertEqual(self._sent_credentials(), [True, False, True, False, True])
+        self.assertEqual(self.session.stats()["reauthentications"], 2)
+
+    def test_rejected_credentials_raise_without_retry_loop(self):
+        self.transport.request.return_value = _response(b"forbidden", status_code=403)
+
+        with self.assertRaises(AccessDeniedException):
+            self.session.post(PROBLEM_URL)
+
+        self.assertEqual(self.transport.request.call_count, 1)
+        self.assertFalse(self.session.stats()["authenticated"])
+
+    def test_login_page_after_reauthentication_raises_instead_of_returning_it(self):
+        self.transport.request.side_effect = [_response(), _login_page(), _login_page()]
+
+        self.session.post(PROBLEM_URL)
+        with self.assertRaises(AccessDeniedException):
+            self.session.post(PROBLEM_URL)
+
+        self.assertEqual(self._sent_credentials(), [True, False, True])
+        self.assertFalse(self.session.stats()["authenticated"])
+
+    def test_download_without_web_session_uses_a_closed_one_off_session(self):
+        transport = Mock()
+        transport.request.return_value = _response()
+
+        with patch("src.polygon.web_session.PolygonTransport", return_value=transport):
+            content = download_problem_descriptor(PROBLEM_URL, "login", "password")
+
+        self.assertEqual(content, b"<problem />")
+        self.assertIn("password", transport.request.call_args.kwargs["data"])
+        transport.close.assert_called_once_with()
+
+    def test_streamed_requests_detect_login_page_from_headers(self):
+        self.transport.request.side_effect = [_response(), _login_page(), _response()]
+
+        self.session.post(PROBLEM_URL)
+        self.session.post(PROBLEM_URL, headers={"Range": "bytes=10-"}, stream=True)
+
+        last = self.transport.request.call_args
+        self.assertIs(last.kwargs["stream"], True)
+        self.assertEqual(last.kwargs["headers"], {"Range": "bytes=10-"})
+        self.assertEqual(self._sent_credentials(), [True, False, True])
+
+
+class WebSessionRegistryTest(unittest.TestCase):
+    def tearDown(self):
+        reset_client_cache()
+
+    def test_reuses_session_per_account_and_closes_on_clear(self):
+        registry = WebSessionRegistry(lambda login, password: Mock(login=login))
+
+        first = registry.get("alice", "secret")
+        again = registry.get("alice", "secret")
+        other = registry.get("alice", "changed")
+        registry.clear()
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        first.close.assert_called_once()
+        self.assertEqual(len(registry), 0)
+
+    @patch("src.mcp.utils.common.build_transport")
+    def test_mcp_helper_shares_session_until_reset(self, transport_mock):
+        first = get_web_session("alice", "secret")
+        again = get_web_session("alice", "secret")
+        reset_client_cache()
+        after_reset = get_web_session("alice", "secret")
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, after_reset)
+        self.assertEqual(transport_mock.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()